@@ -0,0 +1,217 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import contextlib
+import io
+import sys
+import threading
+from ..common.config import CLI_DRIVER_POOL_SIZE
+from .services import create_driver
+from awscli.clidriver import CLIDriver
+from typing import Any, Callable, Iterator, TextIO
+
+
+CHUNK_SIZE = 64 * 1024
+
+# Customizations that only write to the standard output from the thread running them.
+# Other customizations, like the s3 transfer commands, print from worker threads, so
+# their output can only be captured by redirecting the output of every thread.
+THREAD_SAFE_CUSTOMIZATIONS = {
+    ('s3', 'ls'),
+    ('s3', 'presign'),
+    ('s3', 'mb'),
+    ('s3', 'website'),
+    ('cloudfront', 'sign'),
+    ('ecr', 'get-login-password'),
+    ('ecr-public', 'get-login-password'),
+    ('eks', 'get-token'),
+    ('rds', 'generate-db-auth-token'),
+}
+
+
+def is_thread_safe_customization(service: str | None, operation: str | None) -> bool:
+    """Check if the customization can run concurrently with other customizations."""
+    return (service, operation) in THREAD_SAFE_CUSTOMIZATIONS
+
+
+class BoundedOutput(io.TextIOBase):
+    """Text stream keeping the first max_bytes written to it, in chunks of bounded size.
+
+    Writes past the budget are dropped and mark the output as truncated, the command
+    writing to the stream is not interrupted.
+    """
+
+    def __init__(self, max_bytes: int | None = None, chunk_size: int = CHUNK_SIZE):
+        """Initialize an empty output."""
+        super().__init__()
+        self.max_bytes = max_bytes
+        self.chunk_size = chunk_size
+        self.truncated = False
+        self.size = 0
+        self._chunks: list[str] = []
+        self._pending: list[str] = []
+        self._pending_size = 0
+
+    def writable(self) -> bool:
+        """The output is always writable."""
+        return True
+
+    def write(self, s: str) -> int:
+        """Append the text to the output, up to the size budget."""
+        if self.truncated or not s:
+            return len(s)
+        text = s
+        size = len(text.encode('utf-8'))
+        if self.max_bytes is not None and self.size + size > self.max_bytes:
+            # Cut on a character boundary rather than in the middle of a multibyte character
+            remaining = self.max_bytes - self.size
+            text = text.encode('utf-8')[:remaining].decode('utf-8', errors='ignore')
+            size = len(text.encode('utf-8'))
+            self.truncated = True
+        self.size += size
+        self._pending.append(text)
+        self._pending_size += size
+        if self._pending_size >= self.chunk_size:
+            self._flush_pending()
+        return len(s)
+
+    def chunks(self) -> list[str]:
+        """Get the output written so far, in chunks of about chunk_size bytes."""
+        self._flush_pending()
+        return list(self._chunks)
+
+    def getvalue(self) -> str:
+        """Get the output written so far."""
+        return ''.join(self.chunks())
+
+    def _flush_pending(self):
+        if self._pending:
+            self._chunks.append(''.join(self._pending))
+            self._pending = []
+            self._pending_size = 0
+
+
+class _ThreadRoutedStream:
+    """Standard stream writing to the output captured by the current thread.
+
+    Threads that do not capture their output write to the output of the exclusive
+    capture if there is one, and to the original stream otherwise.
+    """
+
+    def __init__(self, original: TextIO):
+        self._original = original
+        self._local = threading.local()
+        self.exclusive_target: TextIO | io.TextIOBase | None = None
+
+    @property
+    def target(self) -> Any:
+        return getattr(self._local, 'target', None) or self.exclusive_target or self._original
+
+    @contextlib.contextmanager
+    def routed_to(self, target: io.TextIOBase, exclusive: bool = False) -> Iterator[None]:
+        previous = getattr(self._local, 'target', None)
+        self._local.target = target
+        if exclusive:
+            self.exclusive_target = target
+        try:
+            yield
+        finally:
+            self._local.target = previous
+            if exclusive:
+                self.exclusive_target = None
+
+    def write(self, s: str) -> int:
+        return self.target.write(s)
+
+    def flush(self):
+        self.target.flush()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.target, name)
+
+
+_routing_lock = threading.Lock()
+_exclusive_lock = threading.Lock()
+
+
+def _routed_stream(name: str) -> _ThreadRoutedStream:
+    with _routing_lock:
+        stream = getattr(sys, name)
+        if not isinstance(stream, _ThreadRoutedStream):
+            stream = _ThreadRoutedStream(stream)
+            setattr(sys, name, stream)
+        return stream
+
+
+@contextlib.contextmanager
+def capture_output(
+    max_bytes: int | None = None, exclusive: bool = False
+) -> Iterator[tuple[BoundedOutput, BoundedOutput]]:
+    """Capture what the current thread writes to the standard output and error.
+
+    Captures of different threads do not interfere with each other. An exclusive
+    capture also collects what threads without a capture of their own write, and
+    waits for any other exclusive capture to finish first.
+    """
+    stdout, stderr = BoundedOutput(max_bytes), BoundedOutput(max_bytes)
+    stdout_stream, stderr_stream = _routed_stream('stdout'), _routed_stream('stderr')
+    with contextlib.ExitStack() as stack:
+        if exclusive:
+            stack.enter_context(_exclusive_lock)
+        stack.enter_context(stdout_stream.routed_to(stdout, exclusive))
+        stack.enter_context(stderr_stream.routed_to(stderr, exclusive))
+        yield stdout, stderr
+
+
+class DriverPool:
+    """Warm AWS CLI drivers, reused across customization runs.
+
+    Drivers are created on first use and kept per profile, so credentials resolved
+    by a driver are never used for another profile. Configuration set by the global
+    arguments of a run, like the region, is reset when the driver is released.
+    """
+
+    def __init__(self, size: int, factory: Callable[[], CLIDriver] = create_driver):
+        """Initialize an empty pool keeping up to size idle drivers per profile."""
+        self.size = size
+        self._factory = factory
+        self._idle: dict[str | None, list[CLIDriver]] = {}
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def driver(self, profile: str | None) -> Iterator[CLIDriver]:
+        """Borrow a driver for the given profile, creating one if none is idle."""
+        with self._lock:
+            idle = self._idle.get(profile)
+            cli_driver = idle.pop() if idle else None
+        if cli_driver is None:
+            cli_driver = self._factory()
+        instance_vars = dict(cli_driver.session._session_instance_vars)
+        try:
+            yield cli_driver
+        finally:
+            cli_driver.session._session_instance_vars.clear()
+            cli_driver.session._session_instance_vars.update(instance_vars)
+            with self._lock:
+                idle = self._idle.setdefault(profile, [])
+                if len(idle) < self.size:
+                    idle.append(cli_driver)
+
+    def clear(self):
+        """Drop every idle driver."""
+        with self._lock:
+            self._idle.clear()
+
+
+driver_pool = DriverPool(CLI_DRIVER_POOL_SIZE)
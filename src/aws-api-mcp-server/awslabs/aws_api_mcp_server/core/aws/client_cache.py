@@ -0,0 +1,179 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import boto3
+import hashlib
+import threading
+import time
+from ..common.config import CLIENT_CACHE_SIZE, CLIENT_CACHE_TTL_SECONDS
+from botocore.config import Config
+from collections import OrderedDict
+from loguru import logger
+from typing import Any, NamedTuple
+
+
+ClientCacheKey = tuple[str, str, str, tuple[Any, ...]]
+
+
+class ClientCacheStats(NamedTuple):
+    """Counters describing the usage of a client cache."""
+
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+
+
+class _CachedClient(NamedTuple):
+    client: Any
+    created_at: float
+
+
+def credentials_fingerprint(
+    access_key_id: str, secret_access_key: str, session_token: str | None
+) -> str:
+    """Return a digest identifying a set of credentials without retaining the secrets."""
+    digest = hashlib.sha256()
+    for part in (access_key_id, secret_access_key, session_token or ''):
+        digest.update(part.encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+def _config_key(config: Config) -> tuple[Any, ...]:
+    retries = getattr(config, 'retries', None) or {}
+    return (
+        getattr(config, 'connect_timeout', None),
+        getattr(config, 'read_timeout', None),
+        tuple(sorted(retries.items())),
+        getattr(config, 'user_agent_extra', None),
+    )
+
+
+class ClientCache:
+    """Bounded LRU cache of boto3 clients with TTL eviction.
+
+    Clients are keyed by service, region, a fingerprint of the credentials and the
+    client configuration, so refreshed session tokens always produce a new client
+    while repeated calls with the same credentials reuse the loaded service model
+    and the keep-alive connections of the underlying HTTP pool.
+    """
+
+    def __init__(self, max_size: int = CLIENT_CACHE_SIZE, ttl: float = CLIENT_CACHE_TTL_SECONDS):
+        """Initialize the cache with the given capacity and time to live in seconds."""
+        self.max_size = max_size
+        self.ttl = ttl
+        self._clients: OrderedDict[ClientCacheKey, _CachedClient] = OrderedDict()
+        self._lock = threading.Lock()
+        # boto3 sessions are not thread safe, client creation is serialized separately
+        # so that cache hits are never blocked by a slow client construction
+        self._session_lock = threading.Lock()
+        self._session: boto3.Session | None = None
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get_client(
+        self,
+        service_name: str,
+        access_key_id: str,
+        secret_access_key: str,
+        session_token: str | None,
+        config: Config,
+    ) -> Any:
+        """Return a cached client for the given service, credentials and configuration."""
+        key: ClientCacheKey = (
+            service_name,
+            str(getattr(config, 'region_name', None)),
+            credentials_fingerprint(access_key_id, secret_access_key, session_token),
+            _config_key(config),
+        )
+
+        if self.max_size <= 0:
+            return self._create_client(
+                service_name, access_key_id, secret_access_key, session_token, config
+            )
+
+        with self._lock:
+            cached = self._clients.get(key)
+            if cached is not None and not self._is_expired(cached):
+                self._clients.move_to_end(key)
+                self._hits += 1
+                return cached.client
+            if cached is not None:
+                del self._clients[key]
+                self._evictions += 1
+            self._misses += 1
+
+        client = self._create_client(
+            service_name, access_key_id, secret_access_key, session_token, config
+        )
+
+        with self._lock:
+            self._clients[key] = _CachedClient(client=client, created_at=time.monotonic())
+            self._clients.move_to_end(key)
+            while len(self._clients) > self.max_size:
+                self._clients.popitem(last=False)
+                self._evictions += 1
+
+        return client
+
+    def stats(self) -> ClientCacheStats:
+        """Return the hit, miss and eviction counters of the cache."""
+        with self._lock:
+            return ClientCacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                size=len(self._clients),
+            )
+
+    def clear(self):
+        """Drop every cached client and reset the counters."""
+        with self._lock:
+            self._clients.clear()
+            self._hits = 0
+            self._misses = 0
+            self._evictions = 0
+
+    def _is_expired(self, cached: _CachedClient) -> bool:
+        return self.ttl > 0 and time.monotonic() - cached.created_at >= self.ttl
+
+    def _create_client(
+        self,
+        service_name: str,
+        access_key_id: str,
+        secret_access_key: str,
+        session_token: str | None,
+        config: Config,
+    ) -> Any:
+        logger.debug(
+            'Creating boto3 client for {} in {}',
+            service_name,
+            getattr(config, 'region_name', None),
+        )
+        with self._session_lock:
+            if self._session is None:
+                self._session = boto3.Session()
+            session = self._session
+            return session.client(
+                service_name,
+                aws_access_key_id=access_key_id,
+                aws_secret_access_key=secret_access_key,
+                aws_session_token=session_token,
+                config=config,
+            )
+
+
+client_cache = ClientCache()
@@ -14,12 +14,14 @@
 
 import boto3
 import botocore.exceptions
+import time
 from ..common.errors import (
     CliParsingError,
     CommandValidationError,
     MissingContextError,
 )
 from ..common.helpers import as_json
+from ..common.metrics import stage_metrics
 from ..common.models import Credentials, InterpretedProgram, IRTranslation
 from ..parser.interpretation import interpret
 from ..parser.parser import parse
@@ -61,6 +63,7 @@ def translate_cli_to_ir(cli_command: str) -> IRTranslation:
     Syntactical errors can be used for a refinement loop, while validations
     errors can be used to ask for more clarification from the end-user.
     """
+    start = time.perf_counter()
     try:
         command = parse(cli_command)
     except (CliParsingError, CommandValidationError) as exc:
@@ -71,6 +74,13 @@ def translate_cli_to_ir(cli_command: str) -> IRTranslation:
             command_metadata=exc.command_metadata,
         )
 
+    stage_metrics.record(
+        'parse',
+        command.service_name,
+        command.operation_python_name,
+        command.region,
+        time.perf_counter() - start,
+    )
     return IRTranslation(
         command=command,
         command_metadata=command.command_metadata,
@@ -0,0 +1,99 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import contextlib
+import functools
+import threading
+from ..common.config import MAX_CONCURRENT_CALLS, MAX_CONCURRENT_CALLS_PER_SERVICE
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, ParamSpec, TypeVar
+from weakref import WeakKeyDictionary
+
+
+P = ParamSpec('P')
+T = TypeVar('T')
+
+
+class AwsCallExecutor:
+    """Runs blocking AWS calls in a bounded thread pool, off the event loop.
+
+    The number of calls running at the same time against a single service is limited,
+    so that a burst of calls to one service neither starves the others nor gets
+    throttled. Calls waiting for their service do not hold a thread of the pool.
+    """
+
+    def __init__(self, max_workers: int, max_calls_per_service: int):
+        """Initialize the executor, the thread pool is created on first use."""
+        self.max_workers = max_workers
+        self.max_calls_per_service = max_calls_per_service
+        self._pool: ThreadPoolExecutor | None = None
+        self._pool_lock = threading.Lock()
+        # Asyncio primitives are bound to the event loop they are used in
+        self._service_limits: WeakKeyDictionary[
+            asyncio.AbstractEventLoop, dict[str, asyncio.Semaphore]
+        ] = WeakKeyDictionary()
+        self._exclusive_locks: WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock] = (
+            WeakKeyDictionary()
+        )
+
+    async def run(
+        self, service: str | None, func: Callable[P, T], *args: P.args, **kwargs: P.kwargs
+    ) -> T:
+        """Run the blocking function in the pool, once the service is below its limit.
+
+        Calls that are not made to a service, like command translation, are only limited
+        by the size of the pool.
+        """
+        loop = asyncio.get_running_loop()
+        async with self._service_limit(loop, service):
+            return await loop.run_in_executor(
+                self._get_pool(), functools.partial(func, *args, **kwargs)
+            )
+
+    async def run_exclusive(
+        self, service: str | None, func: Callable[P, T], *args: P.args, **kwargs: P.kwargs
+    ) -> T:
+        """Run the blocking function in the pool, one exclusive call at a time.
+
+        This is meant for calls that change process wide state, like the standard output.
+        """
+        loop = asyncio.get_running_loop()
+        exclusive_lock = self._exclusive_locks.setdefault(loop, asyncio.Lock())
+        async with exclusive_lock:
+            return await self.run(service, func, *args, **kwargs)
+
+    def _service_limit(
+        self, loop: asyncio.AbstractEventLoop, service: str | None
+    ) -> contextlib.AbstractAsyncContextManager:
+        if service is None or self.max_calls_per_service <= 0:
+            return contextlib.nullcontext()
+        limits = self._service_limits.setdefault(loop, {})
+        semaphore = limits.get(service)
+        if semaphore is None:
+            semaphore = limits[service] = asyncio.Semaphore(self.max_calls_per_service)
+        return semaphore
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=max(1, self.max_workers), thread_name_prefix='aws-call'
+                )
+            return self._pool
+
+
+aws_call_executor = AwsCallExecutor(
+    max_workers=MAX_CONCURRENT_CALLS, max_calls_per_service=MAX_CONCURRENT_CALLS_PER_SERVICE
+)
@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from ..common.helpers import as_json
 from .services import PaginationConfig
 from botocore.paginate import PageIterator, Paginator
 from botocore.utils import merge_dicts, set_value_from_jmespath
@@ -20,24 +21,65 @@ from loguru import logger
 from typing import Any
 
 
+# Expression nodes that map a list to a list element by element, so applying them to
+# every page and concatenating the outputs is the same as applying them to the merged pages
+_LIST_PRESERVING_NODES = frozenset(['projection', 'filter_projection', 'flatten'])
+
+
+def _get_field_path(node: Any) -> str | None:
+    if node['type'] == 'field':
+        return node['value']
+    if node['type'] == 'subexpression':
+        parts = [_get_field_path(child) for child in node['children']]
+        if all(part is not None for part in parts):
+            return '.'.join(parts)  # type: ignore[arg-type]
+    return None
+
+
+def _is_filter_page_decomposable(
+    client_side_filter: ParsedResult, result_keys: list[ParsedResult]
+) -> bool:
+    """Check if the client-side filter can be applied to every page independently.
+
+    This is the case for projections, filters and flattens over a single result key,
+    e.g. `Reservations[].Instances[].InstanceId` or `Functions[?Runtime=='python3.13']`.
+    """
+    node: Any = client_side_filter.parsed
+    if node['type'] not in _LIST_PRESERVING_NODES:
+        return False
+
+    while node['type'] in _LIST_PRESERVING_NODES:
+        node = node['children'][0]
+
+    field_path = _get_field_path(node)
+    return field_path is not None and field_path in {key.expression for key in result_keys}
+
+
 def _merge_page_into_result(
     result: dict[str, Any],
     page: dict[str, Any],
     page_iterator: PageIterator,
-) -> dict[str, Any]:
+    measure_size: bool = False,
+) -> int:
+    """Merge the result keys of the page into the aggregated values of the result.
+
+    The aggregated values are kept by result key expression and only written into the
+    nested response structure once, when the result is finalized.
+
+    Returns the serialized size of the merged values if measure_size is set, 0 otherwise.
+    """
+    merged_size = 0
     for result_expression in page_iterator.result_keys:
         result_value = result_expression.search(page)
         if result_value is None:
             continue
 
-        existing_value = result_expression.search(result)
+        if measure_size:
+            merged_size += _serialized_size(result_value)
+        existing_value = result.get(result_expression.expression)
         if existing_value is None:
             # Set the initial result
-            set_value_from_jmespath(
-                result,
-                result_expression.expression,
-                result_value,
-            )
+            result[result_expression.expression] = result_value
             continue
 
         # Merge with existing value
@@ -45,13 +87,22 @@ def _merge_page_into_result(
             existing_value.extend(result_value)
         elif isinstance(result_value, (int | float | str)):
             # Modify the existing result with the sum or concatenation
-            set_value_from_jmespath(
-                result,
-                result_expression.expression,
-                existing_value + result_value,
-            )
+            result[result_expression.expression] = existing_value + result_value
 
-    return result
+    return merged_size
+
+
+def _serialized_size(value: Any) -> int:
+    return len(as_json(value))
+
+
+def _set_resume_token(page_iterator: PageIterator, page: dict[str, Any]) -> bool:
+    """Set the resume token to the page following the given one, if there is any."""
+    next_token = page_iterator._get_next_token(page)
+    if not next_token or all(token is None for token in next_token.values()):
+        return False
+    page_iterator.resume_token = next_token
+    return True
 
 
 def _finalize_result(
@@ -75,6 +126,13 @@ def _finalize_result(
     return result
 
 
+def _build_response(aggregated_values: dict[str, Any]) -> dict[str, Any]:
+    response: dict[str, Any] = {}
+    for expression, value in aggregated_values.items():
+        set_value_from_jmespath(response, expression, value)
+    return response
+
+
 def build_result(
     paginator: Paginator,
     service_name: str,
@@ -82,14 +140,22 @@ def build_result(
     operation_parameters: dict[str, Any],
     pagination_config: PaginationConfig,
     client_side_filter: ParsedResult | None = None,
+    max_result_bytes: int | None = None,
 ):
     """This function is based on build_full_result in botocore with some modifications.
 
     to take into account token limits, max results and timeouts. The first page is always processed.
 
+    When the client-side filter is a projection over a result key it is applied to every
+    page as it arrives, so only the filtered values are kept in memory. When max_result_bytes
+    is given, no more pages are requested once the accumulated result reaches that size and
+    the token to resume from the next page is returned as pagination_token.
+
     https://github.com/boto/botocore/blob/master/botocore/paginate.py#L481
     """
-    result: dict[str, Any] = {}
+    aggregated_values: dict[str, Any] = {}
+    filtered_values: list[Any] | None = None
+    result_size = 0
     response_metadata = None
 
     logger.info(
@@ -97,6 +163,10 @@ def build_result(
     )
     page_iterator = paginator.paginate(**operation_parameters, PaginationConfig=pagination_config)
 
+    filter_per_page = client_side_filter is not None and _is_filter_page_decomposable(
+        client_side_filter, page_iterator.result_keys or []
+    )
+
     for response in page_iterator:
         page = response
 
@@ -104,9 +174,35 @@ def build_result(
         if isinstance(response, tuple) and len(response) == 2:
             page = response[1]
 
-        # For each page in the response we need to inject the necessary components from the page into the result.
-        _merge_page_into_result(result, page, page_iterator)
+        if filter_per_page:
+            page_values = client_side_filter.search(page)  # type: ignore[union-attr]
+            if page_values is not None:
+                filtered_values = filtered_values if filtered_values is not None else []
+                filtered_values.extend(page_values)
+                if max_result_bytes is not None:
+                    result_size += _serialized_size(page_values)
+        else:
+            # For each page in the response we need to inject the necessary components from the page into the result.
+            result_size += _merge_page_into_result(
+                aggregated_values, page, page_iterator, measure_size=max_result_bytes is not None
+            )
 
         response_metadata = page.get('ResponseMetadata')
 
-    return _finalize_result(result, page_iterator, response_metadata, client_side_filter)
+        if max_result_bytes is not None and result_size >= max_result_bytes:
+            if _set_resume_token(page_iterator, page):
+                logger.info(
+                    'Result for {} {} reached {} bytes, stopping pagination early',
+                    service_name,
+                    operation_name,
+                    result_size,
+                )
+            break
+
+    if filter_per_page:
+        result: dict[str, Any] = {'Result': filtered_values}
+        return _finalize_result(result, page_iterator, response_metadata, None)
+
+    return _finalize_result(
+        _build_response(aggregated_values), page_iterator, response_metadata, client_side_filter
+    )
@@ -0,0 +1,280 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import base64
+import hashlib
+import os
+import re
+import threading
+import time
+import zlib
+from ..common.config import (
+    MULTIPART_DOWNLOAD_CONCURRENCY,
+    MULTIPART_DOWNLOAD_PART_SIZE,
+    MULTIPART_DOWNLOAD_THRESHOLD,
+)
+from ..common.errors import DownloadError
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+from loguru import logger
+from typing import Any, Callable
+
+
+CHUNK_SIZE = 4 * 1024 * 1024
+
+# Operations whose streaming output can be requested by byte range
+RANGE_CAPABLE_OPERATIONS = {('s3', 'GetObject')}
+# Parameters selecting a part of the object, which the ranges of the download replace
+PARTIAL_PARAMETERS = ('Range', 'PartNumber')
+
+_MD5_ETAG = re.compile(r'^[0-9a-f]{32}$')
+_KMS_ENCRYPTION = ('aws:kms', 'aws:kms:dsse')
+
+
+class DownloadProgress:
+    """Bytes and parts written by a download, safe to update from several threads."""
+
+    def __init__(self, total_bytes: int, total_parts: int):
+        """Initialize the progress of a download that has not started yet."""
+        self.total_bytes = total_bytes
+        self.total_parts = total_parts
+        self.bytes_written = 0
+        self.parts_completed = 0
+        self.checksum: str | None = None
+        self._started_at = time.perf_counter()
+        self._finished_at: float | None = None
+        self._lock = threading.Lock()
+
+    def add_bytes(self, size: int):
+        """Record bytes written to the file."""
+        with self._lock:
+            self.bytes_written += size
+
+    def complete_part(self):
+        """Record a part fully written to the file."""
+        with self._lock:
+            self.parts_completed += 1
+            logger.debug(
+                'Downloaded part {}/{}, {}/{} bytes',
+                self.parts_completed,
+                self.total_parts,
+                self.bytes_written,
+                self.total_bytes,
+            )
+
+    def finish(self):
+        """Stop the clock of the download."""
+        self._finished_at = time.perf_counter()
+
+    @property
+    def elapsed_seconds(self) -> float:
+        """Seconds since the download started, until it finished."""
+        return (self._finished_at or time.perf_counter()) - self._started_at
+
+    @property
+    def throughput(self) -> float:
+        """Bytes written per second."""
+        return self.bytes_written / max(self.elapsed_seconds, 1e-9)
+
+
+def supports_ranged_download(
+    service_name: str, operation_name: str, parameters: dict[str, Any], response: dict[str, Any]
+) -> bool:
+    """Check if the streaming output of the response is worth downloading in ranges."""
+    if (service_name, operation_name) not in RANGE_CAPABLE_OPERATIONS:
+        return False
+    if any(parameter in parameters for parameter in PARTIAL_PARAMETERS):
+        return False
+    size = response.get('ContentLength')
+    return (
+        MULTIPART_DOWNLOAD_THRESHOLD > 0
+        and isinstance(size, int)
+        and size >= max(MULTIPART_DOWNLOAD_THRESHOLD, MULTIPART_DOWNLOAD_PART_SIZE + 1)
+        and bool(response.get('ETag'))
+    )
+
+
+def download_ranges(
+    operation: Callable[..., dict[str, Any]],
+    parameters: dict[str, Any],
+    response: dict[str, Any],
+    response_key: str,
+    path: str,
+    part_size: int = MULTIPART_DOWNLOAD_PART_SIZE,
+    concurrency: int = MULTIPART_DOWNLOAD_CONCURRENCY,
+) -> DownloadProgress:
+    """Download the streaming output of the response to the path with concurrent ranged requests.
+
+    The body of the response is used for the first part, the other parts are requested
+    again with a Range and pinned to the ETag of the response, so that an object
+    changing during the download fails the download instead of mixing two versions.
+    Parts are written in place into a file preallocated to the size of the object.
+    """
+    size = response['ContentLength']
+    ranges = [(start, min(start + part_size, size) - 1) for start in range(0, size, part_size)]
+    range_parameters = {
+        key: value for key, value in parameters.items() if key not in PARTIAL_PARAMETERS
+    }
+    range_parameters['IfMatch'] = response['ETag']
+    if response.get('VersionId') and 'VersionId' not in range_parameters:
+        range_parameters['VersionId'] = response['VersionId']
+
+    progress = DownloadProgress(size, len(ranges))
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o666)
+    try:
+        os.ftruncate(fd, size)
+        writer = _PositionalWriter(fd)
+
+        def download_range(start: int, end: int):
+            part = operation(**range_parameters, Range=f'bytes={start}-{end}')
+            _write_stream(writer, part[response_key], start, end - start + 1, progress)
+
+        first_start, first_end = ranges[0]
+        with ThreadPoolExecutor(
+            max_workers=max(1, min(concurrency, len(ranges))), thread_name_prefix='ranged-download'
+        ) as executor:
+            futures = [
+                executor.submit(
+                    _write_stream,
+                    writer,
+                    response[response_key],
+                    first_start,
+                    first_end - first_start + 1,
+                    progress,
+                )
+            ]
+            futures.extend(executor.submit(download_range, *part) for part in ranges[1:])
+            done, not_done = wait(futures, return_when=FIRST_EXCEPTION)
+            for future in not_done:
+                future.cancel()
+            for future in done:
+                future.result()
+    except BaseException:
+        os.close(fd)
+        _remove(path)
+        raise
+    os.close(fd)
+
+    progress.checksum = verify_checksum(path, response)
+    progress.finish()
+    logger.info(
+        'Downloaded {} bytes in {} parts to {} in {:.2f} seconds ({:.1f} MiB/s)',
+        progress.bytes_written,
+        progress.total_parts,
+        path,
+        progress.elapsed_seconds,
+        progress.throughput / (1024 * 1024),
+    )
+    return progress
+
+
+def verify_checksum(path: str, response: dict[str, Any]) -> str | None:
+    """Check the downloaded file against the full object checksum of the response.
+
+    Returns the algorithm used, or None when the response has no checksum of the full
+    object, like the ETag of multipart uploads or of objects encrypted with KMS.
+    """
+    expected = _expected_checksum(response)
+    if expected is None:
+        return None
+    algorithm, new_hash, encode, expected_value = expected
+
+    file_hash = new_hash()
+    with open(path, 'rb') as f:
+        while chunk := f.read(CHUNK_SIZE):
+            file_hash.update(chunk)
+    actual_value = encode(file_hash)
+    if actual_value != expected_value:
+        _remove(path)
+        raise DownloadError(
+            f'Downloaded file {path} does not match the {algorithm} checksum of the object, '
+            f'expected {expected_value} but got {actual_value}'
+        )
+    return algorithm
+
+
+class _Crc32:
+    def __init__(self):
+        self.value = 0
+
+    def update(self, data: bytes):
+        self.value = zlib.crc32(data, self.value)
+
+
+def _expected_checksum(response: dict[str, Any]) -> tuple[str, Callable, Callable, str] | None:
+    if response.get('ChecksumCRC32') and response.get('ChecksumType', 'FULL_OBJECT') == (
+        'FULL_OBJECT'
+    ):
+        return (
+            'CRC32',
+            _Crc32,
+            lambda crc: base64.b64encode(crc.value.to_bytes(4, 'big')).decode(),
+            response['ChecksumCRC32'],
+        )
+    etag = response.get('ETag', '').strip('"')
+    if (
+        _MD5_ETAG.match(etag)
+        and response.get('ServerSideEncryption') not in _KMS_ENCRYPTION
+        and not response.get('SSECustomerAlgorithm')
+    ):
+        return 'MD5', lambda: hashlib.md5(usedforsecurity=False), lambda md5: md5.hexdigest(), etag
+    return None
+
+
+class _PositionalWriter:
+    """Writes at an offset of a file without moving a shared file position."""
+
+    def __init__(self, fd: int):
+        self._fd = fd
+        # Without pwrite, like on Windows, seeking and writing must not interleave
+        self._lock = None if hasattr(os, 'pwrite') else threading.Lock()
+
+    def write_at(self, data: bytes, offset: int):
+        view = memoryview(data)
+        while view:
+            if self._lock is None:
+                written = os.pwrite(self._fd, view, offset)
+            else:
+                with self._lock:
+                    os.lseek(self._fd, offset, os.SEEK_SET)
+                    written = os.write(self._fd, view)
+            view = view[written:]
+            offset += written
+
+
+def _write_stream(
+    writer: _PositionalWriter, body: Any, start: int, length: int, progress: DownloadProgress
+):
+    offset = start
+    remaining = length
+    try:
+        while remaining > 0:
+            chunk = body.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            writer.write_at(chunk, offset)
+            offset += len(chunk)
+            remaining -= len(chunk)
+            progress.add_bytes(len(chunk))
+    finally:
+        body.close()
+    if remaining:
+        raise DownloadError(f'Range starting at byte {start} ended {remaining} bytes early')
+    progress.complete_part()
+
+
+def _remove(path: str):
+    try:
+        os.remove(path)
+    except OSError as e:
+        logger.warning('Failed to remove incomplete download {}: {}', path, e)
@@ -12,10 +12,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import contextlib
 import json
-from ..aws.services import driver
-from ..common.config import AWS_API_MCP_PROFILE_NAME, DEFAULT_REGION
+from ..common.config import AWS_API_MCP_PROFILE_NAME, DEFAULT_REGION, MAX_RESULT_BYTES
 from ..common.errors import AwsApiMcpError, Failure
 from ..common.models import (
     AwsApiMcpServerErrorResponse,
@@ -36,10 +34,10 @@ from ..metadata.read_only_operations_list import (
 )
 from ..parser.lexer import split_cli_command
 from ..security.policy import PolicyDecision, SecurityPolicy
+from .cli_runner import capture_output, driver_pool, is_thread_safe_customization
 from .driver import interpret_command as _interpret_command
 from awslabs.aws_api_mcp_server.core.common.command import IRCommand
 from awslabs.aws_api_mcp_server.core.common.helpers import operation_timer
-from io import StringIO
 from loguru import logger
 from mcp.server.elicitation import AcceptedElicitation
 from mcp.server.fastmcp import Context
@@ -137,24 +135,33 @@ def execute_awscli_customization(
         args.extend(['--profile', AWS_API_MCP_PROFILE_NAME])
 
     try:
-        stdout_capture = StringIO()
-        stderr_capture = StringIO()
-
+        # Customizations printing from worker threads need the output of every thread
+        exclusive = not is_thread_safe_customization(
+            ir_command.service_name, ir_command.operation_name
+        )
         with (
-            contextlib.redirect_stdout(stdout_capture),
-            contextlib.redirect_stderr(stderr_capture),
+            driver_pool.driver(ir_command.profile or AWS_API_MCP_PROFILE_NAME) as cli_driver,
+            capture_output(MAX_RESULT_BYTES, exclusive=exclusive) as (stdout, stderr),
         ):
             with operation_timer(
                 ir_command.service_name,
                 ir_command.operation_name,
                 ir_command.region or DEFAULT_REGION,
             ):
-                driver.main(args)
-
-        stdout_output = stdout_capture.getvalue()
-        stderr_output = stderr_capture.getvalue()
+                cli_driver.main(args)
 
-        return AwsCliAliasResponse(response=stdout_output, error=stderr_output)
+        if stdout.truncated or stderr.truncated:
+            logger.warning(
+                'Output of {} {} truncated to {} bytes',
+                ir_command.service_name,
+                ir_command.operation_name,
+                MAX_RESULT_BYTES,
+            )
+        return AwsCliAliasResponse(
+            response=stdout.getvalue(),
+            error=stderr.getvalue(),
+            truncated=stdout.truncated or stderr.truncated,
+        )
     except Exception as e:
         return AwsApiMcpServerErrorResponse(
             error=True,
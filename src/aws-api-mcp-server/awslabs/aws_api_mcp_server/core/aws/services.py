@@ -47,9 +47,16 @@ class ConfigResult(NamedTuple):
 
 filter_query = re.compile(r'^\s+([-a-z0-9_.]+|tag:<key>)\s+')
 
-driver = awscli.clidriver.create_clidriver()
+
+def create_driver() -> awscli.clidriver.CLIDriver:
+    """Create an AWS CLI driver that refuses to load parameters from remote URIs."""
+    cli_driver = awscli.clidriver.create_clidriver()
+    cli_driver.session.register('load-cli-arg', RESTRICTED_URI_HANDLER)
+    return cli_driver
+
+
+driver = create_driver()
 session = driver.session
-session.register('load-cli-arg', RESTRICTED_URI_HANDLER)
 
 
 class OperationFilters:
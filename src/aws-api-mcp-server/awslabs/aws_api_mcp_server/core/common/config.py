@@ -81,3 +81,33 @@ CUSTOM_SCRIPTS_DIR = os.getenv('AWS_API_MCP_AGENT_SCRIPTS_DIR')
 ALLOW_UNRESTRICTED_LOCAL_FILE_ACCESS = get_env_bool(
     ALLOW_UNRESTRICTED_LOCAL_FILE_ACCESS_KEY, False
 )
+CLIENT_CACHE_SIZE = int(os.getenv('AWS_API_MCP_CLIENT_CACHE_SIZE', 32))
+CLIENT_CACHE_TTL_SECONDS = int(os.getenv('AWS_API_MCP_CLIENT_CACHE_TTL_SECONDS', 900))
+MAX_RESULT_BYTES = int(os.getenv('AWS_API_MCP_MAX_RESULT_BYTES', 0)) or None
+KNOWLEDGE_BASE_STORE_DIR = os.getenv(
+    'AWS_API_MCP_KNOWLEDGE_BASE_DIR', get_server_directory() / 'knowledge_base'
+)
+KNOWLEDGE_BASE_STORE_DTYPE = os.getenv('AWS_API_MCP_KNOWLEDGE_BASE_DTYPE', 'float16')
+KNOWLEDGE_BASE_INDEX_TYPE = os.getenv('AWS_API_MCP_KNOWLEDGE_BASE_INDEX', 'flat')
+QUERY_CACHE_SIZE = int(os.getenv('AWS_API_MCP_QUERY_CACHE_SIZE', 1024))
+QUERY_CACHE_FILE = (
+    Path(os.environ['AWS_API_MCP_QUERY_CACHE_FILE'])
+    if os.getenv('AWS_API_MCP_QUERY_CACHE_FILE')
+    else None
+)
+READ_ONLY_OPERATIONS_CACHE_DIR = os.getenv(
+    'AWS_API_MCP_READ_ONLY_OPERATIONS_DIR', get_server_directory() / 'read_only_operations'
+)
+PARSE_CACHE_SIZE = int(os.getenv('AWS_API_MCP_PARSE_CACHE_SIZE', 256))
+MAX_CONCURRENT_CALLS = int(os.getenv('AWS_API_MCP_MAX_CONCURRENT_CALLS', 16))
+MAX_CONCURRENT_CALLS_PER_SERVICE = int(
+    os.getenv('AWS_API_MCP_MAX_CONCURRENT_CALLS_PER_SERVICE', 4)
+)
+CLI_DRIVER_POOL_SIZE = int(os.getenv('AWS_API_MCP_CLI_DRIVER_POOL_SIZE', 4))
+MULTIPART_DOWNLOAD_THRESHOLD = int(
+    os.getenv('AWS_API_MCP_MULTIPART_DOWNLOAD_THRESHOLD', 64 * 1024 * 1024)
+)
+MULTIPART_DOWNLOAD_PART_SIZE = int(
+    os.getenv('AWS_API_MCP_MULTIPART_DOWNLOAD_PART_SIZE', 16 * 1024 * 1024)
+)
+MULTIPART_DOWNLOAD_CONCURRENCY = int(os.getenv('AWS_API_MCP_MULTIPART_DOWNLOAD_CONCURRENCY', 8))
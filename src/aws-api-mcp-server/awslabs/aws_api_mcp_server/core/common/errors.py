@@ -45,6 +45,10 @@ class CliParsingError(AwsApiMcpError):
     """Thrown when the CLI parsing fails."""
 
 
+class DownloadError(AwsApiMcpError):
+    """Thrown when a download is incomplete or does not match the checksum of the object."""
+
+
 class CommandValidationError(AwsApiMcpError):
     """Thrown when the command validation fails.
 
@@ -21,6 +21,7 @@ import tempfile
 import time
 import zipfile
 from .config import EMBEDDING_MODEL_DIR
+from .metrics import stage_metrics
 from botocore.response import StreamingBody
 from contextlib import contextmanager
 from datetime import datetime
@@ -39,7 +40,8 @@ def operation_timer(service: str, operation: str, region: str):
     """
     start = time.perf_counter()
     logger.info('Interpreting operation {}.{} for region {}', service, operation, region)
-    yield
+    with stage_metrics.timer('total', service, operation, region):
+        yield
     end = time.perf_counter()
     elapsed_time = end - start
     logger.info('Operation {}.{} interpreted in {} seconds', service, operation, elapsed_time)
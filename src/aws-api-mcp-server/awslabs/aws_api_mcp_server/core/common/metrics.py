@@ -0,0 +1,203 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, NamedTuple
+
+
+# Each power of two is split in 2**SUB_BUCKET_BITS buckets, about 6% relative error
+SUB_BUCKET_BITS = 4
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+# Latencies are recorded in microseconds, up to about 19 hours
+MAX_VALUE_BITS = 36
+BUCKET_COUNT = SUB_BUCKETS * (MAX_VALUE_BITS - SUB_BUCKET_BITS + 1)
+MAX_VALUE = (1 << MAX_VALUE_BITS) - 1
+
+# Bucket boundaries, in seconds, of the exported Prometheus histograms
+EXPORTED_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+METRIC_NAME = 'aws_api_mcp_stage_duration_seconds'
+MAX_SERIES = 2048
+OTHER = 'other'
+
+
+class StageKey(NamedTuple):
+    """Labels of a stage histogram."""
+
+    stage: str
+    service: str
+    operation: str
+    region: str
+
+
+def _bucket_index(value: int) -> int:
+    shift = max(0, value.bit_length() - SUB_BUCKET_BITS - 1)
+    return (shift << SUB_BUCKET_BITS) + (value >> shift)
+
+
+def _bucket_upper_bound(index: int) -> int:
+    """Smallest value above the values counted in the bucket."""
+    shift = max(0, (index >> SUB_BUCKET_BITS) - 1)
+    return (index - (shift << SUB_BUCKET_BITS) + 1) << shift
+
+
+class LatencyHistogram:
+    """Latency histogram with log-linear buckets, in the style of HDR histograms.
+
+    Memory is fixed regardless of the number of values recorded, and percentiles are
+    accurate to the width of a bucket.
+    """
+
+    def __init__(self):
+        """Initialize an empty histogram."""
+        self.counts = [0] * BUCKET_COUNT
+        self.count = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float):
+        """Record a latency."""
+        index = _bucket_index(min(max(int(seconds * 1_000_000), 0), MAX_VALUE))
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.total_seconds += seconds
+            if seconds > self.max_seconds:
+                self.max_seconds = seconds
+
+    def percentile(self, percent: float) -> float:
+        """Get the latency in seconds below which the given percent of the values fall."""
+        with self._lock:
+            counts, count = list(self.counts), self.count
+        if count == 0:
+            return 0.0
+        rank = max(1, round(count * percent / 100))
+        seen = 0
+        for index, bucket_count in enumerate(counts):
+            seen += bucket_count
+            if seen >= rank:
+                return min(_bucket_upper_bound(index) / 1_000_000, self.max_seconds)
+        return self.max_seconds
+
+    def cumulative_counts(self, bounds: tuple[float, ...]) -> list[int]:
+        """Count the values at or below each bound, in seconds."""
+        with self._lock:
+            counts = list(self.counts)
+        cumulative = []
+        seen = 0
+        index = 0
+        for bound in bounds:
+            limit = bound * 1_000_000
+            while index < BUCKET_COUNT and _bucket_upper_bound(index) <= limit:
+                seen += counts[index]
+                index += 1
+            cumulative.append(seen)
+        return cumulative
+
+
+class StageMetrics:
+    """Latency histograms of the stages of a call, by service, operation and region.
+
+    Once MAX_SERIES histograms exist, new label combinations are recorded under
+    'other' so that memory stays bounded.
+    """
+
+    def __init__(self, max_series: int = MAX_SERIES):
+        """Initialize the metrics without any histogram."""
+        self.max_series = max_series
+        self._histograms: dict[StageKey, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def record(self, stage: str, service: str, operation: str, region: str, seconds: float):
+        """Record the latency of a stage."""
+        key = StageKey(stage, service, operation, region)
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            histogram = self._create_histogram(key)
+        histogram.record(seconds)
+
+    @contextmanager
+    def timer(self, stage: str, service: str, operation: str, region: str) -> Iterator[None]:
+        """Record the time spent in the block as the latency of a stage."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, service, operation, region, time.perf_counter() - start)
+
+    def histograms(self) -> dict[StageKey, LatencyHistogram]:
+        """Get the histograms recorded so far."""
+        with self._lock:
+            return dict(self._histograms)
+
+    def clear(self):
+        """Drop every histogram."""
+        with self._lock:
+            self._histograms.clear()
+
+    def to_prometheus(self) -> str:
+        """Export the histograms in the Prometheus text exposition format."""
+        lines = [
+            f'# HELP {METRIC_NAME} Time spent in each stage of the AWS API MCP server.',
+            f'# TYPE {METRIC_NAME} histogram',
+        ]
+        for key, histogram in sorted(self.histograms().items()):
+            labels = ','.join(
+                f'{name}="{_escape_label(value)}"' for name, value in key._asdict().items()
+            )
+            for bound, cumulative in zip(
+                EXPORTED_BUCKETS, histogram.cumulative_counts(EXPORTED_BUCKETS)
+            ):
+                lines.append(f'{METRIC_NAME}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'{METRIC_NAME}_bucket{{{labels},le="+Inf"}} {histogram.count}')
+            lines.append(f'{METRIC_NAME}_sum{{{labels}}} {histogram.total_seconds}')
+            lines.append(f'{METRIC_NAME}_count{{{labels}}} {histogram.count}')
+        return '\n'.join(lines) + '\n'
+
+    def _create_histogram(self, key: StageKey) -> LatencyHistogram:
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                if len(self._histograms) >= self.max_series:
+                    key = StageKey(key.stage, OTHER, OTHER, OTHER)
+                    histogram = self._histograms.get(key)
+                if histogram is None:
+                    histogram = self._histograms[key] = LatencyHistogram()
+            return histogram
+
+
+def _escape_label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+stage_metrics = StageMetrics()
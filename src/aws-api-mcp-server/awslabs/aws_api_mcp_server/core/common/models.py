@@ -113,6 +113,9 @@ class AwsCliAliasResponse(BaseModel):
 
     response: str | None = Field(None)
     error: str | None = Field(None)
+    truncated: bool = Field(
+        default=False, description='Whether the output was cut at AWS_API_MCP_MAX_RESULT_BYTES'
+    )
 
 
 class ProgramInterpretationResponse(BaseModel):
@@ -25,6 +25,9 @@ from awslabs.aws_api_mcp_server.scripts.download_latest_embeddings import (
 
 class RAG(Protocol):  # pragma: no cover
     def get_suggestions(self, query: str, **kwargs) -> dict[str, list[dict]]: ...
+    def get_batch_suggestions(
+        self, queries: list[str], **kwargs
+    ) -> list[dict[str, list[dict]]]: ...
     def get_cache_file_with_version(self) -> Path | None: ...
 
     @property
@@ -60,14 +63,26 @@ class KnowledgeBase:
             threading.Thread(target=lambda: rag.model, daemon=True).start()
 
     def get_suggestions(self, query: str, **kwargs):
+        rag = self._get_ready_rag()
+        return self._trim_results(rag.get_suggestions(query, **kwargs))
+
+    def get_batch_suggestions(self, queries: list[str], **kwargs):
+        """Return the suggestions for every query, encoded and searched in a single batch."""
+        rag = self._get_ready_rag()
+        return [
+            self._trim_results(results) for results in rag.get_batch_suggestions(queries, **kwargs)
+        ]
+
+    def _get_ready_rag(self) -> RAG:
         if self.rag is None:
             raise RuntimeError('RAG is not initialized. Call setup first.')
 
         if not self.rag.is_model_ready:
             raise RuntimeError('The model is still initializing, try again later.')
 
-        results = self.rag.get_suggestions(query, **kwargs)
+        return self.rag
 
+    def _trim_results(self, results: dict[str, list[dict]]):
         for result in results['suggestions']:
             result['description'] = self.trim_text(result['description'], 1000)
             for key, value in result['parameters'].items():
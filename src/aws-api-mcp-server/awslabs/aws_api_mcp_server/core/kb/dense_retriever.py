@@ -15,8 +15,17 @@
 import json
 import numpy as np
 import os
-from ...core.common.config import EMBEDDING_MODEL_DIR
+from ...core.common.config import (
+    EMBEDDING_MODEL_DIR,
+    KNOWLEDGE_BASE_INDEX_TYPE,
+    KNOWLEDGE_BASE_STORE_DIR,
+    KNOWLEDGE_BASE_STORE_DTYPE,
+    QUERY_CACHE_FILE,
+    QUERY_CACHE_SIZE,
+)
 from ...core.common.helpers import download_embedding_model
+from .embedding_store import EmbeddingStore
+from .query_cache import QueryEmbeddingCache
 from awscli.clidriver import __version__ as awscli_version
 from copy import deepcopy
 from loguru import logger
@@ -41,19 +50,39 @@ class DenseRetriever:
         top_k: int = DEFAULT_TOP_K,
         model_name: str = DEFAULT_EMBEDDING_MODEL,
         cache_dir: Path = DEFAULT_CACHE_DIR,
+        store_dir: Path | None = Path(KNOWLEDGE_BASE_STORE_DIR),
+        store_dtype: str = KNOWLEDGE_BASE_STORE_DTYPE,
+        store_index_type: str = KNOWLEDGE_BASE_INDEX_TYPE,
+        query_cache_size: int = QUERY_CACHE_SIZE,
+        query_cache_path: Path | None = QUERY_CACHE_FILE,
     ):
         """Initializes the retriever.
 
         If cache_dir is given, the documents and embeddings are loaded fro mthe cache on demand. Otherwise the embeddings are generated on the fly given the documents.
+
+        If store_dir is given, the cached knowledge base is converted once into a memory-mapped
+        embedding store in that directory, which is then used to serve suggestions.
+
+        Query embeddings are kept in an LRU cache of query_cache_size entries, persisted to
+        query_cache_path when it is given.
         """
         self.top_k = top_k
         self.cache_dir = cache_dir
         self.model_name = model_name
+        self.store_dir = store_dir
+        self.store_dtype = store_dtype
+        self.store_index_type = store_index_type
         self._model = None
         self._index = None
         self._documents = None
         self._embeddings = None
+        self._store = None
         self._model_ready = False
+        self.query_cache = QueryEmbeddingCache(
+            model_name=model_name,
+            max_size=query_cache_size,
+            persist_path=query_cache_path,
+        )
 
     @property
     def model(self):
@@ -128,6 +157,38 @@ class DenseRetriever:
         """Set the embeddings."""
         self._embeddings = value
 
+    @property
+    def store(self) -> EmbeddingStore | None:
+        """Return the memory-mapped embedding store, creating it from the cache file if needed."""
+        if self._store is None:
+            store_dir = self.get_store_dir_with_version()
+            cache_file = self.get_cache_file_with_version()
+            if store_dir is None:
+                return None
+            if not EmbeddingStore.exists(store_dir):
+                if not cache_file or not Path(cache_file).exists():
+                    return None
+                logger.info(f'Building embedding store from versioned cache: {cache_file}')
+                data = np.load(cache_file, allow_pickle=False)
+                EmbeddingStore.build(
+                    store_dir,
+                    embeddings=data['embeddings'],
+                    documents=json.loads(str(data['documents'])),
+                    dtype=self.store_dtype,  # type: ignore[arg-type]
+                    index_type=self.store_index_type,  # type: ignore[arg-type]
+                )
+            self._store = EmbeddingStore(store_dir)
+        return self._store
+
+    def get_store_dir_with_version(self):
+        """Return the embedding store directory for the current awscli version and store settings."""
+        if self.store_dir:
+            return (
+                Path(self.store_dir)
+                / f'{KNOWLEDGE_BASE_SUFFIX}-{awscli_version}-{self.store_dtype}-{self.store_index_type}'
+            )
+        return None
+
     def get_cache_file_with_version(self):
         """Return cache file name with current awscli version."""
         if self.cache_dir:
@@ -172,21 +233,57 @@ class DenseRetriever:
             show_progress_bar=True,
         ).astype('float32')
 
+    def encode_queries(self, queries: list[str]) -> np.ndarray:
+        """Return the normalized embeddings of the queries, encoding cache misses in one batch."""
+        embeddings: list[np.ndarray | None] = [self.query_cache.get(query) for query in queries]
+        missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+        if missing:
+            encoded = self.model.encode(
+                [queries[i] for i in missing], normalize_embeddings=True
+            ).astype('float32')
+            for i, embedding in zip(missing, encoded, strict=True):
+                embeddings[i] = embedding
+                self.query_cache.put(queries[i], embedding)
+        return np.stack(embeddings)  # type: ignore[arg-type]
+
     def get_suggestions(self, query: str, **_kwargs) -> dict[str, list[dict]]:
         """Search for similar documents using the query."""
-        # Generate embedding for the query
-        query_embedding = self.model.encode([query], normalize_embeddings=True).astype('float32')
+        return self.get_batch_suggestions([query])[0]
+
+    def get_batch_suggestions(self, queries: list[str], **_kwargs) -> list[dict[str, list[dict]]]:
+        """Search for similar documents for every query with a single encoding and search call."""
+        if not queries:
+            return []
 
-        # Perform the search
-        distances, indices = self.index.search(query_embedding, self.top_k)  # type: ignore
+        # Generate embeddings for the queries
+        query_embeddings = self.encode_queries(queries)
+
+        # Serve from the memory-mapped store unless documents were loaded or generated in memory
+        store = self.store if self._documents is None and self._index is None else None
+        if store is not None:
+            distances, indices = store.search(query_embeddings, self.top_k)
+            get_document = store.document
+        else:
+            # Perform the search
+            distances, indices = self.index.search(query_embeddings, self.top_k)  # type: ignore
+            if self.documents is None:
+                raise ValueError('Documents are not loaded.')
+            in_memory_documents = self.documents
+
+            def get_document(idx: int) -> dict:
+                return deepcopy(in_memory_documents[idx])
 
         # Format results
-        documents = []
-        if self.documents is None:
-            raise ValueError('Documents are not loaded.')
-        for distance, idx in zip(distances[0], indices[0], strict=False):
-            document = deepcopy(self.documents[idx])
-            document['similarity'] = round(float(distance), 3)
-            documents.append(document)
-
-        return {'suggestions': documents}
+        results = []
+        for query_distances, query_indices in zip(distances, indices, strict=False):
+            documents = []
+            for distance, idx in zip(query_distances, query_indices, strict=False):
+                if idx < 0:
+                    # Approximate indexes pad the results when fewer than top_k are found
+                    continue
+                document = get_document(int(idx))
+                document['similarity'] = round(float(distance), 3)
+                documents.append(document)
+            results.append({'suggestions': documents})
+
+        return results
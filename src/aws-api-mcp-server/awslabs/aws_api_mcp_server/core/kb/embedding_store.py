@@ -0,0 +1,218 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import mmap
+import numpy as np
+import os
+import shutil
+import tempfile
+from loguru import logger
+from pathlib import Path
+from typing import Any, Literal
+
+
+StoreDtype = Literal['float16', 'int8']
+StoreIndexType = Literal['flat', 'ivf', 'hnsw']
+
+STORE_FORMAT_VERSION = 1
+EMBEDDINGS_FILE = 'embeddings.npy'
+DOCUMENTS_FILE = 'documents.jsonl'
+OFFSETS_FILE = 'offsets.npy'
+INDEX_FILE = 'index.faiss'
+METADATA_FILE = 'metadata.json'
+
+# Embeddings are L2 normalized, so every component is in [-1, 1]
+INT8_SCALE = 127.0
+SEARCH_CHUNK_SIZE = 4096
+IVF_NPROBE = 16
+HNSW_EF_SEARCH = 64
+
+
+def _quantize(embeddings: np.ndarray, dtype: StoreDtype) -> tuple[np.ndarray, float]:
+    if dtype == 'int8':
+        quantized = np.clip(np.rint(embeddings * INT8_SCALE), -INT8_SCALE, INT8_SCALE)
+        return quantized.astype(np.int8), INT8_SCALE
+    return embeddings.astype(np.float16), 1.0
+
+
+def _build_faiss_index(embeddings: np.ndarray, dtype: StoreDtype, index_type: StoreIndexType):
+    import faiss
+
+    count, dimension = embeddings.shape
+    encoding = 'SQ8' if dtype == 'int8' else 'SQfp16'
+    if index_type == 'ivf':
+        nlist = max(1, min(count // 39, int(4 * np.sqrt(count))))
+        description = f'IVF{nlist},{encoding}'
+    else:
+        description = f'HNSW32_{encoding}'
+
+    index = faiss.index_factory(dimension, description, faiss.METRIC_INNER_PRODUCT)
+    vectors = np.ascontiguousarray(embeddings, dtype=np.float32)
+    index.train(vectors)  # type: ignore
+    index.add(vectors)  # type: ignore
+    return index
+
+
+class EmbeddingStore:
+    """Read-only, memory-mapped store of document embeddings.
+
+    A store is a directory holding a quantized embedding matrix, the documents as
+    JSON lines with their byte offsets and, optionally, a prebuilt IVF or HNSW index.
+    Every file is memory-mapped, so server processes on the same host share the pages
+    and documents are only decoded when they are returned as a search hit.
+    """
+
+    def __init__(self, directory: Path):
+        """Open the store in the given directory."""
+        self.directory = Path(directory)
+        with open(self.directory / METADATA_FILE) as metadata_file:
+            self.metadata: dict[str, Any] = json.load(metadata_file)
+        if self.metadata.get('version') != STORE_FORMAT_VERSION:
+            raise ValueError(f'Unsupported embedding store version in {self.directory}')
+
+        self.scale = float(self.metadata['scale'])
+        self.embeddings = np.load(self.directory / EMBEDDINGS_FILE, mmap_mode='r')
+        self.offsets = np.load(self.directory / OFFSETS_FILE, mmap_mode='r')
+        self._documents_buffer = self._map_documents()
+        self.index = self._read_index()
+
+    def __len__(self) -> int:
+        """Return the number of documents in the store."""
+        return int(self.metadata['count'])
+
+    @classmethod
+    def exists(cls, directory: Path) -> bool:
+        """Check if a store was written to the given directory."""
+        return (Path(directory) / METADATA_FILE).exists()
+
+    @classmethod
+    def build(
+        cls,
+        directory: Path,
+        embeddings: np.ndarray,
+        documents: list[dict[str, Any]],
+        dtype: StoreDtype = 'float16',
+        index_type: StoreIndexType = 'flat',
+    ) -> 'EmbeddingStore':
+        """Write a store for the given embeddings and documents and open it.
+
+        The store is written to a temporary directory first and moved in place, so
+        concurrent readers never observe a partially written store.
+        """
+        directory = Path(directory)
+        if dtype not in ('float16', 'int8'):
+            raise ValueError(f'Unsupported embedding store dtype: {dtype}')
+        if index_type not in ('flat', 'ivf', 'hnsw'):
+            raise ValueError(f'Unsupported embedding store index type: {index_type}')
+        if len(embeddings) != len(documents):
+            raise ValueError('The number of embeddings and documents must match')
+
+        directory.parent.mkdir(parents=True, exist_ok=True)
+        tmp_dir = Path(tempfile.mkdtemp(prefix=f'.{directory.name}-', dir=directory.parent))
+        try:
+            quantized, scale = _quantize(np.asarray(embeddings, dtype=np.float32), dtype)
+            np.save(tmp_dir / EMBEDDINGS_FILE, quantized)
+
+            offsets = [0]
+            with open(tmp_dir / DOCUMENTS_FILE, 'wb') as documents_file:
+                for document in documents:
+                    line = json.dumps(document).encode('utf-8') + b'\n'
+                    documents_file.write(line)
+                    offsets.append(offsets[-1] + len(line))
+            np.save(tmp_dir / OFFSETS_FILE, np.array(offsets, dtype=np.int64))
+
+            if index_type != 'flat' and len(documents) > 0:
+                import faiss
+
+                index = _build_faiss_index(np.asarray(embeddings), dtype, index_type)
+                faiss.write_index(index, str(tmp_dir / INDEX_FILE))
+
+            with open(tmp_dir / METADATA_FILE, 'w') as metadata_file:
+                json.dump(
+                    {
+                        'version': STORE_FORMAT_VERSION,
+                        'count': len(documents),
+                        'dimension': int(quantized.shape[1]) if quantized.ndim == 2 else 0,
+                        'dtype': dtype,
+                        'scale': scale,
+                        'index_type': index_type,
+                    },
+                    metadata_file,
+                )
+
+            try:
+                os.rename(tmp_dir, directory)
+            except OSError:
+                # Another process finished writing the same store first
+                if not cls.exists(directory):
+                    raise
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+        except Exception:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+
+        logger.info('Embedding store written to {}', directory)
+        return cls(directory)
+
+    def document(self, idx: int) -> dict[str, Any]:
+        """Decode the document at the given position."""
+        start, end = int(self.offsets[idx]), int(self.offsets[idx + 1])
+        return json.loads(self._documents_buffer[start:end])
+
+    def search(self, queries: np.ndarray, top_k: int) -> tuple[np.ndarray, np.ndarray]:
+        """Return the inner product scores and positions of the top_k documents per query."""
+        queries = np.ascontiguousarray(np.atleast_2d(queries), dtype=np.float32)
+        if self.index is not None:
+            return self.index.search(queries, top_k)
+
+        count = len(self)
+        top_k = min(top_k, count)
+        scores = np.empty((queries.shape[0], count), dtype=np.float32)
+        # Only a chunk of the matrix is converted to float32 at a time, the rest stays mapped
+        for start in range(0, count, SEARCH_CHUNK_SIZE):
+            chunk = np.asarray(self.embeddings[start : start + SEARCH_CHUNK_SIZE], np.float32)
+            scores[:, start : start + SEARCH_CHUNK_SIZE] = queries @ chunk.T
+        scores /= self.scale
+
+        if top_k == 0:
+            return scores[:, :0], np.empty((queries.shape[0], 0), dtype=np.int64)
+        candidates = np.argpartition(-scores, top_k - 1, axis=1)[:, :top_k]
+        candidate_scores = np.take_along_axis(scores, candidates, axis=1)
+        order = np.argsort(-candidate_scores, axis=1)
+        return (
+            np.take_along_axis(candidate_scores, order, axis=1),
+            np.take_along_axis(candidates, order, axis=1),
+        )
+
+    def _map_documents(self) -> bytes | mmap.mmap:
+        documents_path = self.directory / DOCUMENTS_FILE
+        if documents_path.stat().st_size == 0:
+            return b''
+        with open(documents_path, 'rb') as documents_file:
+            return mmap.mmap(documents_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def _read_index(self):
+        index_path = self.directory / INDEX_FILE
+        if not index_path.exists():
+            return None
+
+        import faiss
+
+        index = faiss.read_index(str(index_path), faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY)
+        if self.metadata.get('index_type') == 'ivf':
+            faiss.extract_index_ivf(index).nprobe = IVF_NPROBE
+        else:
+            faiss.downcast_index(index).hnsw.efSearch = HNSW_EF_SEARCH
+        return index
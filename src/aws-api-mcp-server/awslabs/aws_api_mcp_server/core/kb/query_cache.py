@@ -0,0 +1,136 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import atexit
+import numpy as np
+import os
+import re
+import tempfile
+import threading
+from collections import OrderedDict
+from loguru import logger
+from pathlib import Path
+
+
+PERSIST_EVERY = 32
+
+
+def normalize_query(query: str) -> str:
+    """Normalize a query so that trivially different spellings share one embedding."""
+    return re.sub(r'\s+', ' ', query).strip().casefold()
+
+
+class QueryEmbeddingCache:
+    """Size-bounded LRU cache of query embeddings with optional on-disk persistence.
+
+    When a persist path is given, the cache is loaded from it on creation and written
+    back atomically every PERSIST_EVERY new entries and when the process exits.
+    Persisted entries are only reused for the model they were computed with.
+    """
+
+    def __init__(self, model_name: str, max_size: int, persist_path: Path | None = None):
+        """Initialize the cache for the given model."""
+        self.model_name = model_name
+        self.max_size = max_size
+        self.persist_path = Path(persist_path) if persist_path else None
+        self._embeddings: OrderedDict[str, np.ndarray] = OrderedDict()
+        self._lock = threading.Lock()
+        self._unsaved = 0
+        self.hits = 0
+        self.misses = 0
+        if self.persist_path is not None:
+            if self.persist_path.exists():
+                self._load()
+            atexit.register(self.persist)
+
+    def __len__(self) -> int:
+        """Return the number of cached embeddings."""
+        return len(self._embeddings)
+
+    def get(self, query: str) -> np.ndarray | None:
+        """Return the cached embedding of the query, if any."""
+        key = normalize_query(query)
+        with self._lock:
+            embedding = self._embeddings.get(key)
+            if embedding is None:
+                self.misses += 1
+                return None
+            self._embeddings.move_to_end(key)
+            self.hits += 1
+            return embedding
+
+    def put(self, query: str, embedding: np.ndarray):
+        """Store the embedding of the query, evicting the least recently used entries."""
+        if self.max_size <= 0:
+            return
+        key = normalize_query(query)
+        with self._lock:
+            self._embeddings[key] = embedding
+            self._embeddings.move_to_end(key)
+            while len(self._embeddings) > self.max_size:
+                self._embeddings.popitem(last=False)
+            self._unsaved += 1
+            should_persist = self.persist_path is not None and self._unsaved >= PERSIST_EVERY
+        if should_persist:
+            self.persist()
+
+    def clear(self):
+        """Drop every cached embedding and reset the counters."""
+        with self._lock:
+            self._embeddings.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def persist(self):
+        """Write the cache to the persist path, if one is configured."""
+        if self.persist_path is None:
+            return
+        with self._lock:
+            if not self._embeddings:
+                return
+            queries = np.array(list(self._embeddings.keys()))
+            embeddings = np.stack(list(self._embeddings.values()))
+            if not self._unsaved:
+                return
+            self._unsaved = 0
+
+        try:
+            self.persist_path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(
+                prefix=f'.{self.persist_path.name}-', suffix='.npz', dir=self.persist_path.parent
+            )
+            with os.fdopen(fd, 'wb') as tmp_file:
+                np.savez(
+                    tmp_file,
+                    model_name=np.array(self.model_name),
+                    queries=queries,
+                    embeddings=embeddings,
+                )
+            os.replace(tmp_path, self.persist_path)
+        except OSError as e:
+            logger.warning('Failed to persist query embedding cache: {}', e)
+
+    def _load(self):
+        try:
+            data = np.load(self.persist_path, allow_pickle=False)  # type: ignore[arg-type]
+            if str(data['model_name']) != self.model_name:
+                logger.info('Ignoring query embedding cache computed with a different model')
+                return
+            for query, embedding in zip(data['queries'], data['embeddings'], strict=True):
+                self._embeddings[str(query)] = embedding
+            while len(self._embeddings) > self.max_size:
+                self._embeddings.popitem(last=False)
+        except Exception as e:
+            logger.warning('Failed to load query embedding cache: {}', e)
+            self._embeddings.clear()
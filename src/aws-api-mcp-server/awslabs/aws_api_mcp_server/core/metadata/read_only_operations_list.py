@@ -13,109 +13,257 @@
 # limitations under the License.
 import importlib.resources
 import json
+import os
 import requests
+import tempfile
+import threading
+from ..common.config import READ_ONLY_OPERATIONS_CACHE_DIR
 from collections import defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor
 from loguru import logger
-from typing import List
+from pathlib import Path
+from typing import Any, Iterable, List, Optional
 
 
 SERVICE_REFERENCE_URL = 'https://servicereference.us-east-1.amazonaws.com/'
 METADATA_FILE = 'data/api_metadata.json'
+READ_ONLY_INDEX_FILE = 'data/read_only_operations.json'
+SERVICE_REFERENCE_LIST_FILE = 'services.json'
 DEFAULT_REQUEST_TIMEOUT = 5
+# Bump when the layout of the precompiled index or of the on-disk cache changes
+INDEX_FORMAT_VERSION = 1
+MAX_FETCH_WORKERS = 4
+
+CUSTOM_READONLY_OPERATIONS = {
+    's3': ['ls', 'presign'],
+    'cloudfront': ['sign'],
+    'cloudtrail': ['validate-logs'],
+    'codeartifact': ['login'],
+    'codecommit': ['credential-helper'],
+    'datapipeline': ['list-runs'],
+    'ecr': ['get-login', 'get-login-password'],
+    'ecr-public': ['get-login-password'],
+    'eks': ['get-token'],
+    'emr': ['describe-cluster'],
+    'gamelift': ['get-game-session-log'],
+    'logs': ['start-live-tail'],
+    'rds': ['generate-db-auth-token'],
+    'configservice': ['get-status'],
+}
+
+
+def get_versioned_cache_dir(cache_dir: Optional[Path] = None) -> Path:
+    """Get the directory of the on-disk cache for the current index format."""
+    return Path(cache_dir or READ_ONLY_OPERATIONS_CACHE_DIR) / f'v{INDEX_FORMAT_VERSION}'
+
+
+def parse_service_reference(document: dict[str, Any]) -> List[str]:
+    """Get the names of the actions of a service reference document that are not writes."""
+    return [
+        action['Name']
+        for action in document['Actions']
+        if not action['Annotations']['Properties']['IsWrite']
+    ]
+
+
+def compile_read_only_index(
+    service_reference_operations: Optional[dict[str, List[str]]] = None,
+) -> dict[str, List[str]]:
+    """Merge the api metadata, the custom operations and service references into one index."""
+    operations_by_service = defaultdict(set)
+    with (
+        importlib.resources.files('awslabs.aws_api_mcp_server.core')
+        .joinpath(METADATA_FILE)
+        .open() as metadata_file
+    ):
+        data = json.load(metadata_file)
+    for service, operations in data.items():
+        for operation, operation_metadata in operations.items():
+            if operation_metadata.get('type') == 'ReadOnly':
+                operations_by_service[service].add(operation)
+    for service, operations in CUSTOM_READONLY_OPERATIONS.items():
+        operations_by_service[service].update(operations)
+    for service, operations in (service_reference_operations or {}).items():
+        operations_by_service[service].update(operations)
+    return {service: sorted(operations) for service, operations in operations_by_service.items()}
+
+
+def _write_json_atomically(path: Path, data: Any):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=f'.{path.name}-', dir=path.parent)
+    try:
+        with os.fdopen(fd, 'w') as tmp_file:
+            json.dump(data, tmp_file)
+        os.replace(tmp_path, path)
+    except Exception:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
+
+
+def _read_json(path: Path) -> Optional[Any]:
+    try:
+        with open(path) as json_file:
+            return json.load(json_file)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning('Ignoring unreadable read only operations cache {}: {}', path, e)
+        return None
 
 
 class ServiceReferenceUrlsByService(dict):
-    """Service reference urls by service."""
+    """Service reference urls by service.
+
+    The list is persisted to the on-disk cache, which is used when the service
+    reference API cannot be reached.
+    """
 
-    def __init__(self):
+    def __init__(self, cache_dir: Optional[Path] = None):
         """Initialize the urls by service map."""
         super().__init__()
+        cache_file = get_versioned_cache_dir(cache_dir) / SERVICE_REFERENCE_LIST_FILE
         try:
             response = requests.get(SERVICE_REFERENCE_URL, timeout=DEFAULT_REQUEST_TIMEOUT).json()
         except Exception as e:
-            logger.error(f'Error retrieving the service reference document: {e}')
-            raise RuntimeError(f'Error retrieving the service reference document: {e}')
+            response = _read_json(cache_file)
+            if response is None:
+                logger.error(f'Error retrieving the service reference document: {e}')
+                raise RuntimeError(f'Error retrieving the service reference document: {e}')
+            logger.warning('Using the cached service reference list: {}', e)
+        else:
+            try:
+                _write_json_atomically(cache_file, response)
+            except OSError as e:
+                logger.warning('Failed to cache the service reference list: {}', e)
         for service_reference in response:
             self[service_reference['service']] = service_reference['url']
 
 
 class ReadOnlyOperations(dict):
-    """Read only operations list by service."""
+    """Read only operations by service.
+
+    Operations are looked up in frozensets built per service on first use from the
+    precompiled index built when the package is released, or from the api metadata
+    when the index is missing. Services that are only known to the service reference API are
+    read from the on-disk cache. Missing services are fetched in the background, and
+    their operations are not considered read only until the fetch completes, so
+    checking a command never waits on the network.
+    """
 
-    def __init__(self, service_reference_urls_by_service: dict[str, str]):
-        """Initialize the read only operations list."""
+    def __init__(
+        self, service_reference_urls_by_service: dict[str, str], cache_dir: Optional[Path] = None
+    ):
+        """Initialize the read only operations index."""
         super().__init__()
         self._service_reference_urls_by_service = service_reference_urls_by_service
-        self._known_readonly_operations = self._get_known_readonly_operations_from_metadata()
-        for service, operations in self._get_custom_readonly_operations().items():
-            if service in self._known_readonly_operations:
-                self._known_readonly_operations[service] = [
-                    *self._known_readonly_operations[service],
-                    *operations,
-                ]
-            else:
-                self._known_readonly_operations[service] = operations
+        self._cache_dir = get_versioned_cache_dir(cache_dir)
+        precompiled_index = self._load_precompiled_index()
+        self._is_precompiled = precompiled_index is not None
+        self._known_operation_lists = (
+            precompiled_index if precompiled_index is not None else compile_read_only_index()
+        )
+        self._known_readonly_operations: dict[str, frozenset[str]] = {}
+        self._fetches: dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
 
     def has(self, service, operation) -> bool:
         """Check if the operation is in the read only operations list."""
-        logger.info(f'checking in read only list : {service} - {operation}')
-        if (
-            service in self._known_readonly_operations
-            and operation in self._known_readonly_operations[service]
-        ):
+        if operation in self._get_known_readonly_operations(service):
             return True
-        if service not in self:
-            if service not in self._service_reference_urls_by_service:
-                return False
-            self._cache_ready_only_operations_for_service(service)
-        return operation in self[service]
+        operations = self.get(service)
+        if operations is None:
+            operations = self._load_service(service)
+        return operations is not None and operation in operations
+
+    def prefetch(self, services: Optional[Iterable[str]] = None) -> List[Future]:
+        """Fetch the service reference of the given services in the background.
+
+        Without services, fetch every service that is neither in the precompiled index
+        nor in the on-disk cache, which is every service when the index is missing.
+        """
+        if services is None:
+            services = [
+                service
+                for service in self._service_reference_urls_by_service
+                if not (self._is_precompiled and service in self._known_operation_lists)
+                and not (self._cache_dir / f'{service}.json').is_file()
+            ]
+        futures = []
+        for service in services:
+            url = self._service_reference_urls_by_service.get(service)
+            if url is not None:
+                futures.append(self._schedule_fetch(service, url))
+        return futures
 
-    def _cache_ready_only_operations_for_service(self, service: str):
+    def _get_known_readonly_operations(self, service: str) -> frozenset[str]:
+        operations = self._known_readonly_operations.get(service)
+        if operations is None:
+            operations = frozenset(self._known_operation_lists.get(service, ()))
+            self._known_readonly_operations[service] = operations
+        return operations
+
+    def _load_service(self, service: str) -> Optional[frozenset[str]]:
+        url = self._service_reference_urls_by_service.get(service)
+        if url is None:
+            return None
+        cached = _read_json(self._cache_dir / f'{service}.json')
+        if cached is None:
+            logger.info(
+                'Read only operations of {} are not cached yet, fetching them in the background',
+                service,
+            )
+            self._schedule_fetch(service, url)
+            return None
+        operations = frozenset(cached['operations'])
+        self[service] = operations
+        if cached.get('url') != url:
+            # The service reference moved to a new version, refresh it but keep serving the old one
+            self._schedule_fetch(service, url)
+        return operations
+
+    def _schedule_fetch(self, service: str, url: str) -> Future:
+        with self._lock:
+            future = self._fetches.get(service)
+            if future is not None and not future.done():
+                return future
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=MAX_FETCH_WORKERS, thread_name_prefix='read-only-operations'
+                )
+            future = self._executor.submit(self._fetch_service, service, url)
+            self._fetches[service] = future
+            return future
+
+    def _fetch_service(self, service: str, url: str):
         try:
-            response = requests.get(
-                self._service_reference_urls_by_service[service], timeout=DEFAULT_REQUEST_TIMEOUT
-            ).json()
+            response = requests.get(url, timeout=DEFAULT_REQUEST_TIMEOUT).json()
+            operations = parse_service_reference(response)
         except Exception as e:
-            logger.error(f'Error retrieving the service reference document: {e}')
-            raise RuntimeError(f'Error retrieving the service reference document: {e}')
-        self[service] = []
-        for action in response['Actions']:
-            if not action['Annotations']['Properties']['IsWrite']:
-                self[service].append(action['Name'])
-
-    def _get_known_readonly_operations_from_metadata(self) -> dict[str, List[str]]:
-        known_readonly_operations = defaultdict(list)
-        with (
-            importlib.resources.files('awslabs.aws_api_mcp_server.core')
-            .joinpath(METADATA_FILE)
-            .open() as metadata_file
-        ):
-            data = json.load(metadata_file)
-        for service, operations in data.items():
-            for operation, operation_metadata in operations.items():
-                operation_type = operation_metadata.get('type')
-                if operation_type == 'ReadOnly':
-                    known_readonly_operations[service].append(operation)
-        return known_readonly_operations
+            logger.warning('Error retrieving the service reference document of {}: {}', service, e)
+            return
+        self[service] = frozenset(operations)
+        try:
+            _write_json_atomically(
+                self._cache_dir / f'{service}.json', {'url': url, 'operations': operations}
+            )
+        except OSError as e:
+            logger.warning('Failed to cache the read only operations of {}: {}', service, e)
 
     @staticmethod
-    def _get_custom_readonly_operations() -> dict[str, List[str]]:
-        return {
-            's3': ['ls', 'presign'],
-            'cloudfront': ['sign'],
-            'cloudtrail': ['validate-logs'],
-            'codeartifact': ['login'],
-            'codecommit': ['credential-helper'],
-            'datapipeline': ['list-runs'],
-            'ecr': ['get-login', 'get-login-password'],
-            'ecr-public': ['get-login-password'],
-            'eks': ['get-token'],
-            'emr': ['describe-cluster'],
-            'gamelift': ['get-game-session-log'],
-            'logs': ['start-live-tail'],
-            'rds': ['generate-db-auth-token'],
-            'configservice': ['get-status'],
-        }
+    def _load_precompiled_index() -> Optional[dict[str, List[str]]]:
+        index_file = importlib.resources.files('awslabs.aws_api_mcp_server.core').joinpath(
+            READ_ONLY_INDEX_FILE
+        )
+        if not index_file.is_file():
+            logger.info('No precompiled read only operations index, using the api metadata')
+            return None
+        with index_file.open() as f:
+            index = json.load(f)
+        if index.get('version') != INDEX_FORMAT_VERSION:
+            logger.warning('Ignoring read only operations index with an unsupported version')
+            return None
+        return index['services']
 
 
 def get_read_only_operations() -> ReadOnlyOperations:
@@ -12,24 +12,27 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import boto3
 import importlib.metadata
+from ..aws.client_cache import client_cache
 from ..aws.pagination import build_result
+from ..aws.ranged_download import download_ranges, supports_ranged_download
 from ..aws.services import (
     extract_pagination_config,
 )
 from ..common.command import IRCommand, OutputFile
 from ..common.config import (
     ENABLE_AGENT_SCRIPTS,
+    MAX_RESULT_BYTES,
     OPT_IN_TELEMETRY,
     READ_OPERATIONS_ONLY_MODE,
     REQUIRE_MUTATION_CONSENT,
 )
 from ..common.file_system_controls import validate_file_path
 from ..common.helpers import operation_timer
+from ..common.metrics import stage_metrics
 from botocore.config import Config
 from jmespath.parser import ParsedResult
-from typing import Any
+from typing import Any, Callable
 
 
 TIMEOUT_AFTER_SECONDS = 10
@@ -68,33 +71,45 @@ def interpret(
         user_agent_extra=_get_user_agent_extra(),
     )
 
-    with operation_timer(ir.service_name, ir.operation_python_name, region):
-        client = boto3.client(
-            ir.service_name,
-            aws_access_key_id=access_key_id,
-            aws_secret_access_key=secret_access_key,
-            aws_session_token=session_token,
-            config=config,
-        )
+    labels = (ir.service_name, ir.operation_python_name, region)
+    with operation_timer(*labels):
+        with stage_metrics.timer('client', *labels):
+            client = client_cache.get_client(
+                ir.service_name,
+                access_key_id=access_key_id,
+                secret_access_key=secret_access_key,
+                session_token=session_token,
+                config=config,
+            )
 
         if client.can_paginate(ir.operation_python_name):
-            response = build_result(
-                paginator=client.get_paginator(ir.operation_python_name),
-                service_name=ir.service_name,
-                operation_name=ir.operation_name,
-                operation_parameters=ir.parameters,
-                pagination_config=pagination_config,
-                client_side_filter=client_side_filter,
-            )
+            with stage_metrics.timer('pagination', *labels):
+                response = build_result(
+                    paginator=client.get_paginator(ir.operation_python_name),
+                    service_name=ir.service_name,
+                    operation_name=ir.operation_name,
+                    operation_parameters=ir.parameters,
+                    pagination_config=pagination_config,
+                    client_side_filter=client_side_filter,
+                    max_result_bytes=MAX_RESULT_BYTES,
+                )
         else:
             operation = getattr(client, ir.operation_python_name)
-            response = operation(**parameters)
+            with stage_metrics.timer('network', *labels):
+                response = operation(**parameters)
 
             if client_side_filter is not None:
                 response = _apply_filter(response, client_side_filter)
 
         if ir.has_streaming_output and ir.output_file and ir.output_file.path != '-':
-            response = _handle_streaming_output(response, ir.output_file)
+            with stage_metrics.timer('download', *labels):
+                response = _handle_streaming_output(
+                    response,
+                    ir.output_file,
+                    ir,
+                    getattr(client, ir.operation_python_name),
+                    parameters,
+                )
 
         return response
 
@@ -109,15 +124,24 @@ def _get_user_agent_extra() -> str:
     return user_agent_extra
 
 
-def _handle_streaming_output(response: dict[str, Any], output_file: OutputFile) -> dict[str, Any]:
+def _handle_streaming_output(
+    response: dict[str, Any],
+    output_file: OutputFile,
+    ir: IRCommand,
+    operation: Callable[..., dict[str, Any]],
+    parameters: dict[str, Any],
+) -> dict[str, Any]:
     streaming_output = response[output_file.response_key]
 
     # Validate file path before writing
     validated_path = validate_file_path(output_file.path)
 
-    with open(validated_path, 'wb') as f:
-        for chunk in streaming_output.iter_chunks(chunk_size=CHUNK_SIZE):
-            f.write(chunk)
+    if supports_ranged_download(ir.service_name, ir.operation_name, parameters, response):
+        download_ranges(operation, parameters, response, output_file.response_key, validated_path)
+    else:
+        with open(validated_path, 'wb') as f:
+            for chunk in streaming_output.iter_chunks(chunk_size=CHUNK_SIZE):
+                f.write(chunk)
 
     del response[output_file.response_key]
     return response
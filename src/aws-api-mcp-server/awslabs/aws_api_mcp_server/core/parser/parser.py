@@ -14,18 +14,23 @@
 
 import argparse
 import botocore.serialize
+import copy
+import dataclasses
+import functools
 import jmespath
 import os
 import re
+import threading
 from ..aws.regions import GLOBAL_SERVICE_REGIONS
 from ..aws.services import (
+    OperationFilters,
     driver,
     get_operation_filters,
     session,
 )
 from ..common.command import IRCommand, OutputFile
 from ..common.command_metadata import CommandMetadata
-from ..common.config import AWS_API_MCP_PROFILE_NAME, get_region
+from ..common.config import AWS_API_MCP_PROFILE_NAME, PARSE_CACHE_SIZE, get_region
 from ..common.errors import (
     AwsApiMcpError,
     ClientSideFilterError,
@@ -52,6 +57,7 @@ from ..common.errors import (
     UnknownFiltersError,
     UnsupportedFilterError,
 )
+from ..common.file_operations import extract_file_paths_from_parameters
 from ..common.file_system_controls import validate_file_path
 from ..common.helpers import expand_user_home_directory
 from .custom_validators.botocore_param_validator import BotoCoreParamValidator
@@ -61,10 +67,11 @@ from .lexer import split_cli_command
 from argparse import Namespace
 from awscli.argparser import ArgTableArgParser, CommandAction, MainArgParser
 from awscli.argprocess import ParamError
-from awscli.arguments import BaseCLIArgument, CLIArgument
+from awscli.arguments import CLIArgument
 from awscli.clidriver import ServiceCommand
 from botocore.exceptions import ParamValidationError, UndefinedModelAttributeError
 from botocore.model import OperationModel, ServiceModel
+from collections import OrderedDict
 from collections.abc import Generator
 from difflib import SequenceMatcher
 from jmespath.exceptions import ParseError
@@ -148,6 +155,12 @@ ALLOWED_FILTER_KEYS_SUBSETS = {
     frozenset({'key', 'value'}): 'key',
 }
 
+# Number of operations whose parsers and lookup tables are kept in memory
+OPERATION_TABLES_CACHE_SIZE = 1024
+
+# Arguments with these prefixes are replaced by the content of a local file
+_FILE_CONTENT_PREFIXES = ('file://', 'fileb://')
+
 
 class ParsedOperationArgs(NamedTuple):
     """Named tuple to store parsed operation arguments."""
@@ -167,10 +180,17 @@ def _on_error_in_argparse(message: str):
 class ArgTableParser(ArgTableArgParser):
     """Parser for argument tables, supporting AWS CLI command metadata."""
 
+    def __init__(self, *args, **kwargs):
+        """Initialize the parser, which can be shared between threads."""
+        super().__init__(*args, **kwargs)
+        self._lock = threading.Lock()
+
     def parse_operation_args(self, command_metadata: CommandMetadata, args: list[str]):
         """Parse known arguments using the provided command metadata and argument list."""
-        self.command_metadata = command_metadata
-        operation_args, unknown_args = super().parse_known_args(args)
+        # The command metadata is kept on the parser for error reporting
+        with self._lock:
+            self.command_metadata = command_metadata
+            operation_args, unknown_args = super().parse_known_args(args)
 
         supported_args = [
             action.option_strings[0] for action in self._actions if action.option_strings
@@ -341,12 +361,120 @@ parser = GlobalArgParser.get_parser()
 driver._add_aliases(command_table, parser)
 
 
+class OperationTables(NamedTuple):
+    """Parser and lookup tables of a service operation, built once per operation."""
+
+    operation_parser: ArgTableParser
+    serialized_to_cli: dict[str, str]
+    filters: OperationFilters
+
+
+@functools.lru_cache(maxsize=OPERATION_TABLES_CACHE_SIZE)
+def _get_service_parser(service_command: ServiceCommand):
+    return service_command._create_parser()
+
+
+@functools.lru_cache(maxsize=OPERATION_TABLES_CACHE_SIZE)
+def _get_arg_table_parser(operation_command) -> ArgTableParser:
+    return ArgTableParser(operation_command.arg_table)
+
+
+@functools.lru_cache(maxsize=OPERATION_TABLES_CACHE_SIZE)
+def _get_operation_tables(operation_command) -> OperationTables:
+    arg_table = operation_command.arg_table
+    return OperationTables(
+        operation_parser=_get_arg_table_parser(operation_command),
+        serialized_to_cli={
+            arg._serialized_name: arg.cli_name
+            for arg in arg_table.values()
+            if isinstance(arg, CLIArgument)
+            and hasattr(arg, '_serialized_name')
+            and hasattr(arg, 'cli_name')
+        },
+        filters=get_operation_filters(operation_command._operation_model),
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _get_serializer(protocol: str):
+    return botocore.serialize.create_serializer(protocol, include_validation=False)
+
+
+class _CachedCommand(NamedTuple):
+    command: IRCommand
+    # The default region depends on the configuration, so it is resolved on every hit
+    uses_default_region: bool
+
+
+_parsed_commands: OrderedDict[tuple[str, ...], _CachedCommand] = OrderedDict()
+_parsed_commands_lock = threading.Lock()
+
+
+def clear_parse_cache(operation_tables: bool = True):
+    """Drop the parsed commands and, unless told otherwise, the per operation tables."""
+    with _parsed_commands_lock:
+        _parsed_commands.clear()
+    if not operation_tables:
+        return
+    _get_service_parser.cache_clear()
+    _get_arg_table_parser.cache_clear()
+    _get_operation_tables.cache_clear()
+
+
+def _copy_command(command: IRCommand) -> IRCommand:
+    # Parameters are mutated when the command is interpreted
+    return dataclasses.replace(command, parameters=copy.deepcopy(command.parameters))
+
+
+def _is_cacheable(tokens: list[str], command: IRCommand) -> bool:
+    # Commands touching local files are parsed again, so that the file access is validated
+    # and the content of the files is loaded every time
+    if command.output_file is not None:
+        return False
+    if any(prefix in token for token in tokens for prefix in _FILE_CONTENT_PREFIXES):
+        return False
+    return not extract_file_paths_from_parameters(command.command_metadata, command.parameters)
+
+
 def parse(cli_command: str) -> IRCommand:
-    """Parse a CLI command string into an IRCommand object."""
+    """Parse a CLI command string into an IRCommand object.
+
+    Successfully parsed commands are kept in a LRU cache keyed by their tokens, so
+    commands that only differ in quoting or whitespace share an entry.
+    """
     tokens = split_cli_command(cli_command)
     # Strip `aws` and expand paths beginning with ~
     tokens = expand_user_home_directory(tokens[1:])
+    key = tuple(tokens)
+    with _parsed_commands_lock:
+        cached = _parsed_commands.get(key)
+        if cached is not None:
+            _parsed_commands.move_to_end(key)
+    if cached is not None:
+        command = _copy_command(cached.command)
+        if cached.uses_default_region:
+            region = get_region(command.profile or AWS_API_MCP_PROFILE_NAME)
+            command = dataclasses.replace(command, region=region)
+        return command
+
     global_args, remaining = parser.parse_known_args(tokens)
+    command = _parse_command(global_args, remaining, tokens)
+    if PARSE_CACHE_SIZE > 0 and _is_cacheable(tokens, command):
+        # Handlers store the region given explicitly or found in an ARN in the global args
+        uses_default_region = (
+            getattr(global_args, 'region', None) is None
+            and _fetch_region_from_arn(command.parameters) is None
+        )
+        with _parsed_commands_lock:
+            _parsed_commands[key] = _CachedCommand(_copy_command(command), uses_default_region)
+            while len(_parsed_commands) > PARSE_CACHE_SIZE:
+                _parsed_commands.popitem(last=False)
+    return command
+
+
+def _parse_command(
+    global_args: argparse.Namespace, remaining: list[str], tokens: list[str]
+) -> IRCommand:
     service_command = command_table[global_args.command]
 
     # Not all commands have parsers as some of them are "aliases" to existing services
@@ -386,10 +514,12 @@ def _handle_service_command(
     _validate_global_args(service, global_args)
     region = getattr(global_args, 'region', None)
 
-    service_parser = service_command._create_parser()
+    operation_tables = _get_operation_tables(operation_command)
+    service_parser = _get_service_parser(service_command)
     service_args, service_remaining = service_parser.parse_known_args(remaining)
-    operation_parser = ArgTableParser(operation_command.arg_table)
-    parsed_args = operation_parser.parse_operation_args(command_metadata, service_remaining)
+    parsed_args = operation_tables.operation_parser.parse_operation_args(
+        command_metadata, service_remaining
+    )
     _handle_invalid_parameters(command_metadata, service, operation, parsed_args)
 
     try:
@@ -404,12 +534,12 @@ def _handle_service_command(
     _validate_filters(
         service_command.service_model.service_name,
         operation,
-        operation_command._operation_model,
+        operation_tables.filters,
         parameters,
     )
 
     _validate_parameters(
-        parameters, operation_command.arg_table, operation_command._operation_model
+        parameters, operation_tables.serialized_to_cli, operation_command._operation_model
     )
 
     arn_region = _fetch_region_from_arn(parameters)
@@ -507,7 +637,7 @@ def _parse_customization_parameters(
     if not hasattr(operation_command, 'arg_table'):
         raise InvalidServiceOperationError(service, operation)
 
-    operation_parser = ArgTableParser(operation_command.arg_table)
+    operation_parser = _get_arg_table_parser(operation_command)
     parsed_args = operation_parser.parse_operation_args(command_metadata, operation_args)
 
     _handle_invalid_parameters(command_metadata, service, operation, parsed_args)
@@ -634,19 +764,10 @@ def _validate_global_args(service: str, global_args: argparse.Namespace):
 
 def _validate_parameters(
     parameters: dict[str, Any],
-    arg_table: dict[str, BaseCLIArgument],
+    serialized_to_cli: dict[str, str],
     operation_model: OperationModel,
 ) -> None:
     validator = BotoCoreParamValidator()
-
-    serialized_to_cli = {
-        arg._serialized_name: arg.cli_name
-        for arg in arg_table.values()
-        if isinstance(arg, CLIArgument)
-        and hasattr(arg, '_serialized_name')
-        and hasattr(arg, 'cli_name')
-    }
-
     errors = []
 
     input_shape = operation_model.input_shape
@@ -664,13 +785,12 @@ def _validate_parameters(
 
 
 def _validate_filters(
-    service: str, operation: str, operation_model: OperationModel, parameters: dict[str, Any]
+    service: str, operation: str, known_filters: OperationFilters, parameters: dict[str, Any]
 ):
     if 'Filters' not in parameters:
         return
 
     filters = parameters['Filters']
-    known_filters = get_operation_filters(operation_model)
 
     filter_name_key = None
     for allowed_keys_subset, name_key in ALLOWED_FILTER_KEYS_SUBSETS.items():
@@ -735,9 +855,7 @@ def _validate_request_serialization(
     validated_parameters.pop('PaginationConfig', None)
 
     # Parameter validation has been done, just serialize
-    serializer = botocore.serialize.create_serializer(
-        service_model.metadata['protocol'], include_validation=False
-    )
+    serializer = _get_serializer(service_model.metadata['protocol'])
     try:
         serializer.serialize_to_request(validated_parameters, operation_model)
     except ParamValidationError as err:
@@ -752,8 +870,6 @@ def _validate_file_paths(
     parameters: dict[str, Any],
 ):
     """Validate all file paths in the command."""
-    from ..common.file_operations import extract_file_paths_from_parameters
-
     # Validate --outfile parameter for streaming operations
     if command_metadata.has_streaming_output and parsed_args:
         output_file_path = parsed_args.operation_args.outfile
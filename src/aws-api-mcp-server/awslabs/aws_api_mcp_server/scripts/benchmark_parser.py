@@ -0,0 +1,92 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import argparse
+import sys
+from ..core.aws.driver import translate_cli_to_ir
+from ..core.parser.parser import clear_parse_cache
+from .benchmark_utils import measure_each, report
+from loguru import logger
+
+
+DEFAULT_COMMANDS = [
+    'aws ec2 describe-instances --region us-east-1',
+    'aws ec2 describe-instances --filters Name=instance-state-name,Values=running',
+    'aws ec2 describe-security-groups --group-ids sg-0123456789abcdef0',
+    'aws s3api list-buckets',
+    'aws s3api list-objects-v2 --bucket my-bucket --prefix logs/ --max-items 10',
+    'aws s3 ls s3://my-bucket',
+    'aws iam list-users',
+    'aws iam get-role --role-name my-role',
+    'aws lambda list-functions',
+    'aws lambda get-function --function-name my-function',
+    'aws sts get-caller-identity',
+    'aws cloudformation describe-stacks --stack-name my-stack',
+    'aws logs describe-log-groups --log-group-name-prefix /aws/lambda',
+    'aws dynamodb describe-table --table-name my-table',
+    'aws rds describe-db-instances --query "DBInstances[].DBInstanceIdentifier"',
+]
+
+
+def benchmark_parser(commands: list[str], iterations: int) -> dict[str, dict[str, float]]:
+    """Measure the latency and throughput of translating CLI commands to IR.
+
+    The commands are translated cold, with only the per operation tables warm, and
+    with the parsed command cache warm.
+    """
+    reports = {}
+    total_commands = iterations * len(commands)
+
+    def run(command: str):
+        translation = translate_cli_to_ir(command)
+        if translation.command is None:
+            raise ValueError(f'Failed to translate benchmark command: {command}')
+
+    latencies, elapsed = measure_each(run, commands, iterations, before_each=clear_parse_cache)
+    reports['cold'] = report('cold', latencies, total_commands, elapsed, unit='commands')
+
+    latencies, elapsed = measure_each(
+        run, commands, iterations, before_each=lambda: clear_parse_cache(operation_tables=False)
+    )
+    reports['operation_tables_cached'] = report(
+        'operation tables cached', latencies, total_commands, elapsed, unit='commands'
+    )
+
+    latencies, elapsed = measure_each(run, commands, iterations)
+    reports['commands_cached'] = report(
+        'parsed commands cached', latencies, total_commands, elapsed, unit='commands'
+    )
+
+    return reports
+
+
+def main():
+    """Driver for the parser benchmark."""
+    parser = argparse.ArgumentParser(description='Benchmark translating CLI commands to IR')
+    parser.add_argument(
+        '--iterations', type=int, default=20, help='Number of times each command is translated'
+    )
+    parser.add_argument(
+        '--command', action='append', help='Command to benchmark, can be given multiple times'
+    )
+    args = parser.parse_args()
+    benchmark_parser(args.command or DEFAULT_COMMANDS, args.iterations)
+
+
+if __name__ == '__main__':
+    # Configure Loguru logging
+    logger.remove()
+    logger.add(sys.stderr)
+
+    main()
@@ -0,0 +1,105 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import argparse
+import sys
+from ..core.kb.dense_retriever import DEFAULT_CACHE_DIR, DEFAULT_EMBEDDING_MODEL, DenseRetriever
+from .benchmark_utils import measure, measure_each, report
+from loguru import logger
+from pathlib import Path
+
+
+DEFAULT_QUERIES = [
+    'List all running EC2 instances',
+    'Get the size of my S3 bucket',
+    'List all IAM users',
+    'List all Lambda functions in my account',
+    'Create a new S3 bucket with versioning enabled',
+    'Update the memory of my Lambda function',
+    'Add a security group rule to allow inbound traffic on port 443',
+    'Configure CloudWatch alarms for high CPU utilization on my RDS instance',
+]
+
+
+def benchmark_suggestions(
+    retriever: DenseRetriever, queries: list[str], iterations: int
+) -> dict[str, dict[str, float]]:
+    """Measure the latency and throughput of single, cached and batched suggestion calls.
+
+    Latencies are reported per call: one query for the single query runs and the whole
+    query set for the batched run.
+    """
+    reports = {}
+    reset_cache = retriever.query_cache.clear
+    total_queries = iterations * len(queries)
+
+    def run_single(query: str):
+        retriever.get_suggestions(query)
+
+    reset_cache()
+    latencies, elapsed = measure_each(run_single, queries, iterations, before_each=reset_cache)
+    reports['single_uncached'] = report(
+        'single query, uncached', latencies, total_queries, elapsed
+    )
+
+    latencies, elapsed = measure_each(run_single, queries, iterations)
+    reports['single_cached'] = report('single query, cached', latencies, total_queries, elapsed)
+
+    def run_batch():
+        reset_cache()
+        retriever.get_batch_suggestions(queries)
+
+    latencies, elapsed = measure(run_batch, iterations)
+    reports['batch_uncached'] = report(
+        f'batch of {len(queries)}, uncached', latencies, total_queries, elapsed
+    )
+
+    return reports
+
+
+def main():
+    """Driver for the suggestion benchmark."""
+    parser = argparse.ArgumentParser(description='Benchmark suggest_aws_commands retrieval')
+    parser.add_argument(
+        '--model-name',
+        type=str,
+        default=DEFAULT_EMBEDDING_MODEL,
+        help='Name or path of the model to load',
+    )
+    parser.add_argument(
+        '--cache-dir',
+        type=str,
+        default=DEFAULT_CACHE_DIR,
+        help='Directory containing the cached knowledge base',
+    )
+    parser.add_argument(
+        '--iterations', type=int, default=20, help='Number of times each query set is run'
+    )
+    parser.add_argument(
+        '--query', action='append', help='Query to benchmark, can be given multiple times'
+    )
+    args = parser.parse_args()
+
+    retriever = DenseRetriever(model_name=args.model_name, cache_dir=Path(args.cache_dir))
+    # Load the model and the knowledge base before measuring
+    retriever.get_suggestions('warm up')
+    benchmark_suggestions(retriever, args.query or DEFAULT_QUERIES, args.iterations)
+
+
+if __name__ == '__main__':
+    # Configure Loguru logging
+    logger.remove()
+    logger.add(sys.stderr)
+
+    main()
@@ -0,0 +1,70 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+import time
+from loguru import logger
+from typing import Callable
+
+
+def report(
+    name: str, latencies: list[float], count: int, elapsed: float, unit: str = 'queries'
+) -> dict[str, float]:
+    """Log and return the p50 and p99 latencies and the throughput of a benchmark run."""
+    result = {
+        'p50_ms': float(np.percentile(latencies, 50)) * 1000,
+        'p99_ms': float(np.percentile(latencies, 99)) * 1000,
+        f'{unit}_per_second': count / elapsed if elapsed else float('inf'),
+    }
+    logger.info(
+        '{}: p50={:.2f}ms p99={:.2f}ms throughput={:.1f} {}/s',
+        name,
+        result['p50_ms'],
+        result['p99_ms'],
+        result[f'{unit}_per_second'],
+        unit,
+    )
+    return result
+
+
+def measure(call: Callable[[], object], iterations: int) -> tuple[list[float], float]:
+    """Time the given call, returning the latency of every iteration and the total time."""
+    latencies = []
+    elapsed = 0.0
+    for _ in range(iterations):
+        start = time.perf_counter()
+        call()
+        latencies.append(time.perf_counter() - start)
+        elapsed += latencies[-1]
+    return latencies, elapsed
+
+
+def measure_each(
+    call: Callable[[str], object],
+    inputs: list[str],
+    iterations: int,
+    before_each: Callable[[], object] | None = None,
+) -> tuple[list[float], float]:
+    """Time the given call for every input, running before_each outside of the timing."""
+    latencies = []
+    elapsed = 0.0
+    for _ in range(iterations):
+        for item in inputs:
+            if before_each is not None:
+                before_each()
+            start = time.perf_counter()
+            call(item)
+            latencies.append(time.perf_counter() - start)
+            elapsed += latencies[-1]
+    return latencies, elapsed
@@ -0,0 +1,95 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import argparse
+import json
+import requests
+import sys
+from ..core.metadata.read_only_operations_list import (
+    DEFAULT_REQUEST_TIMEOUT,
+    INDEX_FORMAT_VERSION,
+    READ_ONLY_INDEX_FILE,
+    SERVICE_REFERENCE_URL,
+    compile_read_only_index,
+    parse_service_reference,
+)
+from awscli.clidriver import __version__ as awscli_version
+from concurrent.futures import ThreadPoolExecutor
+from loguru import logger
+from pathlib import Path
+
+
+DEFAULT_OUTPUT_FILE = Path(__file__).parent.parent / 'core' / READ_ONLY_INDEX_FILE
+
+
+def fetch_service_reference_operations(max_workers: int) -> dict[str, list[str]]:
+    """Fetch the read only operations of every service from the service reference API."""
+    service_references = requests.get(
+        SERVICE_REFERENCE_URL, timeout=DEFAULT_REQUEST_TIMEOUT
+    ).json()
+
+    def fetch(service_reference: dict[str, str]) -> tuple[str, list[str]]:
+        document = requests.get(service_reference['url'], timeout=DEFAULT_REQUEST_TIMEOUT).json()
+        return service_reference['service'], parse_service_reference(document)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return dict(executor.map(fetch, service_references))
+
+
+def build_read_only_index(output_file: Path, max_workers: int = 16):
+    """Write the precompiled read only operations index shipped with the package."""
+    services = compile_read_only_index(fetch_service_reference_operations(max_workers))
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_file, 'w') as f:
+        json.dump(
+            {
+                'version': INDEX_FORMAT_VERSION,
+                'awscli_version': awscli_version,
+                'services': services,
+            },
+            f,
+            indent=None,
+            separators=(',', ':'),
+            sort_keys=True,
+        )
+    logger.info(
+        'Read only operations index of {} services written to {}', len(services), output_file
+    )
+
+
+def main():
+    """Driver for the read only operations index build."""
+    parser = argparse.ArgumentParser(description='Build the read only operations index')
+    parser.add_argument(
+        '--output',
+        type=str,
+        default=str(DEFAULT_OUTPUT_FILE),
+        help='Path of the index file to write',
+    )
+    parser.add_argument(
+        '--max-workers',
+        type=int,
+        default=16,
+        help='Number of service reference documents fetched concurrently',
+    )
+    args = parser.parse_args()
+    build_read_only_index(Path(args.output), args.max_workers)
+
+
+if __name__ == '__main__':
+    # Configure Loguru logging
+    logger.remove()
+    logger.add(sys.stderr)
+
+    main()
@@ -12,10 +12,13 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
 import os
 import sys
 from .core.agent_scripts.manager import AGENT_SCRIPTS_MANAGER
+from .core.aws.cli_runner import is_thread_safe_customization
 from .core.aws.driver import translate_cli_to_ir
+from .core.aws.executor import aws_call_executor
 from .core.aws.service import (
     check_security_policy,
     execute_awscli_customization,
@@ -23,6 +26,7 @@ from .core.aws.service import (
     request_consent,
     validate,
 )
+from .core.common.command import IRCommand
 from .core.common.config import (
     DEFAULT_REGION,
     ENABLE_AGENT_SCRIPTS,
@@ -37,9 +41,11 @@ from .core.common.config import (
 )
 from .core.common.errors import AwsApiMcpError
 from .core.common.helpers import validate_aws_region
+from .core.common.metrics import stage_metrics
 from .core.common.models import (
     AwsApiMcpServerErrorResponse,
     AwsCliAliasResponse,
+    IRTranslation,
     ProgramInterpretationResponse,
 )
 from .core.kb import knowledge_base
@@ -51,7 +57,7 @@ from mcp.server.fastmcp import Context, FastMCP
 from mcp.types import ToolAnnotations
 from pathlib import Path
 from pydantic import Field
-from typing import Annotated, Any, Optional
+from typing import Annotated, Any, Optional, cast
 
 
 logger.remove()
@@ -65,6 +71,10 @@ logger.add(log_file, rotation='10 MB', retention='7 days')
 server = FastMCP(name='AWS-API-MCP', log_level=FASTMCP_LOG_LEVEL, host=HOST, port=PORT)
 READ_OPERATIONS_INDEX: Optional[ReadOnlyOperations] = None
 
+CallAwsResponse = (
+    ProgramInterpretationResponse | AwsApiMcpServerErrorResponse | AwsCliAliasResponse
+)
+
 
 @server.tool(
     name='suggest_aws_commands',
@@ -160,6 +170,7 @@ async def suggest_aws_commands(
     - For cross-region or account-wide operations, explicitly include --region parameter
     - All commands are validated before execution to prevent errors
     - Supports pagination control via max_results parameter
+    - Independent commands, like the same command across regions or profiles, can be passed as a list to run them concurrently. The results are returned in the same order as the commands
     - The current working directory is {WORKING_DIRECTORY}
     - File paths should always have forward slash (/) as a separator regardless of the system. Example: 'c:/folder/file.txt'
 
@@ -194,17 +205,82 @@ async def suggest_aws_commands(
 )
 async def call_aws(
     cli_command: Annotated[
-        str, Field(description='The complete AWS CLI command to execute. MUST start with "aws"')
+        str | list[str],
+        Field(
+            description=(
+                'The complete AWS CLI command to execute. MUST start with "aws". '
+                'A list of independent commands can be given to execute them concurrently'
+            )
+        ),
     ],
     ctx: Context,
     max_results: Annotated[
         int | None,
         Field(description='Optional limit for number of results (useful for pagination)'),
     ] = None,
-) -> ProgramInterpretationResponse | AwsApiMcpServerErrorResponse | AwsCliAliasResponse:
+) -> CallAwsResponse | list[CallAwsResponse]:
     """Call AWS with the given CLI command and return the result as a dictionary."""
+    if isinstance(cli_command, list):
+        return await _call_aws_batch(cli_command, ctx, max_results)
+
+    translation = await _translate_command(cli_command, ctx)
+    if isinstance(translation, AwsApiMcpServerErrorResponse):
+        return translation
+
     try:
-        ir = translate_cli_to_ir(cli_command)
+        denied = await _authorize_command(cli_command, translation, ctx)
+        if denied is not None:
+            return denied
+    except Exception as e:
+        return await _execution_error(e, ctx)
+
+    return await _execute_command(cli_command, translation, ctx, max_results)
+
+
+async def _call_aws_batch(
+    cli_commands: list[str], ctx: Context, max_results: int | None
+) -> list[CallAwsResponse]:
+    """Execute independent commands concurrently, reporting progress as each one finishes.
+
+    Commands are validated and authorized one after the other first, so that consent
+    is requested for one command at a time.
+    """
+    results: list[CallAwsResponse | None] = [None] * len(cli_commands)
+    executions = []
+    for position, cli_command in enumerate(cli_commands):
+        translation = await _translate_command(cli_command, ctx)
+        if isinstance(translation, AwsApiMcpServerErrorResponse):
+            results[position] = translation
+            continue
+        try:
+            results[position] = await _authorize_command(cli_command, translation, ctx)
+        except Exception as e:
+            results[position] = await _execution_error(e, ctx)
+        if results[position] is None:
+            executions.append(
+                _execute_command_at(position, cli_command, translation, ctx, max_results)
+            )
+
+    finished = len(cli_commands) - len(executions)
+    await ctx.report_progress(finished, len(cli_commands))
+    for execution in asyncio.as_completed(executions):
+        position, result = await execution
+        results[position] = result
+        finished += 1
+        await ctx.report_progress(
+            finished,
+            len(cli_commands),
+            f'{"Failed" if _is_error(result) else "Executed"}: {cli_commands[position]}',
+        )
+
+    return cast(list[CallAwsResponse], results)
+
+
+async def _translate_command(
+    cli_command: str, ctx: Context
+) -> IRTranslation | AwsApiMcpServerErrorResponse:
+    try:
+        ir = await aws_call_executor.run(None, translate_cli_to_ir, cli_command)
         ir_validation = validate(ir)
 
         if not ir.command or ir_validation.validation_failed:
@@ -233,65 +309,111 @@ async def call_aws(
         ir.command.service_name,
         ir.command.operation_cli_name,
     )
-
-    try:
-        # Check security policy
-        if READ_OPERATIONS_INDEX is not None:
+    return ir
+
+
+async def _authorize_command(
+    cli_command: str, ir: IRTranslation, ctx: Context
+) -> AwsApiMcpServerErrorResponse | None:
+    # Check security policy
+    if READ_OPERATIONS_INDEX is not None:
+        command = cast(IRCommand, ir.command)
+        with stage_metrics.timer(
+            'security_policy', command.service_name, command.operation_python_name, command.region
+        ):
             policy_decision = check_security_policy(ir, READ_OPERATIONS_INDEX, ctx)
 
-            if policy_decision == PolicyDecision.DENY:
-                error_message = 'Execution of this operation is denied by security policy.'
-                await ctx.error(error_message)
-                return AwsApiMcpServerErrorResponse(detail=error_message)
-            elif policy_decision == PolicyDecision.ELICIT:
-                await request_consent(cli_command, ctx)
-        else:
-            if READ_OPERATIONS_ONLY_MODE:
-                error_message = (
-                    'Execution of this operation is not allowed because read only mode is enabled. '
-                    f'It can be disabled by setting the {READ_ONLY_KEY} environment variable to False.'
-                )
-                await ctx.error(error_message)
-                return AwsApiMcpServerErrorResponse(
-                    detail=error_message,
-                )
-            elif REQUIRE_MUTATION_CONSENT:
-                await request_consent(cli_command, ctx)
-
-        if ir.command and ir.command.is_awscli_customization:
-            response: AwsCliAliasResponse | AwsApiMcpServerErrorResponse = (
-                execute_awscli_customization(cli_command, ir.command)
+        if policy_decision == PolicyDecision.DENY:
+            error_message = 'Execution of this operation is denied by security policy.'
+            await ctx.error(error_message)
+            return AwsApiMcpServerErrorResponse(detail=error_message)
+        elif policy_decision == PolicyDecision.ELICIT:
+            await request_consent(cli_command, ctx)
+    else:
+        if READ_OPERATIONS_ONLY_MODE:
+            error_message = (
+                'Execution of this operation is not allowed because read only mode is enabled. '
+                f'It can be disabled by setting the {READ_ONLY_KEY} environment variable to False.'
+            )
+            await ctx.error(error_message)
+            return AwsApiMcpServerErrorResponse(
+                detail=error_message,
+            )
+        elif REQUIRE_MUTATION_CONSENT:
+            await request_consent(cli_command, ctx)
+    return None
+
+
+async def _execute_command(
+    cli_command: str, ir: IRTranslation, ctx: Context, max_results: int | None
+) -> CallAwsResponse:
+    command = cast(IRCommand, ir.command)
+    try:
+        if command.is_awscli_customization:
+            # Customizations printing from worker threads capture the output of the process
+            run = (
+                aws_call_executor.run
+                if is_thread_safe_customization(command.service_name, command.operation_name)
+                else aws_call_executor.run_exclusive
+            )
+            response: AwsCliAliasResponse | AwsApiMcpServerErrorResponse = await run(
+                command.service_name, execute_awscli_customization, cli_command, command
             )
             if isinstance(response, AwsApiMcpServerErrorResponse):
                 await ctx.error(response.detail)
             return response
 
-        return interpret_command(
+        return await aws_call_executor.run(
+            command.service_name,
+            interpret_command,
             cli_command=cli_command,
             max_results=max_results,
         )
-    except NoCredentialsError:
+    except Exception as e:
+        return await _execution_error(e, ctx)
+
+
+async def _execute_command_at(
+    position: int, cli_command: str, ir: IRTranslation, ctx: Context, max_results: int | None
+) -> tuple[int, CallAwsResponse]:
+    return position, await _execute_command(cli_command, ir, ctx, max_results)
+
+
+async def _execution_error(error: Exception, ctx: Context) -> AwsApiMcpServerErrorResponse:
+    if isinstance(error, NoCredentialsError):
         error_message = (
             'Error while executing the command: No AWS credentials found. '
             "Please configure your AWS credentials using 'aws configure' "
             'or set appropriate environment variables.'
         )
-        await ctx.error(error_message)
-        return AwsApiMcpServerErrorResponse(
-            detail=error_message,
-        )
-    except AwsApiMcpError as e:
-        error_message = f'Error while executing the command: {e.as_failure().reason}'
-        await ctx.error(error_message)
-        return AwsApiMcpServerErrorResponse(
-            detail=error_message,
-        )
-    except Exception as e:
-        error_message = f'Error while executing the command: {str(e)}'
-        await ctx.error(error_message)
-        return AwsApiMcpServerErrorResponse(
-            detail=error_message,
-        )
+    elif isinstance(error, AwsApiMcpError):
+        error_message = f'Error while executing the command: {error.as_failure().reason}'
+    else:
+        error_message = f'Error while executing the command: {str(error)}'
+    await ctx.error(error_message)
+    return AwsApiMcpServerErrorResponse(
+        detail=error_message,
+    )
+
+
+def _is_error(response: CallAwsResponse) -> bool:
+    if isinstance(response, AwsApiMcpServerErrorResponse):
+        return True
+    if isinstance(response, ProgramInterpretationResponse):
+        return response.response is None or response.response.error is not None
+    return False
+
+
+@server.resource(
+    'aws-api://metrics',
+    name='StageLatencyMetrics',
+    description='Latency histograms of the stages of call_aws, by service, operation and '
+    'region, in the Prometheus text exposition format.',
+    mime_type='text/plain',
+)
+def get_stage_metrics() -> str:
+    """Export the latency histograms of the stages of call_aws."""
+    return stage_metrics.to_prometheus()
 
 
 # EXPERIMENTAL: Agent scripts tool - only registered if ENABLE_AGENT_SCRIPTS is True
@@ -377,6 +499,10 @@ def main():
         logger.warning('Failed to load read operations index: {}', e)
         READ_OPERATIONS_INDEX = None
 
+    # Operations of services missing from the index are denied until fetched, so start now
+    if READ_OPERATIONS_ONLY_MODE and READ_OPERATIONS_INDEX is not None:
+        READ_OPERATIONS_INDEX.prefetch()
+
     server.run(transport=TRANSPORT)
 
 
@@ -0,0 +1,117 @@
+import sys
+import threading
+from awslabs.aws_api_mcp_server.core.aws.cli_runner import (
+    BoundedOutput,
+    DriverPool,
+    capture_output,
+    is_thread_safe_customization,
+)
+from unittest.mock import MagicMock
+
+
+def test_bounded_output_groups_writes_in_chunks():
+    """Test that small writes are merged into chunks of bounded size."""
+    output = BoundedOutput(chunk_size=8)
+    for _ in range(5):
+        output.write('line\n')
+
+    assert output.chunks() == ['line\nline\n', 'line\nline\n', 'line\n']
+    assert output.getvalue() == 'line\n' * 5
+    assert output.truncated is False
+
+
+def test_bounded_output_truncates_on_character_boundary():
+    """Test that the budget never splits a multibyte character."""
+    output = BoundedOutput(max_bytes=5)
+
+    assert output.write('ab€cd') == 5
+    output.write('ignored')
+
+    assert output.getvalue() == 'ab€'
+    assert output.size == 5
+    assert output.truncated is True
+
+
+def test_captures_of_concurrent_threads_are_isolated():
+    """Test that each thread only captures its own output."""
+    barrier = threading.Barrier(2)
+    outputs = {}
+
+    def run(name):
+        with capture_output() as (stdout, stderr):
+            barrier.wait()
+            print(f'out {name}')
+            print(f'err {name}', file=sys.stderr)
+            barrier.wait()
+        outputs[name] = (stdout.getvalue(), stderr.getvalue())
+
+    threads = [threading.Thread(target=run, args=(name,)) for name in ('a', 'b')]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert outputs == {'a': ('out a\n', 'err a\n'), 'b': ('out b\n', 'err b\n')}
+
+
+def test_exclusive_capture_collects_output_of_worker_threads():
+    """Test that an exclusive capture also collects what spawned threads print."""
+    with capture_output(exclusive=True) as (stdout, _):
+        worker = threading.Thread(target=print, args=('from worker',))
+        worker.start()
+        worker.join()
+
+    assert stdout.getvalue() == 'from worker\n'
+
+
+def test_thread_safe_customizations():
+    """Test that only customizations printing from their own thread run concurrently."""
+    assert is_thread_safe_customization('s3', 'ls')
+    assert not is_thread_safe_customization('s3', 'sync')
+    assert not is_thread_safe_customization(None, None)
+
+
+def _mock_driver():
+    driver = MagicMock()
+    driver.session._session_instance_vars = {}
+    return driver
+
+
+def test_driver_pool_reuses_drivers_per_profile():
+    """Test that idle drivers are reused, but never across profiles."""
+    factory = MagicMock(side_effect=_mock_driver)
+    pool = DriverPool(2, factory=factory)
+
+    with pool.driver('dev') as first:
+        pass
+    with pool.driver('dev') as second:
+        pass
+    with pool.driver('prod') as third:
+        pass
+
+    assert first is second
+    assert third is not first
+    assert factory.call_count == 2
+
+
+def test_driver_pool_creates_drivers_for_concurrent_runs():
+    """Test that concurrent runs get distinct drivers and only size of them are kept."""
+    factory = MagicMock(side_effect=_mock_driver)
+    pool = DriverPool(1, factory=factory)
+
+    with pool.driver(None) as first, pool.driver(None) as second:
+        assert first is not second
+    with pool.driver(None), pool.driver(None):
+        pass
+
+    assert factory.call_count == 3
+
+
+def test_driver_pool_resets_global_arguments():
+    """Test that configuration set by a run does not leak into the next one."""
+    pool = DriverPool(1, factory=_mock_driver)
+
+    with pool.driver(None) as driver:
+        driver.session._session_instance_vars.update(region='eu-west-1')
+    with pool.driver(None) as driver:
+        assert driver.session._session_instance_vars == {}
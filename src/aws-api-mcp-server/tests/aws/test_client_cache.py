@@ -0,0 +1,118 @@
+import threading
+from awslabs.aws_api_mcp_server.core.aws.client_cache import (
+    ClientCache,
+    credentials_fingerprint,
+)
+from botocore.config import Config
+from unittest.mock import MagicMock, patch
+
+
+def _get_client(cache, service='s3', region='us-east-1', token='token', read_timeout=10):
+    return cache.get_client(
+        service,
+        access_key_id='key',
+        secret_access_key='secret',  # pragma: allowlist secret
+        session_token=token,
+        config=Config(region_name=region, read_timeout=read_timeout),
+    )
+
+
+def test_client_is_reused_for_same_key():
+    """Test that the same client is returned for identical requests."""
+    cache = ClientCache(max_size=4, ttl=60)
+
+    first = _get_client(cache)
+    second = _get_client(cache)
+
+    assert first is second
+    stats = cache.stats()
+    assert stats.hits == 1
+    assert stats.misses == 1
+    assert stats.size == 1
+
+
+def test_client_key_includes_region_credentials_and_config():
+    """Test that region, session token and config changes produce new clients."""
+    cache = ClientCache(max_size=8, ttl=60)
+
+    base = _get_client(cache)
+
+    assert _get_client(cache, region='eu-west-1') is not base
+    assert _get_client(cache, token='refreshed-token') is not base
+    assert _get_client(cache, read_timeout=60) is not base
+    assert _get_client(cache, service='ec2') is not base
+    assert cache.stats().misses == 5
+
+
+def test_least_recently_used_client_is_evicted():
+    """Test that the cache never grows beyond its maximum size."""
+    cache = ClientCache(max_size=2, ttl=60)
+
+    s3 = _get_client(cache, service='s3')
+    _get_client(cache, service='ec2')
+    _get_client(cache, service='s3')
+    _get_client(cache, service='iam')
+
+    assert _get_client(cache, service='s3') is s3
+    stats = cache.stats()
+    assert stats.size == 2
+    assert stats.evictions == 1
+
+
+def test_expired_client_is_recreated():
+    """Test that clients older than the TTL are replaced."""
+    cache = ClientCache(max_size=2, ttl=5)
+
+    with patch('awslabs.aws_api_mcp_server.core.aws.client_cache.time.monotonic') as monotonic:
+        monotonic.return_value = 100.0
+        first = _get_client(cache)
+        monotonic.return_value = 104.0
+        assert _get_client(cache) is first
+        monotonic.return_value = 106.0
+        assert _get_client(cache) is not first
+
+    assert cache.stats().evictions == 1
+
+
+def test_disabled_cache_always_creates_clients():
+    """Test that a cache size of zero disables caching."""
+    cache = ClientCache(max_size=0, ttl=60)
+
+    assert _get_client(cache) is not _get_client(cache)
+    assert cache.stats().size == 0
+
+
+def test_concurrent_access_creates_consistent_stats():
+    """Test that the cache can be used from multiple threads."""
+    cache = ClientCache(max_size=4, ttl=60)
+    cache._create_client = MagicMock(side_effect=lambda *args, **kwargs: object())
+
+    threads = [threading.Thread(target=_get_client, args=(cache,)) for _ in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stats = cache.stats()
+    assert stats.hits + stats.misses == 16
+    assert stats.size == 1
+
+
+def test_clear_resets_cache():
+    """Test that clearing the cache removes clients and counters."""
+    cache = ClientCache(max_size=4, ttl=60)
+    _get_client(cache)
+
+    cache.clear()
+
+    assert cache.stats() == (0, 0, 0, 0)
+
+
+def test_credentials_fingerprint_does_not_contain_secret():
+    """Test that the fingerprint is stable and does not leak the secret key."""
+    secret = 'secret'  # pragma: allowlist secret
+    fingerprint = credentials_fingerprint('key', secret, None)
+
+    assert fingerprint == credentials_fingerprint('key', secret, None)
+    assert fingerprint != credentials_fingerprint('key', secret, 'token')
+    assert secret not in fingerprint
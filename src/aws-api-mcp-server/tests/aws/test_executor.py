@@ -0,0 +1,67 @@
+import asyncio
+import threading
+import time
+from awslabs.aws_api_mcp_server.core.aws.executor import AwsCallExecutor
+
+
+class _ConcurrencyTracker:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.running = 0
+        self.max_running = 0
+
+    def call(self, value):
+        with self.lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        time.sleep(0.05)
+        with self.lock:
+            self.running -= 1
+        return value
+
+
+async def test_run_returns_result_off_the_event_loop():
+    """Test that the blocking function runs in a worker thread."""
+    executor = AwsCallExecutor(max_workers=2, max_calls_per_service=2)
+
+    thread_name = await executor.run('s3', lambda: threading.current_thread().name)
+
+    assert thread_name.startswith('aws-call')
+
+
+async def test_calls_to_a_service_are_limited():
+    """Test that calls to one service are limited while other services keep running."""
+    executor = AwsCallExecutor(max_workers=8, max_calls_per_service=2)
+    ec2 = _ConcurrencyTracker()
+    s3 = _ConcurrencyTracker()
+
+    results = await asyncio.gather(
+        *[executor.run('ec2', ec2.call, i) for i in range(6)],
+        *[executor.run('s3', s3.call, i) for i in range(2)],
+    )
+
+    assert results == [0, 1, 2, 3, 4, 5, 0, 1]
+    assert ec2.max_running == 2
+    assert s3.max_running == 2
+
+
+async def test_calls_without_service_are_only_limited_by_the_pool():
+    """Test that calls outside of a service and disabled limits only depend on the pool size."""
+    executor = AwsCallExecutor(max_workers=4, max_calls_per_service=0)
+    tracker = _ConcurrencyTracker()
+
+    await asyncio.gather(*[executor.run('ec2', tracker.call, i) for i in range(8)])
+
+    assert tracker.max_running == 4
+
+
+async def test_exclusive_calls_do_not_overlap():
+    """Test that exclusive calls run one at a time, even for different services."""
+    executor = AwsCallExecutor(max_workers=4, max_calls_per_service=4)
+    tracker = _ConcurrencyTracker()
+
+    await asyncio.gather(
+        *[executor.run_exclusive(service, tracker.call, 1) for service in ['s3', 'ec2', 'iam']]
+    )
+
+    assert tracker.max_running == 1
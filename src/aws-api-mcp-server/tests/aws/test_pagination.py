@@ -1,5 +1,6 @@
 import jmespath
 from awslabs.aws_api_mcp_server.core.aws.pagination import build_result
+from botocore.paginate import Paginator
 from unittest.mock import MagicMock, Mock
 
 
@@ -123,3 +124,132 @@ def test_build_result_with_max_results():
     assert functions[1].get('FunctionName') == 'my-function-2'
     assert (result.get('ResponseMetadata') or {}).get('HTTPStatusCode') == 200
     assert result.get('pagination_token') is None
+
+
+def _paginator_for_pages(pages, result_key='Functions'):
+    """Return a real botocore paginator serving the given pages."""
+    pages_by_marker = {None: pages[0]}
+    for index, page in enumerate(pages[:-1]):
+        page['NextMarker'] = f'marker-{index + 1}'
+        pages_by_marker[page['NextMarker']] = pages[index + 1]
+    requested_markers = []
+
+    def method(**kwargs):
+        requested_markers.append(kwargs.get('Marker'))
+        return pages_by_marker[kwargs.get('Marker')]
+
+    paginator = Paginator(
+        method,
+        {
+            'input_token': 'Marker',
+            'output_token': 'NextMarker',
+            'limit_key': 'MaxItems',
+            'result_key': result_key,
+        },
+        Mock(),
+    )
+    return paginator, requested_markers
+
+
+def test_build_result_applies_projection_filter_per_page():
+    """Test that projection filters give the same result when applied page by page."""
+    paginator, _ = _paginator_for_pages(get_pages())
+
+    result = build_result(
+        paginator=paginator,
+        service_name='lambda',
+        operation_name='ListFunctions',
+        operation_parameters={},
+        pagination_config={},
+        client_side_filter=jmespath.compile("Functions[?Runtime=='nodejs20.x'].FunctionName"),
+    )
+
+    assert result['Result'] == ['my-function-1', 'my-function-2']
+    assert 'pagination_token' not in result
+
+
+def test_build_result_applies_non_projection_filter_on_merged_result():
+    """Test that filters over the whole result are applied once all pages are merged."""
+    paginator, _ = _paginator_for_pages(get_pages())
+
+    result = build_result(
+        paginator=paginator,
+        service_name='lambda',
+        operation_name='ListFunctions',
+        operation_parameters={},
+        pagination_config={},
+        client_side_filter=jmespath.compile('length(Functions)'),
+    )
+
+    assert result['Result'] == 2
+
+
+def test_build_result_merges_nested_result_keys():
+    """Test that nested result keys are merged into the nested response structure."""
+    pages = [
+        {'DistributionList': {'Items': [{'Id': 'a'}]}, 'ResponseMetadata': {}},
+        {'DistributionList': {'Items': [{'Id': 'b'}]}, 'ResponseMetadata': {}},
+    ]
+    paginator, _ = _paginator_for_pages(pages, result_key='DistributionList.Items')
+
+    result = build_result(
+        paginator=paginator,
+        service_name='cloudfront',
+        operation_name='ListDistributions',
+        operation_parameters={},
+        pagination_config={},
+        client_side_filter=jmespath.compile('DistributionList.Items[].Id'),
+    )
+
+    assert result['Result'] == ['a', 'b']
+
+
+def test_build_result_stops_at_byte_budget():
+    """Test that pagination stops once the byte budget is reached and can be resumed."""
+    pages = [
+        {'Functions': [{'FunctionName': f'function-{index}'}], 'ResponseMetadata': {}}
+        for index in range(5)
+    ]
+    paginator, requested_markers = _paginator_for_pages(pages)
+
+    result = build_result(
+        paginator=paginator,
+        service_name='lambda',
+        operation_name='ListFunctions',
+        operation_parameters={},
+        pagination_config={},
+        max_result_bytes=1,
+    )
+
+    assert [f['FunctionName'] for f in result['Functions']] == ['function-0']
+    assert requested_markers == [None]
+    assert result['pagination_token'] is not None
+
+    resumed = build_result(
+        paginator=paginator,
+        service_name='lambda',
+        operation_name='ListFunctions',
+        operation_parameters={},
+        pagination_config={'StartingToken': result['pagination_token']},
+        client_side_filter=jmespath.compile('Functions[].FunctionName'),
+    )
+
+    assert resumed['Result'] == ['function-1', 'function-2', 'function-3', 'function-4']
+    assert requested_markers[-1] == 'marker-4'
+
+
+def test_build_result_byte_budget_on_last_page_has_no_token():
+    """Test that reaching the budget on the last page does not return a resume token."""
+    paginator, _ = _paginator_for_pages(get_pages())
+
+    result = build_result(
+        paginator=paginator,
+        service_name='lambda',
+        operation_name='ListFunctions',
+        operation_parameters={},
+        pagination_config={},
+        max_result_bytes=10**6,
+    )
+
+    assert len(result['Functions']) == 2
+    assert 'pagination_token' not in result
@@ -0,0 +1,150 @@
+import base64
+import hashlib
+import io
+import os
+import pytest
+import re
+import zlib
+from awslabs.aws_api_mcp_server.core.aws import ranged_download
+from awslabs.aws_api_mcp_server.core.aws.ranged_download import (
+    download_ranges,
+    supports_ranged_download,
+)
+from awslabs.aws_api_mcp_server.core.common.errors import DownloadError
+from botocore.response import StreamingBody
+from unittest.mock import patch
+
+
+DATA = bytes(range(256)) * 4
+ETAG = f'"{hashlib.md5(DATA).hexdigest()}"'
+
+
+def _body(data: bytes) -> StreamingBody:
+    return StreamingBody(io.BytesIO(data), len(data))
+
+
+class _FakeGetObject:
+    def __init__(self, data: bytes, truncate_by: int = 0):
+        self.data = data
+        self.truncate_by = truncate_by
+        self.calls = []
+
+    def __call__(self, **kwargs):
+        self.calls.append(kwargs)
+        match = re.fullmatch(r'bytes=(\d+)-(\d+)', kwargs['Range'])
+        assert match is not None
+        start, end = int(match.group(1)), int(match.group(2))
+        return {'Body': _body(self.data[start : end + 1 - self.truncate_by])}
+
+
+def _response(data: bytes = DATA, **fields) -> dict:
+    return {'Body': _body(data), 'ContentLength': len(data), 'ETag': ETAG, **fields}
+
+
+def test_download_ranges_writes_every_part(tmp_path):
+    """Test that the object is assembled from the first body and concurrent ranged requests."""
+    operation = _FakeGetObject(DATA)
+    path = tmp_path / 'object.bin'
+
+    progress = download_ranges(
+        operation,
+        {'Bucket': 'bucket', 'Key': 'key'},
+        _response(VersionId='v1'),
+        'Body',
+        str(path),
+        part_size=100,
+        concurrency=4,
+    )
+
+    assert path.read_bytes() == DATA
+    assert (progress.total_parts, progress.parts_completed) == (11, 11)
+    assert progress.bytes_written == len(DATA)
+    assert progress.checksum == 'MD5'
+    assert sorted(call['Range'] for call in operation.calls)[:2] == [
+        'bytes=100-199',
+        'bytes=1000-1023',
+    ]
+    assert all(call['IfMatch'] == ETAG for call in operation.calls)
+    assert all(call['VersionId'] == 'v1' for call in operation.calls)
+
+
+def test_download_ranges_without_pwrite(tmp_path, monkeypatch):
+    """Test that parts are written at their offset on platforms without pwrite."""
+    monkeypatch.delattr(os, 'pwrite')
+    path = tmp_path / 'object.bin'
+
+    download_ranges(
+        _FakeGetObject(DATA), {}, _response(), 'Body', str(path), part_size=64, concurrency=8
+    )
+
+    assert path.read_bytes() == DATA
+
+
+def test_download_ranges_verifies_full_object_crc32(tmp_path):
+    """Test that a full object CRC32 is preferred over the ETag."""
+    checksum = base64.b64encode(zlib.crc32(DATA).to_bytes(4, 'big')).decode()
+    response = _response(ETag='"abc-2"', ChecksumCRC32=checksum, ChecksumType='FULL_OBJECT')
+
+    progress = download_ranges(
+        _FakeGetObject(DATA), {}, response, 'Body', str(tmp_path / 'object.bin'), part_size=300
+    )
+
+    assert progress.checksum == 'CRC32'
+
+
+def test_download_ranges_skips_checksum_of_multipart_etag(tmp_path):
+    """Test that the ETag of multipart uploads is not mistaken for an MD5."""
+    progress = download_ranges(
+        _FakeGetObject(DATA),
+        {},
+        _response(ETag='"0123456789abcdef0123456789abcdef-3"'),
+        'Body',
+        str(tmp_path / 'object.bin'),
+        part_size=300,
+    )
+
+    assert progress.checksum is None
+
+
+def test_download_ranges_removes_file_on_checksum_mismatch(tmp_path):
+    """Test that a corrupted download is removed."""
+    path = tmp_path / 'object.bin'
+    corrupted = DATA[:-1] + b'\x00'
+
+    with pytest.raises(DownloadError, match='does not match the MD5 checksum'):
+        download_ranges(
+            _FakeGetObject(corrupted), {}, _response(), 'Body', str(path), part_size=300
+        )
+
+    assert not path.exists()
+
+
+def test_download_ranges_removes_file_on_short_range(tmp_path):
+    """Test that a range ending early fails the download."""
+    path = tmp_path / 'object.bin'
+
+    with pytest.raises(DownloadError, match='ended 1 bytes early'):
+        download_ranges(
+            _FakeGetObject(DATA, truncate_by=1), {}, _response(), 'Body', str(path), part_size=300
+        )
+
+    assert not path.exists()
+
+
+@pytest.mark.parametrize(
+    'service,operation,parameters,response,expected',
+    [
+        ('s3', 'GetObject', {}, {'ContentLength': 1000, 'ETag': ETAG}, True),
+        ('s3', 'GetObject', {}, {'ContentLength': 100, 'ETag': ETAG}, False),
+        ('s3', 'GetObject', {'Range': 'bytes=0-9'}, {'ContentLength': 1000, 'ETag': ETAG}, False),
+        ('s3', 'GetObject', {}, {'ContentLength': 1000}, False),
+        ('lambda', 'Invoke', {}, {'ContentLength': 1000, 'ETag': ETAG}, False),
+    ],
+)
+def test_supports_ranged_download(service, operation, parameters, response, expected):
+    """Test that only large objects of range capable operations are downloaded in ranges."""
+    with (
+        patch.object(ranged_download, 'MULTIPART_DOWNLOAD_THRESHOLD', 500),
+        patch.object(ranged_download, 'MULTIPART_DOWNLOAD_PART_SIZE', 100),
+    ):
+        assert supports_ranged_download(service, operation, parameters, response) is expected
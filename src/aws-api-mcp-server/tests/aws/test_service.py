@@ -1,6 +1,7 @@
 import json
 import pytest
 from ..history_handler import history
+from awslabs.aws_api_mcp_server.core.aws.cli_runner import DriverPool
 from awslabs.aws_api_mcp_server.core.aws.driver import translate_cli_to_ir
 from awslabs.aws_api_mcp_server.core.aws.service import (
     execute_awscli_customization,
@@ -448,31 +449,50 @@ def test_is_operation_read_only_raises_error_for_missing_operation_name():
         is_operation_read_only(ir, read_only_operations)
 
 
-@patch('awslabs.aws_api_mcp_server.core.aws.service.driver')
+@pytest.fixture
+def mock_driver():
+    """Serve customizations from a pool holding a single mocked driver."""
+    driver = MagicMock()
+    driver.session._session_instance_vars = {}
+    with patch(
+        'awslabs.aws_api_mcp_server.core.aws.service.driver_pool',
+        DriverPool(1, factory=lambda: driver),
+    ):
+        yield driver
+
+
 def test_execute_awscli_customization_success(mock_driver):
     """Test execute_awscli_customization returns AwsCliAliasResponse on successful execution."""
-    mock_driver.main.return_value = None
+    mock_driver.main.side_effect = lambda args: print('bucket1\nbucket2')
+
+    cli_command = 'aws s3 ls'
+    ir_command = translate_cli_to_ir(cli_command).command
+    assert ir_command is not None
+    result = execute_awscli_customization(cli_command, ir_command)
 
-    with patch('awslabs.aws_api_mcp_server.core.aws.service.StringIO') as mock_stringio:
-        mock_stdout = MagicMock()
-        mock_stderr = MagicMock()
-        mock_stdout.getvalue.return_value = 'bucket1\nbucket2\n'
-        mock_stderr.getvalue.return_value = ''
-        mock_stringio.side_effect = [mock_stdout, mock_stderr]
+    assert isinstance(result, AwsCliAliasResponse)
+    assert result.response == 'bucket1\nbucket2\n'
+    assert result.error == ''
+    assert result.truncated is False
 
-        cli_command = 'aws s3 ls'
-        ir_command = translate_cli_to_ir(cli_command).command
-        assert ir_command is not None
-        result = execute_awscli_customization(cli_command, ir_command)
+    mock_driver.main.assert_called_once_with(['s3', 'ls'])
 
-        assert isinstance(result, AwsCliAliasResponse)
-        assert result.response == 'bucket1\nbucket2\n'
-        assert result.error == ''
 
-        mock_driver.main.assert_called_once_with(['s3', 'ls'])
+@patch('awslabs.aws_api_mcp_server.core.aws.service.MAX_RESULT_BYTES', 10)
+def test_execute_awscli_customization_output_is_truncated(mock_driver):
+    """Test that the output of a customization is cut at the result size budget."""
+    mock_driver.main.side_effect = lambda args: print('bucket1\nbucket2')
+
+    cli_command = 'aws s3 ls'
+    ir_command = translate_cli_to_ir(cli_command).command
+    assert ir_command is not None
+    result = execute_awscli_customization(cli_command, ir_command)
+
+    assert isinstance(result, AwsCliAliasResponse)
+    assert result.response == 'bucket1\nbu'
+    assert result.truncated is True
 
 
-@patch('awslabs.aws_api_mcp_server.core.aws.service.driver')
 def test_execute_awscli_customization_error(mock_driver):
     """Test execute_awscli_customization returns AwsApiMcpServerErrorResponse on exception."""
     mock_driver.main.side_effect = Exception('Invalid command')
@@ -494,9 +514,8 @@ def test_execute_awscli_customization_error(mock_driver):
     mock_driver.main.assert_called_once_with(['invalid', 'command'])
 
 
-@patch('awslabs.aws_api_mcp_server.core.aws.service.driver.main')
 @patch('awslabs.aws_api_mcp_server.core.aws.service.AWS_API_MCP_PROFILE_NAME', None)
-def test_profile_not_added_when_env_var_none(mock_main):
+def test_profile_not_added_when_env_var_none(mock_driver):
     """Test that profile is not added when AWS_API_MCP_PROFILE_NAME is None."""
     cli_command = 'aws s3 ls'
     ir_command = translate_cli_to_ir(cli_command).command
@@ -505,13 +524,12 @@ def test_profile_not_added_when_env_var_none(mock_main):
     execute_awscli_customization(cli_command, ir_command)
 
     # Verify profile was not added to args
-    args = mock_main.call_args[0][0]
+    args = mock_driver.main.call_args[0][0]
     assert '--profile' not in args
 
 
-@patch('awslabs.aws_api_mcp_server.core.aws.service.driver.main')
 @patch('awslabs.aws_api_mcp_server.core.aws.service.AWS_API_MCP_PROFILE_NAME', 'test-profile')
-def test_profile_added_when_env_var_set(mock_main):
+def test_profile_added_when_env_var_set(mock_driver):
     """Test that profile is added when AWS_API_MCP_PROFILE_NAME is set."""
     cli_command = 'aws s3 ls'
     ir_command = translate_cli_to_ir(cli_command).command
@@ -520,16 +538,15 @@ def test_profile_added_when_env_var_set(mock_main):
     execute_awscli_customization(cli_command, ir_command)
 
     # Verify profile was added to args
-    args = mock_main.call_args[0][0]
+    args = mock_driver.main.call_args[0][0]
     assert '--profile' in args
     profile_index = args.index('--profile')
     assert args[profile_index + 1] == 'test-profile'
 
 
-@patch('awslabs.aws_api_mcp_server.core.aws.service.driver.main')
 @patch('awslabs.aws_api_mcp_server.core.aws.service.AWS_API_MCP_PROFILE_NAME', 'test-profile')
 @patch('awslabs.aws_api_mcp_server.core.parser.parser.get_region', return_value='us-east-1')
-def test_profile_not_added_if_present_for_customizations(mock_get_region, mock_main):
+def test_profile_not_added_if_present_for_customizations(mock_get_region, mock_driver):
     """Test that profile is not added when one is already present."""
     cli_command = 'aws s3 ls --profile different'
     ir_command = translate_cli_to_ir(cli_command).command
@@ -538,7 +555,7 @@ def test_profile_not_added_if_present_for_customizations(mock_get_region, mock_m
     execute_awscli_customization(cli_command, ir_command)
 
     # Verify profile was added to args
-    args = mock_main.call_args[0][0]
+    args = mock_driver.main.call_args[0][0]
     assert '--profile' in args
     profile_index = args.index('--profile')
     assert args[profile_index + 1] == 'different'
@@ -0,0 +1,85 @@
+import pytest
+from awslabs.aws_api_mcp_server.core.common.metrics import (
+    BUCKET_COUNT,
+    LatencyHistogram,
+    StageKey,
+    StageMetrics,
+)
+
+
+def test_histogram_percentiles_are_within_bucket_precision():
+    """Test that percentiles are within the relative error of a bucket."""
+    histogram = LatencyHistogram()
+    for millis in range(1, 1001):
+        histogram.record(millis / 1000)
+
+    assert histogram.count == 1000
+    assert histogram.total_seconds == pytest.approx(500.5)
+    assert histogram.percentile(50) == pytest.approx(0.5, rel=0.07)
+    assert histogram.percentile(99) == pytest.approx(0.99, rel=0.07)
+    assert histogram.percentile(100) == 1.0
+
+
+def test_histogram_memory_is_fixed():
+    """Test that extreme values are clamped into the fixed set of buckets."""
+    histogram = LatencyHistogram()
+    histogram.record(-1)
+    histogram.record(0)
+    histogram.record(10**9)
+
+    assert len(histogram.counts) == BUCKET_COUNT
+    assert histogram.counts[0] == 2
+    assert histogram.counts[-1] == 1
+
+
+def test_empty_histogram_percentile():
+    """Test that an empty histogram reports a zero latency."""
+    assert LatencyHistogram().percentile(99) == 0.0
+
+
+def test_timer_records_failed_stages():
+    """Test that the timer records the stage even when it raises."""
+    metrics = StageMetrics()
+
+    with pytest.raises(ValueError):
+        with metrics.timer('network', 's3', 'list_buckets', 'us-east-1'):
+            raise ValueError()
+
+    histogram = metrics.histograms()[StageKey('network', 's3', 'list_buckets', 'us-east-1')]
+    assert histogram.count == 1
+
+
+def test_series_beyond_the_limit_are_grouped():
+    """Test that label combinations beyond the limit share one histogram per stage."""
+    metrics = StageMetrics(max_series=1)
+
+    metrics.record('parse', 's3', 'list_buckets', 'us-east-1', 0.001)
+    metrics.record('parse', 'ec2', 'describe_instances', 'us-east-1', 0.001)
+    metrics.record('parse', 'iam', 'list_users', 'us-east-1', 0.001)
+
+    assert metrics.histograms()[StageKey('parse', 'other', 'other', 'other')].count == 2
+
+
+def test_prometheus_export():
+    """Test that histograms are exported with cumulative buckets, sum and count."""
+    metrics = StageMetrics()
+    metrics.record('network', 's3', 'list_buckets', 'us-east-1', 0.002)
+    metrics.record('network', 's3', 'list_buckets', 'us-east-1', 0.2)
+
+    exported = metrics.to_prometheus().splitlines()
+
+    labels = 'stage="network",service="s3",operation="list_buckets",region="us-east-1"'
+    assert '# TYPE aws_api_mcp_stage_duration_seconds histogram' in exported
+    assert f'aws_api_mcp_stage_duration_seconds_bucket{{{labels},le="0.001"}} 0' in exported
+    assert f'aws_api_mcp_stage_duration_seconds_bucket{{{labels},le="0.0025"}} 1' in exported
+    assert f'aws_api_mcp_stage_duration_seconds_bucket{{{labels},le="0.25"}} 2' in exported
+    assert f'aws_api_mcp_stage_duration_seconds_bucket{{{labels},le="+Inf"}} 2' in exported
+    assert f'aws_api_mcp_stage_duration_seconds_count{{{labels}}} 2' in exported
+
+
+def test_prometheus_export_escapes_labels():
+    """Test that quotes in label values do not break the exposition format."""
+    metrics = StageMetrics()
+    metrics.record('parse', 's3', 'say "hi"', 'us-east-1', 0.001)
+
+    assert 'operation="say \\"hi\\""' in metrics.to_prometheus()
@@ -282,3 +282,13 @@ class DummyCtx:
         """
         # Do nothing because MCP ctx.error doesn't throw exception
         pass
+
+    async def report_progress(self, progress, total=None, message=None):
+        """Mock MCP ctx.report_progress with the given progress.
+
+        Args:
+            progress: The current progress
+            total: The total progress
+            message: The progress message
+        """
+        pass
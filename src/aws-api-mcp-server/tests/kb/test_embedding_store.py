@@ -0,0 +1,111 @@
+import json
+import numpy as np
+import pytest
+from awslabs.aws_api_mcp_server.core.kb.dense_retriever import DenseRetriever
+from awslabs.aws_api_mcp_server.core.kb.embedding_store import EmbeddingStore
+from unittest.mock import MagicMock
+
+
+def _normalized_embeddings(count, dimension=32, seed=0):
+    embeddings = np.random.default_rng(seed).standard_normal((count, dimension))
+    embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True)
+    return embeddings.astype('float32')
+
+
+def _documents(count):
+    return [
+        {'command': f'aws service operation-{i}', 'description': f'Doc {i}'} for i in range(count)
+    ]
+
+
+@pytest.mark.parametrize('dtype', ['float16', 'int8'])
+def test_flat_store_matches_exact_search(tmp_path, dtype):
+    """Test that the quantized flat store returns the same neighbours as exact search."""
+    embeddings = _normalized_embeddings(200)
+    store = EmbeddingStore.build(tmp_path / 'store', embeddings, _documents(200), dtype=dtype)
+
+    distances, indices = store.search(embeddings[:3], 5)
+
+    exact = np.argsort(-(embeddings[:3] @ embeddings.T), axis=1)[:, :5]
+    assert indices.shape == (3, 5)
+    assert indices[:, 0].tolist() == [0, 1, 2]
+    assert set(indices[0]) == set(exact[0])
+    assert distances[0, 0] == pytest.approx(1.0, abs=0.02)
+    assert isinstance(store.embeddings, np.memmap)
+    assert store.embeddings.dtype == np.dtype(dtype)
+
+
+def test_store_decodes_documents_by_offset(tmp_path):
+    """Test that documents are decoded individually from the document file."""
+    documents = [{'command': 'aws s3 ls', 'description': 'Unicode ✓'}, {'command': 'aws sts'}]
+    store = EmbeddingStore.build(tmp_path / 'store', _normalized_embeddings(2), documents)
+
+    assert len(store) == 2
+    assert store.document(1) == documents[1]
+    assert store.document(0) == documents[0]
+    assert store.document(0) is not store.document(0)
+
+
+@pytest.mark.parametrize('index_type', ['ivf', 'hnsw'])
+def test_store_with_prebuilt_index(tmp_path, index_type):
+    """Test that approximate indexes are written and used for the search."""
+    embeddings = _normalized_embeddings(500)
+    EmbeddingStore.build(
+        tmp_path / 'store', embeddings, _documents(500), dtype='int8', index_type=index_type
+    )
+
+    store = EmbeddingStore(tmp_path / 'store')
+    _, indices = store.search(embeddings[:1], 3)
+
+    assert store.index is not None
+    assert indices[0, 0] == 0
+
+
+def test_build_keeps_existing_store(tmp_path):
+    """Test that building a store that was already written keeps the existing one."""
+    EmbeddingStore.build(tmp_path / 'store', _normalized_embeddings(2), _documents(2))
+    store = EmbeddingStore.build(tmp_path / 'store', _normalized_embeddings(3), _documents(3))
+
+    assert len(store) == 2
+    assert [path.name for path in tmp_path.iterdir()] == ['store']
+
+
+def test_build_rejects_invalid_input(tmp_path):
+    """Test that invalid store parameters are rejected."""
+    with pytest.raises(ValueError, match='dtype'):
+        EmbeddingStore.build(tmp_path / 'store', _normalized_embeddings(2), _documents(2), 'int4')  # type: ignore[arg-type]
+    with pytest.raises(ValueError, match='must match'):
+        EmbeddingStore.build(tmp_path / 'store', _normalized_embeddings(2), _documents(3))
+    assert not EmbeddingStore.exists(tmp_path / 'store')
+
+
+def test_dense_retriever_serves_suggestions_from_store(tmp_path):
+    """Test that the retriever converts the cache file into a store and searches it."""
+    embeddings = _normalized_embeddings(10)
+    documents = _documents(10)
+    rag = DenseRetriever(top_k=3, cache_dir=tmp_path / 'cache', store_dir=tmp_path / 'store')
+    cache_file = rag.get_cache_file_with_version()
+    assert cache_file is not None
+    cache_file.parent.mkdir(parents=True)
+    np.savez_compressed(
+        cache_file, embeddings=embeddings, documents=np.array(json.dumps(documents))
+    )
+    rag.model = MagicMock()
+    rag.model.encode.return_value = embeddings[4:5]
+
+    suggestions = rag.get_suggestions('query')
+
+    assert [s['command'] for s in suggestions['suggestions']][0] == documents[4]['command']
+    assert len(suggestions['suggestions']) == 3
+    store_dir = rag.get_store_dir_with_version()
+    assert store_dir is not None
+    assert EmbeddingStore.exists(store_dir)
+    assert rag._documents is None
+    assert rag._embeddings is None
+
+
+def test_dense_retriever_without_cache_file_has_no_store(tmp_path):
+    """Test that no store is created when there is no cache file to build it from."""
+    rag = DenseRetriever(cache_dir=tmp_path / 'cache', store_dir=tmp_path / 'store')
+
+    assert rag.store is None
@@ -0,0 +1,127 @@
+import numpy as np
+from awslabs.aws_api_mcp_server.core.kb import KnowledgeBase
+from awslabs.aws_api_mcp_server.core.kb.dense_retriever import DenseRetriever
+from awslabs.aws_api_mcp_server.core.kb.query_cache import (
+    PERSIST_EVERY,
+    QueryEmbeddingCache,
+    normalize_query,
+)
+from awslabs.aws_api_mcp_server.scripts.benchmark_suggestions import benchmark_suggestions
+from pathlib import Path
+from unittest.mock import MagicMock, PropertyMock
+
+
+DOCUMENTS = [
+    {'command': 'aws ec2 describe-instances', 'description': 'Describe', 'parameters': {}},
+    {'command': 'aws s3 ls', 'description': 'List buckets', 'parameters': {}},
+    {'command': 'aws iam list-users', 'description': 'List users', 'parameters': {}},
+]
+EMBEDDINGS = np.eye(3, dtype='float32')
+
+
+def _encode(queries, **kwargs):
+    """Encode queries mentioning a service onto the matching document embedding."""
+    services = ['ec2', 's3', 'iam']
+    return np.stack(
+        [EMBEDDINGS[next(i for i, s in enumerate(services) if s in q.lower())] for q in queries]
+    )
+
+
+def _retriever(**kwargs):
+    rag = DenseRetriever(top_k=2, cache_dir=Path('/tmp'), **kwargs)
+    rag.documents = [dict(document) for document in DOCUMENTS]
+    rag.embeddings = EMBEDDINGS
+    model = MagicMock()
+    model.encode.side_effect = _encode
+    rag.model = model
+    return rag, model
+
+
+def test_normalize_query():
+    """Test that whitespace and case differences are normalized."""
+    assert normalize_query('  List   EC2\tInstances ') == 'list ec2 instances'
+
+
+def test_cache_evicts_least_recently_used():
+    """Test that the cache is bounded and keeps recently used entries."""
+    cache = QueryEmbeddingCache('model', max_size=2)
+    cache.put('a', np.zeros(2))
+    cache.put('b', np.ones(2))
+    assert cache.get('A ') is not None
+    cache.put('c', np.ones(2))
+
+    assert cache.get('b') is None
+    assert cache.get('a') is not None
+    assert len(cache) == 2
+    assert (cache.hits, cache.misses) == (2, 1)
+
+
+def test_cache_is_persisted_and_reloaded(tmp_path):
+    """Test that the cache is written to disk and reused for the same model only."""
+    path = tmp_path / 'queries.npz'
+    cache = QueryEmbeddingCache('model', max_size=PERSIST_EVERY * 2, persist_path=path)
+    for i in range(PERSIST_EVERY):
+        cache.put(f'query {i}', np.full(3, i, dtype='float32'))
+
+    assert path.exists()
+    reloaded = QueryEmbeddingCache('model', max_size=PERSIST_EVERY * 2, persist_path=path)
+    np.testing.assert_array_equal(reloaded.get('Query 5'), np.full(3, 5))
+    assert len(QueryEmbeddingCache('other-model', max_size=10, persist_path=path)) == 0
+
+
+def test_repeated_queries_are_encoded_once():
+    """Test that normalized duplicates reuse the cached embedding."""
+    rag, model = _retriever()
+
+    first = rag.get_suggestions('List S3 buckets')
+    second = rag.get_suggestions('list   s3 buckets')
+
+    assert first == second
+    assert first['suggestions'][0]['command'] == 'aws s3 ls'
+    assert model.encode.call_count == 1
+
+
+def test_batch_suggestions_encode_misses_in_one_call():
+    """Test that batch suggestions encode all uncached queries in a single forward pass."""
+    rag, model = _retriever()
+    rag.get_suggestions('iam users')
+    model.encode.reset_mock()
+
+    results = rag.get_batch_suggestions(['ec2 instances', 'iam users', 's3 buckets'])
+
+    assert [r['suggestions'][0]['command'] for r in results] == [
+        'aws ec2 describe-instances',
+        'aws iam list-users',
+        'aws s3 ls',
+    ]
+    model.encode.assert_called_once()
+    assert model.encode.call_args.args[0] == ['ec2 instances', 's3 buckets']
+    assert rag.get_batch_suggestions([]) == []
+
+
+def test_knowledge_base_batch_suggestions_trims_text():
+    """Test that the knowledge base trims every result of a batch."""
+    kb = KnowledgeBase()
+    mock_rag = MagicMock(spec=DenseRetriever)
+    type(mock_rag).is_model_ready = PropertyMock(return_value=True)
+    mock_rag.get_batch_suggestions.return_value = [
+        {'suggestions': [{'description': 'x' * 1200, 'parameters': {'--p': 'y' * 600}}]}
+    ]
+    kb.rag = mock_rag
+
+    results = kb.get_batch_suggestions(['query'])
+
+    assert len(results[0]['suggestions'][0]['description']) == 1003
+    assert len(results[0]['suggestions'][0]['parameters']['--p']) == 503
+
+
+def test_benchmark_reports_latency_and_throughput():
+    """Test that the benchmark reports p50, p99 and throughput for every scenario."""
+    rag, _ = _retriever()
+
+    reports = benchmark_suggestions(rag, ['ec2 instances', 's3 buckets'], iterations=2)
+
+    assert set(reports) == {'single_uncached', 'single_cached', 'batch_uncached'}
+    for report in reports.values():
+        assert set(report) == {'p50_ms', 'p99_ms', 'queries_per_second'}
+        assert report['p99_ms'] >= report['p50_ms']
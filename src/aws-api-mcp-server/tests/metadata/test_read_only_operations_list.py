@@ -1,9 +1,12 @@
+import json
 import pytest
 from awslabs.aws_api_mcp_server.core.metadata.read_only_operations_list import (
     DEFAULT_REQUEST_TIMEOUT,
     SERVICE_REFERENCE_URL,
     ReadOnlyOperations,
     ServiceReferenceUrlsByService,
+    compile_read_only_index,
+    get_versioned_cache_dir,
 )
 from requests import Response
 from unittest.mock import MagicMock, call, patch
@@ -71,18 +74,25 @@ def sample_service_reference_response():
     }
 
 
+def _response(data):
+    response = MagicMock(spec=Response)
+    response.json.return_value = data
+    return response
+
+
+def _wait_for_fetches(operations):
+    for future in list(operations._fetches.values()):
+        future.result(timeout=5)
+
+
 @patch('requests.get')
 def test_read_only_operations_initialization(
-    mocked_requests_get, sample_service_reference_list_response
+    mocked_requests_get, sample_service_reference_list_response, tmp_path
 ):
     """Test ReadOnlyOperations initialization."""
-    mocked_service_reference_list_response = MagicMock(spec=Response)
-    mocked_service_reference_list_response.json.return_value = (
-        sample_service_reference_list_response
-    )
-    mocked_requests_get.return_value = mocked_service_reference_list_response
+    mocked_requests_get.return_value = _response(sample_service_reference_list_response)
 
-    operations = ReadOnlyOperations(ServiceReferenceUrlsByService())
+    operations = ReadOnlyOperations(ServiceReferenceUrlsByService(tmp_path), tmp_path)
 
     assert isinstance(operations, dict)
     mocked_requests_get.assert_called_once_with(
@@ -92,25 +102,26 @@ def test_read_only_operations_initialization(
 
 @patch('requests.get')
 def test_read_only_operations_has_method_missing_service(
-    mocked_requests_get, sample_service_reference_list_response, sample_service_reference_response
+    mocked_requests_get,
+    sample_service_reference_list_response,
+    sample_service_reference_response,
+    tmp_path,
 ):
-    """Test the has method of ReadOnlyOperations when the provided service is missing."""
-    mocked_service_reference_list_response = MagicMock(spec=Response)
-    mocked_service_reference_list_response.json.return_value = (
-        sample_service_reference_list_response
-    )
-    mocked_service_reference_response = MagicMock(spec=Response)
-    mocked_service_reference_response.json.return_value = sample_service_reference_response
+    """Test that a missing service is fetched in the background instead of blocking the check."""
     mocked_requests_get.side_effect = [
-        mocked_service_reference_list_response,
-        mocked_service_reference_response,
+        _response(sample_service_reference_list_response),
+        _response(sample_service_reference_response),
     ]
 
-    operations = ReadOnlyOperations(ServiceReferenceUrlsByService())
+    operations = ReadOnlyOperations(ServiceReferenceUrlsByService(tmp_path), tmp_path)
 
     assert isinstance(operations, dict)
+    # Not fetched yet, so conservatively not read only
+    assert not operations.has(TEST_SERVICE, TEST_READ_OPERATION)
+    _wait_for_fetches(operations)
     assert operations.has(TEST_SERVICE, TEST_READ_OPERATION)
     assert not operations.has(TEST_SERVICE, TEST_WRITE_OPERATION)
+    assert isinstance(operations[TEST_SERVICE], frozenset)
     mocked_requests_get.assert_has_calls(
         [
             call(SERVICE_REFERENCE_URL, timeout=DEFAULT_REQUEST_TIMEOUT),
@@ -122,75 +133,122 @@ def test_read_only_operations_has_method_missing_service(
 
 @patch('requests.get')
 def test_read_only_operations_has_method_second_call_for_service_queries_local_cache(
-    mocked_requests_get, sample_service_reference_list_response, sample_service_reference_response
+    mocked_requests_get,
+    sample_service_reference_list_response,
+    sample_service_reference_response,
+    tmp_path,
 ):
-    """Test the has method of ReadOnlyOperations when the provided service is available."""
-    mocked_service_reference_list_response = MagicMock(spec=Response)
-    mocked_service_reference_list_response.json.return_value = (
-        sample_service_reference_list_response
-    )
-    mocked_service_reference_response = MagicMock(spec=Response)
-    mocked_service_reference_response.json.return_value = sample_service_reference_response
+    """Test that fetched services are served from memory and from the on-disk cache."""
     mocked_requests_get.side_effect = [
-        mocked_service_reference_list_response,
-        mocked_service_reference_response,
+        _response(sample_service_reference_list_response),
+        _response(sample_service_reference_response),
     ]
 
-    operations = ReadOnlyOperations(ServiceReferenceUrlsByService())
+    operations = ReadOnlyOperations(ServiceReferenceUrlsByService(tmp_path), tmp_path)
+    for future in operations.prefetch([TEST_SERVICE]):
+        future.result(timeout=5)
 
-    assert isinstance(operations, dict)
-    # First call for a service, should get data from service reference API
     assert operations.has(TEST_SERVICE, TEST_READ_OPERATION)
-    # Second call for the same service, should lookup data from local cache
     assert operations.has(TEST_SERVICE, TEST_READ_OPERATION_2)
-    mocked_requests_get.assert_has_calls(
-        [
-            call(SERVICE_REFERENCE_URL, timeout=DEFAULT_REQUEST_TIMEOUT),
-            call(TEST_URL, timeout=DEFAULT_REQUEST_TIMEOUT),
-        ],
-        any_order=False,
-    )
     assert mocked_requests_get.call_count == 2
 
+    # A new process reads the service from the on-disk cache, even when offline
+    mocked_requests_get.side_effect = RuntimeError('offline')
+    reloaded = ReadOnlyOperations(ServiceReferenceUrlsByService(tmp_path), tmp_path)
+    assert reloaded.has(TEST_SERVICE, TEST_READ_OPERATION_2)
+    assert not reloaded.has(TEST_SERVICE, TEST_WRITE_OPERATION)
+    assert TEST_SERVICE not in reloaded._fetches
+
+
+@patch('requests.get')
+def test_read_only_operations_refreshes_service_with_new_url(
+    mocked_requests_get, sample_service_reference_response, tmp_path
+):
+    """Test that a cached service is served while a new version of it is fetched."""
+    cache_dir = get_versioned_cache_dir(tmp_path)
+    cache_dir.mkdir(parents=True)
+    (cache_dir / f'{TEST_SERVICE}.json').write_text(
+        json.dumps({'url': 'https://old-url.json', 'operations': [TEST_WRITE_OPERATION]})
+    )
+    mocked_requests_get.return_value = _response(sample_service_reference_response)
+
+    operations = ReadOnlyOperations({TEST_SERVICE: TEST_URL}, tmp_path)
+
+    assert operations.has(TEST_SERVICE, TEST_WRITE_OPERATION)
+    _wait_for_fetches(operations)
+    assert not operations.has(TEST_SERVICE, TEST_WRITE_OPERATION)
+    assert operations.has(TEST_SERVICE, TEST_READ_OPERATION)
+    mocked_requests_get.assert_called_once_with(TEST_URL, timeout=DEFAULT_REQUEST_TIMEOUT)
+
 
 @patch('requests.get')
 def test_read_only_operations_has_method_error(
-    mocked_requests_get, sample_service_reference_list_response
+    mocked_requests_get, sample_service_reference_list_response, tmp_path
 ):
     """Test the has method of ReadOnlyOperations when the service reference API call throws an error."""
-    mocked_response = MagicMock(spec=Response)
-    mocked_response.json.return_value = sample_service_reference_list_response
     mocked_requests_get.side_effect = [
-        mocked_response,
+        _response(sample_service_reference_list_response),
         RuntimeError('Error while calling service reference API'),
     ]
 
-    operations = ReadOnlyOperations(ServiceReferenceUrlsByService())
+    operations = ReadOnlyOperations(ServiceReferenceUrlsByService(tmp_path), tmp_path)
 
-    assert isinstance(operations, dict)
-    with pytest.raises(RuntimeError):
-        operations.has(TEST_SERVICE, TEST_READ_OPERATION)
-    mocked_requests_get.assert_has_calls(
-        [
-            call(SERVICE_REFERENCE_URL, timeout=DEFAULT_REQUEST_TIMEOUT),
-            call(TEST_URL, timeout=DEFAULT_REQUEST_TIMEOUT),
-        ],
-        any_order=False,
-    )
+    assert not operations.has(TEST_SERVICE, TEST_READ_OPERATION)
+    _wait_for_fetches(operations)
+    assert not operations.has(TEST_SERVICE, TEST_READ_OPERATION)
+    assert not (get_versioned_cache_dir(tmp_path) / f'{TEST_SERVICE}.json').exists()
 
 
 @patch('requests.get')
-def test_service_reference_urls_by_service_error(mocked_requests_get):
+def test_service_reference_urls_by_service_error(mocked_requests_get, tmp_path):
     """Test ServiceReferenceUrlsByService initialization when the service reference API call throws an error."""
     mocked_requests_get.side_effect = RuntimeError('Error while calling service reference API')
 
     with pytest.raises(RuntimeError):
-        ServiceReferenceUrlsByService()
+        ServiceReferenceUrlsByService(tmp_path)
     mocked_requests_get.assert_has_calls(
         [call(SERVICE_REFERENCE_URL, timeout=DEFAULT_REQUEST_TIMEOUT)], any_order=False
     )
 
 
+@patch('requests.get')
+def test_read_only_operations_prefetch_missing_services(
+    mocked_requests_get, sample_service_reference_response, tmp_path
+):
+    """Test that prefetching without services fetches those missing from the index and cache."""
+    cache_dir = get_versioned_cache_dir(tmp_path)
+    cache_dir.mkdir(parents=True)
+    (cache_dir / 'cached.json').write_text(json.dumps({'url': TEST_URL, 'operations': []}))
+    mocked_requests_get.return_value = _response(sample_service_reference_response)
+    urls = {TEST_SERVICE: TEST_URL, 'cached': TEST_URL, 'indexed': TEST_URL}
+
+    with patch.object(
+        ReadOnlyOperations, '_load_precompiled_index', return_value={'indexed': ['Describe']}
+    ):
+        operations = ReadOnlyOperations(urls, tmp_path)
+    for future in operations.prefetch():
+        future.result(timeout=5)
+
+    mocked_requests_get.assert_called_once_with(TEST_URL, timeout=DEFAULT_REQUEST_TIMEOUT)
+    assert operations.has(TEST_SERVICE, TEST_READ_OPERATION)
+    assert operations.has('indexed', 'Describe')
+
+    # Without a precompiled index, services of the api metadata are fetched too
+    operations = ReadOnlyOperations({'s3': TEST_URL, 'cached': TEST_URL}, tmp_path)
+    futures = operations.prefetch()
+    for future in futures:
+        future.result(timeout=5)
+    assert len(futures) == 1
+
+
+def test_read_only_operations_unknown_service(tmp_path):
+    """Test that services without a service reference are not read only and not fetched."""
+    operations = ReadOnlyOperations({}, tmp_path)
+
+    assert not operations.has('unknown', 'ListThings')
+    assert operations.prefetch(['unknown']) == []
+
+
 def test_read_only_operations_has_method_custom_operation():
     """Test the has method of ReadOnlyOperations with custom operations."""
     operations = ReadOnlyOperations({})
@@ -208,3 +266,12 @@ def test_read_only_operations_has_method_operation_from_metadata():
     assert not operations.has('s3', 'DeleteObject')
     assert not operations.has('lambda', 'CreateAlias')
     assert not operations.has('rds', 'CreateDBSecurityGroup')
+
+
+def test_compile_read_only_index_merges_sources():
+    """Test that the precompiled index merges metadata, custom and service reference operations."""
+    index = compile_read_only_index({'s3': ['GetObjectAttributes'], TEST_SERVICE: ['Describe']})
+
+    assert {'ListBuckets', 'ls', 'GetObjectAttributes'} <= set(index['s3'])
+    assert 'DeleteObject' not in index['s3']
+    assert index[TEST_SERVICE] == ['Describe']
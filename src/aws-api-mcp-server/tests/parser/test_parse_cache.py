@@ -0,0 +1,113 @@
+import pytest
+from awslabs.aws_api_mcp_server.core.common.errors import InvalidServiceOperationError
+from awslabs.aws_api_mcp_server.core.parser import parser as parser_module
+from awslabs.aws_api_mcp_server.core.parser.parser import (
+    _get_operation_tables,
+    _parsed_commands,
+    clear_parse_cache,
+    parse,
+)
+from awslabs.aws_api_mcp_server.scripts.benchmark_parser import benchmark_parser
+from unittest.mock import patch
+
+
+@pytest.fixture(autouse=True)
+def empty_parse_cache():
+    """Start every test with an empty parse cache."""
+    clear_parse_cache()
+    yield
+    clear_parse_cache()
+
+
+@patch('awslabs.aws_api_mcp_server.core.parser.parser.get_region', return_value='us-east-1')
+def test_equivalent_commands_share_a_cache_entry(mock_get_region):
+    """Test that commands differing only in whitespace and quoting are parsed once."""
+    first = parse(
+        'aws ec2 describe-instances --instance-ids i-0123456789abcdef0 --region us-west-2'
+    )
+    second = parse(
+        "aws  ec2 describe-instances --instance-ids 'i-0123456789abcdef0'   --region us-west-2"
+    )
+
+    assert first == second
+    assert first is not second
+    assert len(_parsed_commands) == 1
+    mock_get_region.assert_not_called()
+
+
+@patch('awslabs.aws_api_mcp_server.core.parser.parser.get_region', return_value='us-east-1')
+def test_cached_parameters_are_not_shared(mock_get_region):
+    """Test that mutating a parsed command does not affect later cache hits."""
+    command = 'aws s3api list-objects-v2 --bucket my-bucket --max-items 10'
+    first = parse(command)
+    first.parameters.pop('PaginationConfig')
+
+    second = parse(command)
+
+    assert second.parameters['PaginationConfig'] == {'MaxItems': 10}
+
+
+@patch('awslabs.aws_api_mcp_server.core.parser.parser.get_region')
+def test_default_region_is_resolved_on_every_hit(mock_get_region):
+    """Test that cached commands without an explicit region pick up configuration changes."""
+    mock_get_region.side_effect = ['us-east-1', 'eu-west-1']
+
+    assert parse('aws iam list-users').region == 'us-east-1'
+    assert parse('aws iam list-users').region == 'eu-west-1'
+    assert parse('aws lambda list-functions --region eu-central-1').region == 'eu-central-1'
+    assert parse('aws lambda list-functions --region eu-central-1').region == 'eu-central-1'
+    assert mock_get_region.call_count == 2
+
+
+@patch('awslabs.aws_api_mcp_server.core.parser.parser.validate_file_path')
+def test_commands_with_local_files_are_not_cached(mock_validate_file_path):
+    """Test that commands referencing local files are validated on every parse."""
+    command = (
+        'aws s3api get-object --bucket my-bucket --key key /tmp/target.txt --region us-east-1'
+    )
+
+    parse(command)
+    validations_per_parse = mock_validate_file_path.call_count
+    parse(command)
+
+    assert len(_parsed_commands) == 0
+    assert validations_per_parse > 0
+    assert mock_validate_file_path.call_count == 2 * validations_per_parse
+
+
+def test_failed_commands_are_not_cached():
+    """Test that commands failing validation raise on every parse."""
+    for _ in range(2):
+        with pytest.raises(InvalidServiceOperationError):
+            parse('aws ec2 describe-unknown-things')
+    assert len(_parsed_commands) == 0
+
+
+def test_parse_cache_is_bounded():
+    """Test that the least recently used command is evicted when the cache is full."""
+    with patch.object(parser_module, 'PARSE_CACHE_SIZE', 2):
+        parse('aws iam list-users --region us-east-1')
+        parse('aws iam list-roles --region us-east-1')
+        parse('aws iam list-users --region us-east-1')
+        parse('aws iam list-groups --region us-east-1')
+
+    assert [key[1] for key in _parsed_commands] == ['list-users', 'list-groups']
+
+
+def test_operation_tables_are_built_once_per_operation():
+    """Test that parsers and lookup tables are reused across different commands."""
+    parse('aws ec2 describe-instances --instance-ids i-0123456789abcdef0 --region us-east-1')
+    parse('aws ec2 describe-instances --instance-ids i-0123456789abcdef1 --region us-east-1')
+
+    cache_info = _get_operation_tables.cache_info()
+    assert (cache_info.misses, cache_info.hits) == (1, 1)
+
+
+@patch('awslabs.aws_api_mcp_server.core.parser.parser.get_region', return_value='us-east-1')
+def test_benchmark_reports_latency_and_throughput(mock_get_region):
+    """Test that the parser benchmark reports every scenario."""
+    reports = benchmark_parser(['aws sts get-caller-identity'], iterations=2)
+
+    assert set(reports) == {'cold', 'operation_tables_cached', 'commands_cached'}
+    for report in reports.values():
+        assert set(report) == {'p50_ms', 'p99_ms', 'commands_per_second'}
@@ -1,4 +1,5 @@
 import pytest
+import threading
 from awslabs.aws_api_mcp_server.core.common.errors import AwsApiMcpError
 from awslabs.aws_api_mcp_server.core.common.models import (
     AwsApiMcpServerErrorResponse,
@@ -7,7 +8,12 @@ from awslabs.aws_api_mcp_server.core.common.models import (
     InterpretationResponse,
     ProgramInterpretationResponse,
 )
-from awslabs.aws_api_mcp_server.server import call_aws, main, suggest_aws_commands
+from awslabs.aws_api_mcp_server.server import (
+    call_aws,
+    get_stage_metrics,
+    main,
+    suggest_aws_commands,
+)
 from botocore.exceptions import NoCredentialsError
 from mcp.server.elicitation import AcceptedElicitation
 from tests.fixtures import DummyCtx
@@ -711,6 +717,7 @@ def test_main_success_with_read_only_mode(
     mock_chdir.assert_called_once_with('/tmp')
     mock_knowledge_base.setup.assert_called_once()
     mock_get_read_only_operations.assert_called_once()
+    mock_read_operations.prefetch.assert_called_once_with()
     mock_server.run.assert_called_once_with(transport='stdio')
 
 
@@ -800,3 +807,96 @@ async def test_get_execution_plan_exception_handling():
         mock_ctx.error.assert_called_once_with(
             'Error while retrieving execution plan: Test exception'
         )
+
+
+@patch('awslabs.aws_api_mcp_server.server.READ_OPERATIONS_INDEX', None)
+@patch('awslabs.aws_api_mcp_server.server.REQUIRE_MUTATION_CONSENT', False)
+@patch('awslabs.aws_api_mcp_server.server.READ_OPERATIONS_ONLY_MODE', False)
+@patch('awslabs.aws_api_mcp_server.server.interpret_command')
+@patch('awslabs.aws_api_mcp_server.server.validate')
+@patch('awslabs.aws_api_mcp_server.server.translate_cli_to_ir')
+async def test_call_aws_batch_runs_commands_concurrently(
+    mock_translate_cli_to_ir, mock_validate, mock_interpret
+):
+    """Test call_aws executes a list of commands concurrently and keeps their order."""
+    barrier = threading.Barrier(2, timeout=5)
+
+    def translate(cli_command):
+        if 'invalid' in cli_command:
+            raise AwsApiMcpError('invalid command')
+        ir = MagicMock()
+        ir.command.is_awscli_customization = False
+        ir.command.service_name = cli_command.split()[1]
+        return ir
+
+    def interpret(cli_command, max_results):
+        # Both commands have to be in flight at the same time to pass the barrier
+        barrier.wait()
+        return ProgramInterpretationResponse(
+            response=InterpretationResponse(error=None, json=cli_command, status_code=200)
+        )
+
+    mock_translate_cli_to_ir.side_effect = translate
+    mock_validate.return_value = MagicMock(validation_failed=False)
+    mock_interpret.side_effect = interpret
+    ctx = DummyCtx()
+    ctx.report_progress = AsyncMock()
+
+    result = await call_aws(
+        [
+            'aws ec2 describe-instances --region us-east-1',
+            'aws invalid command',
+            'aws s3api list-buckets',
+        ],
+        ctx,
+    )
+
+    assert isinstance(result, list)
+    assert isinstance(result[0], ProgramInterpretationResponse)
+    assert result[0].response is not None
+    assert result[0].response.as_json == 'aws ec2 describe-instances --region us-east-1'
+    assert isinstance(result[1], AwsApiMcpServerErrorResponse)
+    assert isinstance(result[2], ProgramInterpretationResponse)
+    assert result[2].response is not None
+    assert result[2].response.as_json == 'aws s3api list-buckets'
+    assert mock_interpret.call_count == 2
+    assert [c.args[:2] for c in ctx.report_progress.call_args_list] == [(1, 3), (2, 3), (3, 3)]
+
+
+@patch('awslabs.aws_api_mcp_server.server.READ_OPERATIONS_INDEX', None)
+@patch('awslabs.aws_api_mcp_server.server.REQUIRE_MUTATION_CONSENT', True)
+@patch('awslabs.aws_api_mcp_server.server.READ_OPERATIONS_ONLY_MODE', False)
+@patch('awslabs.aws_api_mcp_server.server.request_consent')
+@patch('awslabs.aws_api_mcp_server.server.interpret_command')
+@patch('awslabs.aws_api_mcp_server.server.validate')
+@patch('awslabs.aws_api_mcp_server.server.translate_cli_to_ir')
+async def test_call_aws_batch_skips_rejected_commands(
+    mock_translate_cli_to_ir, mock_validate, mock_interpret, mock_request_consent
+):
+    """Test that only the commands the user consented to are executed in a batch."""
+    mock_ir = MagicMock()
+    mock_ir.command.is_awscli_customization = False
+    mock_translate_cli_to_ir.return_value = mock_ir
+    mock_validate.return_value = MagicMock(validation_failed=False)
+    mock_interpret.return_value = ProgramInterpretationResponse(response=None)
+    mock_request_consent.side_effect = [None, AwsApiMcpError('User rejected the execution')]
+
+    result = await call_aws(
+        ['aws s3api create-bucket --bucket a', 'aws s3api create-bucket --bucket b'], DummyCtx()
+    )
+
+    assert isinstance(result, list)
+    assert result[0] == ProgramInterpretationResponse(response=None)
+    assert isinstance(result[1], AwsApiMcpServerErrorResponse)
+    assert 'User rejected the execution' in result[1].detail
+    mock_interpret.assert_called_once_with(
+        cli_command='aws s3api create-bucket --bucket a', max_results=None
+    )
+
+
+@patch('awslabs.aws_api_mcp_server.server.stage_metrics')
+def test_get_stage_metrics_exports_prometheus_text(mock_stage_metrics):
+    """Test that the metrics resource serves the stage histograms in Prometheus format."""
+    mock_stage_metrics.to_prometheus.return_value = '# TYPE metric histogram\n'
+
+    assert get_stage_metrics() == '# TYPE metric histogram\n'
@@ -0,0 +1,135 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Offline store of prefetched documentation pages for AWS Documentation MCP Server.
+
+The store is a single SQLite file of converted pages, compressed with zlib, filled by
+the prefetch crawler and read by ``read_documentation`` before going to the network.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from loguru import logger
+from typing import List, Optional
+
+
+# Path of the offline store read by read_documentation, disabled when unset
+OFFLINE_STORE_PATH = os.getenv('AWS_DOCUMENTATION_OFFLINE_STORE')
+
+# zlib level of the stored pages, trading prefetch time for size on disk
+OFFLINE_STORE_COMPRESSION_LEVEL = 6
+
+
+class OfflineStore:
+    """SQLite store of compressed converted pages, keyed by their URL."""
+
+    def __init__(self, path: Optional[str]):
+        """Initialize a store, opened on first use.
+
+        Args:
+            path: Path of the SQLite file, or None for a disabled store that holds no page
+        """
+        self.path = path
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Number of pages in the store."""
+        connection = self._connect()
+        if connection is None:
+            return 0
+        with self._lock:
+            return connection.execute('SELECT COUNT(*) FROM pages').fetchone()[0]
+
+    def __contains__(self, url: str) -> bool:
+        """Check whether the store has a page of a URL."""
+        connection = self._connect()
+        if connection is None:
+            return False
+        with self._lock:
+            row = connection.execute('SELECT 1 FROM pages WHERE url = ?', (url,)).fetchone()
+        return row is not None
+
+    def get(self, url: str) -> Optional[str]:
+        """Get the content of a stored page.
+
+        Args:
+            url: URL of the page
+
+        Returns:
+            Content of the page, or None if the page is not in the store
+        """
+        connection = self._connect()
+        if connection is None:
+            return None
+        with self._lock:
+            row = connection.execute('SELECT content FROM pages WHERE url = ?', (url,)).fetchone()
+        if row is None:
+            return None
+        return zlib.decompress(row[0]).decode('utf-8')
+
+    def put(self, url: str, content: str):
+        """Store a page, replacing the previous version of its URL.
+
+        Args:
+            url: URL of the page
+            content: Converted content of the page
+        """
+        connection = self._connect()
+        if connection is None:
+            return
+        compressed = zlib.compress(content.encode('utf-8'), OFFLINE_STORE_COMPRESSION_LEVEL)
+        with self._lock, connection:
+            connection.execute(
+                'INSERT OR REPLACE INTO pages (url, content, fetched_at) VALUES (?, ?, ?)',
+                (url, compressed, time.time()),
+            )
+
+    def urls(self) -> List[str]:
+        """Get the URLs of the stored pages, in order."""
+        connection = self._connect()
+        if connection is None:
+            return []
+        with self._lock:
+            return [row[0] for row in connection.execute('SELECT url FROM pages ORDER BY url')]
+
+    def close(self):
+        """Close the connection to the store, reopened by the next use."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        if not self.path:
+            return None
+        with self._lock:
+            if self._connection is None:
+                directory = os.path.dirname(os.path.abspath(self.path))
+                os.makedirs(directory, exist_ok=True)
+                # The connection is shared by the server threads, serialized by the lock
+                connection = sqlite3.connect(self.path, check_same_thread=False)
+                connection.execute(
+                    'CREATE TABLE IF NOT EXISTS pages '
+                    '(url TEXT PRIMARY KEY, content BLOB NOT NULL, fetched_at REAL NOT NULL)'
+                )
+                connection.commit()
+                logger.debug(f'Opened offline documentation store {self.path}')
+                self._connection = connection
+            return self._connection
+
+
+offline_store = OfflineStore(OFFLINE_STORE_PATH)
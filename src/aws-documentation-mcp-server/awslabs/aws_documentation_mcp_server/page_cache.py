@@ -0,0 +1,213 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Cache of converted documentation pages for AWS Documentation MCP Server.
+
+Pages are cached as the markdown they convert to, so that reading a long page
+chunk by chunk downloads and converts it once. Entries are kept in a bounded
+in-memory LRU, optionally backed by a directory on disk shared across restarts.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, replace
+from loguru import logger
+from typing import Dict, Optional
+
+
+# Maximum size of the markdown of the pages kept in memory
+PAGE_CACHE_MAX_BYTES = int(os.getenv('AWS_DOCUMENTATION_CACHE_MAX_BYTES', str(64 * 1024 * 1024)))
+
+# Seconds a cached page is served without asking the server whether it changed
+PAGE_CACHE_TTL_SECONDS = float(os.getenv('AWS_DOCUMENTATION_CACHE_TTL_SECONDS', '300'))
+
+# Directory of the on-disk tier of the cache, disabled when unset
+PAGE_CACHE_DIR = os.getenv('AWS_DOCUMENTATION_CACHE_DIR')
+
+
+@dataclass(frozen=True)
+class CachedPage:
+    """Converted content of a documentation page with its validators."""
+
+    url: str
+    content: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    fetched_at: float
+
+    @property
+    def size(self) -> int:
+        """Size of the content in bytes."""
+        return len(self.content.encode('utf-8'))
+
+    def validation_headers(self) -> Dict[str, str]:
+        """Get the headers asking the server to reply 304 if the page did not change.
+
+        Returns:
+            Conditional request headers for the validators of the page
+        """
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+    def revalidated(self) -> 'CachedPage':
+        """Get the page as confirmed unchanged by the server now."""
+        return replace(self, fetched_at=time.time())
+
+
+class PageCache:
+    """LRU cache of converted pages, bounded by the size of their content."""
+
+    def __init__(
+        self,
+        max_bytes: int,
+        ttl_seconds: float,
+        cache_dir: Optional[str] = None,
+    ):
+        """Initialize an empty cache.
+
+        Args:
+            max_bytes: Maximum total size of the content of the pages kept in memory
+            ttl_seconds: Seconds a page is served without being revalidated
+            cache_dir: Directory of the on-disk tier, or None to keep pages in memory only
+        """
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.cache_dir = cache_dir
+        self.hits = 0
+        self.misses = 0
+        self._entries: 'OrderedDict[str, CachedPage]' = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Number of pages kept in memory."""
+        return len(self._entries)
+
+    def get(self, url: str) -> Optional[CachedPage]:
+        """Get the cached page of a URL, fresh or not.
+
+        Args:
+            url: URL of the page
+
+        Returns:
+            The cached page, or None if the page is not cached
+        """
+        with self._lock:
+            page = self._entries.get(url)
+            if page is not None:
+                self._entries.move_to_end(url)
+                self.hits += 1
+                return page
+        page = self._read(url)
+        with self._lock:
+            if page is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._store(page)
+        return page
+
+    def is_fresh(self, page: CachedPage) -> bool:
+        """Check whether a page can be served without revalidation.
+
+        Args:
+            page: Cached page
+
+        Returns:
+            True if the page was fetched or revalidated less than the TTL ago
+        """
+        return time.time() - page.fetched_at < self.ttl_seconds
+
+    def put(self, page: CachedPage):
+        """Cache a page, replacing the previous version of its URL.
+
+        Args:
+            page: Page to cache
+        """
+        with self._lock:
+            self._store(page)
+        self._write(page)
+
+    def clear(self):
+        """Drop every page kept in memory."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self) -> Dict[str, float]:
+        """Get the hit rate and the size of the cache.
+
+        Returns:
+            Dictionary with the hits, misses, hit rate, pages and size of the cache
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'pages': len(self._entries),
+                'size_bytes': self._size,
+            }
+
+    def _store(self, page: CachedPage):
+        previous = self._entries.pop(page.url, None)
+        if previous is not None:
+            self._size -= previous.size
+        self._entries[page.url] = page
+        self._size += page.size
+        # The most recently cached page is kept even when it exceeds the budget alone
+        while self._size > self.max_bytes and len(self._entries) > 1:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= evicted.size
+
+    def _path(self, url: str) -> Optional[str]:
+        if not self.cache_dir:
+            return None
+        return os.path.join(self.cache_dir, hashlib.sha256(url.encode('utf-8')).hexdigest())
+
+    def _read(self, url: str) -> Optional[CachedPage]:
+        path = self._path(url)
+        if path is None or not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                page = CachedPage(**json.load(f))
+        except Exception as e:
+            logger.warning(f'Error reading cached page {path}: {e}')
+            return None
+        # Different URLs with the same hash are not confused
+        return page if page.url == url else None
+
+    def _write(self, page: CachedPage):
+        path = self._path(page.url)
+        if path is None:
+            return
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(f'{path}.tmp', 'w', encoding='utf-8') as f:
+                json.dump(asdict(page), f)
+            os.replace(f'{path}.tmp', path)
+        except OSError as e:
+            logger.warning(f'Error writing cached page {path}: {e}')
+
+
+page_cache = PageCache(PAGE_CACHE_MAX_BYTES, PAGE_CACHE_TTL_SECONDS, PAGE_CACHE_DIR)
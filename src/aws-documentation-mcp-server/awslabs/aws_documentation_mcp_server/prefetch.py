@@ -0,0 +1,305 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Prefetch crawler filling the offline store with the pages of documentation guides.
+
+A guide is crawled from its table of contents, ``toc-contents.json`` next to its pages,
+and every page under the guide is downloaded and converted concurrently.
+"""
+
+import argparse
+import asyncio
+import httpx
+from awslabs.aws_documentation_mcp_server.offline_store import (
+    OFFLINE_STORE_PATH,
+    OfflineStore,
+)
+from awslabs.aws_documentation_mcp_server.server_utils import (
+    DEFAULT_USER_AGENT,
+    get_http_client,
+)
+from awslabs.aws_documentation_mcp_server.util import extract_content_from_html, is_html_content
+from dataclasses import dataclass, field
+from loguru import logger
+from typing import Any, Iterator, List, Optional
+from urllib.parse import urldefrag, urljoin
+
+
+# Table of contents of a guide, next to its pages
+TOC_FILE = 'toc-contents.json'
+
+# Maximum number of pages downloaded at the same time
+PREFETCH_MAX_CONCURRENCY = 8
+
+# Seconds to wait for a page of a guide
+PREFETCH_TIMEOUT_SECONDS = 30
+
+
+@dataclass
+class PrefetchResult:
+    """Outcome of the prefetch of a guide."""
+
+    guide_url: str
+    pages: List[str] = field(default_factory=list)
+    skipped: List[str] = field(default_factory=list)
+    failed: List[str] = field(default_factory=list)
+
+
+def get_guide_url(url: str) -> str:
+    """Get the URL of the guide of a page, the directory of the page.
+
+    Args:
+        url: URL of a page of the guide, or of the guide itself
+
+    Returns:
+        URL of the guide, ending with a slash
+    """
+    url = urldefrag(url).url.split('?', 1)[0]
+    return url[: url.rindex('/') + 1] if '/' in url else url
+
+
+def iter_toc_hrefs(entries: List[Any]) -> Iterator[str]:
+    """Iterate over the links of the entries of a table of contents and their children.
+
+    Args:
+        entries: Entries of a table of contents, each with an optional href and contents
+
+    Yields:
+        Links of the entries, depth first
+    """
+    for entry in entries:
+        if not isinstance(entry, dict):
+            continue
+        href = entry.get('href')
+        if isinstance(href, str):
+            yield href
+        yield from iter_toc_hrefs(entry.get('contents') or [])
+
+
+def get_toc_page_urls(toc: Any, guide_url: str) -> List[str]:
+    """Get the URLs of the pages of a guide listed by its table of contents.
+
+    Links are resolved against the guide, anchors are dropped, and pages outside of the
+    guide are left out.
+
+    Args:
+        toc: Parsed table of contents of the guide
+        guide_url: URL of the guide
+
+    Returns:
+        URLs of the pages of the guide, in table of contents order, without duplicates
+    """
+    contents = toc.get('contents', []) if isinstance(toc, dict) else []
+    urls = {}
+    for href in iter_toc_hrefs(contents):
+        url = urldefrag(urljoin(guide_url, href)).url
+        if url.startswith(guide_url) and url.endswith('.html'):
+            urls[url] = None
+    return list(urls)
+
+
+async def fetch_toc(client: httpx.AsyncClient, guide_url: str) -> List[str]:
+    """Fetch the table of contents of a guide.
+
+    Args:
+        client: HTTP client
+        guide_url: URL of the guide
+
+    Returns:
+        URLs of the pages of the guide
+
+    Raises:
+        httpx.HTTPError: If the table of contents cannot be fetched
+        ValueError: If the table of contents is not JSON
+    """
+    response = await client.get(
+        urljoin(guide_url, TOC_FILE),
+        follow_redirects=True,
+        headers={'User-Agent': DEFAULT_USER_AGENT},
+        timeout=PREFETCH_TIMEOUT_SECONDS,
+    )
+    response.raise_for_status()
+    return get_toc_page_urls(response.json(), guide_url)
+
+
+async def prefetch_page(
+    client: httpx.AsyncClient,
+    url: str,
+    store: OfflineStore,
+    semaphore: asyncio.Semaphore,
+) -> bool:
+    """Download, convert and store a page.
+
+    Args:
+        client: HTTP client
+        url: URL of the page
+        store: Store receiving the page
+        semaphore: Semaphore bounding the number of pages downloaded at the same time
+
+    Returns:
+        True if the page was stored, False if it could not be fetched or converted
+    """
+    async with semaphore:
+        try:
+            response = await client.get(
+                url,
+                follow_redirects=True,
+                headers={'User-Agent': DEFAULT_USER_AGENT},
+                timeout=PREFETCH_TIMEOUT_SECONDS,
+            )
+            response.raise_for_status()
+        except httpx.HTTPError as e:
+            logger.warning(f'Failed to prefetch {url}: {e}')
+            return False
+    page_raw = response.text
+    if is_html_content(page_raw, response.headers.get('content-type', '')):
+        # Converting is CPU bound, so it runs in a thread while other pages download
+        content = await asyncio.to_thread(extract_content_from_html, page_raw)
+        # Failed conversions are not stored, so that they are not served offline
+        if content.startswith('<e>') and content.endswith('</e>'):
+            logger.warning(f'Failed to convert {url}: {content}')
+            return False
+    else:
+        content = page_raw
+    await asyncio.to_thread(store.put, url, content)
+    return True
+
+
+async def prefetch_guide(
+    url: str,
+    store: OfflineStore,
+    max_concurrency: int = PREFETCH_MAX_CONCURRENCY,
+    refresh: bool = False,
+    client: Optional[httpx.AsyncClient] = None,
+) -> PrefetchResult:
+    """Prefetch the pages of a guide into an offline store.
+
+    Args:
+        url: URL of the guide, or of any of its pages
+        store: Store receiving the pages
+        max_concurrency: Maximum number of pages downloaded at the same time
+        refresh: Whether to download again the pages already in the store
+        client: HTTP client, the shared client of the server by default
+
+    Returns:
+        Pages stored, skipped because they were already stored, and failed
+
+    Raises:
+        httpx.HTTPError: If the table of contents of the guide cannot be fetched
+        ValueError: If the table of contents of the guide is not JSON
+    """
+    client = client or get_http_client()
+    guide_url = get_guide_url(url)
+    result = PrefetchResult(guide_url=guide_url)
+    page_urls = await fetch_toc(client, guide_url)
+    logger.info(f'Prefetching {len(page_urls)} pages of {guide_url}')
+
+    to_fetch = []
+    for page_url in page_urls:
+        if not refresh and page_url in store:
+            result.skipped.append(page_url)
+        else:
+            to_fetch.append(page_url)
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+    stored = await asyncio.gather(
+        *(prefetch_page(client, page_url, store, semaphore) for page_url in to_fetch)
+    )
+    for page_url, ok in zip(to_fetch, stored):
+        (result.pages if ok else result.failed).append(page_url)
+    return result
+
+
+async def prefetch_guides(
+    urls: List[str],
+    store: OfflineStore,
+    max_concurrency: int = PREFETCH_MAX_CONCURRENCY,
+    refresh: bool = False,
+) -> List[PrefetchResult]:
+    """Prefetch several guides one after the other, with the shared HTTP client.
+
+    A guide whose table of contents cannot be fetched is reported as failed, with its
+    table of contents as the failed page, and the next guides are still prefetched.
+
+    Args:
+        urls: URLs of the guides
+        store: Store receiving the pages
+        max_concurrency: Maximum number of pages downloaded at the same time
+        refresh: Whether to download again the pages already in the store
+
+    Returns:
+        Outcome of the prefetch of each guide
+    """
+    client = get_http_client()
+    results = []
+    try:
+        for url in urls:
+            try:
+                results.append(await prefetch_guide(url, store, max_concurrency, refresh, client))
+            except (httpx.HTTPError, ValueError) as e:
+                guide_url = get_guide_url(url)
+                logger.error(f'Failed to fetch the table of contents of {guide_url}: {e}')
+                results.append(
+                    PrefetchResult(guide_url=guide_url, failed=[urljoin(guide_url, TOC_FILE)])
+                )
+    finally:
+        await client.aclose()
+    return results
+
+
+def main():
+    """Prefetch documentation guides into the offline store."""
+    parser = argparse.ArgumentParser(
+        description='Prefetch AWS documentation guides for read_documentation to serve offline'
+    )
+    parser.add_argument(
+        'urls',
+        nargs='+',
+        help='URLs of the guides to prefetch, or of any of their pages',
+    )
+    parser.add_argument(
+        '--store',
+        default=OFFLINE_STORE_PATH,
+        help='Path of the offline store, AWS_DOCUMENTATION_OFFLINE_STORE by default',
+    )
+    parser.add_argument(
+        '--concurrency',
+        type=int,
+        default=PREFETCH_MAX_CONCURRENCY,
+        help='Maximum number of pages downloaded at the same time',
+    )
+    parser.add_argument(
+        '--refresh',
+        action='store_true',
+        help='Download again the pages already in the store',
+    )
+    args = parser.parse_args()
+    if not args.store:
+        parser.error('--store is required when AWS_DOCUMENTATION_OFFLINE_STORE is not set')
+    if args.concurrency < 1:
+        parser.error('--concurrency must be at least 1')
+
+    store = OfflineStore(args.store)
+    try:
+        results = asyncio.run(prefetch_guides(args.urls, store, args.concurrency, args.refresh))
+    finally:
+        store.close()
+    for result in results:
+        print(
+            f'{result.guide_url}: {len(result.pages)} stored, '
+            f'{len(result.skipped)} already stored, {len(result.failed)} failed'
+        )
+
+
+if __name__ == '__main__':
+    main()
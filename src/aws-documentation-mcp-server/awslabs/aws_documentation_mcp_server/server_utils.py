@@ -11,7 +11,12 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import asyncio
 import httpx
+import importlib.util
+import time
+from awslabs.aws_documentation_mcp_server.offline_store import offline_store
+from awslabs.aws_documentation_mcp_server.page_cache import CachedPage, page_cache
 from awslabs.aws_documentation_mcp_server.util import (
     extract_content_from_html,
     format_documentation_result,
@@ -20,6 +25,7 @@ from awslabs.aws_documentation_mcp_server.util import (
 from importlib.metadata import version
 from loguru import logger
 from mcp.server.fastmcp import Context
+from typing import Optional, Tuple
 
 
 try:
@@ -29,6 +35,50 @@ except Exception:
 
 DEFAULT_USER_AGENT = f'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36 ModelContextProtocol/{__version__} (AWS Documentation Server)'
 
+# HTTP/2 needs the h2 package, installed with the http2 extra of httpx
+HTTP2_AVAILABLE = importlib.util.find_spec('h2') is not None
+
+# Connections kept open between requests, and how long an idle one is kept
+HTTP_MAX_KEEPALIVE_CONNECTIONS = 10
+HTTP_KEEPALIVE_EXPIRY_SECONDS = 60.0
+
+_http_client: Optional[Tuple[asyncio.AbstractEventLoop, httpx.AsyncClient]] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get the HTTP client shared by the requests of the server.
+
+    The client keeps connections alive between requests and multiplexes them over
+    HTTP/2, so that requests to the same host skip the TCP and TLS handshakes. A
+    client is bound to the event loop it was created in, so a new one is created
+    for another event loop.
+
+    Returns:
+        The shared HTTP client
+    """
+    global _http_client
+    loop = asyncio.get_running_loop()
+    if _http_client is None or _http_client[0] is not loop or _http_client[1].is_closed:
+        client = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(
+                max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=HTTP_KEEPALIVE_EXPIRY_SECONDS,
+            ),
+        )
+        _http_client = (loop, client)
+    return _http_client[1]
+
+
+def reset_http_client():
+    """Forget the shared HTTP client, so that the next request creates a new one."""
+    global _http_client
+    _http_client = None
+
+
+class DocumentationFetchError(Exception):
+    """Error fetching a documentation page, with the message returned to the client."""
+
 
 async def read_documentation_impl(
     ctx: Context,
@@ -38,40 +88,18 @@ async def read_documentation_impl(
     session_uuid: str,
 ) -> str:
     """The implementation of the read_documentation tool."""
-    logger.debug(f'Fetching documentation from {url_str}')
-
-    url_with_session = f'{url_str}?session={session_uuid}'
-
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(
-                url_with_session,
-                follow_redirects=True,
-                headers={
-                    'User-Agent': DEFAULT_USER_AGENT,
-                    'X-MCP-Session-Id': session_uuid,
-                },
-                timeout=30,
-            )
-        except httpx.HTTPError as e:
-            error_msg = f'Failed to fetch {url_str}: {str(e)}'
-            logger.error(error_msg)
-            await ctx.error(error_msg)
-            return error_msg
-
-        if response.status_code >= 400:
-            error_msg = f'Failed to fetch {url_str} - status code {response.status_code}'
-            logger.error(error_msg)
-            await ctx.error(error_msg)
-            return error_msg
-
-        page_raw = response.text
-        content_type = response.headers.get('content-type', '')
-
-    if is_html_content(page_raw, content_type):
-        content = extract_content_from_html(page_raw)
+    cached = page_cache.get(url_str)
+    if cached is not None and page_cache.is_fresh(cached):
+        logger.debug(f'Serving documentation from the page cache for {url_str}')
+        content = cached.content
+    elif (stored := offline_store.get(url_str)) is not None:
+        logger.debug(f'Serving documentation from the offline store for {url_str}')
+        content = stored
     else:
-        content = page_raw
+        try:
+            content = await fetch_documentation(ctx, url_str, session_uuid, cached)
+        except DocumentationFetchError as e:
+            return str(e)
 
     result = format_documentation_result(url_str, content, start_index, max_length)
 
@@ -82,3 +110,81 @@ async def read_documentation_impl(
         )
 
     return result
+
+
+async def fetch_documentation(
+    ctx: Context,
+    url_str: str,
+    session_uuid: str,
+    cached: Optional[CachedPage] = None,
+) -> str:
+    """Fetch a documentation page and convert it to markdown, caching the result.
+
+    Args:
+        ctx: MCP context for logging and error handling
+        url_str: URL of the documentation page
+        session_uuid: Session ID sent with the request
+        cached: Cached version of the page to revalidate, if any
+
+    Returns:
+        Content of the page
+
+    Raises:
+        DocumentationFetchError: If the page cannot be fetched, with the message for the client
+    """
+    logger.debug(f'Fetching documentation from {url_str}')
+
+    url_with_session = f'{url_str}?session={session_uuid}'
+    headers = {
+        'User-Agent': DEFAULT_USER_AGENT,
+        'X-MCP-Session-Id': session_uuid,
+    }
+    if cached is not None:
+        headers.update(cached.validation_headers())
+
+    client = get_http_client()
+    try:
+        response = await client.get(
+            url_with_session,
+            follow_redirects=True,
+            headers=headers,
+            timeout=30,
+        )
+    except httpx.HTTPError as e:
+        if cached is not None:
+            logger.warning(f'Failed to revalidate {url_str}, serving the cached page: {e}')
+            return cached.content
+        error_msg = f'Failed to fetch {url_str}: {str(e)}'
+        logger.error(error_msg)
+        await ctx.error(error_msg)
+        raise DocumentationFetchError(error_msg)
+
+    if response.status_code == 304 and cached is not None:
+        logger.debug(f'Cached page of {url_str} is still current')
+        page_cache.put(cached.revalidated())
+        return cached.content
+
+    if response.status_code >= 400:
+        error_msg = f'Failed to fetch {url_str} - status code {response.status_code}'
+        logger.error(error_msg)
+        await ctx.error(error_msg)
+        raise DocumentationFetchError(error_msg)
+
+    page_raw = response.text
+    content_type = response.headers.get('content-type', '')
+
+    if is_html_content(page_raw, content_type):
+        content = extract_content_from_html(page_raw)
+    else:
+        content = page_raw
+
+    page_cache.put(
+        CachedPage(
+            url=url_str,
+            content=content,
+            etag=response.headers.get('etag'),
+            last_modified=response.headers.get('last-modified'),
+            fetched_at=time.time(),
+        )
+    )
+    return content
@@ -13,14 +13,132 @@
 # limitations under the License.
 """Utility functions for AWS Documentation MCP Server."""
 
+import lxml.html
 import markdownify
+import re
 from awslabs.aws_documentation_mcp_server.models import RecommendationResult
+from bs4 import BeautifulSoup
+from lxml.etree import XPath
 from typing import Any, Dict, List
 
 
+# Common content container selectors for AWS documentation, in order of preference
+CONTENT_SELECTORS = [
+    'main',
+    'article',
+    '#main-content',
+    '.main-content',
+    '#content',
+    '.content',
+    "div[role='main']",
+    '#awsdocs-content',
+    '.awsui-article',
+]
+
+# Navigation elements that might be in the main content
+NAV_SELECTORS = [
+    'noscript',
+    '.prev-next',
+    '#main-col-footer',
+    '.awsdocs-page-utilities',
+    '#quick-feedback-yes',
+    '#quick-feedback-no',
+    '.page-loading-indicator',
+    '#tools-panel',
+    '.doc-cookie-banner',
+    'awsdocs-copyright',
+    'awsdocs-thumb-feedback',
+]
+
+# Define tags to strip - these are elements we don't want in the output
+TAGS_TO_STRIP = [
+    'script',
+    'style',
+    'noscript',
+    'meta',
+    'link',
+    'footer',
+    'nav',
+    'aside',
+    'header',
+    # AWS documentation specific elements
+    'awsdocs-cookie-consent-container',
+    'awsdocs-feedback-container',
+    'awsdocs-page-header',
+    'awsdocs-page-header-container',
+    'awsdocs-filter-selector',
+    'awsdocs-breadcrumb-container',
+    'awsdocs-page-footer',
+    'awsdocs-page-footer-container',
+    'awsdocs-footer',
+    'awsdocs-cookie-banner',
+    # Common unnecessary elements
+    'js-show-more-buttons',
+    'js-show-more-text',
+    'feedback-container',
+    'feedback-section',
+    'doc-feedback-container',
+    'doc-feedback-section',
+    'warning-container',
+    'warning-section',
+    'cookie-banner',
+    'cookie-notice',
+    'copyright-section',
+    'legal-section',
+    'terms-section',
+]
+
+SIMPLE_SELECTOR_PATTERN = re.compile(
+    r"^(?P<tag>[a-zA-Z][\w-]*)?(?:#(?P<id>[\w-]+)|\.(?P<class>[\w-]+)|\[(?P<attr>[\w-]+)='(?P<value>[^']*)'\])?$"
+)
+
+
+def selector_to_xpath(selector: str) -> str:
+    """Translate a simple CSS selector into an XPath expression matching the same elements.
+
+    Args:
+        selector: Selector made of an optional tag name and an optional ID, class or
+            attribute value, like `main`, `#content`, `.content` or `div[role='main']`
+
+    Returns:
+        XPath expression selecting the matching descendants of the context node
+    """
+    match = SIMPLE_SELECTOR_PATTERN.match(selector)
+    if not match or not any(match.groups()):
+        raise ValueError(f'Unsupported selector: {selector}')
+    xpath = f'.//{match.group("tag") or "*"}'
+    if match.group('id'):
+        xpath += f"[@id='{match.group('id')}']"
+    elif match.group('class'):
+        xpath += (
+            f"[contains(concat(' ', normalize-space(@class), ' '), ' {match.group('class')} ')]"
+        )
+    elif match.group('attr'):
+        xpath += f"[@{match.group('attr')}='{match.group('value')}']"
+    return xpath
+
+
+CONTENT_XPATHS = [XPath(selector_to_xpath(selector)) for selector in CONTENT_SELECTORS]
+# All navigation elements are found by a single query
+NAV_XPATH = XPath(' | '.join(selector_to_xpath(selector) for selector in NAV_SELECTORS))
+
+MARKDOWN_CONVERTER = markdownify.MarkdownConverter(
+    heading_style=markdownify.ATX,
+    autolinks=True,
+    default_title=True,
+    escape_asterisks=True,
+    escape_underscores=True,
+    newline_style='SPACES',
+    strip=TAGS_TO_STRIP,
+)
+
+
 def extract_content_from_html(html: str) -> str:
     """Extract and convert HTML content to Markdown format.
 
+    The page is parsed with lxml, and only its main content, without navigation
+    elements, is converted to markdown.
+
     Args:
         html: Raw HTML content to process
 
@@ -31,107 +149,33 @@ def extract_content_from_html(html: str) -> str:
         return '<e>Empty HTML content</e>'
 
     try:
-        # First use BeautifulSoup to clean up the HTML
-        from bs4 import BeautifulSoup
-
-        # Parse HTML with BeautifulSoup
-        soup = BeautifulSoup(html, 'html.parser')
-
-        # Try to find the main content area
-        main_content = None
-
-        # Common content container selectors for AWS documentation
-        content_selectors = [
-            'main',
-            'article',
-            '#main-content',
-            '.main-content',
-            '#content',
-            '.content',
-            "div[role='main']",
-            '#awsdocs-content',
-            '.awsui-article',
-        ]
+        # lxml rejects str input starting with an XML declaration, unlike the bytes it
+        # decodes itself
+        document = lxml.html.document_fromstring(
+            html.encode('utf-8'), parser=lxml.html.HTMLParser(encoding='utf-8')
+        )
 
         # Try to find the main content using common selectors
-        for selector in content_selectors:
-            content = soup.select_one(selector)
-            if content:
-                main_content = content
+        main_content = None
+        for content_xpath in CONTENT_XPATHS:
+            matches = content_xpath(document)
+            if matches:
+                main_content = matches[0]
                 break
 
         # If no main content found, use the body
-        if not main_content:
-            main_content = soup.body if soup.body else soup
-
-        # Remove navigation elements that might be in the main content
-        nav_selectors = [
-            'noscript',
-            '.prev-next',
-            '#main-col-footer',
-            '.awsdocs-page-utilities',
-            '#quick-feedback-yes',
-            '#quick-feedback-no',
-            '.page-loading-indicator',
-            '#tools-panel',
-            '.doc-cookie-banner',
-            'awsdocs-copyright',
-            'awsdocs-thumb-feedback',
-        ]
-
-        for selector in nav_selectors:
-            for element in main_content.select(selector):
-                element.decompose()
-
-        # Define tags to strip - these are elements we don't want in the output
-        tags_to_strip = [
-            'script',
-            'style',
-            'noscript',
-            'meta',
-            'link',
-            'footer',
-            'nav',
-            'aside',
-            'header',
-            # AWS documentation specific elements
-            'awsdocs-cookie-consent-container',
-            'awsdocs-feedback-container',
-            'awsdocs-page-header',
-            'awsdocs-page-header-container',
-            'awsdocs-filter-selector',
-            'awsdocs-breadcrumb-container',
-            'awsdocs-page-footer',
-            'awsdocs-page-footer-container',
-            'awsdocs-footer',
-            'awsdocs-cookie-banner',
-            # Common unnecessary elements
-            'js-show-more-buttons',
-            'js-show-more-text',
-            'feedback-container',
-            'feedback-section',
-            'doc-feedback-container',
-            'doc-feedback-section',
-            'warning-container',
-            'warning-section',
-            'cookie-banner',
-            'cookie-notice',
-            'copyright-section',
-            'legal-section',
-            'terms-section',
-        ]
-
-        # Use markdownify on the cleaned HTML content
-        content = markdownify.markdownify(
-            str(main_content),
-            heading_style=markdownify.ATX,
-            autolinks=True,
-            default_title=True,
-            escape_asterisks=True,
-            escape_underscores=True,
-            newline_style='SPACES',
-            strip=tags_to_strip,
-        )
+        if main_content is None:
+            main_content = document.find('body')
+            if main_content is None:
+                main_content = document
+
+        # Remove navigation elements, keeping the text that follows them
+        for element in NAV_XPATH(main_content):
+            element.drop_tree()
+
+        # Convert the main content alone, so the rest of the page is not parsed again
+        soup = BeautifulSoup(lxml.html.tostring(main_content, encoding='unicode'), 'lxml')
+        content = MARKDOWN_CONVERTER.convert_soup(soup)
 
         if not content:
             return '<e>Page failed to be simplified from HTML</e>'
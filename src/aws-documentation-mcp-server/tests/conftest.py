@@ -14,6 +14,8 @@
 """Configuration for pytest."""
 
 import pytest
+from awslabs.aws_documentation_mcp_server.page_cache import page_cache
+from awslabs.aws_documentation_mcp_server.server_utils import reset_http_client
 
 
 def pytest_addoption(parser):
@@ -24,17 +26,45 @@ def pytest_addoption(parser):
         default=False,
         help='Run tests that make live API calls',
     )
+    parser.addoption(
+        '--run-benchmark',
+        action='store_true',
+        default=False,
+        help='Run tests that measure conversion times',
+    )
 
 
 def pytest_configure(config):
     """Configure pytest."""
     config.addinivalue_line('markers', 'live: mark test as making live API calls')
+    config.addinivalue_line('markers', 'benchmark: mark test as measuring conversion times')
 
 
 def pytest_collection_modifyitems(config, items):
-    """Skip live tests unless --run-live is specified."""
+    """Skip live tests unless --run-live is specified, and benchmarks unless --run-benchmark."""
     if not config.getoption('--run-live'):
         skip_live = pytest.mark.skip(reason='need --run-live option to run')
         for item in items:
             if 'live' in item.keywords:
                 item.add_marker(skip_live)
+    if not config.getoption('--run-benchmark'):
+        skip_benchmark = pytest.mark.skip(reason='need --run-benchmark option to run')
+        for item in items:
+            if 'benchmark' in item.keywords:
+                item.add_marker(skip_benchmark)
+
+
+@pytest.fixture(autouse=True)
+def clear_page_cache():
+    """Start every test with an empty page cache, so pages are fetched again."""
+    page_cache.clear()
+    yield
+    page_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def fresh_http_client():
+    """Start every test without a shared HTTP client, so patched clients are used."""
+    reset_http_client()
+    yield
+    reset_http_client()
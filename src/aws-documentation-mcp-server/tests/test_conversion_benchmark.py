@@ -0,0 +1,93 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmark of the HTML to Markdown conversion on saved AWS documentation pages."""
+
+import markdownify
+import os
+import pytest
+import time
+from awslabs.aws_documentation_mcp_server.util import (
+    CONTENT_SELECTORS,
+    NAV_SELECTORS,
+    TAGS_TO_STRIP,
+    extract_content_from_html,
+)
+from bs4 import BeautifulSoup
+from loguru import logger
+
+
+RESOURCES_DIR = os.path.join(os.path.dirname(__file__), 'resources')
+
+
+def reference_extract(html):
+    """Convert a page like the html.parser and markdownify implementation did."""
+    soup = BeautifulSoup(html, 'html.parser')
+    main_content = next(
+        (content for content in map(soup.select_one, CONTENT_SELECTORS) if content), soup.body
+    )
+    for selector in NAV_SELECTORS:
+        for element in main_content.select(selector):  # type: ignore
+            element.decompose()
+    return markdownify.markdownify(
+        str(main_content),
+        heading_style=markdownify.ATX,
+        autolinks=True,
+        default_title=True,
+        escape_asterisks=True,
+        escape_underscores=True,
+        newline_style='SPACES',
+        strip=TAGS_TO_STRIP,
+    )
+
+
+def load_corpus():
+    """Load the saved pages, with a page the size of a large API reference built from them."""
+    with open(os.path.join(RESOURCES_DIR, 'lambda_sns_raw.html'), encoding='utf-8') as f:
+        page = f.read()
+    # API reference pages are long runs of sections, so the sections of the page are repeated
+    sections_start = page.index('<h2', page.index('<div id="main-col-body">'))
+    sections_end = page.index('<awsdocs-copyright', sections_start)
+    sections = page[sections_start:sections_end]
+    large_page = page[:sections_start] + sections * 20 + page[sections_end:]
+    return {'lambda_sns': page, 'large_reference': large_page}
+
+
+def measure(function, html, repeat):
+    """Measure the average time of a conversion in milliseconds."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function(html)
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+@pytest.mark.parametrize('name,html', load_corpus().items())
+def test_conversion_matches_the_reference(name, html):
+    """Test that the lxml conversion gives the markdown of the reference conversion."""
+    assert extract_content_from_html(html) == reference_extract(html)
+
+
+@pytest.mark.benchmark
+def test_conversion_benchmark():
+    """Benchmark the lxml conversion against the reference conversion on the corpus.
+
+    Timings depend on the machine, so they are only logged. Run with --run-benchmark.
+    """
+    for name, html in load_corpus().items():
+        repeat = 2 if len(html) > 100_000 else 10
+        reference_ms = measure(reference_extract, html, repeat)
+        lxml_ms = measure(extract_content_from_html, html, repeat)
+        logger.info(
+            f'{name} ({len(html)} bytes): reference {reference_ms:.1f} ms, '
+            f'lxml {lxml_ms:.1f} ms, {reference_ms / lxml_ms:.1f}x'
+        )
@@ -0,0 +1,91 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for the offline store of prefetched documentation pages."""
+
+import pytest
+import sqlite3
+from awslabs.aws_documentation_mcp_server.offline_store import OfflineStore
+from awslabs.aws_documentation_mcp_server.server_utils import read_documentation_impl
+from mcp.server.fastmcp.server import Context
+from unittest.mock import AsyncMock, MagicMock, patch
+
+
+URL = 'https://docs.aws.amazon.com/test.html'
+
+
+def test_store_round_trip(tmp_path):
+    """Test that stored pages are read back, also after reopening the store."""
+    path = str(tmp_path / 'store' / 'docs.sqlite')
+    store = OfflineStore(path)
+    store.put(URL, '# Title\n\nContent')
+    store.put('https://docs.aws.amazon.com/a.html', 'A')
+    store.close()
+
+    reopened = OfflineStore(path)
+    assert reopened.get(URL) == '# Title\n\nContent'
+    assert reopened.get('https://docs.aws.amazon.com/missing.html') is None
+    assert URL in reopened
+    assert len(reopened) == 2
+    assert reopened.urls() == ['https://docs.aws.amazon.com/a.html', URL]
+
+
+def test_store_replaces_and_compresses_pages(tmp_path):
+    """Test that storing a page again replaces it, and that pages are compressed."""
+    path = str(tmp_path / 'docs.sqlite')
+    store = OfflineStore(path)
+    store.put(URL, 'old')
+    store.put(URL, 'resources ' * 10000)
+
+    assert store.get(URL) == 'resources ' * 10000
+    assert len(store) == 1
+    store.close()
+    with sqlite3.connect(path) as connection:
+        (size,) = connection.execute('SELECT LENGTH(content) FROM pages').fetchone()
+    assert size < 1000
+
+
+def test_disabled_store():
+    """Test that a store without a path holds no page and creates no file."""
+    store = OfflineStore(None)
+    store.put(URL, 'content')
+
+    assert store.get(URL) is None
+    assert URL not in store
+    assert len(store) == 0
+    assert store.urls() == []
+
+
+@pytest.mark.asyncio
+async def test_read_documentation_serves_stored_pages(tmp_path):
+    """Test that stored pages are read without fetching them, and others are fetched."""
+    store = OfflineStore(str(tmp_path / 'docs.sqlite'))
+    store.put(URL, 'Stored content')
+    ctx = MagicMock(spec=Context)
+
+    with (
+        patch('awslabs.aws_documentation_mcp_server.server_utils.offline_store', store),
+        patch(
+            'awslabs.aws_documentation_mcp_server.server_utils.fetch_documentation',
+            new_callable=AsyncMock,
+            return_value='Fetched content',
+        ) as fetch,
+    ):
+        stored = await read_documentation_impl(ctx, URL, 10000, 0, 'session')
+        fetched = await read_documentation_impl(
+            ctx, 'https://docs.aws.amazon.com/other.html', 10000, 0, 'session'
+        )
+
+    assert 'Stored content' in stored
+    assert 'Fetched content' in fetched
+    assert fetch.call_count == 1
@@ -0,0 +1,208 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for the cache of converted documentation pages."""
+
+import httpx
+import pytest
+import time
+from awslabs.aws_documentation_mcp_server.page_cache import CachedPage, PageCache, page_cache
+from awslabs.aws_documentation_mcp_server.server_utils import read_documentation_impl
+from mcp.server.fastmcp.server import Context
+from unittest.mock import AsyncMock, MagicMock, patch
+
+
+URL = 'https://docs.aws.amazon.com/test.html'
+
+
+def make_page(url=URL, content='content', fetched_at=None, etag='"v1"'):
+    """Create a cached page."""
+    return CachedPage(
+        url=url,
+        content=content,
+        etag=etag,
+        last_modified='Wed, 01 Jan 2025 00:00:00 GMT',
+        fetched_at=time.time() if fetched_at is None else fetched_at,
+    )
+
+
+def test_cache_evicts_least_recently_used_pages():
+    """Test that the cache stays within its budget by dropping the oldest lookups."""
+    cache = PageCache(max_bytes=20, ttl_seconds=60)
+    cache.put(make_page('a', 'x' * 8))
+    cache.put(make_page('b', 'x' * 8))
+    assert cache.get('a') is not None
+
+    cache.put(make_page('c', 'x' * 8))
+
+    assert cache.get('b') is None
+    assert cache.get('a') is not None
+    assert cache.get('c') is not None
+    assert cache.stats()['size_bytes'] == 16
+
+
+def test_cache_replaces_a_page():
+    """Test that caching a page again replaces its previous version."""
+    cache = PageCache(max_bytes=100, ttl_seconds=60)
+    cache.put(make_page(content='old'))
+    cache.put(make_page(content='newer'))
+
+    page = cache.get(URL)
+    assert page is not None
+    assert page.content == 'newer'
+    assert len(cache) == 1
+    assert cache.stats()['size_bytes'] == 5
+
+
+def test_cache_freshness():
+    """Test that pages are fresh until their TTL expires."""
+    cache = PageCache(max_bytes=100, ttl_seconds=60)
+
+    assert cache.is_fresh(make_page())
+    stale = make_page(fetched_at=time.time() - 61)
+    assert not cache.is_fresh(stale)
+    assert cache.is_fresh(stale.revalidated())
+    assert stale.validation_headers() == {
+        'If-None-Match': '"v1"',
+        'If-Modified-Since': 'Wed, 01 Jan 2025 00:00:00 GMT',
+    }
+
+
+def test_disk_tier(tmp_path):
+    """Test that pages written to disk are served by another cache instance."""
+    PageCache(max_bytes=100, ttl_seconds=60, cache_dir=str(tmp_path)).put(make_page())
+
+    cache = PageCache(max_bytes=100, ttl_seconds=60, cache_dir=str(tmp_path))
+    page = cache.get(URL)
+    assert page is not None
+    assert (page.content, page.etag) == ('content', '"v1"')
+    assert cache.get('https://docs.aws.amazon.com/other.html') is None
+    assert len(cache) == 1
+
+
+def test_disk_tier_ignores_unreadable_pages(tmp_path):
+    """Test that a corrupt page on disk is a miss."""
+    cache = PageCache(max_bytes=100, ttl_seconds=60, cache_dir=str(tmp_path))
+    cache.put(make_page())
+    for path in tmp_path.iterdir():
+        path.write_text('not json')
+
+    assert PageCache(100, 60, str(tmp_path)).get(URL) is None
+
+
+def mock_client(*responses):
+    """Patch httpx.AsyncClient to return responses, or raise errors, in order."""
+    client = MagicMock()
+    client.__aenter__ = AsyncMock(return_value=client)
+    client.__aexit__ = AsyncMock(return_value=None)
+    client.get = AsyncMock(side_effect=list(responses))
+    return patch('httpx.AsyncClient', return_value=client), client
+
+
+def make_response(status_code=200, text='', headers=None):
+    """Create an HTTP response."""
+    response = MagicMock()
+    response.status_code = status_code
+    response.text = text
+    response.headers = {'content-type': 'text/plain', **(headers or {})}
+    return response
+
+
+@pytest.fixture
+def ctx():
+    """Create a context with a mocked error method."""
+    ctx = MagicMock(spec=Context)
+    ctx.error = AsyncMock()
+    return ctx
+
+
+@pytest.mark.asyncio
+async def test_chunks_are_served_from_the_cache(ctx):
+    """Test that reading a page chunk by chunk fetches and converts it once."""
+    html = '<html><body><main>' + '<p>paragraph</p>' * 200 + '</main></body></html>'
+    patcher, client = mock_client(make_response(text=html, headers={'content-type': 'text/html'}))
+
+    with (
+        patcher,
+        patch(
+            'awslabs.aws_documentation_mcp_server.server_utils.extract_content_from_html',
+            wraps=lambda page: page.replace('<p>', '').replace('</p>', '\n'),
+        ) as convert,
+    ):
+        chunks = [await read_documentation_impl(ctx, URL, 500, i * 500, 'uuid') for i in range(4)]
+
+    assert client.get.call_count == 1
+    assert convert.call_count == 1
+    assert all('paragraph' in chunk for chunk in chunks)
+    assert page_cache.stats()['hits'] == 3
+
+
+@pytest.mark.asyncio
+async def test_stale_pages_are_revalidated(ctx):
+    """Test that a stale page is revalidated and served from the cache when unchanged."""
+    page_cache.put(make_page(content='cached content', fetched_at=0))
+    patcher, client = mock_client(make_response(status_code=304))
+
+    with patcher:
+        result = await read_documentation_impl(ctx, URL, 1000, 0, 'uuid')
+
+    assert 'cached content' in result
+    headers = client.get.call_args.kwargs['headers']
+    assert headers['If-None-Match'] == '"v1"'
+    assert headers['If-Modified-Since'] == 'Wed, 01 Jan 2025 00:00:00 GMT'
+    page = page_cache.get(URL)
+    assert page is not None and page_cache.is_fresh(page)
+
+
+@pytest.mark.asyncio
+async def test_changed_pages_replace_the_cached_page(ctx):
+    """Test that a stale page that changed is fetched and cached again."""
+    page_cache.put(make_page(content='old content', fetched_at=0))
+    patcher, _ = mock_client(make_response(text='new content', headers={'etag': '"v2"'}))
+
+    with patcher:
+        result = await read_documentation_impl(ctx, URL, 1000, 0, 'uuid')
+
+    assert 'new content' in result
+    page = page_cache.get(URL)
+    assert page is not None
+    assert (page.content, page.etag) == ('new content', '"v2"')
+
+
+@pytest.mark.asyncio
+async def test_stale_pages_are_served_when_the_server_is_unreachable(ctx):
+    """Test that a stale page is served when it cannot be revalidated."""
+    page_cache.put(make_page(content='cached content', fetched_at=0))
+    patcher, _ = mock_client(httpx.ConnectError('Connection error'))
+
+    with patcher:
+        result = await read_documentation_impl(ctx, URL, 1000, 0, 'uuid')
+
+    assert 'cached content' in result
+    ctx.error.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_errors_are_not_cached(ctx):
+    """Test that a failed fetch is retried by the next read."""
+    patcher, client = mock_client(
+        make_response(status_code=503), make_response(text='recovered content')
+    )
+
+    with patcher:
+        first = await read_documentation_impl(ctx, URL, 1000, 0, 'uuid')
+        second = await read_documentation_impl(ctx, URL, 1000, 0, 'uuid')
+
+    assert first == f'Failed to fetch {URL} - status code 503'
+    assert 'recovered content' in second
+    assert client.get.call_count == 2
@@ -0,0 +1,217 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for the prefetch crawler, against a guide served from a local HTTP server."""
+
+import asyncio
+import functools
+import httpx
+import os
+import pytest
+import threading
+from awslabs.aws_documentation_mcp_server.offline_store import OfflineStore
+from awslabs.aws_documentation_mcp_server.prefetch import (
+    get_guide_url,
+    get_toc_page_urls,
+    prefetch_guide,
+    prefetch_guides,
+)
+from awslabs.aws_documentation_mcp_server.server_utils import read_documentation_impl
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from mcp.server.fastmcp.server import Context
+from unittest.mock import MagicMock, patch
+
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), 'resources', 'offline_guide')
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    """Request handler serving files without logging every request."""
+
+    def log_message(self, format, *args):
+        """Do not log requests."""
+
+
+@pytest.fixture
+def docs_server():
+    """Serve the fixture guide tree from a local HTTP server, returning its root URL."""
+    server = ThreadingHTTPServer(
+        ('127.0.0.1', 0), functools.partial(QuietHandler, directory=FIXTURE_DIR)
+    )
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_address[1]}'
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Create an empty offline store."""
+    store = OfflineStore(str(tmp_path / 'docs.sqlite'))
+    yield store
+    store.close()
+
+
+class CountingTransport(httpx.AsyncHTTPTransport):
+    """Transport recording the largest number of requests in flight at the same time."""
+
+    def __init__(self):
+        """Initialize the transport with no request in flight."""
+        super().__init__()
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def handle_async_request(self, request):
+        """Send a request, counting it while it is in flight."""
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            # Give the other requests a chance to start
+            await asyncio.sleep(0.01)
+            return await super().handle_async_request(request)
+        finally:
+            self.in_flight -= 1
+
+
+def test_get_guide_url():
+    """Test that the guide of a page is its directory."""
+    assert (
+        get_guide_url('https://docs.aws.amazon.com/lambda/latest/dg/welcome.html#top')
+        == 'https://docs.aws.amazon.com/lambda/latest/dg/'
+    )
+    assert (
+        get_guide_url('https://docs.aws.amazon.com/lambda/latest/dg/')
+        == 'https://docs.aws.amazon.com/lambda/latest/dg/'
+    )
+
+
+def test_get_toc_page_urls():
+    """Test that nested entries are listed once, in order, without pages of other guides."""
+    guide_url = 'https://docs.aws.amazon.com/service/latest/guide/'
+    toc = {
+        'contents': [
+            {'title': 'Welcome', 'href': 'welcome.html'},
+            {
+                'title': 'Topic',
+                'contents': [
+                    {'title': 'Page', 'href': 'page.html#section'},
+                    {'title': 'Page again', 'href': 'page.html'},
+                    {'title': 'External', 'href': 'https://example.com/page.html'},
+                ],
+            },
+            {'title': 'Other guide', 'href': '../other/page.html'},
+            {'title': 'Archive', 'href': 'guide.pdf'},
+        ]
+    }
+
+    assert get_toc_page_urls(toc, guide_url) == [
+        f'{guide_url}welcome.html',
+        f'{guide_url}page.html',
+    ]
+    assert get_toc_page_urls([], guide_url) == []
+
+
+@pytest.mark.asyncio
+async def test_prefetch_guide(docs_server, store):
+    """Test that the pages of the table of contents are converted and stored."""
+    guide_url = f'{docs_server}/guide/'
+
+    result = await prefetch_guide(f'{guide_url}welcome.html', store)
+
+    assert result.guide_url == guide_url
+    assert result.pages == [
+        f'{guide_url}welcome.html',
+        f'{guide_url}getting-started.html',
+        f'{guide_url}create-resource.html',
+        f'{guide_url}quotas.html',
+    ]
+    assert result.failed == [f'{guide_url}delete-resource.html']
+    assert store.urls() == sorted(result.pages)
+    content = store.get(f'{guide_url}create-resource.html')
+    assert content is not None
+    assert 'Create a resource' in content
+    assert '`example create-resource`' in content
+    assert 'Previous and next pages' not in content
+    assert 'footer' not in content
+
+
+@pytest.mark.asyncio
+async def test_prefetch_bounds_concurrent_downloads(docs_server, store):
+    """Test that no more pages than the concurrency limit are downloaded at the same time."""
+    transport = CountingTransport()
+    async with httpx.AsyncClient(transport=transport) as client:
+        result = await prefetch_guide(
+            f'{docs_server}/guide/', store, max_concurrency=2, client=client
+        )
+
+    assert len(result.pages) == 4
+    assert transport.max_in_flight == 2
+
+
+@pytest.mark.asyncio
+async def test_prefetch_skips_stored_pages(docs_server, store):
+    """Test that stored pages are only downloaded again on refresh."""
+    guide_url = f'{docs_server}/guide/'
+    store.put(f'{guide_url}welcome.html', 'Stored welcome')
+
+    result = await prefetch_guide(guide_url, store)
+    assert result.skipped == [f'{guide_url}welcome.html']
+    assert store.get(f'{guide_url}welcome.html') == 'Stored welcome'
+
+    result = await prefetch_guide(guide_url, store, refresh=True)
+    assert result.skipped == []
+    assert store.get(f'{guide_url}welcome.html') != 'Stored welcome'
+
+
+@pytest.mark.asyncio
+async def test_prefetch_does_not_store_failed_conversions(docs_server, store):
+    """Test that pages failing to convert are reported as failed instead of stored."""
+    guide_url = f'{docs_server}/guide/'
+
+    with patch(
+        'awslabs.aws_documentation_mcp_server.prefetch.extract_content_from_html',
+        return_value='<e>Error converting HTML to Markdown: broken</e>',
+    ):
+        result = await prefetch_guide(guide_url, store)
+
+    assert result.pages == []
+    assert len(result.failed) == 5
+    assert store.urls() == []
+
+
+@pytest.mark.asyncio
+async def test_prefetch_guides_reports_missing_tables_of_contents(docs_server, store):
+    """Test that a guide without table of contents fails without stopping the others."""
+    results = await prefetch_guides([f'{docs_server}/other/', f'{docs_server}/guide/'], store)
+
+    assert results[0].failed == [f'{docs_server}/other/toc-contents.json']
+    assert results[0].pages == []
+    assert len(results[1].pages) == 4
+
+
+@pytest.mark.asyncio
+async def test_read_documentation_serves_prefetched_pages_offline(docs_server, store):
+    """Test that prefetched pages are read without the network."""
+    guide_url = f'{docs_server}/guide/'
+    await prefetch_guide(guide_url, store)
+    ctx = MagicMock(spec=Context)
+
+    with (
+        patch('awslabs.aws_documentation_mcp_server.server_utils.offline_store', store),
+        patch('httpx.AsyncClient.get', side_effect=httpx.ConnectError('offline')),
+    ):
+        result = await read_documentation_impl(ctx, f'{guide_url}quotas.html', 10000, 0, 'id')
+
+    assert 'An account has up to **100** resources.' in result
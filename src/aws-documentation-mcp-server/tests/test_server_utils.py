@@ -13,10 +13,13 @@
 # limitations under the License.
 """Tests for server utility functions in the AWS Documentation MCP Server."""
 
+import asyncio
 import httpx
 import pytest
 from awslabs.aws_documentation_mcp_server.server_utils import (
     DEFAULT_USER_AGENT,
+    HTTP2_AVAILABLE,
+    get_http_client,
     read_documentation_impl,
 )
 from mcp.server.fastmcp.server import Context
@@ -331,3 +334,52 @@ class TestVersionImport:
         mock_version.assert_called_once_with('awslabs.aws-documentation-mcp-server')
         assert version in server_utils.DEFAULT_USER_AGENT
         assert f'ModelContextProtocol/{version}' in server_utils.DEFAULT_USER_AGENT
+
+
+class TestHttpClient:
+    """Tests for the HTTP client shared by the requests of the server."""
+
+    @pytest.mark.asyncio
+    async def test_client_is_shared(self):
+        """Test that requests share a client until it is closed."""
+        client = get_http_client()
+
+        assert get_http_client() is client
+        await client.aclose()
+        assert get_http_client() is not client
+
+    def test_client_per_event_loop(self):
+        """Test that a client is not used from another event loop than its own."""
+
+        async def get_client():
+            return get_http_client()
+
+        first = asyncio.run(get_client())
+        second = asyncio.run(get_client())
+
+        assert first is not second
+
+    @pytest.mark.asyncio
+    async def test_reads_reuse_the_client(self):
+        """Test that reading several pages creates a single client."""
+        ctx = MagicMock(spec=Context)
+        ctx.error = AsyncMock()
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.text = 'Plain text content'
+        mock_response.headers = {'content-type': 'text/plain'}
+
+        with patch('httpx.AsyncClient') as mock_client_class:
+            mock_client = MagicMock()
+            mock_client.is_closed = False
+            mock_client.get = AsyncMock(return_value=mock_response)
+            mock_client_class.return_value = mock_client
+
+            for page in ('a', 'b', 'c'):
+                await read_documentation_impl(
+                    ctx, f'https://docs.aws.amazon.com/{page}.html', 1000, 0, 'test-uuid'
+                )
+
+        assert mock_client_class.call_count == 1
+        assert mock_client.get.call_count == 3
+        assert mock_client_class.call_args.kwargs['http2'] is HTTP2_AVAILABLE
@@ -14,13 +14,15 @@
 """Tests for utility functions in the AWS Documentation MCP Server."""
 
 import os
+import pytest
 from awslabs.aws_documentation_mcp_server.util import (
     extract_content_from_html,
     format_documentation_result,
     is_html_content,
     parse_recommendation_results,
+    selector_to_xpath,
 )
-from unittest.mock import MagicMock, patch
+from unittest.mock import patch
 
 
 class TestIsHtmlContent:
@@ -123,23 +125,11 @@ class TestFormatDocumentationResult:
 class TestExtractContentFromHtml:
     """Tests for extract_content_from_html function."""
 
-    @patch('bs4.BeautifulSoup')
-    @patch('markdownify.markdownify')
-    def test_successful_extraction(self, mock_markdownify, mock_soup):
-        """Test successful HTML content extraction."""
-        # Setup mocks
-        mock_soup_instance = mock_soup.return_value
-        mock_soup_instance.body = mock_soup_instance
-        mock_soup_instance.select_one.return_value = None  # No main content found
-        mock_markdownify.return_value = 'Test content'
-
-        # Call function
+    def test_successful_extraction(self):
+        """Test successful HTML content extraction from the body without main content."""
         result = extract_content_from_html('<html><body><p>Test content</p></body></html>')
 
-        # Assertions
-        assert 'Test content' in result
-        mock_soup.assert_called_once()
-        mock_markdownify.assert_called_once()
+        assert result == 'Test content'
 
     @patch('bs4.BeautifulSoup')
     def test_empty_content(self, mock_soup):
@@ -219,26 +209,67 @@ class TestExtractContentFromHtml:
     def test_extract_content_from_html(self):
         """Test extracting content from HTML."""
         html = '<html><body><h1>Test</h1><p>This is a test.</p></body></html>'
-        with patch('bs4.BeautifulSoup') as mock_bs:
-            mock_soup = MagicMock()
-            mock_bs.return_value = mock_soup
-            with patch('markdownify.markdownify') as mock_markdownify:
-                mock_markdownify.return_value = '# Test\n\nThis is a test.'
-                result = extract_content_from_html(html)
-                assert result == '# Test\n\nThis is a test.'
-                mock_bs.assert_called_once()
-                mock_markdownify.assert_called_once()
+
+        assert extract_content_from_html(html) == '# Test\n\nThis is a test.'
 
     def test_extract_content_from_html_no_content(self):
         """Test extracting content from HTML with no content."""
-        html = '<html><body></body></html>'
-        with patch('bs4.BeautifulSoup') as mock_bs:
-            mock_soup = MagicMock()
-            mock_bs.return_value = mock_soup
-            mock_soup.body = None
-            result = extract_content_from_html(html)
-            assert '<e>' in result
-            mock_bs.assert_called_once()
+        result = extract_content_from_html('<html><body></body></html>')
+
+        assert result == '<e>Page failed to be simplified from HTML</e>'
+
+    def test_extract_main_content_without_navigation(self):
+        """Test that only the main content is converted, without navigation elements."""
+        html = (
+            '<html><body><div id="sidebar">Sidebar</div>'
+            '<div class="awsdocs main-content"><h2>Title</h2><noscript>Enable JS</noscript>'
+            'Kept<div class="prev-next"><a href="/next">Next</a></div> text'
+            '<awsdocs-copyright>Copyright</awsdocs-copyright></div>'
+            '<main>Later main</main></body></html>'
+        )
+
+        result = extract_content_from_html(html)
+
+        assert result == 'Later main'
+        html = html.replace('<main>Later main</main>', '')
+        assert extract_content_from_html(html) == '## Title\n\nKept text'
+
+    def test_extract_content_with_xml_declaration(self):
+        """Test that pages starting with an XML declaration are converted."""
+        html = (
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<html><head><meta charset="iso-8859-1"></head><body><p>hi é</p></body></html>'
+        )
+
+        assert extract_content_from_html(html) == 'hi é'
+
+    def test_conversion_error(self):
+        """Test that a conversion error is returned as an error message."""
+        with patch(
+            'awslabs.aws_documentation_mcp_server.util.MARKDOWN_CONVERTER.convert_soup',
+            side_effect=RuntimeError('broken'),
+        ):
+            result = extract_content_from_html('<html><body><p>Test</p></body></html>')
+
+        assert result == '<e>Error converting HTML to Markdown: broken</e>'
+
+
+class TestSelectorToXpath:
+    """Tests for selector_to_xpath function."""
+
+    def test_selectors(self):
+        """Test translation of the supported selectors."""
+        assert selector_to_xpath('main') == './/main'
+        assert selector_to_xpath('#content') == ".//*[@id='content']"
+        assert selector_to_xpath('.content') == (
+            ".//*[contains(concat(' ', normalize-space(@class), ' '), ' content ')]"
+        )
+        assert selector_to_xpath("div[role='main']") == ".//div[@role='main']"
+
+    def test_unsupported_selector(self):
+        """Test that selectors that cannot be translated are rejected."""
+        with pytest.raises(ValueError):
+            selector_to_xpath('div > p')
 
 
 class TestParseRecommendationResults:
@@ -18,8 +18,10 @@ This module provides functionality for analyzing CDK projects to identify AWS se
 and their configurations.
 """
 
+import asyncio
 import logging
 import re
+from awslabs.aws_pricing_mcp_server.project_scanner import analyze_files, find_source_files
 from pathlib import Path
 from typing import Any, Dict, List
 
@@ -151,22 +153,21 @@ class CDKAnalyzer:
 
         all_services = []
 
-        # Get all Python and TypeScript files in the project
-        source_files = list(self.project_path.rglob('*.py')) + list(
-            self.project_path.rglob('*.ts')
+        # Get all Python and TypeScript files in the project, skipping node_modules and cdk.out
+        source_files = [
+            file_path
+            for file_path in find_source_files(self.project_path, ('.py', '.ts'))
+            if file_path.name != '__init__.py'
+        ]
+        logger.info(f'Found {len(source_files)} source files')
+
+        analyzed_files = await asyncio.to_thread(
+            analyze_files, source_files, self._analyze_file, 'cdk'
         )
-        logger.info(f'Found source files: {source_files}')
-
-        for file_path in source_files:
-            if file_path.name != '__init__.py':
-                logger.info(f'Analyzing file: {file_path}')
-                try:
-                    file_services = self._analyze_file(file_path)
-                    if file_services:
-                        logger.info(f'Found services in {file_path}: {file_services}')
-                        all_services.extend(file_services)
-                except Exception as e:
-                    logger.error(f'Error analyzing {file_path}: {e}')
+        for file_path, file_services in analyzed_files:
+            if file_services:
+                logger.info(f'Found services in {file_path}: {file_services}')
+                all_services.extend(file_services)
 
         # Deduplicate services by name
         seen_services = set()
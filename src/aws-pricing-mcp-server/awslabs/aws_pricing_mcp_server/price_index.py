@@ -0,0 +1,678 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""awslabs MCP AWS Pricing mcp server local price index.
+
+This module builds a local index from the bulk Price List offer files, and answers
+``get_pricing`` queries from it without calling the AWS Pricing API.
+
+An offer file is streamed, never loaded whole, and indexed as one partition per service
+and region. A partition stores every product attribute as a dictionary-encoded column and
+every product as its compressed Price List record, so that a query evaluates its filters
+on the columns and only decodes the records it returns.
+"""
+
+import argparse
+import codecs
+import json
+import mmap
+import os
+import re
+import shutil
+import sqlite3
+import tempfile
+import threading
+import urllib.request
+import zlib
+from array import array
+from awslabs.aws_pricing_mcp_server import consts
+from awslabs.aws_pricing_mcp_server.models import PricingFilter
+from awslabs.aws_pricing_mcp_server.pricing_client import (
+    get_currency_for_region,
+    get_pricing_client,
+)
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from loguru import logger
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Union
+
+
+# Bytes of an offer file read at a time
+INDEX_READ_CHUNK_SIZE = 1024 * 1024
+
+# Seconds to wait for the download of an offer file to start or continue
+INDEX_DOWNLOAD_TIMEOUT_SECONDS = 60
+
+# zlib level of the indexed Price List records
+INDEX_COMPRESSION_LEVEL = 6
+
+# Products spilled to disk at a time while an offer file is streamed
+INDEX_SPILL_BATCH_SIZE = 10000
+
+# Prefix of the pagination tokens of the index, telling them apart from API tokens
+INDEX_NEXT_TOKEN_PREFIX = 'index:'
+
+# Partition of the products that have no region
+INDEX_GLOBAL_REGION = 'global'
+
+# Product fields indexed as columns besides the product attributes
+INDEX_PRODUCT_FIELDS = ('productFamily',)
+
+_META_FILE = 'meta.json'
+_COLUMNS_FILE = 'columns.bin'
+_OFFSETS_FILE = 'offsets.bin'
+_RECORDS_FILE = 'records.bin'
+
+_NAME_PATTERN = re.compile(r'^[A-Za-z0-9][A-Za-z0-9._-]*$')
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+
+@dataclass
+class IndexedPartition:
+    """Partition of the index written from an offer file."""
+
+    service_code: str
+    region: str
+    products: int
+    publication_date: Optional[str]
+
+
+class OfferFileReader:
+    """Incremental reader of the JSON of an offer file, one member at a time.
+
+    Objects are iterated key by key with ``iter_object``, and the values of the keys are
+    read with ``read_value``, so that only one product or one term group of a product is
+    decoded at a time.
+    """
+
+    def __init__(self, chunks: Iterable[str]):
+        """Initialize a reader.
+
+        Args:
+            chunks: Text of the offer file, in chunks of any size
+        """
+        self._chunks = iter(chunks)
+        self._buffer = ''
+        self._pos = 0
+        self._decoder = json.JSONDecoder()
+
+    def read_value(self) -> Any:
+        """Read the JSON value at the current position.
+
+        Returns:
+            Decoded value
+
+        Raises:
+            ValueError: If the offer file is not valid JSON
+        """
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if not self._read_chunk():
+                    raise
+                continue
+            # A number at the end of the buffer may continue in the next chunk
+            if end == len(self._buffer) and self._read_chunk():
+                continue
+            self._pos = end
+            return value
+
+    def iter_object(self) -> Iterator[str]:
+        """Iterate over the keys of the object at the current position.
+
+        The value of each key must be read, with ``read_value`` or ``iter_object``, before
+        asking for the next key.
+
+        Yields:
+            Keys of the object, in order
+
+        Raises:
+            ValueError: If the offer file is not valid JSON
+        """
+        self._expect('{')
+        if self._peek() == '}':
+            self._pos += 1
+            return
+        while True:
+            if self._peek() != '"':
+                raise ValueError('Expected a key in the offer file')
+            key = self.read_value()
+            self._expect(':')
+            yield key
+            char = self._peek()
+            self._pos += 1
+            if char == '}':
+                return
+            if char != ',':
+                raise ValueError(f"Expected ',' or '}}' in the offer file, found {char!r}")
+
+    def _read_chunk(self) -> bool:
+        for chunk in self._chunks:
+            if chunk:
+                self._buffer = self._buffer[self._pos :] + chunk
+                self._pos = 0
+                return True
+        return False
+
+    def _peek(self) -> str:
+        while True:
+            match = _WHITESPACE.match(self._buffer, self._pos)
+            self._pos = match.end() if match else self._pos
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._read_chunk():
+                raise ValueError('Unexpected end of the offer file')
+
+    def _expect(self, char: str):
+        found = self._peek()
+        if found != char:
+            raise ValueError(f'Expected {char!r} in the offer file, found {found!r}')
+        self._pos += 1
+
+
+def read_offer_file(source: str, chunk_size: int = INDEX_READ_CHUNK_SIZE) -> Iterator[str]:
+    """Read an offer file chunk by chunk, from a URL or a local path.
+
+    Args:
+        source: HTTPS URL of the offer file, as returned by get_price_list_urls, or local path
+        chunk_size: Bytes read at a time
+
+    Yields:
+        Text of the offer file, in chunks
+    """
+    if source.startswith('https://'):
+        stream = urllib.request.urlopen(source, timeout=INDEX_DOWNLOAD_TIMEOUT_SECONDS)  # nosec B310
+    else:
+        stream = open(source, 'rb')
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    with stream:
+        while chunk := stream.read(chunk_size):
+            yield decoder.decode(chunk)
+    yield decoder.decode(b'', final=True)
+
+
+def _check_name(name: str) -> str:
+    if not _NAME_PATTERN.match(name):
+        raise ValueError(f'Invalid service code or region for the price index: {name!r}')
+    return name
+
+
+def _spill_offer_file(reader: OfferFileReader, spill: sqlite3.Connection, region: Optional[str]):
+    """Stream the products and terms of an offer file into a spill database.
+
+    Products come before terms in an offer file, and the terms of a product are spread
+    over the term types, so both are spilled to disk to be joined by SKU afterwards.
+    """
+    header = {}
+    rows = []
+    for key in reader.iter_object():
+        if key == 'products':
+            for _ in reader.iter_object():
+                product = reader.read_value()
+                attributes = product.get('attributes') or {}
+                rows.append(
+                    (
+                        product['sku'],
+                        attributes.get('regionCode') or region or INDEX_GLOBAL_REGION,
+                        json.dumps(product, separators=(',', ':')),
+                    )
+                )
+                if len(rows) >= INDEX_SPILL_BATCH_SIZE:
+                    spill.executemany('INSERT INTO products VALUES (NULL, ?, ?, ?)', rows)
+                    rows.clear()
+            spill.executemany('INSERT INTO products VALUES (NULL, ?, ?, ?)', rows)
+            rows.clear()
+        elif key == 'terms':
+            for term_type in reader.iter_object():
+                for sku in reader.iter_object():
+                    rows.append(
+                        (sku, term_type, json.dumps(reader.read_value(), separators=(',', ':')))
+                    )
+                    if len(rows) >= INDEX_SPILL_BATCH_SIZE:
+                        spill.executemany('INSERT INTO terms VALUES (?, ?, ?)', rows)
+                        rows.clear()
+            spill.executemany('INSERT INTO terms VALUES (?, ?, ?)', rows)
+            rows.clear()
+        else:
+            header[key] = reader.read_value()
+    spill.execute('CREATE INDEX terms_sku ON terms (sku)')
+    return header
+
+
+def _write_partition(
+    spill: sqlite3.Connection,
+    directory: str,
+    service_code: str,
+    region: str,
+    header: Dict[str, Any],
+) -> int:
+    """Write the partition of a region from the spill database.
+
+    Returns:
+        Number of products in the partition
+    """
+    record_tail = ',"version":{},"publicationDate":{}}}'.format(
+        json.dumps(header.get('version')), json.dumps(header.get('publicationDate'))
+    )
+    record_head = '{"product":'
+    service = f',"serviceCode":{json.dumps(service_code)},"terms":{{'
+    dictionaries: Dict[str, Dict[str, int]] = {}
+    columns: Dict[str, array] = {}
+    offsets = array('Q', [0])
+    terms_cursor = spill.cursor()
+    count = 0
+    with open(os.path.join(directory, _RECORDS_FILE), 'wb') as records:
+        for sku, product_json in spill.execute(
+            'SELECT sku, product FROM products WHERE region = ? ORDER BY row', (region,)
+        ):
+            product = json.loads(product_json)
+            values = dict(product.get('attributes') or {})
+            values.update(
+                {field: product[field] for field in INDEX_PRODUCT_FIELDS if field in product}
+            )
+            for name, value in values.items():
+                if not isinstance(value, str):
+                    continue
+                column = columns.get(name)
+                if column is None:
+                    column = columns[name] = array('I', bytes(4 * count))
+                    dictionaries[name] = {}
+                dictionary = dictionaries[name]
+                code = dictionary.setdefault(value, len(dictionary) + 1)
+                column.extend([0] * (count - len(column)))
+                column.append(code)
+
+            terms = ','.join(
+                f'{json.dumps(term_type)}:{term_json}'
+                for term_type, term_json in terms_cursor.execute(
+                    'SELECT term_type, terms FROM terms WHERE sku = ?', (sku,)
+                )
+            )
+            record = f'{record_head}{product_json}{service}{terms}}}{record_tail}'
+            records.write(zlib.compress(record.encode('utf-8'), INDEX_COMPRESSION_LEVEL))
+            offsets.append(records.tell())
+            count += 1
+
+    meta_columns = {}
+    with open(os.path.join(directory, _COLUMNS_FILE), 'wb') as columns_file:
+        for name, column in columns.items():
+            column.extend([0] * (count - len(column)))
+            meta_columns[name] = {
+                'offset': columns_file.tell(),
+                'values': list(dictionaries[name]),
+            }
+            column.tofile(columns_file)
+    with open(os.path.join(directory, _OFFSETS_FILE), 'wb') as offsets_file:
+        offsets.tofile(offsets_file)
+    meta = {
+        'service_code': service_code,
+        'region': region,
+        'version': header.get('version'),
+        'publication_date': header.get('publicationDate'),
+        'products': count,
+        'columns': meta_columns,
+    }
+    with open(os.path.join(directory, _META_FILE), 'w') as meta_file:
+        json.dump(meta, meta_file)
+    return count
+
+
+def _replace_directory(source: str, target: str):
+    """Move a directory in place of another, so readers never see a partial partition."""
+    if not os.path.exists(target):
+        os.replace(source, target)
+        return
+    previous = tempfile.mkdtemp(dir=os.path.dirname(target), prefix='.previous-')
+    os.replace(target, os.path.join(previous, 'partition'))
+    os.replace(source, target)
+    shutil.rmtree(previous, ignore_errors=True)
+
+
+def build_price_index(
+    chunks: Iterable[str], index_dir: str, region: Optional[str] = None
+) -> List[IndexedPartition]:
+    """Index an offer file, replacing the partitions of its service and regions.
+
+    Args:
+        chunks: Text of the offer file, in chunks, as read by read_offer_file
+        index_dir: Directory of the index
+        region: Region of the products without a regionCode attribute, global by default
+
+    Returns:
+        Partitions written, one per region of the offer file
+
+    Raises:
+        ValueError: If the offer file is not valid JSON or has no offer code
+    """
+    os.makedirs(index_dir, exist_ok=True)
+    with tempfile.TemporaryDirectory(dir=index_dir, prefix='.build-') as build_dir:
+        spill = sqlite3.connect(os.path.join(build_dir, 'spill.sqlite'))
+        try:
+            spill.execute('PRAGMA journal_mode = OFF')
+            spill.execute('PRAGMA synchronous = OFF')
+            spill.execute(
+                'CREATE TABLE products '
+                '(row INTEGER PRIMARY KEY, sku TEXT, region TEXT, product TEXT)'
+            )
+            spill.execute('CREATE TABLE terms (sku TEXT, term_type TEXT, terms TEXT)')
+            header = _spill_offer_file(OfferFileReader(chunks), spill, region)
+            service_code = header.get('offerCode')
+            if not isinstance(service_code, str):
+                raise ValueError('The offer file has no offerCode')
+            service_dir = os.path.join(index_dir, _check_name(service_code))
+            os.makedirs(service_dir, exist_ok=True)
+
+            partitions = []
+            regions = [row[0] for row in spill.execute('SELECT DISTINCT region FROM products')]
+            for partition_region in sorted(regions):
+                partition_dir = tempfile.mkdtemp(dir=service_dir, prefix='.build-')
+                try:
+                    count = _write_partition(
+                        spill, partition_dir, service_code, partition_region, header
+                    )
+                    _replace_directory(
+                        partition_dir, os.path.join(service_dir, _check_name(partition_region))
+                    )
+                except BaseException:
+                    shutil.rmtree(partition_dir, ignore_errors=True)
+                    raise
+                logger.info(f'Indexed {count} products of {service_code} in {partition_region}')
+                partitions.append(
+                    IndexedPartition(
+                        service_code=service_code,
+                        region=partition_region,
+                        products=count,
+                        publication_date=header.get('publicationDate'),
+                    )
+                )
+        finally:
+            spill.close()
+    return partitions
+
+
+def _matching_codes(pricing_filter: PricingFilter, values: List[str]) -> Set[int]:
+    """Get the codes of the dictionary values of a column matching a filter.
+
+    Values are compared without case. Code 0 stands for products without the attribute,
+    which only match NONE_OF filters.
+    """
+    filter_type = pricing_filter.type.upper()
+    value = pricing_filter.value
+    if filter_type in ('ANY_OF', 'NONE_OF'):
+        expected = value if isinstance(value, list) else value.split(',')
+    else:
+        expected = [','.join(value) if isinstance(value, list) else value]
+    expected = [item.strip().casefold() for item in expected]
+
+    if filter_type in ('EQUALS', 'TERM_MATCH', 'ANY_OF'):
+        wanted = set(expected)
+        return {code for code, item in enumerate(values, 1) if item.casefold() in wanted}
+    if filter_type == 'CONTAINS':
+        return {code for code, item in enumerate(values, 1) if expected[0] in item.casefold()}
+    if filter_type == 'NONE_OF':
+        excluded = set(expected)
+        return {0} | {
+            code for code, item in enumerate(values, 1) if item.casefold() not in excluded
+        }
+    raise ValueError(f'Unsupported filter type for the price index: {pricing_filter.type}')
+
+
+class _Partition:
+    """Partition of the index opened for queries."""
+
+    def __init__(self, directory: str):
+        with open(os.path.join(directory, _META_FILE)) as meta_file:
+            meta = json.load(meta_file)
+        self.size: int = meta['products']
+        self.values: Dict[str, List[str]] = {
+            name: column['values'] for name, column in meta['columns'].items()
+        }
+        self.columns: Dict[str, array] = {}
+        with open(os.path.join(directory, _COLUMNS_FILE), 'rb') as columns_file:
+            for name, column in meta['columns'].items():
+                codes = array('I')
+                columns_file.seek(column['offset'])
+                codes.fromfile(columns_file, self.size)
+                self.columns[name] = codes
+        self.offsets = array('Q')
+        with open(os.path.join(directory, _OFFSETS_FILE), 'rb') as offsets_file:
+            self.offsets.fromfile(offsets_file, self.size + 1)
+        self._postings: Dict[str, Dict[int, List[int]]] = {}
+        self._records: Optional[mmap.mmap] = None
+        if self.size:
+            with open(os.path.join(directory, _RECORDS_FILE), 'rb') as records_file:
+                self._records = mmap.mmap(records_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def postings(self, name: str) -> Dict[int, List[int]]:
+        """Get the rows of each code of a column, built on first use."""
+        postings = self._postings.get(name)
+        if postings is None:
+            postings = {}
+            for row, code in enumerate(self.columns[name]):
+                postings.setdefault(code, []).append(row)
+            self._postings[name] = postings
+        return postings
+
+    def match(self, filters: List[PricingFilter]) -> List[int]:
+        """Get the rows of the products matching all filters, in order.
+
+        The most selective filter gives the candidate rows from the postings of its
+        column, and the other filters are checked on the columns of the candidates.
+        """
+        plans = []
+        for pricing_filter in filters:
+            codes = _matching_codes(pricing_filter, self.values.get(pricing_filter.field, []))
+            if pricing_filter.field not in self.columns:
+                if 0 in codes:
+                    continue
+                return []
+            postings = self.postings(pricing_filter.field)
+            plans.append(
+                (sum(len(postings.get(code, ())) for code in codes), pricing_filter.field, codes)
+            )
+        if not plans:
+            return list(range(self.size))
+
+        plans.sort(key=lambda plan: plan[0])
+        _, name, codes = plans[0]
+        postings = self.postings(name)
+        rows = sorted(row for code in codes for row in postings.get(code, ()))
+        for _, name, codes in plans[1:]:
+            column = self.columns[name]
+            rows = [row for row in rows if column[row] in codes]
+        return rows
+
+    def record(self, row: int) -> str:
+        """Get the Price List record of a row, as returned by the Pricing API."""
+        assert self._records is not None
+        data = self._records[self.offsets[row] : self.offsets[row + 1]]
+        return zlib.decompress(data).decode('utf-8')
+
+
+class PriceIndex:
+    """Local price index, answering get_products queries for the indexed partitions."""
+
+    def __init__(self, directory: Optional[str]):
+        """Initialize an index, whose partitions are opened on first use.
+
+        Args:
+            directory: Directory of the index, or None for a disabled index without partitions
+        """
+        self.directory = directory
+        self._partitions: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+
+    def has(self, service_code: str, region: Union[str, List[str]]) -> bool:
+        """Check whether the index has the partitions of a service in all regions.
+
+        Args:
+            service_code: Service code
+            region: Region, or list of regions
+
+        Returns:
+            True if every region of the service is indexed
+        """
+        regions = region if isinstance(region, list) else [region]
+        return bool(regions) and all(
+            self._partition_dir(service_code, name) is not None for name in regions
+        )
+
+    def get_products(
+        self,
+        service_code: str,
+        region: Union[str, List[str]],
+        filters: Optional[List[PricingFilter]] = None,
+        max_results: int = 100,
+        next_token: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Get the products of a service matching filters, like the GetProducts API.
+
+        Args:
+            service_code: Service code
+            region: Region, or list of regions
+            filters: Filters on the product attributes
+            max_results: Maximum number of products returned
+            next_token: Pagination token of a previous response of the index
+
+        Returns:
+            Dictionary with the PriceList records of the page, and a NextToken when more
+            products match
+
+        Raises:
+            ValueError: If a partition is missing, or a filter or the token is invalid
+        """
+        offset = 0
+        if next_token:
+            token = next_token.removeprefix(INDEX_NEXT_TOKEN_PREFIX)
+            if token == next_token or not token.isdigit():
+                raise ValueError(f'Invalid pagination token for the price index: {next_token}')
+            offset = int(token)
+
+        regions = region if isinstance(region, list) else [region]
+        page = []
+        total = 0
+        for name in regions:
+            partition = self._open(service_code, name)
+            rows = partition.match(filters or [])
+            start = max(offset - total, 0)
+            for row in rows[start : start + max_results - len(page)]:
+                page.append(partition.record(row))
+            total += len(rows)
+
+        response: Dict[str, Any] = {'PriceList': page, 'FormatVersion': 'aws_v1'}
+        if offset + max_results < total:
+            response['NextToken'] = f'{INDEX_NEXT_TOKEN_PREFIX}{offset + max_results}'
+        return response
+
+    def _partition_dir(self, service_code: str, region: str) -> Optional[str]:
+        if not self.directory:
+            return None
+        if not (_NAME_PATTERN.match(service_code) and _NAME_PATTERN.match(region)):
+            return None
+        directory = os.path.join(self.directory, service_code, region)
+        return directory if os.path.isfile(os.path.join(directory, _META_FILE)) else None
+
+    def _open(self, service_code: str, region: str) -> _Partition:
+        directory = self._partition_dir(service_code, region)
+        if directory is None:
+            raise ValueError(f'{service_code} in {region} is not in the price index')
+        # A rebuilt partition has a new meta file, and is opened again
+        version = os.stat(os.path.join(directory, _META_FILE)).st_mtime_ns
+        with self._lock:
+            cached = self._partitions.get(directory)
+            if cached is None or cached[0] != version:
+                logger.debug(f'Opening price index partition {directory}')
+                cached = self._partitions[directory] = (version, _Partition(directory))
+            return cached[1]
+
+
+def get_offer_file_url(service_code: str, region: str) -> str:
+    """Get the URL of the current JSON offer file of a service in a region.
+
+    Args:
+        service_code: Service code
+        region: Region
+
+    Returns:
+        URL of the offer file
+
+    Raises:
+        ValueError: If the service has no price list in the region
+    """
+    pricing_client = get_pricing_client()
+    price_lists = pricing_client.list_price_lists(
+        ServiceCode=service_code,
+        EffectiveDate=datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M'),
+        RegionCode=region,
+        CurrencyCode=get_currency_for_region(region),
+    ).get('PriceLists', [])
+    if not price_lists:
+        raise ValueError(f'No price list found for {service_code} in {region}')
+    url = pricing_client.get_price_list_file_url(
+        PriceListArn=price_lists[0]['PriceListArn'], FileFormat='JSON'
+    ).get('Url')
+    if not url:
+        raise ValueError(f'No JSON price list file found for {service_code} in {region}')
+    return url
+
+
+price_index = PriceIndex(consts.PRICING_INDEX_DIR)
+
+
+def main():
+    """Build the local price index from offer files."""
+    parser = argparse.ArgumentParser(
+        description='Index AWS bulk Price List offer files for get_pricing to answer locally'
+    )
+    parser.add_argument(
+        'sources',
+        nargs='*',
+        help='Local paths or HTTPS URLs of JSON offer files, as returned by get_price_list_urls',
+    )
+    parser.add_argument(
+        '--service',
+        help='Service code whose current offer files are downloaded, for each --region',
+    )
+    parser.add_argument(
+        '--region',
+        action='append',
+        default=[],
+        help='Region of the offer file of --service, can be repeated',
+    )
+    parser.add_argument(
+        '--index-dir',
+        default=consts.PRICING_INDEX_DIR,
+        help='Directory of the price index, PRICING_INDEX_DIR by default',
+    )
+    args = parser.parse_args()
+    if not args.index_dir:
+        parser.error('--index-dir is required when PRICING_INDEX_DIR is not set')
+    if bool(args.service) != bool(args.region):
+        parser.error('--service and --region must be used together')
+    if not args.sources and not args.service:
+        parser.error('give offer files, or --service and --region')
+
+    sources = [(source, None) for source in args.sources]
+    sources.extend((get_offer_file_url(args.service, region), region) for region in args.region)
+    for source, region in sources:
+        for partition in build_price_index(read_offer_file(source), args.index_dir, region):
+            print(
+                f'{partition.service_code} in {partition.region}: {partition.products} products, '
+                f'published {partition.publication_date}'
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,161 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""awslabs MCP AWS Pricing mcp server discovery cache.
+
+This module caches the results of the discovery calls of the Pricing API, service codes,
+service attributes and attribute values, which change at most daily.
+
+Entries younger than the TTL are served as they are. Older entries are still served, up
+to a maximum age, while a refresh runs in the background, so that callers only wait for
+the API on a miss. Entries are kept in memory, and in a SQLite file when a path is set
+so that they outlive the server process.
+"""
+
+import json
+import time
+from awslabs.aws_pricing_mcp_server import consts
+from awslabs.aws_pricing_mcp_server.pricing_client import get_pricing_region, pricing_executor
+from awslabs.aws_pricing_mcp_server.sqlite_cache import SQLiteCache
+from concurrent.futures import Executor
+from loguru import logger
+from typing import Any, Callable, Optional, Set, Tuple
+
+
+# Seconds before a cached entry is refreshed in the background
+PRICING_CACHE_TTL_SECONDS = 12 * 60 * 60
+
+# Seconds after which a cached entry is no longer served, and is fetched again
+PRICING_CACHE_MAX_AGE_SECONDS = 7 * 24 * 60 * 60
+
+
+class PricingCache(SQLiteCache[str, Tuple[float, Any]]):
+    """TTL cache of Pricing API results with background refresh, optionally on disk."""
+
+    description = 'pricing cache'
+    table = 'entries'
+    schema = (
+        'CREATE TABLE IF NOT EXISTS entries '
+        '(key TEXT PRIMARY KEY, value TEXT NOT NULL, fetched_at REAL NOT NULL)'
+    )
+
+    def __init__(
+        self,
+        path: Optional[str],
+        namespace: str = '',
+        ttl: float = PRICING_CACHE_TTL_SECONDS,
+        max_age: float = PRICING_CACHE_MAX_AGE_SECONDS,
+        executor: Optional[Executor] = None,
+    ):
+        """Initialize a cache, whose file is opened on first use.
+
+        Args:
+            path: Path of the SQLite file, or None to keep the entries in memory only
+            namespace: Prefix of the keys, telling apart the results of different partitions
+            ttl: Seconds before an entry is refreshed in the background
+            max_age: Seconds after which an entry is fetched again before being served
+            executor: Executor of the background refreshes, the pricing thread pool by default
+        """
+        super().__init__(path)
+        self.namespace = namespace
+        self.ttl = ttl
+        self.max_age = max_age
+        self._executor = executor or pricing_executor
+        self._refreshing: Set[str] = set()
+
+    def get(self, key: str, fetch: Callable[[], Any]) -> Any:
+        """Get the cached result of a call, fetching it when missing or too old.
+
+        Results are shared between callers, which must not change them. Empty results
+        are not cached, so that a service or attribute added later is found.
+
+        Args:
+            key: Key of the call
+            fetch: Function making the call
+
+        Returns:
+            Result of the call
+
+        Raises:
+            Exception: Any exception of fetch, when the result has to be fetched
+        """
+        key = f'{self.namespace}/{key}'
+        entry = self._load(key)
+        if entry is not None:
+            fetched_at, value = entry
+            age = time.time() - fetched_at
+            if age < self.ttl:
+                return value
+            if age < self.max_age:
+                self._refresh_in_background(key, fetch)
+                return value
+        return self._fetch(key, fetch)
+
+    def _fetch(self, key: str, fetch: Callable[[], Any]) -> Any:
+        value = fetch()
+        if value:
+            self._store(key, value)
+        return value
+
+    def _refresh_in_background(self, key: str, fetch: Callable[[], Any]):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+        self._executor.submit(self._refresh, key, fetch)
+
+    def _refresh(self, key: str, fetch: Callable[[], Any]):
+        try:
+            self._fetch(key, fetch)
+            logger.debug(f'Refreshed cached pricing data {key}')
+        except Exception as e:
+            # The cached entry is served until the next refresh succeeds
+            logger.warning(f'Failed to refresh cached pricing data {key}: {e}')
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def _load(self, key: str) -> Optional[Tuple[float, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None:
+            return entry
+        connection = self._connect()
+        if connection is None:
+            return None
+        with self._lock:
+            row = connection.execute(
+                'SELECT fetched_at, value FROM entries WHERE key = ?', (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        entry = (row[0], json.loads(row[1]))
+        with self._lock:
+            self._entries.setdefault(key, entry)
+        return entry
+
+    def _store(self, key: str, value: Any):
+        entry = (time.time(), value)
+        connection = self._connect()
+        with self._lock:
+            self._entries[key] = entry
+            if connection is not None:
+                with connection:
+                    connection.execute(
+                        'INSERT OR REPLACE INTO entries (key, value, fetched_at) VALUES (?, ?, ?)',
+                        (key, json.dumps(value), entry[0]),
+                    )
+
+
+# Results are kept per pricing endpoint, as the China partition has its own services
+pricing_cache = PricingCache(consts.PRICING_CACHE_PATH, namespace=get_pricing_region())
@@ -19,8 +19,10 @@ This module provides utilities for creating boto3 pricing clients.
 
 import boto3
 import sys
+import threading
 from awslabs.aws_pricing_mcp_server import __version__, consts
 from botocore.config import Config
+from concurrent.futures import ThreadPoolExecutor
 from loguru import logger
 from typing import Any, Optional
 
@@ -29,6 +31,17 @@ from typing import Any, Optional
 logger.remove()
 logger.add(sys.stderr, level=consts.LOG_LEVEL)
 
+# Maximum number of Pricing API calls made at the same time, within the connection pool
+PRICING_MAX_WORKERS = 8
+
+# Thread pool running the blocking Pricing API calls of the tools
+pricing_executor = ThreadPoolExecutor(
+    max_workers=PRICING_MAX_WORKERS, thread_name_prefix='pricing'
+)
+
+_shared_client: Optional[Any] = None
+_shared_client_lock = threading.Lock()
+
 
 def get_pricing_region(requested_region: Optional[str] = None) -> str:
     """Determine the appropriate AWS Pricing API region.
@@ -99,6 +112,7 @@ def create_pricing_client(profile: Optional[str] = None, region: Optional[str] =
     config = Config(
         region_name=pricing_region,
         user_agent_extra=f'awslabs/mcp/{consts.MCP_SERVER_NAME}/{__version__}',
+        max_pool_connections=PRICING_MAX_WORKERS,
     )
 
     logger.debug(
@@ -107,6 +121,29 @@ def create_pricing_client(profile: Optional[str] = None, region: Optional[str] =
     return session.client('pricing', config=config, endpoint_url=consts.PRICING_ENDPOINT)
 
 
+def get_pricing_client() -> Any:
+    """Get the pricing client shared by the tools, created on first use.
+
+    boto3 clients are thread safe, so one client and its connection pool serve all the
+    calls instead of a new client per call. A failed creation is retried on the next call.
+
+    Returns:
+        boto3 pricing client
+    """
+    global _shared_client
+    with _shared_client_lock:
+        if _shared_client is None:
+            _shared_client = create_pricing_client()
+        return _shared_client
+
+
+def reset_pricing_client():
+    """Drop the shared pricing client, so that the next call creates a new one."""
+    global _shared_client
+    with _shared_client_lock:
+        _shared_client = None
+
+
 def get_currency_for_region(region: str) -> str:
     """Determine currency based on AWS region.
 
@@ -17,11 +17,28 @@
 import json
 import logging
 from .models import OutputOptions
-from typing import Any, Dict, List, Optional
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 
 logger = logging.getLogger(__name__)
 
+# orjson decodes and encodes several times faster than json, and is used when installed
+try:
+    import orjson  # pyright: ignore [reportMissingImports]
+except ImportError:
+    orjson = None
+
+
+@dataclass
+class PricingPage:
+    """Records of a page of pricing data transformed within a character budget."""
+
+    records: List[Dict[str, Any]] = field(default_factory=list)
+    characters: int = 0
+    consumed: int = 0
+    complete: bool = True
+
 
 def _is_free_product(pricing_item: Dict[str, Any]) -> bool:
     """Check if product has only $0.00 OnDemand pricing across all currencies.
@@ -55,6 +72,131 @@ def _is_free_product(pricing_item: Dict[str, Any]) -> bool:
     return True
 
 
+def _loads(json_str: str) -> Any:
+    if orjson is not None:
+        return orjson.loads(json_str)
+    return json.loads(json_str)
+
+
+def serialized_length(item: Any) -> int:
+    """Get the length of the compact JSON serialization of a record.
+
+    Args:
+        item: Pricing record
+
+    Returns:
+        Number of characters of the record in JSON, counted in UTF-8 bytes with orjson
+    """
+    if orjson is not None:
+        return len(orjson.dumps(item))
+    return len(json.dumps(item, ensure_ascii=False, separators=(',', ':')))
+
+
+def _prune(item: Dict[str, Any], output_options: OutputOptions) -> Dict[str, Any]:
+    """Drop the pricing terms and product attributes not asked for from a record."""
+    # Start with original item, modify only what's needed
+    filtered_item = item
+
+    # Apply pricing terms filtering
+    if output_options.pricing_terms is not None and 'terms' in item:
+        filtered_terms = {
+            term_type: item['terms'][term_type]
+            for term_type in output_options.pricing_terms
+            if term_type in item['terms']
+        }
+        filtered_item = {**item, 'terms': filtered_terms}
+
+    # Apply product attributes filtering
+    if (
+        output_options.product_attributes is not None
+        and 'product' in filtered_item
+        and 'attributes' in filtered_item['product']
+    ):
+        original_attributes = filtered_item['product']['attributes']
+        filtered_attributes = {
+            attr_name: original_attributes[attr_name]
+            for attr_name in output_options.product_attributes
+            if attr_name in original_attributes
+        }
+        filtered_item = {
+            **filtered_item,
+            'product': {**filtered_item['product'], 'attributes': filtered_attributes},
+        }
+
+    return filtered_item
+
+
+def iter_pricing_records(
+    pricing_json_list: List[str], output_options: Optional[OutputOptions], start: int = 0
+) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """Decode and filter pricing records one at a time.
+
+    A record is only decoded when the iteration reaches it, and is pruned right away, so
+    that records past a budget are never decoded and dropped terms are not kept.
+
+    Args:
+        pricing_json_list: List of JSON strings from AWS Pricing API
+        output_options: Optional filtering options for pricing terms and product attributes
+        start: Index of the first record to decode, skipping the previous ones
+
+    Yields:
+        Index of each kept record in the list, and the filtered record
+
+    Raises:
+        ValueError: If JSON parsing fails for a record
+    """
+    for i in range(start, len(pricing_json_list)):
+        try:
+            item = _loads(pricing_json_list[i])
+        except ValueError as e:
+            raise ValueError(f'Invalid JSON format in pricing data at index {i}: {e}')
+        # Remove redundant serviceCode field (optimization)
+        item.pop('serviceCode', None)
+
+        if output_options is not None:
+            # Filter out free products first (before removing OnDemand terms)
+            if output_options.exclude_free_products and _is_free_product(item):
+                continue  # Skip this item
+            item = _prune(item, output_options)
+
+        yield i, item
+
+
+def transform_pricing_page(
+    pricing_json_list: List[str],
+    output_options: Optional[OutputOptions],
+    max_characters: Optional[int] = None,
+    start: int = 0,
+) -> PricingPage:
+    """Filter pricing records until their serialized size reaches a character budget.
+
+    Args:
+        pricing_json_list: List of JSON strings from AWS Pricing API
+        output_options: Optional filtering options for pricing terms and product attributes
+        max_characters: Character budget of the records in JSON, None for no budget
+        start: Index of the first record to transform, to continue a previous page
+
+    Returns:
+        Records within the budget, their size, and the number of input records consumed,
+        which is where the next page starts when the page is not complete
+
+    Raises:
+        ValueError: If JSON parsing fails for a record within the budget
+    """
+    page = PricingPage(consumed=start)
+    for i, item in iter_pricing_records(pricing_json_list, output_options, start):
+        if max_characters is not None:
+            length = serialized_length(item)
+            if page.characters + length > max_characters:
+                page.consumed = i
+                page.complete = False
+                return page
+            page.characters += length
+        page.records.append(item)
+    page.consumed = len(pricing_json_list)
+    return page
+
+
 def transform_pricing_data(
     pricing_json_list: List[str], output_options: Optional[OutputOptions]
 ) -> List[Dict[str, Any]]:
@@ -70,59 +212,4 @@ def transform_pricing_data(
     Raises:
         ValueError: If JSON parsing fails for any record
     """
-    if not pricing_json_list:
-        return []
-
-    # Parse all JSON strings upfront with error handling
-    parsed_data = []
-    for i, json_str in enumerate(pricing_json_list):
-        try:
-            parsed_item = json.loads(json_str)
-            # Remove redundant serviceCode field (optimization)
-            parsed_item.pop('serviceCode', None)
-            parsed_data.append(parsed_item)
-        except json.JSONDecodeError as e:
-            raise ValueError(f'Invalid JSON format in pricing data at index {i}: {e}')
-
-    # Return early if no filtering is needed
-    if output_options is None:
-        return parsed_data
-
-    result = []
-    for item in parsed_data:
-        # Filter out free products first (before removing OnDemand terms)
-        if output_options.exclude_free_products and _is_free_product(item):
-            continue  # Skip this item
-
-        # Start with original item, modify only what's needed
-        filtered_item = item
-
-        # Apply pricing terms filtering
-        if output_options.pricing_terms is not None and 'terms' in item:
-            filtered_terms = {
-                term_type: item['terms'][term_type]
-                for term_type in output_options.pricing_terms
-                if term_type in item['terms']
-            }
-            filtered_item = {**item, 'terms': filtered_terms}
-
-        # Apply product attributes filtering
-        if (
-            output_options.product_attributes is not None
-            and 'product' in filtered_item
-            and 'attributes' in filtered_item['product']
-        ):
-            original_attributes = filtered_item['product']['attributes']
-            filtered_attributes = {
-                attr_name: original_attributes[attr_name]
-                for attr_name in output_options.product_attributes
-                if attr_name in original_attributes
-            }
-            filtered_item = {
-                **filtered_item,
-                'product': {**filtered_item['product'], 'attributes': filtered_attributes},
-            }
-
-        result.append(filtered_item)
-
-    return result
+    return [item for _, item in iter_pricing_records(pricing_json_list, output_options)]
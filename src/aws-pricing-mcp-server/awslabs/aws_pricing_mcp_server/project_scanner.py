@@ -0,0 +1,268 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Project Scanner.
+
+This module finds and analyzes the source files of the projects analyzed by the Terraform
+and CDK analyzers.
+
+Directories of dependencies, caches and build outputs, like node_modules and .terraform,
+are not walked. Files whose modification time and size did not change since their last
+analysis are answered from a cache, kept in memory and in a SQLite file when a path is
+set. The other files are analyzed in a process pool when there are enough of them.
+"""
+
+import json
+import logging
+import multiprocessing
+import os
+import threading
+from awslabs.aws_pricing_mcp_server import consts
+from awslabs.aws_pricing_mcp_server.sqlite_cache import SQLiteCache
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Directories never holding project sources, which are not walked
+PRUNED_DIRECTORIES = frozenset(
+    {
+        '.git',
+        '.hg',
+        '.svn',
+        '.terraform',
+        '.terragrunt-cache',
+        'node_modules',
+        'cdk.out',
+        '__pycache__',
+        '.venv',
+        'venv',
+        '.tox',
+        '.mypy_cache',
+        '.pytest_cache',
+        '.ruff_cache',
+    }
+)
+
+# Worker processes analyzing files, none on a single CPU
+SCAN_MAX_WORKERS = min(8, os.cpu_count() or 1)
+
+# Files to analyze below which the process pool is not worth its overhead
+SCAN_PROCESS_POOL_MIN_FILES = 64
+
+# Batches of files per worker, balancing the workers against the cost of each task
+SCAN_BATCHES_PER_WORKER = 4
+
+FileResults = List[Dict[str, Any]]
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+_process_pool_lock = threading.Lock()
+
+
+class ScanCache(SQLiteCache[Tuple[str, str], Tuple[int, int, FileResults]]):
+    """Cache of per-file analysis results, keyed by path, modification time and size."""
+
+    description = 'project scan cache'
+    table = 'files'
+    schema = (
+        'CREATE TABLE IF NOT EXISTS files (namespace TEXT NOT NULL, '
+        'path TEXT NOT NULL, mtime_ns INTEGER NOT NULL, size INTEGER NOT NULL, '
+        'results TEXT NOT NULL, PRIMARY KEY (namespace, path))'
+    )
+
+    def get(self, namespace: str, file_path: str, stat: os.stat_result) -> Optional[FileResults]:
+        """Get the results of a file, unless it changed since they were stored.
+
+        Args:
+            namespace: Analyzer of the results
+            file_path: Absolute path of the file
+            stat: Current status of the file
+
+        Returns:
+            Results of the file, or None when missing or stale
+        """
+        key = (namespace, file_path)
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            connection = self._connect()
+            if connection is None:
+                return None
+            with self._lock:
+                row = connection.execute(
+                    'SELECT mtime_ns, size, results FROM files WHERE namespace = ? AND path = ?',
+                    key,
+                ).fetchone()
+            if row is None:
+                return None
+            entry = (row[0], row[1], json.loads(row[2]))
+            with self._lock:
+                self._entries.setdefault(key, entry)
+        mtime_ns, size, results = entry
+        if mtime_ns != stat.st_mtime_ns or size != stat.st_size:
+            return None
+        return results
+
+    def put_many(self, namespace: str, entries: Sequence[Tuple[str, os.stat_result, FileResults]]):
+        """Store the results of files, as of the status they were read with.
+
+        Args:
+            namespace: Analyzer of the results
+            entries: Absolute path, status and results of each file
+        """
+        if not entries:
+            return
+        connection = self._connect()
+        with self._lock:
+            for file_path, stat, results in entries:
+                self._entries[(namespace, file_path)] = (stat.st_mtime_ns, stat.st_size, results)
+            if connection is not None:
+                with connection:
+                    connection.executemany(
+                        'INSERT OR REPLACE INTO files (namespace, path, mtime_ns, size, results) '
+                        'VALUES (?, ?, ?, ?, ?)',
+                        [
+                            (namespace, file_path, stat.st_mtime_ns, stat.st_size, json.dumps(r))
+                            for file_path, stat, r in entries
+                        ],
+                    )
+
+
+def find_source_files(root: Path, suffixes: Sequence[str]) -> List[Path]:
+    """Find the source files of a project, without walking pruned directories.
+
+    Args:
+        root: Project root
+        suffixes: Suffixes of the source files, like '.tf'
+
+    Returns:
+        Source files, grouped by suffix in the order of suffixes, then sorted by path
+    """
+    files: Dict[str, List[Path]] = {suffix: [] for suffix in suffixes}
+    for directory, dirnames, filenames in os.walk(root):
+        # Pruning dirnames in place stops os.walk from descending into them
+        dirnames[:] = sorted(d for d in dirnames if d not in PRUNED_DIRECTORIES)
+        for filename in sorted(filenames):
+            suffix = os.path.splitext(filename)[1]
+            if suffix in files:
+                files[suffix].append(Path(directory, filename))
+    return [path for suffix in suffixes for path in files[suffix]]
+
+
+def analyze_files(
+    files: Sequence[Path],
+    analyze_file: Callable[[Path], FileResults],
+    namespace: str,
+    cacheable: Optional[Callable[[FileResults], bool]] = None,
+) -> List[Tuple[Path, FileResults]]:
+    """Analyze files, answering unchanged ones from the scan cache.
+
+    Args:
+        files: Files to analyze
+        analyze_file: Function analyzing a file, picklable to run in the process pool
+        namespace: Analyzer of the results, telling apart the results of each analyzer
+        cacheable: Function telling whether results may be cached, when they depend on
+            other files than the one analyzed
+
+    Returns:
+        Each file with its results, in the order of files
+    """
+    results: List[FileResults] = []
+    pending: List[Tuple[int, str, os.stat_result]] = []
+    for i, file_path in enumerate(files):
+        absolute_path = os.path.abspath(file_path)
+        try:
+            stat = os.stat(absolute_path)
+        except OSError as e:
+            logger.warning(f'Error reading file {file_path}: {e}')
+            results.append([])
+            continue
+        cached = scan_cache.get(namespace, absolute_path, stat)
+        results.append(cached if cached is not None else [])
+        if cached is None:
+            pending.append((i, absolute_path, stat))
+
+    logger.info(f'Analyzing {len(pending)} of {len(files)} files, the others are cached')
+    analyzed = _analyze_pending([files[i] for i, _, _ in pending], analyze_file)
+
+    to_cache = []
+    for (i, absolute_path, stat), file_results in zip(pending, analyzed):
+        if file_results is None:
+            continue
+        results[i] = file_results
+        if cacheable is None or cacheable(file_results):
+            to_cache.append((absolute_path, stat, file_results))
+    scan_cache.put_many(namespace, to_cache)
+
+    return list(zip(files, results))
+
+
+def shutdown_process_pool():
+    """Stop the worker processes, started again by the next analysis needing them."""
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is not None:
+            _process_pool.shutdown(wait=True)
+            _process_pool = None
+
+
+def _analyze_batch(
+    analyze_file: Callable[[Path], FileResults], files: Sequence[Path]
+) -> List[Optional[FileResults]]:
+    results: List[Optional[FileResults]] = []
+    for file_path in files:
+        try:
+            results.append(analyze_file(file_path))
+        except Exception as e:
+            # Failed files are left out of the results and of the cache
+            logger.error(f'Error analyzing {file_path}: {e}')
+            results.append(None)
+    return results
+
+
+def _analyze_pending(
+    files: List[Path], analyze_file: Callable[[Path], FileResults]
+) -> List[Optional[FileResults]]:
+    if SCAN_MAX_WORKERS < 2 or len(files) < SCAN_PROCESS_POOL_MIN_FILES:
+        return _analyze_batch(analyze_file, files)
+
+    batch_size = -(-len(files) // (SCAN_MAX_WORKERS * SCAN_BATCHES_PER_WORKER))
+    batches = [files[i : i + batch_size] for i in range(0, len(files), batch_size)]
+    try:
+        pool = _get_process_pool()
+        futures = [pool.submit(_analyze_batch, analyze_file, batch) for batch in batches]
+        return [result for future in futures for result in future.result()]
+    except BrokenProcessPool as e:
+        logger.warning(f'Process pool failed, analyzing files in this process: {e}')
+        shutdown_process_pool()
+        return _analyze_batch(analyze_file, files)
+
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is None:
+            # Forking the threads of the server is unsafe, so workers are spawned
+            _process_pool = ProcessPoolExecutor(
+                max_workers=SCAN_MAX_WORKERS, mp_context=multiprocessing.get_context('spawn')
+            )
+        return _process_pool
+
+
+# Results of unchanged files are reused across analyses, and server restarts with a path
+scan_cache = ScanCache(consts.PROJECT_SCAN_CACHE_PATH)
@@ -17,6 +17,10 @@
 This server provides tools for analyzing AWS service costs across different user tiers.
 """
 
+import asyncio
+import base64
+import functools
+import json
 import sys
 from awslabs.aws_pricing_mcp_server import consts
 from awslabs.aws_pricing_mcp_server.cdk_analyzer import analyze_cdk_project
@@ -34,11 +38,18 @@ from awslabs.aws_pricing_mcp_server.models import (
     OutputOptions,
     PricingFilter,
 )
+from awslabs.aws_pricing_mcp_server.price_index import INDEX_NEXT_TOKEN_PREFIX, price_index
+from awslabs.aws_pricing_mcp_server.pricing_cache import pricing_cache
 from awslabs.aws_pricing_mcp_server.pricing_client import (
-    create_pricing_client,
     get_currency_for_region,
+    get_pricing_client,
+    pricing_executor,
+)
+from awslabs.aws_pricing_mcp_server.pricing_transformer import (
+    iter_pricing_records,
+    serialized_length,
+    transform_pricing_page,
 )
-from awslabs.aws_pricing_mcp_server.pricing_transformer import transform_pricing_data
 from awslabs.aws_pricing_mcp_server.static.patterns import BEDROCK
 from awslabs.aws_pricing_mcp_server.terraform_analyzer import analyze_terraform_project
 from datetime import datetime, timezone
@@ -46,13 +57,16 @@ from loguru import logger
 from mcp.server.fastmcp import Context, FastMCP
 from pydantic import Field
 from pydantic.fields import FieldInfo
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 
 # Set up logging
 logger.remove()
 logger.add(sys.stderr, level=consts.LOG_LEVEL)
 
+# Prefix of the get_pricing tokens continuing a page cut at max_allowed_characters
+CONTINUATION_TOKEN_PREFIX = 'resume:'
+
 
 async def create_error_response(
     ctx: Context,
@@ -73,6 +87,21 @@ async def create_error_response(
     return error_response.model_dump()
 
 
+async def get_cached(key: str, fetch: Callable[[], Any]) -> Any:
+    """Get the cached result of a Pricing API call, calling it in the pricing thread pool.
+
+    Args:
+        key: Key of the call in the pricing cache
+        fetch: Function making the call, run when the result is missing or too old
+
+    Returns:
+        Result of the call, shared with other callers and not to be changed
+    """
+    return await asyncio.get_running_loop().run_in_executor(
+        pricing_executor, pricing_cache.get, key, fetch
+    )
+
+
 mcp = FastMCP(
     name='awslabs.aws-pricing-mcp-server',
     instructions="""This server provides two primary functionalities:
@@ -232,7 +261,7 @@ async def analyze_terraform_project_wrapper(
     - max_allowed_characters (optional): Response size limit in characters (default: 100,000, use -1 for unlimited)
     - output_options (optional): OutputOptions object for response transformation and size reduction
     - max_results (optional): Maximum number of results to return per page (default: 100, min: 1, max: 100)
-    - next_token (optional): Pagination token from previous response to get next page of results
+    - next_token (optional): Pagination token from previous response to get next page of results, also returned when max_allowed_characters cut a page short
 
     **MANDATORY WORKFLOW - ALWAYS FOLLOW:**
 
@@ -303,7 +332,7 @@ async def analyze_terraform_project_wrapper(
     **CONSTRAINTS:**
     - **CURRENT PRICING ONLY**: Use get_price_list_urls for historical data
     - **NO SPOT/SAVINGS PLANS**: Only OnDemand and Reserved Instance pricing available
-    - **CHARACTER LIMIT**: 100,000 characters default response limit (use output_options to reduce)
+    - **CHARACTER LIMIT**: 100,000 characters default response limit (use output_options to reduce); records past the limit are returned on the next page, with next_token
     - **REGION AUTO-FILTER**: Region parameter automatically creates regionCode filter
 
     **ANTI-PATTERNS:**
@@ -381,6 +410,9 @@ async def get_pricing(
 ) -> Dict[str, Any]:
     """Get pricing information from AWS Price List API.
 
+    When the local price index (PRICING_INDEX_DIR) has the service in all requested regions,
+    the query is answered from the index instead of the API.
+
     Args:
         service_code: The service code (e.g., 'AmazonES' for OpenSearch, 'AmazonS3' for S3)
         region: AWS region(s) - single region string (e.g., 'us-west-2') or list for multi-region comparison (e.g., ['us-east-1', 'us-west-2'])
@@ -394,6 +426,7 @@ async def get_pricing(
     Returns:
         Dictionary containing pricing information from AWS Pricing API. If more results are available,
         the response will include a 'next_token' field that can be used for subsequent requests.
+        Records past max_allowed_characters are left for the next request, through next_token.
     """
     # Handle Pydantic Field objects when called directly (not through MCP framework)
     if isinstance(filters, FieldInfo):
@@ -409,54 +442,88 @@ async def get_pricing(
 
     logger.info(f'Getting pricing for {service_code} in {region}')
 
-    # Create pricing client with error handling
-    try:
-        pricing_client = create_pricing_client()
-    except Exception as e:
-        return await create_error_response(
-            ctx=ctx,
-            error_type='client_creation_failed',
-            message=f'Failed to create AWS Pricing client: {str(e)}',
-            service_code=service_code,
-            region=region,
-        )
-
-    # Build filters
-    try:
-        # Build region filter based on parameter type
-        api_filters = [
-            {
-                'Field': 'regionCode',
-                'Type': 'ANY_OF' if isinstance(region, list) else 'TERM_MATCH',
-                'Value': ','.join(region) if isinstance(region, list) else region,
-            }
-        ]
+    # A continuation token resumes a page where the character budget cut it
+    start = 0
+    if next_token and next_token.startswith(CONTINUATION_TOKEN_PREFIX):
+        try:
+            next_token, start = _decode_continuation_token(next_token)
+        except ValueError as e:
+            return await create_error_response(
+                ctx=ctx,
+                error_type='invalid_next_token',
+                message=f'Invalid next_token: {str(e)}',
+                service_code=service_code,
+                region=region,
+                suggestion='Pass the next_token of the previous get_pricing response unchanged, with the same parameters.',
+            )
 
-        # Add any additional filters if provided
-        if filters:
-            api_filters.extend([f.model_dump(by_alias=True) for f in filters])
+    # Answer from the local price index when it has the service in all regions
+    source = 'AWS Pricing API'
+    if price_index.has(service_code, region) and (
+        not next_token or next_token.startswith(INDEX_NEXT_TOKEN_PREFIX)
+    ):
+        source = 'local price index'
+        try:
+            response = price_index.get_products(
+                service_code, region, filters, max_results, next_token
+            )
+        except Exception as e:
+            return await create_error_response(
+                ctx=ctx,
+                error_type='index_error',
+                message=f'Failed to retrieve pricing data for service "{service_code}" in region "{region}" from the local price index: {str(e)}',
+                service_code=service_code,
+                region=region,
+            )
+    else:
+        # Get the shared pricing client with error handling
+        try:
+            pricing_client = get_pricing_client()
+        except Exception as e:
+            return await create_error_response(
+                ctx=ctx,
+                error_type='client_creation_failed',
+                message=f'Failed to create AWS Pricing client: {str(e)}',
+                service_code=service_code,
+                region=region,
+            )
 
-        # Make the API request
-        api_params = {
-            'ServiceCode': service_code,
-            'Filters': api_filters,
-            'MaxResults': max_results,
-        }
+        # Build filters
+        try:
+            # Build region filter based on parameter type
+            api_filters = [
+                {
+                    'Field': 'regionCode',
+                    'Type': 'ANY_OF' if isinstance(region, list) else 'TERM_MATCH',
+                    'Value': ','.join(region) if isinstance(region, list) else region,
+                }
+            ]
+
+            # Add any additional filters if provided
+            if filters:
+                api_filters.extend([f.model_dump(by_alias=True) for f in filters])
+
+            # Make the API request
+            api_params = {
+                'ServiceCode': service_code,
+                'Filters': api_filters,
+                'MaxResults': max_results,
+            }
 
-        # Only include NextToken if it's provided
-        if next_token:
-            api_params['NextToken'] = next_token
+            # Only include NextToken if it's provided
+            if next_token:
+                api_params['NextToken'] = next_token
 
-        response = pricing_client.get_products(**api_params)
-    except Exception as e:
-        return await create_error_response(
-            ctx=ctx,
-            error_type='api_error',
-            message=f'Failed to retrieve pricing data for service "{service_code}" in region "{region}": {str(e)}',
-            service_code=service_code,
-            region=region,
-            suggestion='Verify that the service code and region combination is valid. Use get_service_codes() to get valid service codes.',
-        )
+            response = pricing_client.get_products(**api_params)
+        except Exception as e:
+            return await create_error_response(
+                ctx=ctx,
+                error_type='api_error',
+                message=f'Failed to retrieve pricing data for service "{service_code}" in region "{region}": {str(e)}',
+                service_code=service_code,
+                region=region,
+                suggestion='Verify that the service code and region combination is valid. Use get_service_codes() to get valid service codes.',
+            )
 
     # Check if results are empty
     if not response.get('PriceList'):
@@ -479,9 +546,11 @@ async def get_pricing(
             },
         )
 
-    # Apply filtering with error handling
+    # Filter records, decoding them lazily until the character budget is reached
+    budget = None if max_allowed_characters == -1 else max_allowed_characters
     try:
-        price_list = transform_pricing_data(response['PriceList'], output_options)
+        page = transform_pricing_page(response['PriceList'], output_options, budget, start)
+        price_list = page.records
         total_count = len(price_list)
     except ValueError as e:
         return await create_error_response(
@@ -492,24 +561,22 @@ async def get_pricing(
             region=region,
         )
 
-    # Check if results exceed the character threshold (unless max_characters is -1 for unlimited)
-    if max_allowed_characters != -1:
-        # Calculate total character count of the FILTERED response data
-        total_characters = sum(len(str(item)) for item in price_list)
-
-        if total_characters > max_allowed_characters:
-            return await create_error_response(
-                ctx=ctx,
-                error_type='result_too_large',
-                message=f'Query returned {total_characters:,} characters, exceeding the limit of {max_allowed_characters:,}. Use more specific filters or try output_options={{"pricing_terms": ["OnDemand"]}} to reduce response size.',
-                service_code=service_code,
-                region=region,
-                total_count=total_count,
-                total_characters=total_characters,
-                max_allowed_characters=max_allowed_characters,
-                sample_records=price_list[:3],
-                suggestion='Add more specific filters like instanceType, storageClass, deploymentOption, or engineCode to reduce the number of results. For large services like EC2, consider using output_options={"pricing_terms": ["OnDemand"]} to significantly reduce response size by excluding Reserved Instance pricing.',
-            )
+    # Fail only when not even the next record fits within the budget
+    if not page.complete and not price_list:
+        _, record = next(
+            iter_pricing_records(response['PriceList'], output_options, page.consumed)
+        )
+        record_characters = serialized_length(record)
+        return await create_error_response(
+            ctx=ctx,
+            error_type='result_too_large',
+            message=f'A single pricing record has {record_characters:,} characters, exceeding the limit of {max_allowed_characters:,}. Use more specific filters or try output_options={{"pricing_terms": ["OnDemand"]}} to reduce response size.',
+            service_code=service_code,
+            region=region,
+            record_characters=record_characters,
+            max_allowed_characters=max_allowed_characters,
+            suggestion='Raise max_allowed_characters, or reduce the size of each record. For large services like EC2, consider using output_options={"pricing_terms": ["OnDemand"]} to significantly reduce response size by excluding Reserved Instance pricing, and output_options={"product_attributes": [...]} to keep only the attributes you need.',
+        )
 
     # Success response
     logger.info(f'Successfully retrieved {total_count} pricing items for {service_code}')
@@ -519,16 +586,44 @@ async def get_pricing(
         'status': 'success',
         'service_name': service_code,
         'data': price_list,
-        'message': f'Retrieved pricing for {service_code} in {region} from AWS Pricing API',
+        'message': f'Retrieved pricing for {service_code} in {region} from {source}',
     }
 
-    # Include next_token if present for pagination
-    if 'NextToken' in response:
+    # Continue the page past the character budget first, then the next pages
+    if not page.complete:
+        result['next_token'] = _encode_continuation_token(next_token, page.consumed)
+        result['message'] += (
+            f'. Returned {total_count} records within {max_allowed_characters:,} characters, '
+            'pass next_token to get the next records'
+        )
+    elif 'NextToken' in response:
         result['next_token'] = response['NextToken']
 
     return result
 
 
+def _encode_continuation_token(page_token: Optional[str], start: int) -> str:
+    """Encode the token continuing a page, from the token of the page and its next record."""
+    data = json.dumps([page_token, start]).encode('utf-8')
+    return CONTINUATION_TOKEN_PREFIX + base64.urlsafe_b64encode(data).decode('ascii')
+
+
+def _decode_continuation_token(token: str) -> Tuple[Optional[str], int]:
+    """Decode a continuation token into the token of the page and its next record.
+
+    Raises:
+        ValueError: If the token was not made by _encode_continuation_token
+    """
+    try:
+        data = base64.urlsafe_b64decode(token[len(CONTINUATION_TOKEN_PREFIX) :].encode('ascii'))
+        page_token, start = json.loads(data)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f'malformed continuation token ({e})')
+    if not (page_token is None or isinstance(page_token, str)) or not isinstance(start, int):
+        raise ValueError('malformed continuation token')
+    return page_token, start
+
+
 @mcp.tool(
     name='get_bedrock_patterns',
     description='Get architecture patterns for Amazon Bedrock applications, including component relationships and cost considerations',
@@ -803,6 +898,29 @@ async def generate_cost_report_wrapper(
     )
 
 
+def _fetch_service_codes(pricing_client) -> List[str]:
+    """Retrieve all service codes from the Price List API, following pagination."""
+    service_codes = []
+    next_token = None
+
+    # Retrieve all service codes with pagination handling
+    while True:
+        if next_token:
+            response = pricing_client.describe_services(NextToken=next_token)
+        else:
+            response = pricing_client.describe_services()
+
+        for service in response['Services']:
+            service_codes.append(service['ServiceCode'])
+
+        if 'NextToken' in response:
+            next_token = response['NextToken']
+        else:
+            break
+
+    return service_codes
+
+
 @mcp.tool(
     name='get_pricing_service_codes',
     description="""Get AWS service codes available in the Price List API.
@@ -831,9 +949,9 @@ async def get_pricing_service_codes(ctx: Context) -> Union[List[str], Dict[str,
     """
     logger.info('Retrieving AWS service codes from Price List API')
 
-    # Create pricing client with error handling
+    # Get the shared pricing client with error handling
     try:
-        pricing_client = create_pricing_client()
+        pricing_client = get_pricing_client()
     except Exception as e:
         return await create_error_response(
             ctx=ctx,
@@ -843,24 +961,9 @@ async def get_pricing_service_codes(ctx: Context) -> Union[List[str], Dict[str,
 
     # Retrieve service codes with error handling
     try:
-        service_codes = []
-        next_token = None
-
-        # Retrieve all service codes with pagination handling
-        while True:
-            if next_token:
-                response = pricing_client.describe_services(NextToken=next_token)
-            else:
-                response = pricing_client.describe_services()
-
-            for service in response['Services']:
-                service_codes.append(service['ServiceCode'])
-
-            if 'NextToken' in response:
-                next_token = response['NextToken']
-            else:
-                break
-
+        service_codes = await get_cached(
+            'service_codes', functools.partial(_fetch_service_codes, pricing_client)
+        )
     except Exception as e:
         return await create_error_response(
             ctx=ctx,
@@ -918,9 +1021,9 @@ async def get_pricing_service_attributes(
     """
     logger.info(f'Retrieving attributes for AWS service: {service_code}')
 
-    # Create pricing client with error handling
+    # Get the shared pricing client with error handling
     try:
-        pricing_client = create_pricing_client()
+        pricing_client = get_pricing_client()
     except Exception as e:
         return await create_error_response(
             ctx=ctx,
@@ -931,7 +1034,10 @@ async def get_pricing_service_attributes(
 
     # Get service attributes with error handling
     try:
-        response = pricing_client.describe_services(ServiceCode=service_code)
+        services = await get_cached(
+            f'service_attributes/{service_code}',
+            lambda: pricing_client.describe_services(ServiceCode=service_code).get('Services'),
+        )
     except Exception as e:
         return await create_error_response(
             ctx=ctx,
@@ -942,7 +1048,7 @@ async def get_pricing_service_attributes(
         )
 
     # Check if service was found
-    if not response.get('Services'):
+    if not services:
         return await create_error_response(
             ctx=ctx,
             error_type='service_not_found',
@@ -960,7 +1066,7 @@ async def get_pricing_service_attributes(
 
     # Extract attribute names
     attributes = []
-    for attr in response['Services'][0].get('AttributeNames', []):
+    for attr in services[0].get('AttributeNames', []):
         attributes.append(attr)
 
     # Check for empty results
@@ -998,12 +1104,39 @@ class AttributeValuesError(Exception):
         super().__init__(message)
 
 
+def _fetch_attribute_values(pricing_client, service_code: str, attribute_name: str) -> List[str]:
+    """Retrieve the values of an attribute from the Price List API, following pagination."""
+    values = []
+    next_token = None
+
+    while True:
+        if next_token:
+            response = pricing_client.get_attribute_values(
+                ServiceCode=service_code, AttributeName=attribute_name, NextToken=next_token
+            )
+        else:
+            response = pricing_client.get_attribute_values(
+                ServiceCode=service_code, AttributeName=attribute_name
+            )
+
+        for attr_value in response.get('AttributeValues', []):
+            if 'Value' in attr_value:
+                values.append(attr_value['Value'])
+
+        if 'NextToken' in response:
+            next_token = response['NextToken']
+        else:
+            break
+
+    return values
+
+
 async def _get_single_attribute_values(
     pricing_client,
     service_code: str,
     attribute_name: str,
 ) -> List[str]:
-    """Helper function to retrieve values for a single attribute.
+    """Helper function to retrieve values for a single attribute, through the pricing cache.
 
     Args:
         pricing_client: AWS pricing client instance
@@ -1017,29 +1150,12 @@ async def _get_single_attribute_values(
         AttributeValuesError: When API calls fail or no values are found
     """
     try:
-        # Get attribute values with pagination handling
-        values = []
-        next_token = None
-
-        while True:
-            if next_token:
-                response = pricing_client.get_attribute_values(
-                    ServiceCode=service_code, AttributeName=attribute_name, NextToken=next_token
-                )
-            else:
-                response = pricing_client.get_attribute_values(
-                    ServiceCode=service_code, AttributeName=attribute_name
-                )
-
-            for attr_value in response.get('AttributeValues', []):
-                if 'Value' in attr_value:
-                    values.append(attr_value['Value'])
-
-            if 'NextToken' in response:
-                next_token = response['NextToken']
-            else:
-                break
-
+        values = await get_cached(
+            f'attribute_values/{service_code}/{attribute_name}',
+            functools.partial(
+                _fetch_attribute_values, pricing_client, service_code, attribute_name
+            ),
+        )
     except Exception as e:
         raise AttributeValuesError(
             error_type='api_error',
@@ -1131,9 +1247,9 @@ async def get_pricing_attribute_values(
         f'Retrieving values for {len(attribute_names)} attributes of service: {service_code}'
     )
 
-    # Create pricing client with error handling
+    # Get the shared pricing client with error handling
     try:
-        pricing_client = create_pricing_client()
+        pricing_client = get_pricing_client()
     except Exception as e:
         return await create_error_response(
             ctx=ctx,
@@ -1143,18 +1259,22 @@ async def get_pricing_attribute_values(
             attribute_names=attribute_names,
         )
 
-    # Process each attribute - all-or-nothing approach
+    # Fetch all attributes concurrently in the pricing thread pool
+    values_results = await asyncio.gather(
+        *(
+            _get_single_attribute_values(pricing_client, service_code, attribute_name)
+            for attribute_name in attribute_names
+        ),
+        return_exceptions=True,
+    )
+
+    # Process each attribute in request order - all-or-nothing approach
     result = {}
-    for attribute_name in attribute_names:
+    for attribute_name, values_result in zip(attribute_names, values_results):
         logger.debug(f'Processing attribute: {attribute_name}')
 
-        try:
-            values_result = await _get_single_attribute_values(
-                pricing_client, service_code, attribute_name
-            )
-            # Success - add to result
-            result[attribute_name] = values_result
-        except AttributeValuesError as e:
+        if isinstance(values_result, AttributeValuesError):
+            e = values_result
             # If any attribute fails, return error for entire operation
             return await create_error_response(
                 ctx=ctx,
@@ -1166,6 +1286,11 @@ async def get_pricing_attribute_values(
                 requested_attributes=attribute_names,
                 **e.extra_fields,
             )
+        if isinstance(values_result, BaseException):
+            raise values_result
+
+        # Success - add to result
+        result[attribute_name] = values_result
 
     total_values = sum(len(values) for values in result.values())
     logger.info(
@@ -1238,8 +1363,8 @@ async def get_price_list_urls(
     logger.debug(f'Using currency {currency} for region {region}')
 
     try:
-        # Create pricing client
-        pricing_client = create_pricing_client()
+        # Get the shared pricing client
+        pricing_client = get_pricing_client()
     except Exception as e:
         return await create_error_response(
             ctx=ctx,
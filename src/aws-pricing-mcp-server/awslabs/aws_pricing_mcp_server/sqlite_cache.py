@@ -0,0 +1,85 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""awslabs MCP AWS Pricing mcp server SQLite cache.
+
+This module holds the base of the caches of the server, the discovery cache and the
+project scan cache. Entries are kept in memory, and in a table of a SQLite file when a
+path is set. The file is opened on first use, and reopened by the next use once closed.
+"""
+
+import os
+import sqlite3
+import threading
+from loguru import logger
+from typing import Dict, Generic, Optional, TypeVar
+
+
+K = TypeVar('K')
+V = TypeVar('V')
+
+
+class SQLiteCache(Generic[K, V]):
+    """Cache of entries in memory, and in a SQLite file when a path is set.
+
+    Subclasses describe the cache, and name the table of their entries with the statement
+    creating it.
+    """
+
+    # Description of the cache in logs, like 'pricing cache'
+    description: str
+    # Name of the table of the entries, and statement creating it when missing
+    table: str
+    schema: str
+
+    def __init__(self, path: Optional[str]):
+        """Initialize a cache, whose file is opened on first use.
+
+        Args:
+            path: Path of the SQLite file, or None to keep the entries in memory only
+        """
+        self.path = path
+        self._entries: Dict[K, V] = {}
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def clear(self):
+        """Remove all entries, in memory and on disk."""
+        connection = self._connect()
+        with self._lock:
+            self._entries.clear()
+            if connection is not None:
+                with connection:
+                    connection.execute(f'DELETE FROM {self.table}')
+
+    def close(self):
+        """Close the cache file, reopened by the next use."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        if not self.path:
+            return None
+        with self._lock:
+            if self._connection is None:
+                directory = os.path.dirname(os.path.abspath(self.path))
+                os.makedirs(directory, exist_ok=True)
+                # The connection is shared by the server threads, serialized by the lock
+                connection = sqlite3.connect(self.path, check_same_thread=False)
+                connection.execute(self.schema)
+                connection.commit()
+                logger.debug(f'Opened {self.description} {self.path}')
+                self._connection = connection
+            return self._connection
@@ -18,8 +18,10 @@ This module provides functionality for analyzing Terraform projects to identify
 and their configurations.
 """
 
+import asyncio
 import logging
 import re
+from awslabs.aws_pricing_mcp_server.project_scanner import analyze_files, find_source_files
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
@@ -374,21 +376,22 @@ class TerraformAnalyzer:
 
         all_services = []
 
-        # Get all Terraform files in the project
-        source_files = list(self.project_path.rglob('*.tf')) + list(
-            self.project_path.rglob('*.hcl')
+        # Get all Terraform files in the project, skipping .terraform and other dependencies
+        source_files = find_source_files(self.project_path, ('.tf', '.hcl'))
+        logger.info(f'Found {len(source_files)} source files')
+
+        # Files using local modules are not cached, as their services come from other files
+        analyzed_files = await asyncio.to_thread(
+            analyze_files,
+            source_files,
+            self._analyze_file,
+            'terraform',
+            cacheable=_uses_no_local_module,
         )
-        logger.info(f'Found source files: {source_files}')
-
-        for file_path in source_files:
-            logger.info(f'Analyzing file: {file_path}')
-            try:
-                file_services = self._analyze_file(file_path)
-                if file_services:
-                    logger.info(f'Found services in {file_path}: {file_services}')
-                    all_services.extend(file_services)
-            except Exception as e:
-                logger.error(f'Error analyzing {file_path}: {e}')
+        for file_path, file_services in analyzed_files:
+            if file_services:
+                logger.info(f'Found services in {file_path}: {file_services}')
+                all_services.extend(file_services)
 
         # Debug logging for all services
         logger.info(f'All services before deduplication: {all_services}')
@@ -422,6 +425,12 @@ class TerraformAnalyzer:
         return result
 
 
+def _uses_no_local_module(services: List[Dict[str, Any]]) -> bool:
+    return not any(
+        service.get('module_source', '').startswith(('./', '../')) for service in services
+    )
+
+
 async def analyze_terraform_project(project_path: str) -> Dict[str, Any]:
     """Analyze a Terraform project to identify AWS services.
 
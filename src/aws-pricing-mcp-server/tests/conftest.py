@@ -17,11 +17,26 @@
 import json
 import pytest
 import tempfile
+from awslabs.aws_pricing_mcp_server.pricing_cache import pricing_cache
+from awslabs.aws_pricing_mcp_server.pricing_client import reset_pricing_client
+from awslabs.aws_pricing_mcp_server.project_scanner import scan_cache
 from pathlib import Path
 from typing import Any, Dict, Generator
 from unittest.mock import AsyncMock, MagicMock
 
 
+@pytest.fixture(autouse=True)
+def reset_pricing_state():
+    """Start every test with a new shared pricing client, and empty pricing and scan caches."""
+    reset_pricing_client()
+    pricing_cache.clear()
+    scan_cache.clear()
+    yield
+    reset_pricing_client()
+    pricing_cache.clear()
+    scan_cache.clear()
+
+
 @pytest.fixture
 def mock_context():
     """Create a mock MCP context."""
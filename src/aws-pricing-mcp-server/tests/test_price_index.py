@@ -0,0 +1,212 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for the local price index built from offer files."""
+
+import json
+import os
+import pytest
+from awslabs.aws_pricing_mcp_server.models import PricingFilter
+from awslabs.aws_pricing_mcp_server.price_index import (
+    OfferFileReader,
+    PriceIndex,
+    build_price_index,
+    read_offer_file,
+)
+from awslabs.aws_pricing_mcp_server.server import get_pricing
+from typing import List, Union
+from unittest.mock import patch
+
+
+OFFER_FILE = os.path.join(os.path.dirname(__file__), 'resources', 'AmazonEC2-offer.json')
+
+
+@pytest.fixture
+def index_dir(tmp_path):
+    """Index the fixture offer file, reading it in small chunks to cross value boundaries."""
+    directory = str(tmp_path / 'index')
+    build_price_index(read_offer_file(OFFER_FILE, chunk_size=7), directory)
+    return directory
+
+
+def skus(response):
+    """Get the SKUs of the records of a get_products response."""
+    return [json.loads(record)['product']['sku'] for record in response['PriceList']]
+
+
+def test_reader_streams_members():
+    """Test that the reader decodes members split across chunks of any size."""
+    text = '{"a": 12345, "b": {"x": [1, 2], "y": "\\u00e9t\\u00e9"}, "c": {}, "d": true}'
+    for size in (1, 2, 5, len(text)):
+        reader = OfferFileReader(text[i : i + size] for i in range(0, len(text), size))
+        members = {}
+        for key in reader.iter_object():
+            if key == 'b':
+                members[key] = {inner: reader.read_value() for inner in reader.iter_object()}
+            else:
+                members[key] = reader.read_value()
+        assert members == json.loads(text)
+
+
+def test_reader_rejects_truncated_files():
+    """Test that a truncated offer file is an error."""
+    reader = OfferFileReader(['{"products": {"SKU": {"sku"'])
+    with pytest.raises(ValueError):
+        for _ in reader.iter_object():
+            for _ in reader.iter_object():
+                reader.read_value()
+
+
+def test_build_price_index_partitions_regions(index_dir):
+    """Test that products are partitioned by region, with their records joined to terms."""
+    with open(OFFER_FILE) as offer_file:
+        offer = json.load(offer_file)
+    index = PriceIndex(index_dir)
+
+    assert index.has('AmazonEC2', ['us-east-1', 'eu-west-1'])
+    assert index.has('AmazonEC2', 'global')
+    assert not index.has('AmazonEC2', 'ap-south-1')
+    assert not index.has('AmazonS3', 'us-east-1')
+    assert not index.has('AmazonEC2', '../AmazonEC2')
+
+    response = index.get_products('AmazonEC2', 'us-east-1')
+    assert skus(response) == ['SKUA1', 'SKUA2', 'SKUA3', 'SKUA4', 'SKUC1']
+    record = json.loads(response['PriceList'][0])
+    assert record == {
+        'product': offer['products']['SKUA1'],
+        'serviceCode': 'AmazonEC2',
+        'terms': {
+            'OnDemand': offer['terms']['OnDemand']['SKUA1'],
+            'Reserved': offer['terms']['Reserved']['SKUA1'],
+        },
+        'version': '20250601000000',
+        'publicationDate': '2025-06-01T00:00:00Z',
+    }
+    assert list(json.loads(response['PriceList'][1])['terms']) == ['OnDemand']
+
+
+def test_filters(index_dir):
+    """Test that filters match like the Pricing API, without case."""
+    index = PriceIndex(index_dir)
+
+    def query(*filters, region: Union[str, List[str]] = 'us-east-1'):
+        return skus(index.get_products('AmazonEC2', region, [PricingFilter(**f) for f in filters]))
+
+    assert query({'Field': 'instanceType', 'Value': 'm5.large'}) == ['SKUA1', 'SKUA2']
+    assert query(
+        {'Field': 'instanceType', 'Type': 'TERM_MATCH', 'Value': 'm5.large'},
+        {'Field': 'operatingSystem', 'Value': 'linux'},
+    ) == ['SKUA1']
+    assert query(
+        {'Field': 'instanceType', 'Type': 'ANY_OF', 'Value': ['t3.micro', 'm5.xlarge']}
+    ) == [
+        'SKUA3',
+        'SKUA4',
+    ]
+    assert query({'Field': 'instanceType', 'Type': 'CONTAINS', 'Value': 'm5'}) == [
+        'SKUA1',
+        'SKUA2',
+        'SKUA3',
+    ]
+    assert query({'Field': 'tenancy', 'Type': 'NONE_OF', 'Value': 'Dedicated,Host'}) == [
+        'SKUA1',
+        'SKUA2',
+        'SKUA4',
+        'SKUC1',
+    ]
+    assert query({'Field': 'productFamily', 'Value': 'Storage'}) == ['SKUC1']
+    assert query({'Field': 'unknownAttribute', 'Value': 'x'}) == []
+    assert query(
+        {'Field': 'instanceType', 'Value': 't3.micro'}, region=['us-east-1', 'eu-west-1']
+    ) == ['SKUA4', 'SKUB2']
+    with pytest.raises(ValueError, match='Unsupported filter type'):
+        query({'Field': 'instanceType', 'Type': 'LESS_THAN', 'Value': '1'})
+
+
+def test_pagination(index_dir):
+    """Test that pages continue across regions with index tokens."""
+    index = PriceIndex(index_dir)
+    regions = ['us-east-1', 'eu-west-1']
+
+    first = index.get_products('AmazonEC2', regions, max_results=4)
+    second = index.get_products('AmazonEC2', regions, max_results=4, next_token=first['NextToken'])
+
+    assert skus(first) == ['SKUA1', 'SKUA2', 'SKUA3', 'SKUA4']
+    assert skus(second) == ['SKUC1', 'SKUB1', 'SKUB2']
+    assert 'NextToken' not in second
+    with pytest.raises(ValueError, match='Invalid pagination token'):
+        index.get_products('AmazonEC2', regions, next_token='api-token')
+
+
+def test_rebuild_replaces_partitions(index_dir, tmp_path):
+    """Test that indexing an offer file again replaces its partitions for open indexes."""
+    index = PriceIndex(index_dir)
+    assert len(index.get_products('AmazonEC2', 'eu-west-1')['PriceList']) == 2
+
+    with open(OFFER_FILE) as offer_file:
+        offer = json.load(offer_file)
+    del offer['products']['SKUB2']
+    smaller = tmp_path / 'smaller.json'
+    smaller.write_text(json.dumps(offer))
+    partitions = build_price_index(read_offer_file(str(smaller)), index_dir, region='us-east-1')
+
+    assert [(p.region, p.products) for p in partitions] == [('eu-west-1', 1), ('us-east-1', 6)]
+    assert skus(index.get_products('AmazonEC2', 'eu-west-1')) == ['SKUB1']
+    assert sorted(os.listdir(os.path.join(index_dir, 'AmazonEC2'))) == [
+        'eu-west-1',
+        'global',
+        'us-east-1',
+    ]
+
+
+def test_build_price_index_requires_offer_code(tmp_path):
+    """Test that a file without offer code is not indexed."""
+    with pytest.raises(ValueError, match='offerCode'):
+        build_price_index(['{"products": {}, "terms": {}}'], str(tmp_path))
+
+
+@pytest.mark.asyncio
+async def test_get_pricing_answers_from_the_index(index_dir, mock_context):
+    """Test that get_pricing answers from the index without creating an API client."""
+    with (
+        patch('awslabs.aws_pricing_mcp_server.server.price_index', PriceIndex(index_dir)),
+        patch('awslabs.aws_pricing_mcp_server.server.get_pricing_client') as get_client,
+    ):
+        result = await get_pricing(
+            mock_context,
+            'AmazonEC2',
+            'us-east-1',
+            filters=[PricingFilter(Field='instanceType', Value='m5.large')],
+            max_results=1,
+        )
+
+    get_client.assert_not_called()
+    assert result['status'] == 'success'
+    assert result['message'].endswith('from local price index')
+    assert result['next_token'] == 'index:1'
+    assert len(result['data']) == 1
+    assert result['data'][0]['product']['sku'] == 'SKUA1'
+
+
+@pytest.mark.asyncio
+async def test_get_pricing_falls_back_to_the_api(index_dir, mock_context):
+    """Test that regions missing from the index, and API tokens, go to the Pricing API."""
+    with (
+        patch('awslabs.aws_pricing_mcp_server.server.price_index', PriceIndex(index_dir)),
+        patch('awslabs.aws_pricing_mcp_server.server.get_pricing_client') as get_client,
+    ):
+        get_client.return_value.get_products.return_value = {'PriceList': []}
+        await get_pricing(mock_context, 'AmazonEC2', ['us-east-1', 'ap-south-1'])
+        await get_pricing(mock_context, 'AmazonEC2', 'us-east-1', next_token='api-token')
+
+    assert get_client.return_value.get_products.call_count == 2
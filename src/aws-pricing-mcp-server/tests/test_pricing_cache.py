@@ -0,0 +1,181 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for the discovery cache of Pricing API results."""
+
+import pytest
+import threading
+import time
+from awslabs.aws_pricing_mcp_server.pricing_cache import PricingCache
+from awslabs.aws_pricing_mcp_server.server import (
+    get_pricing_attribute_values,
+    get_pricing_service_attributes,
+    get_pricing_service_codes,
+)
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+
+
+@pytest.fixture
+def executor():
+    """Create a single thread executor for background refreshes."""
+    executor = ThreadPoolExecutor(max_workers=1)
+    yield executor
+    executor.shutdown(wait=True)
+
+
+def wait_for_refreshes(executor):
+    """Wait for the refreshes submitted to a single thread executor."""
+    executor.submit(lambda: None).result()
+
+
+def later(seconds):
+    """Patch the clock of the cache to a time some seconds from now."""
+    return patch(
+        'awslabs.aws_pricing_mcp_server.pricing_cache.time.time',
+        return_value=time.time() + seconds,
+    )
+
+
+def test_fresh_entries_are_served_from_the_cache(executor):
+    """Test that an entry younger than the TTL is served without calling the API."""
+    cache = PricingCache(None, ttl=60, executor=executor)
+    fetch = MagicMock(return_value=['AmazonEC2'])
+
+    assert cache.get('service_codes', fetch) == ['AmazonEC2']
+    assert cache.get('service_codes', fetch) == ['AmazonEC2']
+    assert fetch.call_count == 1
+
+
+def test_stale_entries_are_refreshed_in_the_background(executor):
+    """Test that an entry older than the TTL is served while it is refreshed once."""
+    cache = PricingCache(None, ttl=60, max_age=3600, executor=executor)
+    cache.get('service_codes', lambda: ['AmazonEC2'])
+    release = threading.Event()
+
+    def describe_services():
+        # The refresh is held until the stale entry has been served twice
+        release.wait(timeout=5)
+        return ['AmazonEC2', 'AmazonS3']
+
+    fetch = MagicMock(side_effect=describe_services)
+
+    with later(120):
+        assert cache.get('service_codes', fetch) == ['AmazonEC2']
+        assert cache.get('service_codes', fetch) == ['AmazonEC2']
+        release.set()
+        wait_for_refreshes(executor)
+
+    assert fetch.call_count == 1
+    assert cache.get('service_codes', fetch) == ['AmazonEC2', 'AmazonS3']
+
+
+def test_failed_refreshes_keep_the_entry(executor):
+    """Test that an entry is still served when its background refresh fails."""
+    cache = PricingCache(None, ttl=60, max_age=3600, executor=executor)
+    cache.get('service_codes', lambda: ['AmazonEC2'])
+
+    with later(120):
+        assert cache.get('service_codes', MagicMock(side_effect=Exception('Throttled'))) == [
+            'AmazonEC2'
+        ]
+        wait_for_refreshes(executor)
+        assert cache.get('service_codes', MagicMock(side_effect=Exception('Throttled'))) == [
+            'AmazonEC2'
+        ]
+
+
+def test_expired_entries_and_empty_results_are_fetched_again(executor):
+    """Test that entries older than the maximum age, and empty results, are not served."""
+    cache = PricingCache(None, ttl=60, max_age=3600, executor=executor)
+    cache.get('service_codes', lambda: ['AmazonEC2'])
+    fetch = MagicMock(return_value=['AmazonS3'])
+
+    with later(7200):
+        assert cache.get('service_codes', fetch) == ['AmazonS3']
+    assert cache.get('attribute_values/AmazonEC2/unknown', list) == []
+    assert cache.get('attribute_values/AmazonEC2/unknown', lambda: ['value']) == ['value']
+
+
+def test_entries_persist_in_the_cache_file(tmp_path, executor):
+    """Test that entries are read back by another cache on the same file."""
+    path = str(tmp_path / 'cache' / 'pricing.sqlite')
+    cache = PricingCache(path, namespace='us-east-1', executor=executor)
+    cache.get('service_attributes/AmazonEC2', lambda: [{'AttributeNames': ['instanceType']}])
+    cache.close()
+
+    reopened = PricingCache(path, namespace='us-east-1', executor=executor)
+    fetch = MagicMock(return_value=[])
+    assert reopened.get('service_attributes/AmazonEC2', fetch) == [
+        {'AttributeNames': ['instanceType']}
+    ]
+    fetch.assert_not_called()
+
+    other_partition = PricingCache(path, namespace='cn-northwest-1', executor=executor)
+    assert other_partition.get('service_attributes/AmazonEC2', fetch) == []
+
+    reopened.clear()
+    assert reopened.get('service_attributes/AmazonEC2', fetch) == []
+    assert fetch.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_discovery_tools_reuse_cached_results(mock_context):
+    """Test that repeated discovery calls only reach the API once."""
+    pricing_client = MagicMock()
+    pricing_client.describe_services.return_value = {
+        'Services': [{'ServiceCode': 'AmazonEC2', 'AttributeNames': ['instanceType']}]
+    }
+    pricing_client.get_attribute_values.return_value = {'AttributeValues': [{'Value': 'm5.large'}]}
+
+    with patch(
+        'awslabs.aws_pricing_mcp_server.server.get_pricing_client', return_value=pricing_client
+    ):
+        for _ in range(2):
+            assert await get_pricing_service_codes(mock_context) == ['AmazonEC2']
+            assert await get_pricing_service_attributes(mock_context, 'AmazonEC2') == [
+                'instanceType'
+            ]
+            assert await get_pricing_attribute_values(
+                mock_context, 'AmazonEC2', ['instanceType']
+            ) == {'instanceType': ['m5.large']}
+
+    assert pricing_client.describe_services.call_count == 2
+    assert pricing_client.get_attribute_values.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_attribute_values_are_fetched_concurrently(mock_context):
+    """Test that the values of several attributes are fetched at the same time."""
+    barrier = threading.Barrier(3, timeout=5)
+
+    def get_attribute_values(ServiceCode, AttributeName, **kwargs):
+        # Every call waits for the others, so sequential calls would break the barrier
+        barrier.wait()
+        return {'AttributeValues': [{'Value': f'{AttributeName}-value'}]}
+
+    pricing_client = MagicMock()
+    pricing_client.get_attribute_values.side_effect = get_attribute_values
+
+    with patch(
+        'awslabs.aws_pricing_mcp_server.server.get_pricing_client', return_value=pricing_client
+    ):
+        result = await get_pricing_attribute_values(
+            mock_context, 'AmazonEC2', ['instanceType', 'location', 'tenancy']
+        )
+
+    assert result == {
+        'instanceType': ['instanceType-value'],
+        'location': ['location-value'],
+        'tenancy': ['tenancy-value'],
+    }
@@ -18,6 +18,7 @@ import pytest
 from awslabs.aws_pricing_mcp_server.pricing_client import (
     create_pricing_client,
     get_currency_for_region,
+    get_pricing_client,
     get_pricing_region,
 )
 from unittest.mock import Mock, patch
@@ -167,6 +168,28 @@ class TestCreatePricingClient:
         assert result == mock_client
 
 
+class TestGetPricingClient:
+    """Tests for the shared pricing client."""
+
+    @patch('awslabs.aws_pricing_mcp_server.pricing_client.create_pricing_client')
+    def test_client_is_created_once(self, mock_create):
+        """Test that all calls share the client created by the first one."""
+        assert get_pricing_client() is get_pricing_client()
+        mock_create.assert_called_once_with()
+
+    @patch('awslabs.aws_pricing_mcp_server.pricing_client.create_pricing_client')
+    def test_failed_creation_is_retried(self, mock_create):
+        """Test that a client that could not be created is created by the next call."""
+        client = Mock()
+        mock_create.side_effect = [Exception('No credentials'), client]
+
+        with pytest.raises(Exception, match='No credentials'):
+            get_pricing_client()
+        assert get_pricing_client() is client
+        assert get_pricing_client() is client
+        assert mock_create.call_count == 2
+
+
 class TestGetCurrencyForRegion:
     """Tests for the get_currency_for_region function."""
 
@@ -19,7 +19,9 @@ import pytest
 from awslabs.aws_pricing_mcp_server.models import OutputOptions
 from awslabs.aws_pricing_mcp_server.pricing_transformer import (
     _is_free_product,
+    serialized_length,
     transform_pricing_data,
+    transform_pricing_page,
 )
 
 
@@ -792,3 +794,38 @@ class TestExcludeFreeProductsFiltering:
     def test_is_free_product_helper_function(self, item, expected):
         """Test the _is_free_product helper function with various inputs."""
         assert _is_free_product(item) is expected
+
+
+class TestTransformPricingPage:
+    """Tests for the budget-aware transformation of a page of pricing records."""
+
+    RECORDS = [json.dumps({'sku': f'SKU{i}', 'product': {}}) for i in range(5)]
+
+    def test_records_within_the_budget(self):
+        """Test that records are returned until the next one would exceed the budget."""
+        size = serialized_length({'sku': 'SKU0', 'product': {}})
+        page = transform_pricing_page(self.RECORDS, None, max_characters=size * 2 + 1)
+
+        assert [record['sku'] for record in page.records] == ['SKU0', 'SKU1']
+        assert page.characters == size * 2
+        assert page.consumed == 2
+        assert page.complete is False
+
+    def test_resume_from_start(self):
+        """Test that a page resumes from the first record not returned."""
+        page = transform_pricing_page(self.RECORDS, None, start=3)
+
+        assert [record['sku'] for record in page.records] == ['SKU3', 'SKU4']
+        assert page.consumed == 5
+        assert page.complete is True
+
+    def test_records_past_the_budget_are_not_decoded(self):
+        """Test that only the record exceeding the budget is decoded past it."""
+        records = self.RECORDS[:2] + ['{invalid json']
+        page = transform_pricing_page(records, None, max_characters=30)
+
+        assert len(page.records) == 1
+        assert page.consumed == 1
+        assert page.complete is False
+        with pytest.raises(ValueError, match='at index 2'):
+            transform_pricing_page(records, None)
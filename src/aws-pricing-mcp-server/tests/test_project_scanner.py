@@ -0,0 +1,135 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for the project scanner of the Terraform and CDK analyzers."""
+
+import os
+import pytest
+from awslabs.aws_pricing_mcp_server import project_scanner
+from awslabs.aws_pricing_mcp_server.cdk_analyzer import CDKAnalyzer, analyze_cdk_project
+from awslabs.aws_pricing_mcp_server.project_scanner import (
+    ScanCache,
+    analyze_files,
+    find_source_files,
+    shutdown_process_pool,
+)
+from awslabs.aws_pricing_mcp_server.terraform_analyzer import (
+    TerraformAnalyzer,
+    analyze_terraform_project,
+)
+from unittest.mock import patch
+
+
+def write(path, text):
+    """Write a file, creating its directory."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+    return path
+
+
+def names(result):
+    """Get the names of the services of an analysis result."""
+    return sorted(service['name'] for service in result['services'])
+
+
+def test_find_source_files_prunes_dependencies(tmp_path):
+    """Test that dependency and build directories are not walked."""
+    write(tmp_path / 'main.tf', '')
+    write(tmp_path / 'live' / 'prod.hcl', '')
+    write(tmp_path / 'modules' / 'db' / 'main.tf', '')
+    write(tmp_path / '.terraform' / 'modules' / 'vpc' / 'main.tf', '')
+    write(tmp_path / 'node_modules' / 'aws-cdk-lib' / 'index.ts', '')
+    write(tmp_path / 'cdk.out' / 'asset' / 'handler.py', '')
+
+    files = find_source_files(tmp_path, ('.tf', '.hcl', '.ts', '.py'))
+
+    assert [path.relative_to(tmp_path).as_posix() for path in files] == [
+        'main.tf',
+        'modules/db/main.tf',
+        'live/prod.hcl',
+    ]
+
+
+@pytest.mark.asyncio
+async def test_unchanged_files_are_not_analyzed_again(tmp_path):
+    """Test that only files whose modification time or size changed are analyzed again."""
+    write(tmp_path / 'app.py', 'from aws_cdk.aws_lambda import Function\n')
+    stack = write(tmp_path / 'lib' / 'stack.ts', "import * as s3 from 'aws-cdk-lib/aws-s3';\n")
+    write(tmp_path / 'node_modules' / 'lib.ts', "import * as sqs from 'aws-cdk-lib/aws-sqs';\n")
+
+    with patch.object(CDKAnalyzer, '_analyze_file', autospec=True) as analyze_file:
+        analyze_file.side_effect = lambda self, path: [{'name': path.stem, 'source': 'cdk'}]
+        assert names(await analyze_cdk_project(str(tmp_path))) == ['app', 'stack']
+        assert analyze_file.call_count == 2
+
+        assert names(await analyze_cdk_project(str(tmp_path))) == ['app', 'stack']
+        assert analyze_file.call_count == 2
+
+        stack.write_text("import * as s3 from 'aws-cdk-lib/aws-s3';\n// changed\n")
+        await analyze_cdk_project(str(tmp_path))
+        assert analyze_file.call_count == 3
+        assert analyze_file.call_args.args[1] == stack
+
+
+@pytest.mark.asyncio
+async def test_files_using_local_modules_are_not_cached(tmp_path):
+    """Test that Terraform files using local modules see changes of the modules."""
+    write(tmp_path / 'main.tf', 'module "app" {\n  source = "./modules/app"\n}\n')
+    module = write(
+        tmp_path / 'modules' / 'app' / 'main.tf', 'resource "aws_s3_bucket" "assets" {}\n'
+    )
+
+    assert names(await analyze_terraform_project(str(tmp_path))) == ['s3', 's3']
+
+    module.write_text('resource "aws_sqs_queue" "jobs" {}\n')
+    assert names(await analyze_terraform_project(str(tmp_path))) == ['sqs', 'sqs']
+
+
+def test_results_persist_in_the_cache_file(tmp_path):
+    """Test that results are read back by another cache on the same file."""
+    source = write(tmp_path / 'project' / 'main.tf', 'resource "aws_instance" "web" {}\n')
+    stat = os.stat(source)
+    results = [{'name': 'instance', 'source': 'terraform', 'provider': 'aws'}]
+    path = str(tmp_path / 'cache' / 'scan.sqlite')
+    cache = ScanCache(path)
+    cache.put_many('terraform', [(str(source), stat, results)])
+    cache.close()
+
+    reopened = ScanCache(path)
+    assert reopened.get('terraform', str(source), stat) == results
+    assert reopened.get('cdk', str(source), stat) is None
+
+    source.write_text('resource "aws_instance" "web" {}\nresource "aws_eip" "web" {}\n')
+    assert reopened.get('terraform', str(source), os.stat(source)) is None
+
+
+def test_files_are_analyzed_in_the_process_pool(tmp_path):
+    """Test that enough files are analyzed in worker processes, in the order of the files."""
+    files = [
+        write(tmp_path / f'stack{i}.tf', f'resource "aws_{name}_thing" "x" {{}}\n')
+        for i, name in enumerate(['s3', 'sqs', 'sns', 'ec2', 'rds'])
+    ]
+    analyzer = TerraformAnalyzer(str(tmp_path))
+
+    try:
+        with (
+            patch.object(project_scanner, 'SCAN_MAX_WORKERS', 2),
+            patch.object(project_scanner, 'SCAN_PROCESS_POOL_MIN_FILES', 1),
+        ):
+            analyzed = analyze_files(files, analyzer._analyze_file, 'terraform')
+    finally:
+        shutdown_process_pool()
+
+    assert [(path, results[0]['name']) for path, results in analyzed] == list(
+        zip(files, ['s3', 'sqs', 'sns', 'ec2', 'rds'])
+    )
@@ -363,7 +363,7 @@ class TestGetPricing:
     async def test_get_pricing_client_creation_error(self, mock_context):
         """Test handling of client creation errors."""
         with patch(
-            'awslabs.aws_pricing_mcp_server.server.create_pricing_client',
+            'awslabs.aws_pricing_mcp_server.server.get_pricing_client',
             side_effect=Exception('Client creation failed'),
         ):
             result = await get_pricing(mock_context, 'AWSLambda', 'us-west-2')
@@ -391,21 +391,52 @@ class TestGetPricing:
         pricing_client.get_products.return_value = {'PriceList': large_price_list}
 
         with patch('boto3.Session', return_value=mock_boto3.Session()):
-            result = await get_pricing(
+            first = await get_pricing(
                 mock_context, 'AmazonEC2', 'us-east-1', max_allowed_characters=10000
             )
+            assert first['status'] == 'success'
+            assert 0 < len(first['data']) < 100
+            assert first['next_token'].startswith('resume:')
+            assert 'pass next_token to get the next records' in first['message']
+
+            second = await get_pricing(
+                mock_context,
+                'AmazonEC2',
+                'us-east-1',
+                max_allowed_characters=10000,
+                next_token=first['next_token'],
+            )
+
+        assert second['status'] == 'success'
+        assert second['data'][0]['sku'] == f'SKU{len(first["data"]):03d}'
+        assert pricing_client.get_products.call_args.kwargs.get('NextToken') is None
+
+        # A single record larger than the budget is still an error
+        with patch('boto3.Session', return_value=mock_boto3.Session()):
+            result = await get_pricing(
+                mock_context, 'AmazonEC2', 'us-east-1', max_allowed_characters=100
+            )
 
         assert result['status'] == 'error'
         assert result['error_type'] == 'result_too_large'
-        assert 'exceeding the limit of 10,000' in result['message']
+        assert 'exceeding the limit of 100' in result['message']
         assert 'output_options={"pricing_terms": ["OnDemand"]}' in result['message']
         assert 'significantly reduce response size' in result['suggestion']
-        assert result['total_count'] == 100
-        assert result['max_allowed_characters'] == 10000
-        assert len(result['sample_records']) == 3  # First 3 records as context
-        assert 'Add more specific filters' in result['suggestion']
+        assert result['record_characters'] > 100
+        assert result['max_allowed_characters'] == 100
         mock_context.error.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_get_pricing_invalid_continuation_token(self, mock_boto3, mock_context):
+        """Test that a malformed continuation token is an error."""
+        with patch('boto3.Session', return_value=mock_boto3.Session()):
+            result = await get_pricing(
+                mock_context, 'AmazonEC2', 'us-east-1', next_token='resume:not-a-token'
+            )
+
+        assert result['status'] == 'error'
+        assert result['error_type'] == 'invalid_next_token'
+
     @pytest.mark.asyncio
     async def test_get_pricing_unlimited_results(self, mock_boto3, mock_context):
         """Test that max_allowed_characters=-1 allows unlimited results."""
@@ -445,14 +476,13 @@ class TestGetPricing:
             assert result['status'] == 'success'
             assert len(result['data']) == 10
 
-            # Should fail with threshold of 100 characters (records are too large)
+            # Should stop within a threshold of 100 characters, and resume from there
             result = await get_pricing(
                 mock_context, 'AmazonEC2', 'us-east-1', None, max_allowed_characters=100
             )
-            assert result['status'] == 'error'
-            assert result['error_type'] == 'result_too_large'
-            assert result['total_count'] == 10
-            assert result['max_allowed_characters'] == 100
+            assert result['status'] == 'success'
+            assert [record['sku'] for record in result['data']] == ['SKU0', 'SKU1', 'SKU2']
+            assert result['next_token'].startswith('resume:')
 
     @pytest.mark.asyncio
     @pytest.mark.parametrize(
@@ -750,7 +780,7 @@ class TestGetPricingServiceAttributes:
     async def test_get_pricing_service_attributes_client_creation_error(self, mock_context):
         """Test handling of client creation errors."""
         with patch(
-            'awslabs.aws_pricing_mcp_server.server.create_pricing_client',
+            'awslabs.aws_pricing_mcp_server.server.get_pricing_client',
             side_effect=Exception('Client creation failed'),
         ):
             result = await get_pricing_service_attributes(mock_context, 'AmazonEC2')
@@ -971,7 +1001,7 @@ class TestGetPricingAttributeValues:
     async def test_get_pricing_attribute_values_client_creation_error(self, mock_context):
         """Test handling of client creation errors."""
         with patch(
-            'awslabs.aws_pricing_mcp_server.server.create_pricing_client',
+            'awslabs.aws_pricing_mcp_server.server.get_pricing_client',
             side_effect=Exception('Client creation failed'),
         ):
             result = await get_pricing_attribute_values(
@@ -1042,7 +1072,7 @@ class TestServerIntegration:
         """Test error handling scenarios for get_pricing_service_codes."""
         if error_scenario == 'client_creation_failed':
             with patch(
-                'awslabs.aws_pricing_mcp_server.server.create_pricing_client',
+                'awslabs.aws_pricing_mcp_server.server.get_pricing_client',
                 side_effect=Exception('Client creation failed'),
             ):
                 result = await get_pricing_service_codes(mock_context)
@@ -0,0 +1,54 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for the base of the SQLite caches."""
+
+from awslabs.aws_pricing_mcp_server.sqlite_cache import SQLiteCache
+
+
+class NameCache(SQLiteCache[str, str]):
+    """Cache of names, stored in a table of its own."""
+
+    description = 'name cache'
+    table = 'names'
+    schema = 'CREATE TABLE IF NOT EXISTS names (name TEXT PRIMARY KEY)'
+
+
+def test_caches_without_a_path_have_no_file():
+    """Test that a cache without a path keeps its entries in memory only."""
+    cache = NameCache(None)
+    cache._entries['a'] = 'a'
+
+    assert cache._connect() is None
+    cache.clear()
+    cache.close()
+    assert cache._entries == {}
+
+
+def test_cache_files_are_reopened_after_close(tmp_path):
+    """Test that the file is created with its directory, and reopened by the next use."""
+    path = str(tmp_path / 'cache' / 'names.sqlite')
+    cache = NameCache(path)
+    connection = cache._connect()
+    assert connection is not None
+    assert cache._connect() is connection
+    with connection:
+        connection.execute("INSERT INTO names (name) VALUES ('a')")
+    cache.close()
+
+    connection = cache._connect()
+    assert connection is not None
+    assert connection.execute('SELECT name FROM names').fetchall() == [('a',)]
+    cache.clear()
+    assert connection.execute('SELECT name FROM names').fetchall() == []
+    cache.close()
@@ -216,6 +216,54 @@ class Constants:
     # Default directory for storing indices
     DEFAULT_INDEX_DIR = '.git_repo_research'
 
+    # Directory of the embedding cache shared by all indices, inside the index directory
+    EMBEDDING_CACHE_DIR = '.embedding_cache'
+
+    # Maximum size of the embedding cache, about 170,000 vectors of 1024 dimensions
+    EMBEDDING_CACHE_MAX_BYTES = 700 * 1024 * 1024
+
+    # Maximum size of the index files of the indices kept loaded between searches
+    INDEX_CACHE_MAX_BYTES = 1024 * 1024 * 1024
+
+    # Number of candidates taken from each of the vector and lexical rankings of a search
+    SEARCH_CANDIDATES = 50
+
+    # Rank offset of reciprocal rank fusion, damping the weight of the first ranks
+    RRF_K = 60
+
+    # Maximum number of processes reading and chunking files
+    CHUNKING_MAX_WORKERS = 8
+
+    # Number of files read and chunked by a process at a time
+    CHUNKING_BATCH_FILES = 32
+
+    # Number of chunks embedded by a single call to the embedding model
+    EMBEDDING_BATCH_SIZE = 32
+
+    # Number of embedding batches embedded concurrently, keeping the embedding requests fed
+    EMBEDDING_BATCHES_IN_FLIGHT = 2
+
+    # Number of Bedrock embedding requests in flight when embedding starts
+    EMBEDDING_INITIAL_CONCURRENCY = 4
+
+    # Maximum number of Bedrock embedding requests in flight, reached while none is throttled
+    EMBEDDING_MAX_CONCURRENCY = 32
+
+    # Maximum number of attempts of a throttled embedding request
+    EMBEDDING_MAX_ATTEMPTS = 8
+
+    # Delay before retrying a throttled embedding request, doubled on every attempt
+    EMBEDDING_BACKOFF_SECONDS = 0.5
+
+    # Maximum delay before retrying a throttled embedding request
+    EMBEDDING_MAX_BACKOFF_SECONDS = 20.0
+
+    # Maximum number of texts embedded by a single request to a Cohere model
+    COHERE_TEXTS_PER_REQUEST = 96
+
+    # Number of chunked batches waiting to be embedded before chunking pauses
+    EMBEDDING_QUEUE_SIZE = 8
+
     # Default patterns for file inclusion
     DEFAULT_INCLUDE_PATTERNS = [
         '**/*.md',
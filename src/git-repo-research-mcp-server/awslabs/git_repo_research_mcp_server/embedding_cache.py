@@ -0,0 +1,451 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Content-addressed embedding cache for Git Repository Research MCP Server.
+
+This module provides a persistent cache of embeddings keyed by the hash of the
+embedded text and of the embedding model, shared by every indexed repository so
+that vendored code, licenses and forks are only embedded once.
+"""
+
+import hashlib
+import mmap
+import numpy as np
+import os
+import struct
+import sys
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from langchain_core.embeddings.embeddings import Embeddings
+from loguru import logger
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple, cast
+
+
+if sys.platform != 'win32':
+    import fcntl
+
+
+DATA_FILE = 'embeddings.bin'
+INDEX_FILE = 'embeddings.idx'
+
+# Data records are the key, the dimension and the float32 vector
+RECORD_HEADER = struct.Struct('<32sI')
+# Index records are the key, the offset of the data record and the dimension
+INDEX_RECORD = struct.Struct('<32sQI')
+
+# Share of the maximum size kept when the cache is compacted
+COMPACTION_RATIO = 0.75
+
+
+def lock_file(file: BinaryIO):
+    """Lock a file against the other processes, waiting for them to unlock it.
+
+    Args:
+        file: Open file to lock
+
+    Windows has no advisory file locks, so there the cache is only shared by the
+    threads of a process.
+    """
+    if sys.platform != 'win32':
+        fcntl.flock(file.fileno(), fcntl.LOCK_EX)
+
+
+def unlock_file(file: BinaryIO):
+    """Unlock a file locked by lock_file.
+
+    Args:
+        file: Open file to unlock
+    """
+    if sys.platform != 'win32':
+        fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+
+
+def get_cache_key(text: str, model_id: str) -> bytes:
+    """Get the cache key of a text embedded with a model.
+
+    Args:
+        text: Embedded text
+        model_id: ID of the embedding model
+
+    Returns:
+        SHA-256 digest of the model ID and the text
+    """
+    digest = hashlib.sha256()
+    digest.update(model_id.encode('utf-8'))
+    digest.update(b'\0')
+    digest.update(text.encode('utf-8'))
+    return digest.digest()
+
+
+class EmbeddingCache:
+    """Persistent cache of embeddings in an append-only memory-mapped file.
+
+    Vectors are appended to a data file read through a memory map, and their
+    offsets to an index file loaded in memory when the cache is opened. Once the
+    data file grows beyond the maximum size, the least recently used vectors are
+    dropped by rewriting the files.
+
+    The files are shared by every server process using the same index directory.
+    Each access locks the data file, then catches up with the vectors appended and
+    the rewrites made by the other processes since the last access.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int):
+        """Open the cache, creating its files if needed.
+
+        Args:
+            cache_dir: Directory of the cache files
+            max_bytes: Maximum size of the data file
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._data_path = os.path.join(cache_dir, DATA_FILE)
+        self._index_path = os.path.join(cache_dir, INDEX_FILE)
+        # Offset and dimension of each vector, from least to most recently used
+        self._entries: 'OrderedDict[bytes, Tuple[int, int]]' = OrderedDict()
+        self._map: Optional[mmap.mmap] = None
+        self._size = 0
+        # Size of the part of the index file loaded into the entries
+        self._index_offset = 0
+        self._index: Optional[BinaryIO] = None
+        self._lock = threading.Lock()
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self._data: BinaryIO = open(self._data_path, 'a+b')
+        # Locking the files loads the index, or rebuilds it when missing
+        with self._lock, self._file_lock():
+            pass
+
+    @property
+    def size_bytes(self) -> int:
+        """Size of the data file."""
+        return self._size
+
+    def __len__(self) -> int:
+        """Number of cached vectors."""
+        return len(self._entries)
+
+    def get_many(self, keys: List[bytes]) -> List[Optional[List[float]]]:
+        """Get the cached vectors of keys.
+
+        Args:
+            keys: Cache keys
+
+        Returns:
+            The vector of each key, or None when it is not cached
+        """
+        with self._lock, self._file_lock():
+            vectors = [self._read(key) for key in keys]
+            hits = sum(vector is not None for vector in vectors)
+            self.hits += hits
+            self.misses += len(keys) - hits
+            return vectors
+
+    def put_many(self, items: Dict[bytes, List[float]]):
+        """Append vectors to the cache.
+
+        Args:
+            items: Vectors by cache key
+        """
+        with self._lock, self._file_lock():
+            index = cast(BinaryIO, self._index)
+            # Other processes may have appended records since this one last wrote
+            offset = self._data.seek(0, os.SEEK_END)
+            for key, vector in items.items():
+                if key in self._entries:
+                    continue
+                values = np.asarray(vector, dtype='<f4')
+                self._data.write(RECORD_HEADER.pack(key, len(values)))
+                self._data.write(values.tobytes())
+                self._entries[key] = (offset, len(values))
+                index.write(INDEX_RECORD.pack(key, offset, len(values)))
+                offset += RECORD_HEADER.size + values.nbytes
+            # The data must reach the file before the index refers to it
+            self._data.flush()
+            index.flush()
+            self._size = offset
+            self._index_offset = index.tell()
+            if self._size > self.max_bytes:
+                self._compact()
+
+    def stats(self) -> Dict[str, float]:
+        """Get the hit rate and the size of the cache.
+
+        Returns:
+            Dictionary with the hits, misses, hit rate, entries and size of the cache
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'entries': len(self._entries),
+                'size_bytes': self._size,
+            }
+
+    def close(self):
+        """Close the files of the cache."""
+        with self._lock:
+            self._close_files()
+
+    @contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        """Lock the data file against the other processes, and load their changes."""
+        while True:
+            lock_file(self._data)
+            if self._is_current():
+                break
+            # The data file was rewritten by another process, whose lock is on the new file
+            unlock_file(self._data)
+            self._close_files()
+            self._data = open(self._data_path, 'a+b')
+        try:
+            self._size = os.fstat(self._data.fileno()).st_size
+            if self._index is None:
+                self._entries = OrderedDict()
+                self._index_offset = 0
+                if os.path.exists(self._index_path):
+                    self._load_index()
+                else:
+                    self._rebuild_index()
+                self._index = open(self._index_path, 'ab')
+                logger.debug(
+                    f'Loaded {len(self._entries)} cached embeddings from {self.cache_dir}'
+                )
+            else:
+                self._load_index()
+            yield
+        finally:
+            unlock_file(self._data)
+
+    def _is_current(self) -> bool:
+        """Check whether the open data file is still the one of the cache directory."""
+        try:
+            current = os.stat(self._data_path)
+        except FileNotFoundError:
+            return False
+        opened = os.fstat(self._data.fileno())
+        return (current.st_dev, current.st_ino) == (opened.st_dev, opened.st_ino)
+
+    def _close_files(self):
+        self._unmap()
+        self._data.close()
+        if self._index is not None:
+            self._index.close()
+            self._index = None
+
+    def _read(self, key: bytes) -> Optional[List[float]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        offset, dimension = entry
+        end = offset + RECORD_HEADER.size + dimension * 4
+        if self._map is None or len(self._map) < end:
+            self._remap()
+        if self._map is None or len(self._map) < end:
+            del self._entries[key]
+            return None
+        stored_key, stored_dimension = RECORD_HEADER.unpack_from(self._map, offset)
+        if stored_key != key or stored_dimension != dimension:
+            # The index refers to a record that was not fully written
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        vector = np.frombuffer(
+            self._map, dtype='<f4', count=dimension, offset=offset + RECORD_HEADER.size
+        )
+        return cast(List[float], vector.tolist())
+
+    def _remap(self):
+        self._unmap()
+        self._data.flush()
+        if self._size:
+            self._map = mmap.mmap(self._data.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def _unmap(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+    def _load_index(self):
+        """Load the index records appended since the index was last loaded."""
+        with open(self._index_path, 'rb') as f:
+            f.seek(self._index_offset)
+            content = f.read()
+        complete = len(content) - len(content) % INDEX_RECORD.size
+        if complete != len(content):
+            # Drop a record interrupted while being appended
+            with open(self._index_path, 'r+b') as f:
+                f.truncate(self._index_offset + complete)
+        for key, offset, dimension in INDEX_RECORD.iter_unpack(content[:complete]):
+            if offset + RECORD_HEADER.size + dimension * 4 <= self._size:
+                self._entries[key] = (offset, dimension)
+        self._index_offset += complete
+
+    def _rebuild_index(self):
+        offset = 0
+        with open(self._index_path, 'wb') as index:
+            self._remap()
+            while self._map is not None and offset + RECORD_HEADER.size <= self._size:
+                key, dimension = RECORD_HEADER.unpack_from(self._map, offset)
+                if offset + RECORD_HEADER.size + dimension * 4 > self._size:
+                    break
+                self._entries[key] = (offset, dimension)
+                index.write(INDEX_RECORD.pack(key, offset, dimension))
+                offset += RECORD_HEADER.size + dimension * 4
+            self._index_offset = index.tell()
+        if offset != self._size:
+            self._data.truncate(offset)
+            self._size = offset
+            self._unmap()
+
+    def _compact(self):
+        """Rewrite the cache with the most recently used vectors only."""
+        budget = int(self.max_bytes * COMPACTION_RATIO)
+        self._remap()
+        if self._map is None:
+            return
+        kept: List[Tuple[bytes, int, int]] = []
+        kept_size = 0
+        for key, (offset, dimension) in reversed(self._entries.items()):
+            record_size = RECORD_HEADER.size + dimension * 4
+            if kept_size + record_size > budget:
+                break
+            kept.append((key, offset, dimension))
+            kept_size += record_size
+        kept.reverse()
+
+        temp_path = f'{self._data_path}.tmp'
+        entries: 'OrderedDict[bytes, Tuple[int, int]]' = OrderedDict()
+        data = open(temp_path, 'w+b')
+        # The new data file is locked before replacing the current one, so that the
+        # other processes wait for its index to be written
+        lock_file(data)
+        for key, offset, dimension in kept:
+            record_size = RECORD_HEADER.size + dimension * 4
+            entries[key] = (data.tell(), dimension)
+            data.write(self._map[offset : offset + record_size])
+        data.flush()
+        evicted = len(self._entries) - len(entries)
+
+        # Closing the previous data file releases its lock
+        self._close_files()
+        # Without an index the data file is scanned again, so a crash cannot leave an
+        # index referring to the offsets of the previous data file
+        os.remove(self._index_path)
+        os.replace(temp_path, self._data_path)
+        with open(self._index_path, 'wb') as f:
+            for key, (offset, dimension) in entries.items():
+                f.write(INDEX_RECORD.pack(key, offset, dimension))
+            self._index_offset = f.tell()
+
+        self._entries = entries
+        self._data = data
+        self._size = data.seek(0, os.SEEK_END)
+        self._index = open(self._index_path, 'ab')
+        logger.info(
+            f'Evicted {evicted} embeddings from the cache, {len(entries)} left in {self._size} bytes'
+        )
+
+
+class CachedEmbeddings(Embeddings):
+    """Embeddings served from an embedding cache before calling the embedding model."""
+
+    def __init__(self, embeddings: Embeddings, cache: EmbeddingCache, model_id: str):
+        """Initialize the cached embeddings.
+
+        Args:
+            embeddings: Embedding model called for the texts missing from the cache
+            cache: Embedding cache
+            model_id: ID of the embedding model, part of the cache keys
+        """
+        self.embeddings = embeddings
+        self.cache = cache
+        self.model_id = model_id
+        # Texts found in and missing from the cache, over every call
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed documents, only calling the embedding model for uncached texts.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            The embedding of each text
+        """
+        keys = [get_cache_key(text, self.model_id) for text in texts]
+        vectors = self.cache.get_many(keys)
+
+        missing: Dict[bytes, str] = {}
+        for key, text, vector in zip(keys, texts, vectors):
+            if vector is None:
+                missing.setdefault(key, text)
+        embedded: Dict[bytes, List[float]] = {}
+        if missing:
+            embedded = dict(zip(missing, self.embeddings.embed_documents(list(missing.values()))))
+            self.cache.put_many(embedded)
+
+        misses = sum(1 for key in keys if key in missing)
+        with self._lock:
+            self.hits += len(texts) - misses
+            self.misses += misses
+        logger.debug(f'Embedding cache: {len(texts) - misses} hits, {misses} misses')
+        return [
+            vector if vector is not None else embedded[key] for key, vector in zip(keys, vectors)
+        ]
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embed a query with the embedding model.
+
+        Args:
+            text: Query to embed
+
+        Returns:
+            The embedding of the query
+        """
+        return self.embeddings.embed_query(text)
+
+    def counters(self) -> Tuple[int, int]:
+        """Get the number of texts found in and missing from the cache so far."""
+        with self._lock:
+            return self.hits, self.misses
+
+
+_caches: Dict[str, EmbeddingCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_embedding_cache(cache_dir: str, max_bytes: int) -> EmbeddingCache:
+    """Get the embedding cache of a directory, shared by the whole process.
+
+    Args:
+        cache_dir: Directory of the cache files
+        max_bytes: Maximum size of the data file
+
+    Returns:
+        EmbeddingCache instance
+    """
+    cache_dir = os.path.abspath(cache_dir)
+    with _caches_lock:
+        cache = _caches.get(cache_dir)
+        if cache is None:
+            cache = _caches[cache_dir] = EmbeddingCache(cache_dir, max_bytes)
+        cache.max_bytes = max_bytes
+        return cache
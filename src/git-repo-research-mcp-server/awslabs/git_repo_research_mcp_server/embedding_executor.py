@@ -0,0 +1,265 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Concurrent embedding executor for Git Repository Research MCP Server.
+
+This module sends the embedding requests of a batch of texts concurrently, with a
+number of requests in flight adapted to throttling by additive increase and
+multiplicative decrease (AIMD), and returns the embeddings in the order of the texts.
+"""
+
+import random
+import threading
+import time
+from awslabs.git_repo_research_mcp_server.defaults import Constants
+from botocore.exceptions import ClientError, HTTPClientError
+from botocore.exceptions import ConnectionError as BotocoreConnectionError
+from concurrent.futures import Future, ThreadPoolExecutor
+from langchain_core.embeddings.embeddings import Embeddings
+from loguru import logger
+from typing import Callable, Dict, List, TypeVar
+
+
+T = TypeVar('T')
+
+# Error codes of requests rejected because of the request rate or the load of the model
+THROTTLING_ERROR_CODES = {
+    'ThrottlingException',
+    'TooManyRequestsException',
+    'ServiceQuotaExceededException',
+    'ServiceUnavailableException',
+}
+
+
+# Error codes of requests failing because of a transient fault of the model or the service
+TRANSIENT_ERROR_CODES = {
+    'InternalServerException',
+    'ModelNotReadyException',
+    'ModelTimeoutException',
+}
+
+
+def is_throttling_error(error: Exception) -> bool:
+    """Check whether an error is a throttled request.
+
+    Args:
+        error: Error raised by the embedding model
+
+    Returns:
+        True if the request was throttled and can be retried later
+    """
+    if isinstance(error, ClientError):
+        return error.response.get('Error', {}).get('Code') in THROTTLING_ERROR_CODES
+    return False
+
+
+def is_transient_error(error: Exception) -> bool:
+    """Check whether an error is a transient fault, other than throttling.
+
+    Args:
+        error: Error raised by the embedding model
+
+    Returns:
+        True if the request failed because of a server or connection fault and can be
+        retried, like the default retries of botocore would
+    """
+    if isinstance(error, (BotocoreConnectionError, HTTPClientError, ConnectionError)):
+        return True
+    if isinstance(error, ClientError):
+        if error.response.get('Error', {}).get('Code') in TRANSIENT_ERROR_CODES:
+            return True
+        return error.response.get('ResponseMetadata', {}).get('HTTPStatusCode', 0) >= 500
+    return False
+
+
+class AdaptiveConcurrencyLimiter:
+    """Limit of requests in flight adapted by additive increase and multiplicative decrease.
+
+    Every successful request raises the limit by 1 / limit, about 1 per limit
+    requests, and a throttled request halves it. Requests that started before the
+    last decrease do not decrease it again, so one burst of throttling halves the
+    limit once.
+    """
+
+    def __init__(
+        self,
+        initial: int,
+        minimum: int,
+        maximum: int,
+        decrease_factor: float = 0.5,
+    ):
+        """Initialize the limiter.
+
+        Args:
+            initial: Initial number of requests in flight
+            minimum: Minimum number of requests in flight
+            maximum: Maximum number of requests in flight
+            decrease_factor: Factor applied to the limit when a request is throttled
+        """
+        self.minimum = minimum
+        self.maximum = maximum
+        self.decrease_factor = decrease_factor
+        self.limit = float(min(max(initial, minimum), maximum))
+        self.in_flight = 0
+        self._epoch = 0
+        self._condition = threading.Condition()
+
+    def acquire(self) -> int:
+        """Wait until a request can be sent.
+
+        Returns:
+            Epoch of the limit the request was sent under, to pass to release
+        """
+        with self._condition:
+            while self.in_flight >= int(self.limit):
+                self._condition.wait()
+            self.in_flight += 1
+            return self._epoch
+
+    def release(self, epoch: int, throttled: bool = False, failed: bool = False):
+        """Record the completion of a request and adapt the limit.
+
+        Args:
+            epoch: Epoch returned by acquire for the request
+            throttled: Whether the request was throttled
+            failed: Whether the request failed otherwise, which leaves the limit unchanged
+        """
+        with self._condition:
+            self.in_flight -= 1
+            if throttled:
+                if epoch == self._epoch:
+                    self.limit = max(self.minimum, self.limit * self.decrease_factor)
+                    self._epoch += 1
+                    logger.info(
+                        f'Embedding requests throttled, limiting to {int(self.limit)} in flight'
+                    )
+            elif not failed:
+                self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            self._condition.notify_all()
+
+
+class ConcurrentEmbeddings(Embeddings):
+    """Embeddings whose requests are sent concurrently under an adaptive concurrency limit.
+
+    The texts of a batch are split into requests of texts_per_request texts, each
+    embedded by a call to the wrapped embedding model from a pool of threads.
+    Throttled requests, and requests failing because of transient faults, are retried
+    with a jittered exponential backoff. Only throttling lowers the concurrency limit.
+    """
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        texts_per_request: int = 1,
+        initial_concurrency: int = Constants.EMBEDDING_INITIAL_CONCURRENCY,
+        max_concurrency: int = Constants.EMBEDDING_MAX_CONCURRENCY,
+        max_attempts: int = Constants.EMBEDDING_MAX_ATTEMPTS,
+        backoff_seconds: float = Constants.EMBEDDING_BACKOFF_SECONDS,
+        max_backoff_seconds: float = Constants.EMBEDDING_MAX_BACKOFF_SECONDS,
+    ):
+        """Initialize the executor.
+
+        Args:
+            embeddings: Embedding model called for each request
+            texts_per_request: Number of texts embedded by a single request
+            initial_concurrency: Initial number of requests in flight
+            max_concurrency: Maximum number of requests in flight
+            max_attempts: Maximum number of attempts of a throttled or failing request
+            backoff_seconds: Delay before the first retry of a request
+            max_backoff_seconds: Maximum delay before retrying a request
+        """
+        self.embeddings = embeddings
+        self.texts_per_request = texts_per_request
+        self.max_attempts = max_attempts
+        self.backoff_seconds = backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self.limiter = AdaptiveConcurrencyLimiter(initial_concurrency, 1, max_concurrency)
+        self.requests = 0
+        self.throttled = 0
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_concurrency, thread_name_prefix='embedding-request'
+        )
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed documents with concurrent requests.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            The embedding of each text, in the order of the texts
+        """
+        futures: List[Future] = [
+            self._pool.submit(self._call, self.embeddings.embed_documents, request)
+            for request in (
+                texts[i : i + self.texts_per_request]
+                for i in range(0, len(texts), self.texts_per_request)
+            )
+        ]
+        vectors: List[List[float]] = []
+        try:
+            for future in futures:
+                vectors.extend(future.result())
+        finally:
+            for future in futures:
+                future.cancel()
+        return vectors
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embed a query under the concurrency limit.
+
+        Args:
+            text: Query to embed
+
+        Returns:
+            The embedding of the query
+        """
+        return self._call(self.embeddings.embed_query, text)
+
+    def stats(self) -> Dict[str, float]:
+        """Get the number of requests, throttled requests and the concurrency limit.
+
+        Returns:
+            Dictionary with the requests, throttled requests and current limit
+        """
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'throttled': self.throttled,
+                'concurrency_limit': int(self.limiter.limit),
+            }
+
+    def _call(self, function: Callable[..., T], *args) -> T:
+        attempt = 1
+        while True:
+            epoch = self.limiter.acquire()
+            throttled = False
+            failed = False
+            try:
+                return function(*args)
+            except Exception as e:
+                throttled = is_throttling_error(e)
+                failed = True
+                if not (throttled or is_transient_error(e)) or attempt >= self.max_attempts:
+                    raise
+                if not throttled:
+                    logger.warning(f'Embedding request failed, retrying: {e}')
+            finally:
+                self.limiter.release(epoch, throttled, failed)
+                with self._lock:
+                    self.requests += 1
+                    self.throttled += throttled
+            delay = min(self.max_backoff_seconds, self.backoff_seconds * 2 ** (attempt - 1))
+            time.sleep(delay * random.uniform(0.5, 1.0))
+            attempt += 1
@@ -18,7 +18,10 @@ using Amazon Bedrock models via LangChain.
 """
 
 import os
+from awslabs.git_repo_research_mcp_server.defaults import Constants
+from awslabs.git_repo_research_mcp_server.embedding_executor import ConcurrentEmbeddings
 from awslabs.git_repo_research_mcp_server.models import EmbeddingModel
+from botocore.config import Config
 from langchain_aws import BedrockEmbeddings
 from langchain_core.embeddings.embeddings import Embeddings
 from loguru import logger
@@ -30,7 +33,7 @@ def create_bedrock_embeddings(
     aws_region: Optional[str] = None,
     aws_profile: Optional[str] = None,
 ) -> Embeddings:
-    """Create and return an instance of BedrockEmbeddings.
+    """Create and return an instance of BedrockEmbeddings sending requests concurrently.
 
     Args:
         model_id: ID of the embedding model to use
@@ -38,7 +41,7 @@ def create_bedrock_embeddings(
         aws_profile: AWS profile to use (optional, uses default if not provided)
 
     Returns:
-        BedrockEmbeddings: An instance of BedrockEmbeddings
+        ConcurrentEmbeddings: BedrockEmbeddings wrapped in a concurrent embedding executor
     """
     aws_region = aws_region or os.environ.get('AWS_REGION', 'us-west-2')
 
@@ -46,9 +49,16 @@ def create_bedrock_embeddings(
         model_id=model_id,
         region_name=aws_region,
         credentials_profile_name=aws_profile,
+        # Failed requests are retried by the executor, which adapts its concurrency to throttling
+        config=Config(
+            max_pool_connections=Constants.EMBEDDING_MAX_CONCURRENCY,
+            retries={'mode': 'standard', 'total_max_attempts': 1},
+        ),
     )
     logger.info(f'Created BedrockEmbeddings with model: {model_id}')
-    return bedrock_embeddings
+    # Cohere models embed several texts per request, Titan models a single one
+    texts_per_request = Constants.COHERE_TEXTS_PER_REQUEST if model_id.startswith('cohere.') else 1
+    return ConcurrentEmbeddings(bedrock_embeddings, texts_per_request=texts_per_request)
 
 
 def get_embedding_model(
@@ -0,0 +1,211 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Resident index cache for Git Repository Research MCP Server.
+
+This module keeps the indices of recently searched repositories loaded in the
+process, so that a search does not read and parse the index files again.
+"""
+
+import os
+import threading
+from awslabs.git_repo_research_mcp_server.defaults import Constants
+from collections import OrderedDict
+from concurrent.futures import Future
+from loguru import logger
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple, TypeVar
+
+
+T = TypeVar('T')
+
+# Files of an index that a loaded index is built from
+INDEX_FILES = ('index.faiss', 'docstore.json', 'index_mapping.json')
+
+# Files that indices of earlier versions do not have
+OPTIONAL_INDEX_FILES = ('lexical_index.npz',)
+
+Fingerprint = Tuple[Tuple[int, int, int], ...]
+
+
+def get_index_fingerprint(index_path: str) -> Optional[Fingerprint]:
+    """Get the inode, size and modification time of the files of an index.
+
+    Args:
+        index_path: Path to the index directory
+
+    Returns:
+        Fingerprint of the index files, or None if one of the required files does not exist
+    """
+    fingerprint = []
+    for name in INDEX_FILES + OPTIONAL_INDEX_FILES:
+        try:
+            stat = os.stat(os.path.join(index_path, name))
+        except OSError:
+            if name in INDEX_FILES:
+                return None
+            fingerprint.append((0, 0, 0))
+            continue
+        fingerprint.append((stat.st_ino, stat.st_size, stat.st_mtime_ns))
+    return tuple(fingerprint)
+
+
+class IndexCache:
+    """LRU cache of loaded indices, bounded by the size of their index files.
+
+    Entries are dropped when their index is saved or deleted by this process, and
+    are reloaded when the fingerprint of the index files changes, which covers an
+    index rewritten by another process. Indices are loaded outside of the lock, so
+    that loading one index does not hold up the lookups of others, and concurrent
+    lookups of an index being loaded wait for that load instead of repeating it.
+    """
+
+    def __init__(self, max_bytes: int):
+        """Initialize an empty cache.
+
+        Args:
+            max_bytes: Maximum total size of the index files of the cached indices
+        """
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries: 'OrderedDict[Tuple[str, Hashable], Tuple[Any, Fingerprint, int]]' = (
+            OrderedDict()
+        )
+        self._size = 0
+        self._loading: Dict[Tuple[str, Hashable], Tuple['Future[Any]', Fingerprint]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def size_bytes(self) -> int:
+        """Total size of the index files of the cached indices."""
+        return self._size
+
+    def __len__(self) -> int:
+        """Number of cached indices."""
+        return len(self._entries)
+
+    def get(self, index_path: str, loader: Callable[[], T], variant: Hashable = None) -> T:
+        """Get the loaded index, loading it on a miss.
+
+        Args:
+            index_path: Path to the index directory
+            loader: Function loading the index
+            variant: Settings the loaded index depends on, like the embedding model
+
+        Returns:
+            The loaded index
+
+        Indices whose files cannot be found are loaded without being cached, so that
+        the loader reports the missing files.
+        """
+        key = (os.path.realpath(index_path), variant)
+        fingerprint = get_index_fingerprint(index_path)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if fingerprint is not None and entry[1] == fingerprint:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[0]
+                self._remove(key)
+            self.misses += 1
+            future: Optional['Future[Any]'] = None
+            owner = False
+            if fingerprint is not None:
+                loading = self._loading.get(key)
+                if loading is not None and loading[1] == fingerprint:
+                    future = loading[0]
+                else:
+                    future = Future()
+                    self._loading[key] = (future, fingerprint)
+                    owner = True
+
+        if fingerprint is None or future is None:
+            return loader()
+        if not owner:
+            # Another lookup is loading the same files
+            return future.result()
+
+        try:
+            index = loader()
+        except BaseException as e:
+            with self._lock:
+                if self._loading.get(key, (None,))[0] is future:
+                    del self._loading[key]
+            future.set_exception(e)
+            raise
+
+        size = sum(file_size for _, file_size, _ in fingerprint)
+        with self._lock:
+            if self._loading.get(key, (None,))[0] is future:
+                del self._loading[key]
+            # A concurrent load of other files of the index may have finished first
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (index, fingerprint, size)
+            self._size += size
+            self._evict()
+        future.set_result(index)
+        logger.debug(f'Loaded index {index_path} into the index cache ({size} bytes)')
+        return index
+
+    def invalidate(self, index_path: str):
+        """Drop the cached copies of an index.
+
+        Args:
+            index_path: Path to the index directory
+        """
+        path = os.path.realpath(index_path)
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == path]:
+                self._remove(key)
+            # Lookups after the invalidation do not wait for loads started before it
+            for key in [key for key in self._loading if key[0] == path]:
+                del self._loading[key]
+
+    def clear(self):
+        """Drop every cached index."""
+        with self._lock:
+            self._entries.clear()
+            self._loading.clear()
+            self._size = 0
+
+    def stats(self) -> Dict[str, float]:
+        """Get the hit rate and the size of the cache.
+
+        Returns:
+            Dictionary with the hits, misses, hit rate, entries and size of the cache
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'entries': len(self._entries),
+                'size_bytes': self._size,
+            }
+
+    def _remove(self, key: Tuple[str, Hashable]):
+        _, _, size = self._entries.pop(key)
+        self._size -= size
+
+    def _evict(self):
+        # The most recently loaded index is kept even when it exceeds the budget alone
+        while self._size > self.max_bytes and len(self._entries) > 1:
+            key = next(iter(self._entries))
+            logger.debug(f'Evicting index {key[0]} from the index cache')
+            self._remove(key)
+
+
+index_cache = IndexCache(Constants.INDEX_CACHE_MAX_BYTES)
@@ -17,26 +17,42 @@ This module provides functionality for creating and managing FAISS indices
 for Git repositories using LangChain's FAISS implementation.
 """
 
+import asyncio
 import faiss
 import json
+import numpy as np
 import os
 import shutil
+import threading
 import time
+import uuid
 from awslabs.git_repo_research_mcp_server.defaults import Constants
+from awslabs.git_repo_research_mcp_server.embedding_cache import (
+    CachedEmbeddings,
+    get_embedding_cache,
+)
 from awslabs.git_repo_research_mcp_server.embeddings import get_embedding_model
+from awslabs.git_repo_research_mcp_server.index_cache import index_cache
+from awslabs.git_repo_research_mcp_server.lexical_index import LexicalIndex
 from awslabs.git_repo_research_mcp_server.models import (
     EmbeddingModel,
     IndexMetadata,
     IndexRepositoryResponse,
 )
 from awslabs.git_repo_research_mcp_server.repository import (
+    Chunk,
+    ChunkLocation,
     cleanup_repository,
     clone_repository,
+    get_changed_files,
+    get_file_extension_stats,
     get_repository_name,
     is_git_repo,
     is_git_url,
-    process_repository,
+    iter_repository_chunks,
+    process_changed_files,
 )
+from awslabs.git_repo_research_mcp_server.utils import load_metadata
 from datetime import datetime
 from git import Repo
 from langchain_community.docstore.in_memory import InMemoryDocstore
@@ -45,7 +61,20 @@ from langchain_core.documents import Document
 from loguru import logger
 from pydantic import BaseModel, field_validator
 from pydantic_core.core_schema import ValidationInfo
-from typing import Any, Dict, List, Optional, Tuple
+from typing import (
+    Any,
+    AsyncGenerator,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+    cast,
+)
 
 
 class RepositoryConfig(BaseModel):
@@ -61,6 +90,7 @@ class RepositoryConfig(BaseModel):
     exclude_patterns: Optional[List[str]] = None
     chunk_size: int = 1000
     chunk_overlap: int = 200
+    incremental: bool = True
 
     @field_validator('repository_path')
     @classmethod
@@ -115,6 +145,7 @@ class IndexConfig(BaseModel):
     aws_region: Optional[str] = None
     aws_profile: Optional[str] = None
     index_dir: Optional[str] = None
+    embedding_cache_max_bytes: int = Constants.EMBEDDING_CACHE_MAX_BYTES
 
     @field_validator('embedding_model')
     @classmethod
@@ -190,6 +221,160 @@ def get_docstore_dict_size(docstore):
     return len(get_docstore_dict(docstore))
 
 
+def create_id_mapped_index(dimension: int) -> faiss.Index:
+    """Create an empty FAISS index whose vectors are addressed by chunk ID.
+
+    Args:
+        dimension: Dimension of the embeddings
+
+    Returns:
+        FAISS index supporting the removal of vectors by ID
+    """
+    return faiss.IndexIDMap2(faiss.IndexFlatL2(dimension))
+
+
+def ensure_id_mapped(vector_store: FAISS) -> FAISS:
+    """Convert the index of a vector store to an index addressed by chunk ID.
+
+    Indexes created by earlier versions store vectors by position, which is also the
+    chunk ID of their documents, so the vectors are copied with their position as ID.
+
+    Args:
+        vector_store: FAISS vector store
+
+    Returns:
+        The vector store, with an index supporting the removal of vectors by ID
+    """
+    index = vector_store.index
+    if isinstance(index, faiss.IndexIDMap):
+        return vector_store
+
+    # The SWIG signature of add_with_ids differs from the numpy wrapper faiss installs
+    id_mapped_index: Any = create_id_mapped_index(index.d)
+    if index.ntotal:
+        id_mapped_index.add_with_ids(
+            index.reconstruct_n(0, index.ntotal), np.arange(index.ntotal, dtype=np.int64)
+        )
+    vector_store.index = id_mapped_index
+    return vector_store
+
+
+def add_embedded_documents(
+    vector_store: FAISS, documents: List[Document], embeddings: List[List[float]]
+):
+    """Add documents and their embeddings to a vector store, under their chunk ID.
+
+    Args:
+        vector_store: FAISS vector store with an ID mapped index
+        documents: Documents with a chunk_id in their metadata
+        embeddings: Embeddings of the documents, in the same order
+    """
+    if not documents:
+        return
+    vectors = np.array(embeddings, dtype=np.float32)
+    faiss.normalize_L2(vectors)
+    chunk_ids = [int(doc.metadata['chunk_id']) for doc in documents]
+    vector_store.index.add_with_ids(vectors, np.array(chunk_ids, dtype=np.int64))
+
+    docstore_dict = ensure_docstore_dict(vector_store.docstore)
+    for chunk_id, doc in zip(chunk_ids, documents):
+        docstore_id = str(uuid.uuid4())
+        docstore_dict[docstore_id] = doc
+        vector_store.index_to_docstore_id[chunk_id] = docstore_id
+
+
+def remove_chunks(vector_store: FAISS, chunk_ids: Iterable[int]) -> int:
+    """Remove chunks and their vectors from a vector store.
+
+    Args:
+        vector_store: FAISS vector store with an ID mapped index
+        chunk_ids: IDs of the chunks to remove
+
+    Returns:
+        Number of vectors removed
+    """
+    chunk_ids = list(chunk_ids)
+    if not chunk_ids:
+        return 0
+    removed = vector_store.index.remove_ids(np.array(chunk_ids, dtype=np.int64))
+    docstore_dict = get_docstore_dict(vector_store.docstore)
+    for chunk_id in chunk_ids:
+        docstore_id = vector_store.index_to_docstore_id.pop(chunk_id, None)
+        if docstore_id is not None:
+            docstore_dict.pop(docstore_id, None)
+    return removed
+
+
+def get_chunk_ids_by_file(vector_store: FAISS) -> Dict[str, List[int]]:
+    """Get the IDs of the chunks of each file of a vector store.
+
+    Args:
+        vector_store: FAISS vector store
+
+    Returns:
+        Dictionary mapping file paths to the IDs of their chunks
+    """
+    docstore_dict = get_docstore_dict(vector_store.docstore)
+    chunk_ids_by_file: Dict[str, List[int]] = {}
+    for chunk_id, docstore_id in vector_store.index_to_docstore_id.items():
+        doc = docstore_dict.get(docstore_id)
+        if doc is not None:
+            chunk_ids_by_file.setdefault(doc.metadata.get('source', 'unknown'), []).append(
+                chunk_id
+            )
+    return chunk_ids_by_file
+
+
+def get_chunk_documents(vector_store: FAISS) -> Dict[int, Document]:
+    """Get the documents of a vector store by chunk ID.
+
+    Args:
+        vector_store: FAISS vector store
+
+    Returns:
+        Dictionary mapping chunk IDs to their documents, ordered by chunk ID
+    """
+    docstore_dict = get_docstore_dict(vector_store.docstore)
+    documents = {}
+    for chunk_id in sorted(vector_store.index_to_docstore_id):
+        doc = docstore_dict.get(vector_store.index_to_docstore_id[chunk_id])
+        if doc is not None:
+            documents[chunk_id] = doc
+    return documents
+
+
+def get_chunk_location(doc: Document) -> ChunkLocation:
+    """Get the file path and lines of the chunk of a document.
+
+    Args:
+        doc: Document of a chunk
+
+    Returns:
+        File path with the first and last line of the chunk, 0 when they are unknown
+    """
+    return (
+        doc.metadata.get('source', 'unknown'),
+        doc.metadata.get('start_line', 0),
+        doc.metadata.get('end_line', 0),
+    )
+
+
+def get_chunk_map(vector_store: FAISS) -> Dict[str, Any]:
+    """Build the chunk map of a vector store, ordered by chunk ID.
+
+    Args:
+        vector_store: FAISS vector store
+
+    Returns:
+        Chunk map with the list of chunks and the file path and lines of each chunk
+    """
+    documents = get_chunk_documents(vector_store).values()
+    return {
+        'chunks': [doc.page_content for doc in documents],
+        'chunk_locations': [get_chunk_location(doc) for doc in documents],
+    }
+
+
 def save_index_without_pickle(vector_store, index_path):
     """Save FAISS index without using pickle.
 
@@ -202,9 +387,11 @@ def save_index_without_pickle(vector_store, index_path):
     """
     os.makedirs(index_path, exist_ok=True)
 
-    # 1. Save FAISS index using faiss's native methods
+    # 1. Save FAISS index using faiss's native methods. Files are replaced rather than
+    # rewritten in place, as searches may have the previous index memory-mapped
     faiss_path = os.path.join(index_path, 'index.faiss')
-    faiss.write_index(vector_store.index, faiss_path)
+    faiss.write_index(vector_store.index, f'{faiss_path}.tmp')
+    os.replace(f'{faiss_path}.tmp', faiss_path)
 
     # 2. Save docstore as JSON
     docstore_path = os.path.join(index_path, 'docstore.json')
@@ -212,15 +399,22 @@ def save_index_without_pickle(vector_store, index_path):
     for doc_id, doc in get_docstore_dict(vector_store.docstore).items():
         docstore_data[doc_id] = {'page_content': doc.page_content, 'metadata': doc.metadata}
 
-    with open(docstore_path, 'w') as f:
+    with open(f'{docstore_path}.tmp', 'w') as f:
         json.dump(docstore_data, f)
+    os.replace(f'{docstore_path}.tmp', docstore_path)
 
     # 3. Save index_to_docstore_id mapping as JSON
     mapping_path = os.path.join(index_path, 'index_mapping.json')
     # Convert numeric keys to strings for JSON serialization
     mapping = {str(k): v for k, v in vector_store.index_to_docstore_id.items()}
-    with open(mapping_path, 'w') as f:
+    with open(f'{mapping_path}.tmp', 'w') as f:
         json.dump(mapping, f)
+    os.replace(f'{mapping_path}.tmp', mapping_path)
+
+    # 4. Save the lexical index of the chunks, searched alongside the vectors
+    LexicalIndex.build(
+        (chunk_id, doc.page_content) for chunk_id, doc in get_chunk_documents(vector_store).items()
+    ).save(index_path)
 
 
 def save_chunk_map_without_pickle(chunk_map, index_path):
@@ -232,14 +426,11 @@ def save_chunk_map_without_pickle(chunk_map, index_path):
 
     This function saves a chunk map using JSON instead of pickle for serialization.
     """
-    # Convert the chunk map to a JSON-serializable format
-    serializable_chunk_map = {'chunks': chunk_map['chunks'], 'chunk_to_file': {}}
-
-    # Convert the chunk_to_file dictionary to a serializable format
-    # Since chunks are not hashable in JSON, we use indices
-    for i, chunk in enumerate(chunk_map['chunks']):
-        if chunk in chunk_map['chunk_to_file']:
-            serializable_chunk_map['chunk_to_file'][str(i)] = chunk_map['chunk_to_file'][chunk]
+    # Locations are stored by chunk position, as identical chunks may be in several files
+    serializable_chunk_map = {
+        'chunks': chunk_map['chunks'],
+        'chunk_locations': [list(location) for location in chunk_map['chunk_locations']],
+    }
 
     # Save as JSON
     chunk_map_path = os.path.join(index_path, 'chunk_map.json')
@@ -267,19 +458,157 @@ def load_chunk_map_without_pickle(index_path):
         with open(chunk_map_path, 'r') as f:
             serialized_map = json.load(f)
 
-        # Reconstruct the chunk-to-file mapping
         chunks = serialized_map['chunks']
-        chunk_to_file = {}
-        for i, chunk in enumerate(chunks):
-            if str(i) in serialized_map['chunk_to_file']:
-                chunk_to_file[chunk] = serialized_map['chunk_to_file'][str(i)]
+        if 'chunk_locations' in serialized_map:
+            chunk_locations = [tuple(location) for location in serialized_map['chunk_locations']]
+        else:
+            # Chunk maps of earlier versions only map chunk positions to file paths
+            chunk_to_file = serialized_map['chunk_to_file']
+            chunk_locations = [
+                (chunk_to_file.get(str(i), 'unknown'), 0, 0) for i in range(len(chunks))
+            ]
 
-        return {'chunks': chunks, 'chunk_to_file': chunk_to_file}
+        return {'chunks': chunks, 'chunk_locations': chunk_locations}
     except Exception as e:
         logger.error(f'Error loading chunk map: {e}')
         return None
 
 
+T = TypeVar('T')
+
+
+async def iterate_in_thread(iterator: Iterator[T], max_queued: int) -> AsyncGenerator[T, None]:
+    """Consume a blocking iterator in a worker thread through a bounded queue.
+
+    The worker thread pauses once max_queued items wait to be consumed, so a slow
+    consumer limits how far ahead the iterator runs.
+
+    Args:
+        iterator: Blocking iterator, like one reading and chunking files
+        max_queued: Maximum number of items produced ahead of the consumer
+
+    Yields:
+        The items of the iterator
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue(maxsize=max_queued)
+    stopped = threading.Event()
+    end = object()
+
+    def put(entry) -> bool:
+        try:
+            future = asyncio.run_coroutine_threadsafe(queue.put(entry), loop)
+        except RuntimeError:
+            # The event loop was closed without the consumer finishing
+            return False
+        while True:
+            try:
+                future.result(timeout=0.1)
+                return True
+            except TimeoutError:
+                # A consumer that stopped without closing this generator never frees room
+                if stopped.is_set() or loop.is_closed():
+                    future.cancel()
+                    return False
+
+    def produce():
+        try:
+            for item in iterator:
+                if stopped.is_set() or not put((item, None)):
+                    return
+            put((end, None))
+        except Exception as e:
+            if not stopped.is_set():
+                put((end, e))
+
+    producer = loop.run_in_executor(None, produce)
+    try:
+        while True:
+            item, error = await queue.get()
+            if error is not None:
+                raise error
+            if item is end:
+                break
+            yield item
+    finally:
+        stopped.set()
+        # Unblock the producer waiting for room in the queue so that it sees the stop
+        while not producer.done():
+            while not queue.empty():
+                queue.get_nowait()
+            await asyncio.wait([producer], timeout=0.01)
+
+
+def create_chunk_document(chunk: str, chunk_id: int, location: ChunkLocation) -> Document:
+    """Create the document of a chunk.
+
+    Args:
+        chunk: Text of the chunk
+        chunk_id: ID of the chunk
+        location: File path with the first and last line of the chunk
+
+    Returns:
+        Document with the file path, chunk ID and lines of the chunk in its metadata
+    """
+    file_path, start_line, end_line = location
+    return Document(
+        page_content=chunk,
+        metadata={
+            'source': file_path,
+            'chunk_id': chunk_id,
+            'start_line': start_line,
+            'end_line': end_line,
+        },
+    )
+
+
+class DocumentBatcher:
+    """Groups the chunks of files into batches of documents, recording every chunk seen."""
+
+    def __init__(self, file_chunks: Iterator[Tuple[str, List[Chunk]]], batch_size: int):
+        """Initialize the batcher.
+
+        Args:
+            file_chunks: Paths of text files with their chunks
+            batch_size: Number of documents in a batch
+        """
+        self.file_chunks = file_chunks
+        self.batch_size = batch_size
+        self.chunks: List[str] = []
+        self.chunk_locations: List[ChunkLocation] = []
+        self.text_files: List[str] = []
+
+    def __iter__(self) -> Iterator[List[Document]]:
+        """Iterate over batches of documents, with chunk IDs in the order of the chunks."""
+        batch = []
+        for file_path, file_chunks in self.file_chunks:
+            self.text_files.append(file_path)
+            for chunk in file_chunks:
+                location = (file_path, chunk.start_line, chunk.end_line)
+                batch.append(create_chunk_document(chunk.text, len(self.chunks), location))
+                self.chunks.append(chunk.text)
+                self.chunk_locations.append(location)
+                if len(batch) >= self.batch_size:
+                    yield batch
+                    batch = []
+        if batch:
+            yield batch
+
+
+def get_cache_counters(embedding_generator) -> Optional[Tuple[int, int]]:
+    """Get the hits and misses of an embedding function backed by the embedding cache.
+
+    Args:
+        embedding_generator: Embedding function
+
+    Returns:
+        Texts found in and missing from the cache so far, or None without a cache
+    """
+    if isinstance(embedding_generator, CachedEmbeddings):
+        return embedding_generator.counters()
+    return None
+
+
 class RepositoryIndexer:
     """Indexer for Git repositories using LangChain's FAISS implementation.
 
@@ -307,6 +636,16 @@ class RepositoryIndexer:
             aws_region=self.aws_region,
             aws_profile=self.aws_profile,
         )
+        if config.embedding_cache_max_bytes > 0:
+            # Serve embeddings computed for any indexed repository from the shared cache
+            self.embedding_generator = CachedEmbeddings(
+                self.embedding_generator,
+                get_embedding_cache(
+                    os.path.join(self.index_dir, Constants.EMBEDDING_CACHE_DIR),
+                    config.embedding_cache_max_bytes,
+                ),
+                self.embedding_model,
+            )
 
     def _get_index_path(self, repository_name: str) -> str:
         """Get the path to the index directory for a repository.
@@ -382,11 +721,31 @@ class RepositoryIndexer:
             if ctx:
                 await ctx.report_progress(0, 100)
 
-            chunks, chunk_to_file, extension_stats = await repo_processor.process_content(
-                repo_path, config, ctx
+            index_path = self._get_index_path(config.output_path or repository_name)
+            if config.incremental:
+                response = await self._update_index(
+                    config, repo_path, repository_name, index_path, start_time, ctx
+                )
+                if response is not None:
+                    return response
+
+            # Step 2: Index creation, embedding batches of chunks while files are chunked
+            batcher = DocumentBatcher(
+                await repo_processor.stream_content(repo_path, config, ctx),
+                Constants.EMBEDDING_BATCH_SIZE,
+            )
+            vector_store = await index_builder.create_vector_store_from_batches(
+                iterate_in_thread(iter(batcher), Constants.EMBEDDING_QUEUE_SIZE),
+                self.embedding_generator,
+                ctx,
+            )
+            chunks, chunk_locations = batcher.chunks, batcher.chunk_locations
+            extension_stats = get_file_extension_stats(batcher.text_files)
+            logger.info(
+                f'Created {len(chunks)} text chunks from {len(batcher.text_files)} text files'
             )
 
-            if not chunks:
+            if vector_store is None:
                 logger.warning('No text chunks found in repository')
                 if ctx:
                     await ctx.info('No text chunks found in repository')
@@ -404,27 +763,21 @@ class RepositoryIndexer:
                     message='No text chunks found in repository',
                 )
 
-            # Step 2: Index creation
-            documents = await index_builder.create_documents(chunks, chunk_to_file, ctx)
-            index_path = self._get_index_path(config.output_path or repository_name)
+            # Step 3: File management
             repo_files_path = os.path.join(index_path, 'repository')
             os.makedirs(repo_files_path, exist_ok=True)
-
-            # Step 3: File management
             await file_manager.copy_repository_files(repo_path, repo_files_path, ctx)
-            vector_store = await index_builder.create_vector_store(
-                documents, self.embedding_generator, ctx
-            )
             index_builder.save_index(vector_store, index_path)
 
             # Save chunk map
-            chunk_map_data = {'chunks': chunks, 'chunk_to_file': chunk_to_file}
+            chunk_map_data = {'chunks': chunks, 'chunk_locations': chunk_locations}
             file_manager.save_chunk_map(chunk_map_data, index_path)
 
             # Step 4: Metadata management
             last_commit_id = await repo_processor.get_commit_id(
                 repo_path, repository_name, config.repository_path
             )
+            dirty_files = await self._get_dirty_files(repo_path, last_commit_id)
 
             metadata = await metadata_manager.create_and_save(
                 {
@@ -433,9 +786,10 @@ class RepositoryIndexer:
                     'index_path': index_path,
                     'repo_files_path': repo_files_path,
                     'chunks': chunks,
-                    'chunk_to_file': chunk_to_file,
+                    'chunk_locations': chunk_locations,
                     'extension_stats': extension_stats,
                     'last_commit_id': last_commit_id,
+                    'dirty_files': dirty_files,
                     'embedding_model': self.embedding_model,
                 },
                 ctx,
@@ -487,12 +841,177 @@ class RepositoryIndexer:
             if temp_dir:
                 cleanup_repository(temp_dir)
 
-    def load_index_without_pickle(self, index_path):
+    async def _update_index(
+        self,
+        config: RepositoryConfig,
+        repo_path: str,
+        repository_name: str,
+        index_path: str,
+        start_time: float,
+        ctx: Optional[Any] = None,
+    ) -> Optional[IndexRepositoryResponse]:
+        """Update an existing index with the files changed since its last commit.
+
+        Only the chunks of added and modified files are embedded, the vectors of
+        modified and removed files are deleted from the index by chunk ID.
+
+        Args:
+            config: RepositoryConfig object with indexing configuration
+            repo_path: Path to the repository
+            repository_name: Name of the repository
+            index_path: Path to the index directory
+            start_time: Time the indexing started
+            ctx: Context object for progress tracking (optional)
+
+        Returns:
+            IndexRepositoryResponse object, or None if the index must be built from scratch
+        """
+        metadata = load_metadata(os.path.join(index_path, 'metadata.json'))
+        if metadata is None or not self._is_index_reusable(metadata, config, index_path):
+            return None
+        last_commit_id = cast(str, metadata.last_commit_id)
+
+        repo_processor = RepositoryProcessor()
+        index_builder = IndexBuilder()
+        file_manager = FileManager()
+
+        changed_files = await asyncio.to_thread(
+            get_changed_files, repo_path, last_commit_id, metadata.dirty_files or ()
+        )
+        if changed_files is None:
+            return None
+
+        message = f'Updating index with {len(changed_files)} files changed since {last_commit_id}'
+        logger.info(message)
+        if ctx:
+            await ctx.info(message)
+            await ctx.report_progress(10, 100)
+
+        # Loading, saving and copying run in threads, so that other tool calls are served
+        vector_store = await asyncio.to_thread(self.load_index_without_pickle, index_path)
+        vector_store = await asyncio.to_thread(ensure_id_mapped, vector_store)
+        repo_files_path = os.path.join(index_path, 'repository')
+        if changed_files:
+            chunks, chunk_locations = await asyncio.to_thread(
+                process_changed_files,
+                repo_path,
+                changed_files,
+                include_patterns=config.include_patterns,
+                exclude_patterns=config.exclude_patterns,
+                chunk_size=config.chunk_size,
+                chunk_overlap=config.chunk_overlap,
+            )
+            await index_builder.update_vector_store(
+                vector_store,
+                changed_files,
+                chunks,
+                chunk_locations,
+                self.embedding_generator,
+                ctx,
+            )
+            await asyncio.to_thread(index_builder.save_index, vector_store, index_path)
+            await file_manager.sync_repository_files(
+                repo_path, repo_files_path, changed_files, ctx
+            )
+
+        chunk_map_data = await asyncio.to_thread(get_chunk_map, vector_store)
+        await asyncio.to_thread(file_manager.save_chunk_map, chunk_map_data, index_path)
+        indexed_files = {file_path for file_path, _, _ in chunk_map_data['chunk_locations']}
+        commit_id = await repo_processor.get_commit_id(
+            repo_path, repository_name, config.repository_path
+        )
+
+        updated_metadata = await MetadataManager().create_and_save(
+            {
+                'repository_name': repository_name,
+                'config': config,
+                'index_path': index_path,
+                'repo_files_path': repo_files_path,
+                'chunks': chunk_map_data['chunks'],
+                'chunk_locations': chunk_map_data['chunk_locations'],
+                'extension_stats': get_file_extension_stats(sorted(indexed_files)),
+                'last_commit_id': commit_id,
+                'dirty_files': await self._get_dirty_files(repo_path, commit_id),
+                'embedding_model': self.embedding_model,
+                'created_at': metadata.created_at,
+            },
+            ctx,
+        )
+
+        execution_time_ms = int((time.time() - start_time) * 1000)
+        logger.info(f'Incremental indexing completed in {execution_time_ms}ms')
+        if ctx:
+            await ctx.info(f'Incremental indexing completed in {execution_time_ms}ms')
+            await ctx.report_progress(100, 100)
+
+        return IndexRepositoryResponse(
+            status='success',
+            repository_name=updated_metadata.repository_name,
+            repository_path=config.repository_path,
+            index_path=index_path,
+            repository_directory=repo_files_path,
+            file_count=updated_metadata.file_count,
+            chunk_count=updated_metadata.chunk_count,
+            embedding_model=self.embedding_model,
+            execution_time_ms=execution_time_ms,
+            message=f'Successfully updated index with {len(changed_files)} changed files, '
+            f'now {updated_metadata.file_count} files and {updated_metadata.chunk_count} chunks',
+        )
+
+    def _is_index_reusable(
+        self, metadata: IndexMetadata, config: RepositoryConfig, index_path: str
+    ) -> bool:
+        """Check if an existing index was built with the same settings and can be updated.
+
+        Args:
+            metadata: Metadata of the existing index
+            config: RepositoryConfig object with indexing configuration
+            index_path: Path to the index directory
+
+        Returns:
+            True if the index can be updated incrementally, False otherwise
+        """
+        if metadata.last_commit_id in (None, 'unknown') or metadata.dirty_files is None:
+            return False
+        if (
+            metadata.embedding_model != self.embedding_model
+            or metadata.chunk_size != config.chunk_size
+            or metadata.chunk_overlap != config.chunk_overlap
+            or metadata.include_patterns != config.include_patterns
+            or metadata.exclude_patterns != config.exclude_patterns
+        ):
+            logger.info('Index settings changed, rebuilding the index')
+            return False
+        return all(
+            os.path.exists(os.path.join(index_path, name))
+            for name in ('index.faiss', 'docstore.json', 'index_mapping.json')
+        )
+
+    async def _get_dirty_files(self, repo_path: str, commit_id: str) -> Optional[List[str]]:
+        """Get the files of the working tree that differ from the commit being indexed.
+
+        Their indexed content is not the one of the commit, so the next update re-indexes
+        them even if they are deleted or reverted by then.
+
+        Args:
+            repo_path: Path to the repository
+            commit_id: ID of the commit being indexed
+
+        Returns:
+            Sorted paths of the dirty files, or None if the repository cannot be diffed
+        """
+        if commit_id == 'unknown':
+            return None
+        dirty_files = await asyncio.to_thread(get_changed_files, repo_path, commit_id)
+        return None if dirty_files is None else sorted(dirty_files)
+
+    def load_index_without_pickle(self, index_path, mmap: bool = False):
         """Load FAISS index without using pickle.
 
         Args:
             index_path: Path to the index
-            embedding_function: Embedding function to use
+            mmap: Whether to memory-map the vectors read-only instead of reading them,
+                so that processes searching the same index share its pages
 
         Returns:
             FAISS vector store
@@ -502,7 +1021,12 @@ class RepositoryIndexer:
         """
         # 1. Load FAISS index using faiss's native methods
         faiss_path = os.path.join(index_path, 'index.faiss')
-        index = faiss.read_index(faiss_path)
+        if mmap:
+            index = faiss.read_index(
+                faiss_path, faiss.IO_FLAG_MMAP | faiss.IO_FLAG_MMAP_IFC | faiss.IO_FLAG_READ_ONLY
+            )
+        else:
+            index = faiss.read_index(faiss_path)
 
         # 2. Load docstore from JSON
         docstore_path = os.path.join(index_path, 'docstore.json')
@@ -571,10 +1095,10 @@ class RepositoryProcessor:
 
         return repo_path, repository_name, temp_dir
 
-    async def process_content(
+    async def stream_content(
         self, repo_path: str, config: RepositoryConfig, ctx: Optional[Any] = None
-    ) -> Tuple[List[str], Dict[str, str], Dict[str, int]]:
-        """Process repository files to get text chunks.
+    ) -> Iterator[Tuple[str, List[Chunk]]]:
+        """Stream the text chunks of the repository files.
 
         Args:
             repo_path: Path to the repository
@@ -582,16 +1106,14 @@ class RepositoryProcessor:
             ctx: Context object for progress tracking (optional)
 
         Returns:
-            Tuple containing:
-            - List of text chunks
-            - Mapping of chunks to file paths
-            - Statistics about file extensions
+            Iterator of the paths of the text files with their chunks and lines, reading and
+            chunking files as it is consumed
         """
         if ctx:
             await ctx.info('Processing repository files...')
             await ctx.report_progress(10, 100)
 
-        chunks, chunk_to_file, extension_stats = process_repository(
+        return iter_repository_chunks(
             repo_path,
             include_patterns=config.include_patterns,
             exclude_patterns=config.exclude_patterns,
@@ -599,11 +1121,6 @@ class RepositoryProcessor:
             chunk_overlap=config.chunk_overlap,
         )
 
-        if ctx:
-            await ctx.report_progress(30, 100)
-
-        return chunks, chunk_to_file, extension_stats
-
     async def get_commit_id(
         self, repo_path: str, repository_name: str, repository_path: str
     ) -> str:
@@ -644,89 +1161,189 @@ class RepositoryProcessor:
 class IndexBuilder:
     """Handles FAISS index creation and management."""
 
-    async def create_documents(
-        self, chunks: List[str], chunk_to_file: Dict[str, str], ctx: Optional[Any] = None
-    ) -> List[Document]:
-        """Convert chunks to LangChain Document objects.
+    async def create_vector_store(
+        self, documents: List[Document], embedding_generator, ctx: Optional[Any] = None
+    ) -> FAISS:
+        """Create a FAISS vector store from documents.
 
         Args:
-            chunks: List of text chunks
-            chunk_to_file: Mapping of chunks to file paths
+            documents: List of LangChain Document objects
+            embedding_generator: Embedding function to use
             ctx: Context object for progress tracking (optional)
 
         Returns:
-            List of LangChain Document objects
+            FAISS vector store
+
+        Raises:
+            ValueError: If there are no documents
         """
-        if ctx:
-            await ctx.info(f'Converting {len(chunks)} chunks to Document objects...')
-            await ctx.report_progress(40, 100)
-
-        documents = []
-        for i, chunk in enumerate(chunks):
-            file_path = chunk_to_file.get(chunk, 'unknown')
-            documents.append(
-                Document(
-                    page_content=chunk,
-                    metadata={'source': file_path, 'chunk_id': i},
-                )
-            )
 
-        logger.debug(f'Number of documents to embed: {len(documents)}')
-        return documents
+        async def batches():
+            for start in range(0, len(documents), Constants.EMBEDDING_BATCH_SIZE):
+                yield documents[start : start + Constants.EMBEDDING_BATCH_SIZE]
 
-    async def create_vector_store(
-        self, documents: List[Document], embedding_generator, ctx: Optional[Any] = None
-    ) -> FAISS:
-        """Create a FAISS vector store from documents.
+        vector_store = await self.create_vector_store_from_batches(
+            batches(), embedding_generator, ctx
+        )
+        if vector_store is None:
+            raise ValueError('No documents to create a vector store from')
+        return vector_store
+
+    async def create_vector_store_from_batches(
+        self,
+        batches: AsyncIterator[List[Document]],
+        embedding_generator,
+        ctx: Optional[Any] = None,
+    ) -> Optional[FAISS]:
+        """Create a FAISS vector store, embedding batches of documents as they arrive.
+
+        Up to EMBEDDING_BATCHES_IN_FLIGHT batches are embedded at once. Documents are added
+        to the index by chunk ID, so batches may complete in any order.
 
         Args:
-            documents: List of LangChain Document objects
+            batches: Batches of LangChain Document objects
             embedding_generator: Embedding function to use
             ctx: Context object for progress tracking (optional)
 
         Returns:
-            FAISS vector store
+            FAISS vector store, or None if there were no documents
         """
         logger.info('Creating FAISS index with LangChain')
         if ctx:
-            await ctx.info('Creating FAISS index...')
-            await ctx.report_progress(70, 100)
+            await ctx.info('Generating embeddings and creating vector store...')
+            await ctx.report_progress(30, 100)
 
-        logger.debug(f'Using embedding function: {embedding_generator}')
+        counters = get_cache_counters(embedding_generator)
+        vector_store: Optional[FAISS] = None
+        in_flight: Set[asyncio.Task] = set()
+
+        async def embed(batch: List[Document]) -> Tuple[List[Document], List[List[float]]]:
+            texts = [doc.page_content for doc in batch]
+            return batch, await asyncio.to_thread(embedding_generator.embed_documents, texts)
+
+        def add_completed(tasks: Set[asyncio.Task]):
+            nonlocal vector_store
+            for task in tasks:
+                batch, embeddings = task.result()
+                if vector_store is None:
+                    vector_store = FAISS(
+                        embedding_function=embedding_generator,
+                        index=create_id_mapped_index(len(embeddings[0])),
+                        docstore=InMemoryDocstore({}),
+                        index_to_docstore_id={},
+                        normalize_L2=True,
+                    )
+                add_embedded_documents(vector_store, batch, embeddings)
 
-        # Test the embedding function
         try:
-            logger.info('Testing embedding function on sample document...')
-            test_content = documents[0].page_content if documents else 'Test content'
-            test_result = embedding_generator.embed_documents([test_content])
-            logger.info(
-                f'Test embedding successful - shape: {len(test_result)}x{len(test_result[0])}'
-            )
-        except Exception as e:
-            logger.error(f'Embedding function test failed: {e}')
+            async for batch in batches:
+                if len(in_flight) >= Constants.EMBEDDING_BATCHES_IN_FLIGHT:
+                    done, in_flight = await asyncio.wait(
+                        in_flight, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    add_completed(done)
+                in_flight.add(asyncio.create_task(embed(batch)))
+            while in_flight:
+                done, in_flight = await asyncio.wait(
+                    in_flight, return_when=asyncio.FIRST_COMPLETED
+                )
+                add_completed(done)
+        except BaseException as e:
+            logger.error(f'Error creating vector store: {e}')
+            for task in in_flight:
+                task.cancel()
+            aclose = getattr(batches, 'aclose', None)
+            if aclose is not None:
+                # Stop the thread producing the batches
+                await aclose()
             raise
 
-        if ctx:
-            await ctx.info('Generating embeddings and creating vector store...')
-            await ctx.report_progress(75, 100)
-
-        logger.debug(f'Number of documents: {len(documents)}')
-
-        try:
-            vector_store = FAISS.from_documents(
-                documents=documents, embedding=embedding_generator, normalize_L2=True
-            )
+        if vector_store is not None:
             logger.debug(
                 f'Created vector store with {get_docstore_dict_size(vector_store.docstore)} documents'
             )
-            return vector_store
-        except Exception as e:
-            logger.error(f'Error creating vector store: {e}')
-            logger.error(f'Document count: {len(documents)}')
-            logger.error(
-                f'First document content: {documents[0].page_content[:100] if documents else "None"}'
+            await self.report_cache_hit_rate(embedding_generator, counters, ctx)
+        return vector_store
+
+    async def update_vector_store(
+        self,
+        vector_store: FAISS,
+        changed_files: Set[str],
+        chunks: List[str],
+        chunk_locations: List[ChunkLocation],
+        embedding_generator,
+        ctx: Optional[Any] = None,
+    ) -> FAISS:
+        """Replace the chunks of changed files in a vector store.
+
+        Args:
+            vector_store: FAISS vector store with an ID mapped index
+            changed_files: Paths of the changed files relative to the repository
+            chunks: Text chunks of the changed files that still exist
+            chunk_locations: File path and lines of each chunk
+            embedding_generator: Embedding function to use
+            ctx: Context object for progress tracking (optional)
+
+        Returns:
+            The updated FAISS vector store
+        """
+        chunk_ids_by_file = await asyncio.to_thread(get_chunk_ids_by_file, vector_store)
+        removed = await asyncio.to_thread(
+            remove_chunks,
+            vector_store,
+            [
+                chunk_id
+                for file_path in changed_files
+                for chunk_id in chunk_ids_by_file.get(file_path, [])
+            ],
+        )
+        logger.info(f'Removed {removed} chunks of changed files from the index')
+
+        if ctx:
+            await ctx.info(f'Embedding {len(chunks)} chunks of changed files...')
+            await ctx.report_progress(50, 100)
+
+        next_chunk_id = max(vector_store.index_to_docstore_id, default=-1) + 1
+        documents = [
+            create_chunk_document(chunk, chunk_id, location)
+            for chunk_id, (chunk, location) in enumerate(
+                zip(chunks, chunk_locations), start=next_chunk_id
             )
-            raise
+        ]
+        if documents:
+            counters = get_cache_counters(embedding_generator)
+            embeddings = await asyncio.to_thread(
+                embedding_generator.embed_documents, [doc.page_content for doc in documents]
+            )
+            await self.report_cache_hit_rate(embedding_generator, counters, ctx)
+            await asyncio.to_thread(add_embedded_documents, vector_store, documents, embeddings)
+        logger.info(f'Added {len(documents)} chunks of changed files to the index')
+        return vector_store
+
+    async def report_cache_hit_rate(
+        self,
+        embedding_generator,
+        counters: Optional[Tuple[int, int]],
+        ctx: Optional[Any] = None,
+    ):
+        """Report how many chunks embedded since the counters were taken came from the cache.
+
+        Args:
+            embedding_generator: Embedding function used
+            counters: Cache counters taken before embedding, None if there is no cache
+            ctx: Context object for progress tracking (optional)
+        """
+        if counters is None or not isinstance(embedding_generator, CachedEmbeddings):
+            return
+        hits, misses = embedding_generator.counters()
+        hits, misses = hits - counters[0], misses - counters[1]
+        message = (
+            f'Embedding cache: {hits} chunks cached, {misses} embedded '
+            f'({hits / max(hits + misses, 1):.1%} hit rate)'
+        )
+        logger.info(message)
+        if ctx:
+            await ctx.info(message)
 
     def save_index(self, vector_store: FAISS, index_path: str):
         """Save FAISS index without using pickle.
@@ -736,6 +1353,7 @@ class IndexBuilder:
             index_path: Path to save the index
         """
         save_index_without_pickle(vector_store, index_path)
+        index_cache.invalidate(index_path)
 
 
 class FileManager:
@@ -788,6 +1406,60 @@ class FileManager:
         logger.info(f'Copied {copied_files} files to {repo_files_path}')
         return copied_files
 
+    async def sync_repository_files(
+        self,
+        repo_path: str,
+        repo_files_path: str,
+        changed_files: Set[str],
+        ctx: Optional[Any] = None,
+    ) -> int:
+        """Copy changed files to the target directory and remove the deleted ones.
+
+        Args:
+            repo_path: Source repository path
+            repo_files_path: Target path for copied files
+            changed_files: Paths of the changed files relative to the repository
+            ctx: Context object for progress tracking (optional)
+
+        Returns:
+            Number of copied files
+        """
+        if ctx:
+            await ctx.info('Updating repository files...')
+            await ctx.report_progress(80, 100)
+
+        copied_files = await asyncio.to_thread(
+            self._sync_files, repo_path, repo_files_path, changed_files
+        )
+        logger.info(f'Updated {len(changed_files)} files in {repo_files_path}')
+        return copied_files
+
+    def _sync_files(self, repo_path: str, repo_files_path: str, changed_files: Set[str]) -> int:
+        """Copy changed files to the target directory and remove the deleted ones, blocking.
+
+        Args:
+            repo_path: Source repository path
+            repo_files_path: Target path for copied files
+            changed_files: Paths of the changed files relative to the repository
+
+        Returns:
+            Number of copied files
+        """
+        copied_files = 0
+        for rel_path in changed_files:
+            source_file = os.path.join(repo_path, rel_path)
+            target_file = os.path.join(repo_files_path, rel_path)
+            try:
+                if os.path.isfile(source_file):
+                    os.makedirs(os.path.dirname(target_file), exist_ok=True)
+                    shutil.copy2(source_file, target_file)
+                    copied_files += 1
+                elif os.path.isfile(target_file):
+                    os.remove(target_file)
+            except Exception as e:
+                logger.warning(f'Error updating file {target_file}: {e}')
+        return copied_files
+
     def save_chunk_map(self, chunk_map_data: Dict, index_path: str):
         """Save chunk map without using pickle.
 
@@ -830,9 +1502,9 @@ class MetadataManager:
             repository_name=final_repo_name,
             repository_path=params['config'].repository_path,
             index_path=params['index_path'],
-            created_at=datetime.now(),
+            created_at=params.get('created_at') or datetime.now(),
             last_accessed=None,
-            file_count=len(set(params['chunk_to_file'].values())),
+            file_count=len({file_path for file_path, _, _ in params['chunk_locations']}),
             chunk_count=len(params['chunks']),
             embedding_model=params['embedding_model'],
             file_types=params['extension_stats'],
@@ -840,6 +1512,11 @@ class MetadataManager:
             index_size_bytes=index_size,
             last_commit_id=params['last_commit_id'],
             repository_directory=params['repo_files_path'],
+            chunk_size=params['config'].chunk_size,
+            chunk_overlap=params['config'].chunk_overlap,
+            include_patterns=params['config'].include_patterns,
+            exclude_patterns=params['config'].exclude_patterns,
+            dirty_files=params.get('dirty_files'),
         )
 
         # Save metadata
@@ -0,0 +1,250 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Lexical index for Git Repository Research MCP Server.
+
+This module provides a BM25 inverted index of the chunks of a repository, saved
+next to its FAISS index, so that identifiers and exact terms are found even when
+the embedding of a query misses them.
+"""
+
+import math
+import numpy as np
+import os
+import re
+from collections import Counter
+from loguru import logger
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+LEXICAL_INDEX_FILE = 'lexical_index.npz'
+
+# Version of the file format, bumped when the tokenization changes
+LEXICAL_INDEX_VERSION = 1
+
+# BM25 term frequency saturation and document length normalization
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Longer tokens, like encoded data, are not indexed
+MAX_TERM_LENGTH = 64
+
+TOKEN_PATTERN = re.compile(r'[A-Za-z_][A-Za-z0-9_]*|[0-9]+')
+# Words of camelCase, PascalCase and snake_case identifiers
+SUBTOKEN_PATTERN = re.compile(r'[A-Z]+(?![a-z])|[A-Z]?[a-z]+|[0-9]+')
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase terms.
+
+    Identifiers are indexed whole and by word, so that `getUserName` is found by
+    `getusername` as well as by `user`.
+
+    Args:
+        text: Text to tokenize
+
+    Returns:
+        Terms of the text, in order
+    """
+    terms = []
+    for match in TOKEN_PATTERN.finditer(text):
+        token = match.group()
+        if len(token) > MAX_TERM_LENGTH:
+            continue
+        terms.append(token.lower())
+        words = SUBTOKEN_PATTERN.findall(token)
+        if len(words) > 1:
+            terms.extend(word.lower() for word in words)
+    return terms
+
+
+class LexicalIndex:
+    """BM25 inverted index of chunks, stored as flat arrays.
+
+    The postings of the term at position i of the vocabulary are the chunk
+    positions postings[offsets[i]:offsets[i + 1]], with their term frequencies.
+    """
+
+    def __init__(
+        self,
+        chunk_ids: np.ndarray,
+        doc_lengths: np.ndarray,
+        terms: List[str],
+        offsets: np.ndarray,
+        postings: np.ndarray,
+        frequencies: np.ndarray,
+    ):
+        """Initialize the index from its arrays.
+
+        Args:
+            chunk_ids: Chunk ID at each chunk position
+            doc_lengths: Number of terms of each chunk
+            terms: Vocabulary, sorted
+            offsets: Start of the postings of each term, followed by the number of postings
+            postings: Chunk positions of the postings
+            frequencies: Frequency of the term in the chunk of each posting
+        """
+        self.chunk_ids = chunk_ids
+        self.doc_lengths = doc_lengths
+        self.terms = terms
+        self.offsets = offsets
+        self.postings = postings
+        self.frequencies = frequencies
+        self.vocabulary: Dict[str, int] = {term: i for i, term in enumerate(terms)}
+        self.average_length = float(doc_lengths.mean()) if len(doc_lengths) else 0.0
+
+    def __len__(self) -> int:
+        """Number of indexed chunks."""
+        return len(self.chunk_ids)
+
+    @classmethod
+    def build(cls, chunks: Iterable[Tuple[int, str]]) -> 'LexicalIndex':
+        """Build the index of chunks.
+
+        Args:
+            chunks: Chunk IDs with the text of the chunk
+
+        Returns:
+            LexicalIndex instance
+        """
+        chunk_ids: List[int] = []
+        doc_lengths: List[int] = []
+        term_postings: Dict[str, Tuple[List[int], List[int]]] = {}
+        for position, (chunk_id, text) in enumerate(chunks):
+            terms = tokenize(text)
+            chunk_ids.append(chunk_id)
+            doc_lengths.append(len(terms))
+            for term, frequency in Counter(terms).items():
+                positions, frequencies = term_postings.setdefault(term, ([], []))
+                positions.append(position)
+                frequencies.append(frequency)
+
+        terms = sorted(term_postings)
+        offsets = np.zeros(len(terms) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(term_postings[term][0]) for term in terms])
+        postings = np.fromiter(
+            (p for term in terms for p in term_postings[term][0]),
+            dtype=np.int32,
+            count=int(offsets[-1]),
+        )
+        frequencies = np.fromiter(
+            (f for term in terms for f in term_postings[term][1]),
+            dtype=np.float32,
+            count=int(offsets[-1]),
+        )
+        return cls(
+            np.array(chunk_ids, dtype=np.int64),
+            np.array(doc_lengths, dtype=np.float32),
+            terms,
+            offsets,
+            postings,
+            frequencies,
+        )
+
+    def has_term(self, term: str) -> bool:
+        """Check whether a term occurs in any chunk.
+
+        Args:
+            term: Term to look up, in any case
+
+        Returns:
+            True if the term is indexed
+        """
+        return term.lower() in self.vocabulary
+
+    def search(self, query: str, limit: int) -> List[Tuple[int, float]]:
+        """Rank the chunks matching the terms of a query by BM25.
+
+        Args:
+            query: Search query text
+            limit: Maximum number of chunks to return
+
+        Returns:
+            Chunk IDs with their BM25 score, best first
+        """
+        if not len(self) or limit <= 0:
+            return []
+        scores = np.zeros(len(self), dtype=np.float32)
+        for term in set(tokenize(query)):
+            index = self.vocabulary.get(term)
+            if index is None:
+                continue
+            start, end = self.offsets[index], self.offsets[index + 1]
+            positions = self.postings[start:end]
+            frequencies = self.frequencies[start:end]
+            document_frequency = end - start
+            idf = math.log(1 + (len(self) - document_frequency + 0.5) / (document_frequency + 0.5))
+            normalization = BM25_K1 * (
+                1 - BM25_B + BM25_B * self.doc_lengths[positions] / self.average_length
+            )
+            # A term has a single posting per chunk, so the positions are unique
+            scores[positions] += idf * frequencies * (BM25_K1 + 1) / (frequencies + normalization)
+
+        matches = np.flatnonzero(scores)
+        if len(matches) > limit:
+            matches = matches[np.argpartition(-scores[matches], limit - 1)[:limit]]
+        # Best score first, ties in the order of the chunks
+        matches = matches[np.lexsort((self.chunk_ids[matches], -scores[matches]))]
+        return [(int(self.chunk_ids[p]), float(scores[p])) for p in matches]
+
+    def save(self, index_path: str):
+        """Save the index in the index directory, replacing the previous one.
+
+        Args:
+            index_path: Path to the index directory
+        """
+        path = os.path.join(index_path, LEXICAL_INDEX_FILE)
+        # Terms cannot contain newlines, so the vocabulary is stored as a single string
+        vocabulary = np.frombuffer('\n'.join(self.terms).encode('utf-8'), dtype=np.uint8)
+        with open(f'{path}.tmp', 'wb') as f:
+            np.savez(
+                f,
+                version=np.array(LEXICAL_INDEX_VERSION),
+                chunk_ids=self.chunk_ids,
+                doc_lengths=self.doc_lengths,
+                vocabulary=vocabulary,
+                offsets=self.offsets,
+                postings=self.postings,
+                frequencies=self.frequencies,
+            )
+        os.replace(f'{path}.tmp', path)
+
+    @classmethod
+    def load(cls, index_path: str) -> Optional['LexicalIndex']:
+        """Load the index saved in an index directory.
+
+        Args:
+            index_path: Path to the index directory
+
+        Returns:
+            LexicalIndex instance, or None if there is no readable index of this version
+        """
+        path = os.path.join(index_path, LEXICAL_INDEX_FILE)
+        if not os.path.exists(path):
+            return None
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                if int(data['version']) != LEXICAL_INDEX_VERSION:
+                    return None
+                vocabulary = data['vocabulary'].tobytes().decode('utf-8')
+                return cls(
+                    data['chunk_ids'],
+                    data['doc_lengths'],
+                    vocabulary.split('\n') if vocabulary else [],
+                    data['offsets'],
+                    data['postings'],
+                    data['frequencies'],
+                )
+        except Exception as e:
+            logger.warning(f'Error loading lexical index {path}: {e}')
+            return None
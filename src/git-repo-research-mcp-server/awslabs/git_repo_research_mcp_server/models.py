@@ -60,6 +60,22 @@ class IndexMetadata(BaseModel):
     repository_directory: Optional[str] = Field(
         None, description='Path to the cloned repository directory'
     )
+    chunk_size: Optional[int] = Field(
+        default=None, description='Maximum size of each chunk in characters'
+    )
+    chunk_overlap: Optional[int] = Field(
+        default=None, description='Overlap between chunks in characters'
+    )
+    include_patterns: Optional[List[str]] = Field(
+        default=None, description='Glob patterns of the files included in the index'
+    )
+    exclude_patterns: Optional[List[str]] = Field(
+        default=None, description='Glob patterns of the files excluded from the index'
+    )
+    dirty_files: Optional[List[str]] = Field(
+        default=None,
+        description='Files that differed from the last commit when the index was updated',
+    )
 
 
 class SearchResult(BaseModel):
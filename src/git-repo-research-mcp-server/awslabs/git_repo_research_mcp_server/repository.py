@@ -18,16 +18,34 @@ Git repositories for indexing and searching.
 """
 
 import fnmatch
+import itertools
+import multiprocessing
 import os
+import re
 import shutil
 import tempfile
+import threading
 from awslabs.git_repo_research_mcp_server.defaults import Constants
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
 from git import Repo
 from loguru import logger
-from typing import Dict, List, Optional, Tuple
+from typing import Deque, Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
 from urllib.parse import urlparse
 
 
+class Chunk(NamedTuple):
+    """Text chunk of a file with the lines it spans, numbered from 1."""
+
+    text: str
+    start_line: int
+    end_line: int
+
+
+# Path of the file of a chunk relative to the repository, with its first and last line
+ChunkLocation = Tuple[str, int, int]
+
+
 def is_git_url(repo_path: str) -> bool:
     """Check if a string is a Git URL.
 
@@ -133,6 +151,126 @@ def get_repository_name(repo_path: str) -> str:
         return os.path.basename(os.path.abspath(repo_path))
 
 
+class PathMatcher:
+    """Include and exclude glob patterns compiled into one regular expression each.
+
+    Patterns have the semantics of fnmatch, where `*` also matches `/`.
+    """
+
+    def __init__(self, include_patterns: List[str], exclude_patterns: List[str]):
+        """Compile the patterns.
+
+        Args:
+            include_patterns: Glob patterns for files to include
+            exclude_patterns: Glob patterns for files to exclude
+        """
+        self._include = _compile_patterns(include_patterns)
+        self._exclude = _compile_patterns(exclude_patterns)
+        # A directory matching the prefix of a `prefix/**` pattern only contains excluded files
+        self._exclude_dir = _compile_patterns(
+            [pattern[:-3] for pattern in exclude_patterns if pattern.endswith('/**')]
+        )
+
+    def matches(self, rel_path: str) -> bool:
+        """Check if a file is included and not excluded.
+
+        Args:
+            rel_path: Path to the file relative to the repository
+
+        Returns:
+            True if the file is selected by the patterns, False otherwise
+        """
+        return bool(self._include.match(rel_path)) and not self._exclude.match(rel_path)
+
+    def is_excluded_dir(self, rel_dir: str) -> bool:
+        """Check if every file of a directory is excluded.
+
+        Args:
+            rel_dir: Path to the directory relative to the repository
+
+        Returns:
+            True if the directory can be skipped entirely, False otherwise
+        """
+        return bool(self._exclude_dir.match(rel_dir))
+
+
+def _compile_patterns(patterns: List[str]) -> 're.Pattern[str]':
+    if not patterns:
+        # A pattern that never matches, as an empty alternation matches everything
+        return re.compile(r'(?!)')
+    return re.compile('|'.join(f'(?:{fnmatch.translate(pattern)})' for pattern in patterns))
+
+
+def get_ignored_paths(repo_path: str) -> Tuple[Set[str], Set[str]]:
+    """Get the files and directories of a repository ignored by Git.
+
+    Ignore rules come from every `.gitignore`, `.git/info/exclude` and the global
+    excludes file. Ignored directories are reported as a whole instead of file by file.
+
+    Args:
+        repo_path: Path to the root of the repository
+
+    Returns:
+        Tuple containing the ignored files and the ignored directories, relative to the
+        repository, both empty if the path is not the root of a Git repository
+    """
+    try:
+        output = Repo(repo_path).git.ls_files(
+            '--others', '--ignored', '--exclude-standard', '--directory', '-z'
+        )
+    except Exception:
+        return set(), set()
+
+    ignored_files, ignored_dirs = set(), set()
+    for path in output.split('\0'):
+        if path.endswith('/'):
+            ignored_dirs.add(os.path.normpath(path))
+        elif path:
+            ignored_files.add(os.path.normpath(path))
+    return ignored_files, ignored_dirs
+
+
+def discover_files(
+    repo_path: str,
+    include_patterns: Optional[List[str]] = None,
+    exclude_patterns: Optional[List[str]] = None,
+) -> Iterator[str]:
+    """Find the files of a repository selected by the patterns.
+
+    Directories ignored by Git, the `.git` directory and directories whose files are
+    all excluded by a pattern are not walked.
+
+    Args:
+        repo_path: Path to the repository
+        include_patterns: Glob patterns for files to include (optional)
+        exclude_patterns: Glob patterns for files to exclude (optional)
+
+    Yields:
+        Paths to the selected files, in a stable order
+    """
+    if include_patterns is None:
+        include_patterns = Constants.TEXT_FILE_INCLUDE_PATTERNS
+    if exclude_patterns is None:
+        exclude_patterns = Constants.TEXT_FILE_EXCLUDE_PATTERNS
+
+    matcher = PathMatcher(include_patterns, exclude_patterns)
+    ignored_files, ignored_dirs = get_ignored_paths(repo_path)
+    ignored_dirs.add('.git')
+
+    for root, dirs, files in os.walk(repo_path):
+        rel_root = os.path.relpath(root, repo_path)
+        prefix = '' if rel_root == '.' else f'{rel_root}{os.sep}'
+        dirs[:] = sorted(
+            d
+            for d in dirs
+            if prefix + d not in ignored_dirs and not matcher.is_excluded_dir(prefix + d)
+        )
+        for file in sorted(files):
+            rel_path = prefix + file
+            if rel_path not in ignored_files and matcher.matches(rel_path):
+                yield os.path.join(root, file)
+
+
 def get_text_files(
     repo_path: str,
     include_patterns: Optional[List[str]] = None,
@@ -148,42 +286,34 @@ def get_text_files(
     Returns:
         List of paths to text files
     """
-    if include_patterns is None:
-        include_patterns = Constants.TEXT_FILE_INCLUDE_PATTERNS
-    if exclude_patterns is None:
-        exclude_patterns = Constants.TEXT_FILE_EXCLUDE_PATTERNS
+    return [
+        file_path
+        for file_path in discover_files(repo_path, include_patterns, exclude_patterns)
+        if is_text_content(file_path)
+    ]
 
-    text_files = []
-    for root, _, files in os.walk(repo_path):
-        for file in files:
-            file_path = os.path.join(root, file)
-            rel_path = os.path.relpath(file_path, repo_path)
-
-            # Check if the file matches any include pattern
-            included = any(fnmatch.fnmatch(rel_path, pattern) for pattern in include_patterns)
-            if not included:
-                continue
-
-            # Check if the file matches any exclude pattern
-            excluded = any(fnmatch.fnmatch(rel_path, pattern) for pattern in exclude_patterns)
-            if excluded:
-                continue
-
-            # Try to read the file as text
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    # Read a small sample to check if it's text
-                    sample = f.read(1024)
-                    # If we can decode it as UTF-8, it's probably text
-                    if sample:
-                        text_files.append(file_path)
-            except UnicodeDecodeError:
-                # Not a text file
-                pass
-            except Exception as e:
-                logger.warning(f'Error reading file {file_path}: {e}')
-
-    return text_files
+
+def is_text_content(file_path: str) -> bool:
+    """Check if a file is a non-empty text file.
+
+    Args:
+        file_path: Path to the file
+
+    Returns:
+        True if the start of the file decodes as UTF-8 text, False otherwise
+    """
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            # Read a small sample to check if it's text
+            sample = f.read(1024)
+            # If we can decode it as UTF-8, it's probably text
+            return bool(sample)
+    except UnicodeDecodeError:
+        # Not a text file
+        return False
+    except Exception as e:
+        logger.warning(f'Error reading file {file_path}: {e}')
+        return False
 
 
 def get_file_extension_stats(file_paths: List[str]) -> Dict[str, int]:
@@ -227,8 +357,10 @@ def read_file_content(file_path: str) -> str:
         raise
 
 
-def chunk_text(text: str, chunk_size: int = 1000, chunk_overlap: int = 200) -> List[str]:
-    """Split text into chunks.
+def get_chunk_spans(
+    text: str, chunk_size: int = 1000, chunk_overlap: int = 200
+) -> List[Tuple[int, int]]:
+    """Get the start and end offsets of the chunks of a text.
 
     Args:
         text: Text to split
@@ -236,17 +368,17 @@ def chunk_text(text: str, chunk_size: int = 1000, chunk_overlap: int = 200) -> L
         chunk_overlap: Overlap between chunks in characters
 
     Returns:
-        List of text chunks
+        List of (start, end) character offsets of the chunks
     """
     if not text or len(text) <= chunk_size:
-        return [text] if text else []
+        return [(0, len(text))] if text else []
 
-    chunks = []
+    spans = []
     start = 0
     while start < len(text):
         end = start + chunk_size
         if end >= len(text):
-            chunks.append(text[start:])
+            spans.append((start, len(text)))
             break
 
         # Try to find a good breaking point (newline or space)
@@ -256,19 +388,189 @@ def chunk_text(text: str, chunk_size: int = 1000, chunk_overlap: int = 200) -> L
         if break_point == -1:
             break_point = end
 
-        chunks.append(text[start:break_point])
+        spans.append((start, break_point))
         start = break_point + 1 if text[break_point] in ['\n', ' '] else break_point
 
+    return spans
+
+
+def chunk_text(text: str, chunk_size: int = 1000, chunk_overlap: int = 200) -> List[str]:
+    """Split text into chunks.
+
+    Args:
+        text: Text to split
+        chunk_size: Maximum size of each chunk in characters
+        chunk_overlap: Overlap between chunks in characters
+
+    Returns:
+        List of text chunks
+    """
+    return [text[start:end] for start, end in get_chunk_spans(text, chunk_size, chunk_overlap)]
+
+
+def chunk_text_with_lines(
+    text: str, chunk_size: int = 1000, chunk_overlap: int = 200
+) -> List[Chunk]:
+    """Split text into chunks, recording the lines each chunk spans.
+
+    Args:
+        text: Text to split
+        chunk_size: Maximum size of each chunk in characters
+        chunk_overlap: Overlap between chunks in characters
+
+    Returns:
+        List of text chunks with their first and last line
+    """
+    chunks = []
+    line, position = 1, 0
+    for start, end in get_chunk_spans(text, chunk_size, chunk_overlap):
+        line += text.count('\n', position, start)
+        position = start
+        # The last line of a chunk is the line of its last character
+        end_line = line + text.count('\n', start, max(start, end - 1))
+        chunks.append(Chunk(text[start:end], line, end_line))
     return chunks
 
 
+def read_and_chunk_file(file_path: str, chunk_size: int, chunk_overlap: int) -> List[Chunk]:
+    """Read a text file once and split it into chunks with their lines.
+
+    Args:
+        file_path: Path to the file
+        chunk_size: Maximum size of each chunk in characters
+        chunk_overlap: Overlap between chunks in characters
+
+    Returns:
+        List of chunks, empty for binary, empty or unreadable files
+    """
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+    except UnicodeDecodeError:
+        # Not a text file
+        return []
+    except Exception as e:
+        logger.warning(f'Error processing file {file_path}: {e}')
+        return []
+    return chunk_text_with_lines(content, chunk_size, chunk_overlap)
+
+
+def _chunk_file_batch(
+    file_paths: List[str], chunk_size: int, chunk_overlap: int
+) -> List[List[Chunk]]:
+    return [read_and_chunk_file(path, chunk_size, chunk_overlap) for path in file_paths]
+
+
+_chunking_pool: Optional[ProcessPoolExecutor] = None
+_chunking_pool_lock = threading.Lock()
+
+
+def get_chunking_workers() -> int:
+    """Get the number of processes reading and chunking files."""
+    return min(Constants.CHUNKING_MAX_WORKERS, os.cpu_count() or 1)
+
+
+def _get_chunking_pool(workers: int) -> ProcessPoolExecutor:
+    global _chunking_pool
+    with _chunking_pool_lock:
+        if _chunking_pool is None:
+            # Spawned rather than forked, as the server process runs threads
+            _chunking_pool = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context('spawn')
+            )
+        return _chunking_pool
+
+
+def iter_file_chunks(
+    repo_path: str,
+    file_paths: Iterable[str],
+    chunk_size: int = 1000,
+    chunk_overlap: int = 200,
+    workers: Optional[int] = None,
+) -> Iterator[Tuple[str, List[Chunk]]]:
+    """Read and chunk files of a repository in a pool of processes.
+
+    Files are sent to the pool in batches, with a bounded number of batches in
+    flight, so that chunks are produced while files are still being discovered.
+
+    Args:
+        repo_path: Path to the repository
+        file_paths: Paths of the files to chunk
+        chunk_size: Maximum size of each chunk in characters
+        chunk_overlap: Overlap between chunks in characters
+        workers: Number of processes (optional, chunks in this process if 1)
+
+    Yields:
+        Path of each text file relative to the repository with its chunks, in the
+        order of the given files
+    """
+    workers = workers or get_chunking_workers()
+    file_paths = iter(file_paths)
+    batches = iter(lambda: list(itertools.islice(file_paths, Constants.CHUNKING_BATCH_FILES)), [])
+
+    def results(batch: List[str], batch_chunks: List[List[Chunk]]):
+        for file_path, file_chunks in zip(batch, batch_chunks):
+            if file_chunks:
+                yield os.path.relpath(file_path, repo_path), file_chunks
+
+    if workers <= 1:
+        for batch in batches:
+            yield from results(batch, _chunk_file_batch(batch, chunk_size, chunk_overlap))
+        return
+
+    pool = _get_chunking_pool(workers)
+    pending: Deque[Tuple[List[str], Future]] = deque()
+    try:
+        for batch in batches:
+            pending.append(
+                (batch, pool.submit(_chunk_file_batch, batch, chunk_size, chunk_overlap))
+            )
+            if len(pending) >= 2 * workers:
+                batch, future = pending.popleft()
+                yield from results(batch, future.result())
+        while pending:
+            batch, future = pending.popleft()
+            yield from results(batch, future.result())
+    finally:
+        for _, future in pending:
+            future.cancel()
+
+
+def iter_repository_chunks(
+    repo_path: str,
+    include_patterns: Optional[List[str]] = None,
+    exclude_patterns: Optional[List[str]] = None,
+    chunk_size: int = 1000,
+    chunk_overlap: int = 200,
+) -> Iterator[Tuple[str, List[Chunk]]]:
+    """Discover, read and chunk the text files of a repository as a stream.
+
+    Args:
+        repo_path: Path to the repository
+        include_patterns: Glob patterns for files to include (optional)
+        exclude_patterns: Glob patterns for files to exclude (optional)
+        chunk_size: Maximum size of each chunk in characters
+        chunk_overlap: Overlap between chunks in characters
+
+    Yields:
+        Path of each text file relative to the repository with its chunks
+    """
+    logger.info(f'Processing repository at {repo_path}')
+    return iter_file_chunks(
+        repo_path,
+        discover_files(repo_path, include_patterns, exclude_patterns),
+        chunk_size,
+        chunk_overlap,
+    )
+
+
 def process_repository(
     repo_path: str,
     include_patterns: Optional[List[str]] = None,
     exclude_patterns: Optional[List[str]] = None,
     chunk_size: int = 1000,
     chunk_overlap: int = 200,
-) -> Tuple[List[str], Dict[str, str], Dict[str, int]]:
+) -> Tuple[List[str], List[ChunkLocation], Dict[str, int]]:
     """Process a repository for indexing.
 
     Args:
@@ -281,33 +583,132 @@ def process_repository(
     Returns:
         Tuple containing:
         - List of text chunks
-        - Dictionary mapping chunks to file paths
+        - List of the file path and lines of each chunk
         - Dictionary of file extension statistics
     """
-    logger.info(f'Processing repository at {repo_path}')
-    text_files = get_text_files(repo_path, include_patterns, exclude_patterns)
+    chunks = []
+    chunk_locations = []
+    text_files = []
+    for rel_path, file_chunks in iter_repository_chunks(
+        repo_path, include_patterns, exclude_patterns, chunk_size, chunk_overlap
+    ):
+        text_files.append(rel_path)
+        for chunk in file_chunks:
+            chunks.append(chunk.text)
+            chunk_locations.append((rel_path, chunk.start_line, chunk.end_line))
     logger.info(f'Found {len(text_files)} text files')
 
     extension_stats = get_file_extension_stats(text_files)
     logger.info(f'File extension statistics: {extension_stats}')
 
+    logger.info(f'Created {len(chunks)} text chunks')
+    return chunks, chunk_locations, extension_stats
+
+
+def process_changed_files(
+    repo_path: str,
+    rel_paths: Iterable[str],
+    include_patterns: Optional[List[str]] = None,
+    exclude_patterns: Optional[List[str]] = None,
+    chunk_size: int = 1000,
+    chunk_overlap: int = 200,
+) -> Tuple[List[str], List[ChunkLocation]]:
+    """Chunk the given files of a repository, skipping deleted and non-text files.
+
+    Args:
+        repo_path: Path to the repository
+        rel_paths: Paths of the files relative to the repository
+        include_patterns: Glob patterns for files to include (optional)
+        exclude_patterns: Glob patterns for files to exclude (optional)
+        chunk_size: Maximum size of each chunk in characters
+        chunk_overlap: Overlap between chunks in characters
+
+    Returns:
+        Tuple containing:
+        - List of text chunks
+        - List of the file path and lines of each chunk
+    """
+    if include_patterns is None:
+        include_patterns = Constants.TEXT_FILE_INCLUDE_PATTERNS
+    if exclude_patterns is None:
+        exclude_patterns = Constants.TEXT_FILE_EXCLUDE_PATTERNS
+
+    matcher = PathMatcher(include_patterns, exclude_patterns)
+    ignored_files, ignored_dirs = get_ignored_paths(repo_path)
+    text_files = []
+    for rel_path in sorted(os.path.normpath(path) for path in rel_paths):
+        file_path = os.path.join(repo_path, rel_path)
+        if (
+            os.path.isfile(file_path)
+            and matcher.matches(rel_path)
+            and rel_path not in ignored_files
+            and not any(rel_path.startswith(os.path.join(d, '')) for d in ignored_dirs)
+        ):
+            text_files.append(file_path)
+
+    return chunk_files(repo_path, text_files, chunk_size, chunk_overlap)
+
+
+def chunk_files(
+    repo_path: str, file_paths: List[str], chunk_size: int = 1000, chunk_overlap: int = 200
+) -> Tuple[List[str], List[ChunkLocation]]:
+    """Read and chunk files of a repository.
+
+    Args:
+        repo_path: Path to the repository
+        file_paths: Paths of the files to chunk
+        chunk_size: Maximum size of each chunk in characters
+        chunk_overlap: Overlap between chunks in characters
+
+    Returns:
+        Tuple containing:
+        - List of text chunks
+        - List of the file path relative to the repository and lines of each chunk
+    """
     chunks = []
-    chunk_to_file = {}
+    chunk_locations = []
 
-    for file_path in text_files:
-        try:
-            content = read_file_content(file_path)
-            file_chunks = chunk_text(content, chunk_size, chunk_overlap)
+    for rel_path, file_chunks in iter_file_chunks(
+        repo_path, file_paths, chunk_size, chunk_overlap
+    ):
+        for chunk in file_chunks:
+            chunks.append(chunk.text)
+            chunk_locations.append((rel_path, chunk.start_line, chunk.end_line))
 
-            rel_path = os.path.relpath(file_path, repo_path)
-            for chunk in file_chunks:
-                chunks.append(chunk)
-                chunk_to_file[chunk] = rel_path
-        except Exception as e:
-            logger.warning(f'Error processing file {file_path}: {e}')
+    return chunks, chunk_locations
 
-    logger.info(f'Created {len(chunks)} text chunks')
-    return chunks, chunk_to_file, extension_stats
+
+def get_changed_files(
+    repo_path: str, commit_id: str, dirty_files: Iterable[str] = ()
+) -> Optional[Set[str]]:
+    """Get the files that changed in the working tree since a commit.
+
+    Committed, staged and unstaged changes are compared against the commit, and
+    untracked files are always considered changed. Renamed files are reported under
+    both their old and new paths. Files that were dirty when the index was built are
+    changed too, as the index holds their content from then, even when they were
+    deleted or reverted since.
+
+    Args:
+        repo_path: Path to the repository
+        commit_id: ID of the commit to compare against
+        dirty_files: Files that differed from the commit when the index was built
+
+    Returns:
+        Paths of the changed files relative to the repository, or None if the
+        repository or the commit cannot be found
+    """
+    try:
+        repo = Repo(repo_path)
+        commit = repo.commit(commit_id)
+        changed_files = set(repo.untracked_files)
+        changed_files.update(dirty_files)
+        for diff in commit.diff(None):
+            changed_files.update(path for path in (diff.a_path, diff.b_path) if path)
+    except Exception as e:
+        logger.warning(f'Cannot diff repository {repo_path} against commit {commit_id}: {e}')
+        return None
+    return changed_files
 
 
 def cleanup_repository(repo_path: str) -> None:
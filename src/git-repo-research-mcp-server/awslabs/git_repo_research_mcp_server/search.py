@@ -13,26 +13,108 @@
 # limitations under the License.
 """Search functionality for Git Repository Research MCP Server.
 
-This module provides functionality for searching within indexed Git repositories
-using LangChain's FAISS implementation.
+This module provides functionality for searching within indexed Git repositories,
+fusing the rankings of LangChain's FAISS implementation and of a BM25 lexical index
+by reciprocal rank fusion.
 """
 
 import os
+import re
 import time
 from awslabs.git_repo_research_mcp_server.defaults import Constants
 from awslabs.git_repo_research_mcp_server.embeddings import get_embedding_model
+from awslabs.git_repo_research_mcp_server.index_cache import index_cache
 from awslabs.git_repo_research_mcp_server.indexer import (
     IndexConfig,
+    get_chunk_documents,
     get_docstore_dict_size,
     get_repository_indexer,
 )
+from awslabs.git_repo_research_mcp_server.lexical_index import LexicalIndex
 from awslabs.git_repo_research_mcp_server.models import (
     EmbeddingModel,
     SearchResponse,
     SearchResult,
 )
+from langchain_community.vectorstores import FAISS
+from langchain_core.documents import Document
 from loguru import logger
-from typing import Optional
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+
+IDENTIFIER_PATTERN = re.compile(r'[A-Za-z_][A-Za-z0-9_]*')
+# Marks of an identifier that is not a plain word: an underscore, a digit or camelCase
+IDENTIFIER_MARK_PATTERN = re.compile(r'[_0-9]|[a-z][A-Z]')
+
+
+class HybridIndex(NamedTuple):
+    """Vector store of an index with the lexical index and the documents of its chunks."""
+
+    vector_store: FAISS
+    lexical_index: LexicalIndex
+    documents: Dict[int, Document]
+
+
+def load_hybrid_index(vector_store: FAISS, index_path: str) -> HybridIndex:
+    """Load the lexical index of a loaded vector store.
+
+    Args:
+        vector_store: FAISS vector store of the index
+        index_path: Path to the index directory
+
+    Returns:
+        HybridIndex instance
+
+    Indices saved without a lexical index, or with one that does not match the
+    vector store, get a lexical index built from their documents.
+    """
+    documents = get_chunk_documents(vector_store)
+    lexical_index = LexicalIndex.load(index_path)
+    if lexical_index is None or len(lexical_index) != len(documents):
+        logger.info(f'Building the lexical index of {index_path}')
+        lexical_index = LexicalIndex.build(
+            (chunk_id, doc.page_content) for chunk_id, doc in documents.items()
+        )
+    return HybridIndex(vector_store, lexical_index, documents)
+
+
+def is_identifier_query(query: str) -> bool:
+    """Check whether a query is a single code identifier, like `get_user` or `getUser`.
+
+    Args:
+        query: Search query text
+
+    Returns:
+        True if the query is an identifier that embeddings are unlikely to rank well
+    """
+    query = query.strip()
+    return (
+        IDENTIFIER_PATTERN.fullmatch(query) is not None
+        and IDENTIFIER_MARK_PATTERN.search(query) is not None
+    )
+
+
+def reciprocal_rank_fusion(rankings: List[List[int]], k: int) -> List[Tuple[int, float]]:
+    """Fuse rankings of chunks by reciprocal rank fusion.
+
+    Args:
+        rankings: Chunk IDs of each ranking, best first
+        k: Rank offset, damping the weight of the first ranks
+
+    Returns:
+        Chunk IDs with their fused score, normalized to 1 for a chunk ranked first
+        by every ranking with candidates, best first with ties in the order of the chunks
+    """
+    rankings = [ranking for ranking in rankings if ranking]
+    scores: Dict[int, float] = {}
+    for ranking in rankings:
+        for rank, chunk_id in enumerate(ranking, start=1):
+            scores[chunk_id] = scores.get(chunk_id, 0.0) + 1.0 / (k + rank)
+    best_score = len(rankings) / (k + 1)
+    return sorted(
+        ((chunk_id, score / best_score) for chunk_id, score in scores.items()),
+        key=lambda item: (-item[1], item[0]),
+    )
 
 
 class RepositorySearcher:
@@ -184,13 +266,13 @@ class RepositorySearcher:
         limit: int = 10,
         threshold: float = 0.0,
     ) -> SearchResponse:
-        """Search within an indexed repository using LangChain's FAISS implementation.
+        """Search within an indexed repository by vector and lexical search.
 
         Args:
             index_path: Path to the index file or repository name
             query: Search query text
             limit: Maximum number of results to return
-            threshold: Similarity threshold for results (0.0-1.0)
+            threshold: Minimum fused score of the results (0.0-1.0)
 
         Returns:
             SearchResponse object with search results
@@ -212,9 +294,13 @@ class RepositorySearcher:
                 repository_name = index_path
                 index_path = self.repository_indexer._get_index_path(repository_name)
 
-            # Load the index and chunk map
-            vector_store = self.repository_indexer.load_index_without_pickle(index_path)
-            if vector_store is None:
+            # Get the index from the index cache, loading it on the first search
+            hybrid_index = index_cache.get(
+                index_path,
+                lambda: self._load_index(index_path),
+                variant=(self.embedding_model, self.aws_region, self.aws_profile),
+            )
+            if hybrid_index is None:
                 logger.error(f'Index or chunk map not found for repository {repository_name}')
                 # Set repository_directory even if index is not found
                 repo_files_path = os.path.join(index_path, 'repository')
@@ -228,70 +314,12 @@ class RepositorySearcher:
                     execution_time_ms=int((time.time() - start_time) * 1000),
                 )
 
-            # Use LangChain's similarity search
             logger.info(f"Searching for '{query}' in repository {repository_name}")
-
-            # Debug: Print vector store info
-            logger.info(f'Vector store type: {type(vector_store)}')
             logger.info(
-                f'Vector store docstore size: {get_docstore_dict_size(vector_store.docstore)}'
+                'Vector store docstore size: '
+                f'{get_docstore_dict_size(hybrid_index.vector_store.docstore)}'
             )
-
-            # Use the same approach as in the test script
-            try:
-                # Use similarity_search directly
-                langchain_results = vector_store.similarity_search(query, k=limit)
-
-                # Process the results
-                results = []
-                if langchain_results:
-                    logger.info(f'Found {len(langchain_results)} results')
-                    for doc in langchain_results:
-                        # Get file path from document metadata
-                        file_path = doc.metadata.get('source', 'unknown')
-
-                        # Create a search result
-                        result = SearchResult(
-                            file_path=file_path,
-                            content=doc.page_content,
-                            score=1.0,  # Default score since we're not using similarity_search_with_score
-                            line_numbers=None,  # We don't track line numbers currently
-                            metadata={'chunk_id': str(doc.metadata.get('chunk_id', -1))},
-                        )
-                        results.append(result)
-                else:
-                    logger.info('No results found')
-            except Exception as e:
-                logger.error(f'Error with similarity_search: {e}')
-                # Try with similarity_search_with_score as a fallback
-                try:
-                    logger.info('Trying with similarity_search_with_score as fallback')
-                    langchain_results = vector_store.similarity_search_with_score(query, k=limit)
-
-                    # Process the results
-                    results = []
-                    for doc, score in langchain_results:
-                        # Get file path from document metadata
-                        file_path = doc.metadata.get('source', 'unknown')
-
-                        # Convert score to similarity (0-1 range)
-                        similarity = 1.0 - min(1.0, score / 2.0)
-
-                        # Create a search result
-                        result = SearchResult(
-                            file_path=file_path,
-                            content=doc.page_content,
-                            score=float(similarity),
-                            line_numbers=None,  # We don't track line numbers currently
-                            metadata={
-                                'distance': str(float(score)),
-                                'chunk_id': str(doc.metadata.get('chunk_id', -1)),
-                            },
-                        )
-                        results.append(result)
-                except Exception as e:
-                    logger.error(f'Error with similarity_search_with_score fallback: {e}')
-                    results = []
+            results = self._hybrid_search(hybrid_index, query, limit, threshold)
 
             execution_time_ms = int((time.time() - start_time) * 1000)
             logger.info(f'Search completed in {execution_time_ms}ms, found {len(results)} results')
@@ -327,6 +355,87 @@ class RepositorySearcher:
                 execution_time_ms=int((time.time() - start_time) * 1000),
             )
 
+    def _load_index(self, index_path: str) -> Optional[HybridIndex]:
+        vector_store = self.repository_indexer.load_index_without_pickle(index_path, mmap=True)
+        if vector_store is None:
+            return None
+        return load_hybrid_index(vector_store, index_path)
+
+    def _hybrid_search(
+        self, hybrid_index: HybridIndex, query: str, limit: int, threshold: float
+    ) -> List[SearchResult]:
+        """Rank the chunks of an index by the fused vector and lexical rankings of a query.
+
+        Args:
+            hybrid_index: Loaded index to search
+            query: Search query text
+            limit: Maximum number of results to return
+            threshold: Minimum fused score of the results (0.0-1.0)
+
+        Returns:
+            Search results, best first
+        """
+        candidates = max(limit, Constants.SEARCH_CANDIDATES)
+        lexical_ranking = [
+            chunk_id for chunk_id, _ in hybrid_index.lexical_index.search(query, candidates)
+        ]
+        rankings = [lexical_ranking]
+        vector_ranking: List[int] = []
+        distances: Dict[int, float] = {}
+        # Vector hits missing from the chunk documents, kept apart from the shared map
+        extra_documents: Dict[int, Document] = {}
+
+        # Identifiers found verbatim are ranked by the lexical index alone, sparing
+        # the embedding request of the query
+        if is_identifier_query(query) and hybrid_index.lexical_index.has_term(query.strip()):
+            logger.info('Identifier query found in the lexical index, skipping vector search')
+        else:
+            try:
+                for doc, distance in hybrid_index.vector_store.similarity_search_with_score(
+                    query, k=candidates
+                ):
+                    chunk_id = int(doc.metadata.get('chunk_id', -1))
+                    if chunk_id not in hybrid_index.documents:
+                        extra_documents.setdefault(chunk_id, doc)
+                    vector_ranking.append(chunk_id)
+                    distances[chunk_id] = float(distance)
+                rankings.append(vector_ranking)
+            except Exception as e:
+                logger.error(f'Error with similarity_search_with_score, using lexical search: {e}')
+
+        vector_ranks = {chunk_id: rank for rank, chunk_id in enumerate(vector_ranking, start=1)}
+        lexical_ranks = {chunk_id: rank for rank, chunk_id in enumerate(lexical_ranking, start=1)}
+        results = []
+        for chunk_id, score in reciprocal_rank_fusion(rankings, Constants.RRF_K):
+            if len(results) >= limit:
+                break
+            if score < threshold:
+                break
+            doc = hybrid_index.documents.get(chunk_id) or extra_documents.get(chunk_id)
+            if doc is None:
+                continue
+            start_line = doc.metadata.get('start_line')
+            end_line = doc.metadata.get('end_line')
+            metadata = {'chunk_id': str(chunk_id)}
+            if chunk_id in vector_ranks:
+                metadata['vector_rank'] = str(vector_ranks[chunk_id])
+                metadata['distance'] = str(distances[chunk_id])
+            if chunk_id in lexical_ranks:
+                metadata['lexical_rank'] = str(lexical_ranks[chunk_id])
+            results.append(
+                SearchResult(
+                    file_path=doc.metadata.get('source', 'unknown'),
+                    content=doc.page_content,
+                    score=score,
+                    line_numbers=[start_line, end_line] if start_line and end_line else None,
+                    metadata=metadata,
+                )
+            )
+        logger.info(
+            f'Fused {len(vector_ranking)} vector and {len(lexical_ranking)} lexical candidates'
+        )
+        return results
+
 
 def get_repository_searcher(
     embedding_model: str = EmbeddingModel.AMAZON_TITAN_EMBED_TEXT_V2,
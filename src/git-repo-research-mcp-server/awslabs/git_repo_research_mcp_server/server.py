@@ -198,6 +198,10 @@ async def mcp_index_repository(
         default=200,
         description='Overlap between chunks in characters',
     ),
+    incremental: bool = Field(
+        default=True,
+        description='Only re-index the files changed since the last indexed commit when an index built with the same settings exists',
+    ),
 ) -> Dict:
     """Build a FAISS index for a Git repository.
 
@@ -213,6 +217,7 @@ async def mcp_index_repository(
         exclude_patterns: Glob patterns for files to exclude (optional)
         chunk_size: Maximum size of each chunk in characters
         chunk_overlap: Overlap between chunks in characters
+        incremental: Only re-index the files changed since the last indexed commit
 
     Returns:
         Information about the created index
@@ -240,6 +245,8 @@ async def mcp_index_repository(
             exclude_patterns=exclude_patterns,
             chunk_size=chunk_size,
             chunk_overlap=chunk_overlap,
+            # Ensure incremental is a boolean, not a Field
+            incremental=incremental if isinstance(incremental, bool) else True,
         )
 
         # Get the repository indexer
@@ -609,7 +616,8 @@ async def mcp_search_repository(
 ) -> Dict:
     """Perform semantic search within an indexed repository.
 
-    This tool searches an indexed repository using semantic search with Amazon Bedrock embeddings.
+    This tool searches an indexed repository using semantic search with Amazon Bedrock embeddings,
+    fused with a lexical (BM25) search that finds identifiers and exact terms.
     It returns results ranked by relevance to the query.
 
     Args:
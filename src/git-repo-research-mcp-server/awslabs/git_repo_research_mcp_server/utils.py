@@ -20,6 +20,7 @@ import json
 import os
 import shutil
 from awslabs.git_repo_research_mcp_server.defaults import Constants
+from awslabs.git_repo_research_mcp_server.index_cache import index_cache
 from awslabs.git_repo_research_mcp_server.models import (
     DetailedIndexedRepositoriesResponse,
     DetailedIndexedRepositoryInfo,
@@ -368,6 +369,8 @@ async def delete_indexed_repository(
                 errors.append(f'Failed to delete index directory {index_path}: {str(e)}')
                 logger.error(f'Error deleting index directory {index_path}: {e}')
 
+    index_cache.invalidate(index_path)
+
     # Return appropriate response based on results
     if not errors:
         return {
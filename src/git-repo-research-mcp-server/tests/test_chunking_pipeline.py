@@ -0,0 +1,260 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for the file discovery and chunking pipeline."""
+
+import asyncio
+import fnmatch
+import os
+import pytest
+import subprocess
+import threading
+import time
+from awslabs.git_repo_research_mcp_server.defaults import Constants
+from awslabs.git_repo_research_mcp_server.indexer import (
+    DocumentBatcher,
+    IndexBuilder,
+    iterate_in_thread,
+)
+from awslabs.git_repo_research_mcp_server.repository import (
+    Chunk,
+    PathMatcher,
+    discover_files,
+    iter_file_chunks,
+)
+from contextlib import aclosing
+from langchain_core.documents import Document
+from unittest.mock import MagicMock
+
+
+PATHS = [
+    'README.md',
+    'setup.py',
+    'src/app.py',
+    'src/app.pyc',
+    'node_modules/lib/index.js',
+    'web/node_modules/lib/index.js',
+    'build/out.txt',
+    'docs/build/out.txt',
+    'package-lock.json',
+    'images/logo.png',
+    '.git/config',
+]
+
+
+@pytest.mark.parametrize(
+    'include_patterns,exclude_patterns',
+    [
+        (Constants.TEXT_FILE_INCLUDE_PATTERNS, Constants.TEXT_FILE_EXCLUDE_PATTERNS),
+        (Constants.DEFAULT_INCLUDE_PATTERNS, Constants.DEFAULT_EXCLUDE_PATTERNS),
+        (['*'], []),
+        ([], ['*']),
+    ],
+)
+def test_path_matcher_matches_like_fnmatch(include_patterns, exclude_patterns):
+    """Test that compiled patterns select the same files as fnmatch."""
+    matcher = PathMatcher(include_patterns, exclude_patterns)
+
+    for path in PATHS:
+        expected = any(fnmatch.fnmatch(path, p) for p in include_patterns) and not any(
+            fnmatch.fnmatch(path, p) for p in exclude_patterns
+        )
+        assert matcher.matches(path) is expected, path
+
+
+def test_path_matcher_excluded_directories():
+    """Test that only directories whose files are all excluded can be skipped."""
+    matcher = PathMatcher(['*'], ['**/node_modules/**', 'build/**', '*.pyc'])
+
+    assert matcher.is_excluded_dir('web/node_modules')
+    assert matcher.is_excluded_dir('build')
+    assert not matcher.is_excluded_dir('node_modules')
+    assert not matcher.is_excluded_dir('docs')
+
+
+def write(path, content):
+    """Write a file, creating its directory."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        f.write(content)
+
+
+@pytest.fixture
+def repo_dir(tmp_path):
+    """Create a Git repository with ignored files and directories."""
+    write(tmp_path / '.gitignore', 'generated/\n*.log\n')
+    write(tmp_path / 'sub' / '.gitignore', 'secret.py\n')
+    write(tmp_path / 'main.py', 'print(1)\n')
+    write(tmp_path / 'tracked.log', 'tracked despite the ignore rule\n')
+    write(tmp_path / 'sub' / 'module.py', 'print(2)\n')
+    write(tmp_path / 'sub' / 'secret.py', 'print(3)\n')
+    write(tmp_path / 'generated' / 'code.py', 'print(4)\n')
+    write(tmp_path / 'debug.log', 'ignored\n')
+    subprocess.run(['git', 'init'], cwd=tmp_path, check=True, capture_output=True)
+    subprocess.run(
+        ['git', 'add', '.gitignore', 'main.py', 'sub/module.py', 'sub/.gitignore'],
+        cwd=tmp_path,
+        check=True,
+    )
+    subprocess.run(['git', 'add', '-f', 'tracked.log'], cwd=tmp_path, check=True)
+    return tmp_path
+
+
+def test_discover_files_skips_files_ignored_by_git(repo_dir):
+    """Test that files and directories ignored by Git are not indexed."""
+    files = discover_files(str(repo_dir), ['*.py', '*.log'], [])
+
+    assert [os.path.relpath(f, repo_dir) for f in files] == [
+        'main.py',
+        'tracked.log',
+        os.path.join('sub', 'module.py'),
+    ]
+
+
+def test_discover_files_without_git(tmp_path):
+    """Test that directories outside Git are walked with the patterns only."""
+    write(tmp_path / 'a.py', 'a')
+    write(tmp_path / 'vendor' / 'b.py', 'b')
+
+    files = discover_files(str(tmp_path), ['*.py'], ['vendor/**'])
+
+    assert [os.path.relpath(f, tmp_path) for f in files] == ['a.py']
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_iter_file_chunks(tmp_path, workers, monkeypatch):
+    """Test that files are chunked in order, skipping binary and empty files."""
+    monkeypatch.setattr(Constants, 'CHUNKING_BATCH_FILES', 2)
+    paths = []
+    for i in range(5):
+        write(tmp_path / f'{i}.txt', f'file {i} ' * 10)
+        paths.append(str(tmp_path / f'{i}.txt'))
+    (tmp_path / 'binary.txt').write_bytes(b'\xff\xfe\x00')
+    write(tmp_path / 'empty.txt', '')
+    paths[2:2] = [str(tmp_path / 'binary.txt'), str(tmp_path / 'empty.txt')]
+
+    results = list(iter_file_chunks(str(tmp_path), paths, 40, 10, workers=workers))
+
+    assert [path for path, _ in results] == [f'{i}.txt' for i in range(5)]
+    assert results[0][1] == [
+        Chunk('file 0 file 0 file 0 file 0 file 0 file', 1, 1),
+        Chunk('0 file 0 file 0 file 0 file 0 ', 1, 1),
+    ]
+
+
+def test_document_batcher():
+    """Test that chunks get consecutive IDs across files and batches."""
+    file_chunks = [
+        ('a.py', [Chunk('1', 1, 1), Chunk('2', 2, 2), Chunk('3', 3, 4)]),
+        ('b.py', [Chunk('4', 1, 1)]),
+    ]
+    batcher = DocumentBatcher(iter(file_chunks), 2)
+
+    batches = list(batcher)
+
+    assert [[doc.page_content for doc in batch] for batch in batches] == [['1', '2'], ['3', '4']]
+    assert [doc.metadata for doc in batches[1]] == [
+        {'source': 'a.py', 'chunk_id': 2, 'start_line': 3, 'end_line': 4},
+        {'source': 'b.py', 'chunk_id': 3, 'start_line': 1, 'end_line': 1},
+    ]
+    assert batcher.chunks == ['1', '2', '3', '4']
+    assert batcher.chunk_locations == [
+        ('a.py', 1, 1),
+        ('a.py', 2, 2),
+        ('a.py', 3, 4),
+        ('b.py', 1, 1),
+    ]
+    assert batcher.text_files == ['a.py', 'b.py']
+
+
+@pytest.mark.asyncio
+async def test_iterate_in_thread_is_bounded():
+    """Test that the producer stays at most a queue ahead of the consumer."""
+    produced = []
+
+    def produce():
+        for i in range(10):
+            produced.append(i)
+            yield i
+
+    consumed = []
+    async for item in iterate_in_thread(produce(), 2):
+        await asyncio.sleep(0.01)
+        consumed.append(item)
+        assert len(produced) - len(consumed) <= 3
+
+    assert consumed == list(range(10))
+
+
+@pytest.mark.asyncio
+async def test_iterate_in_thread_propagates_errors():
+    """Test that an error of the producer is raised to the consumer."""
+
+    def produce():
+        yield 1
+        raise ValueError('broken')
+
+    with pytest.raises(ValueError, match='broken'):
+        async for _ in iterate_in_thread(produce(), 2):
+            pass
+
+
+@pytest.mark.asyncio
+async def test_iterate_in_thread_stops_the_producer():
+    """Test that the producer stops when the consumer stops early."""
+    produced = []
+
+    def produce():
+        for i in range(1000):
+            produced.append(i)
+            yield i
+
+    async with aclosing(iterate_in_thread(produce(), 1)) as items:
+        async for _ in items:
+            break
+
+    assert len(produced) < 10
+
+
+@pytest.mark.asyncio
+async def test_batches_are_embedded_concurrently(monkeypatch):
+    """Test that batches are embedded concurrently and indexed by chunk ID."""
+    monkeypatch.setattr(Constants, 'EMBEDDING_BATCHES_IN_FLIGHT', 3)
+    running, peak = 0, 0
+    lock = threading.Lock()
+
+    def embed_documents(texts):
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.05)
+        with lock:
+            running -= 1
+        return [[float(text), 1.0] for text in texts]
+
+    embedding_generator = MagicMock()
+    embedding_generator.embed_documents.side_effect = embed_documents
+    batcher = DocumentBatcher(iter([(f'{i}.py', [Chunk(str(i), 1, 1)]) for i in range(12)]), 2)
+
+    vector_store = await IndexBuilder().create_vector_store_from_batches(
+        iterate_in_thread(iter(batcher), 2), embedding_generator
+    )
+
+    assert vector_store is not None
+    assert peak == 3
+    assert vector_store.index.ntotal == 12
+    assert sorted(vector_store.index_to_docstore_id) == list(range(12))
+    document = vector_store.docstore.search(vector_store.index_to_docstore_id[7])
+    assert isinstance(document, Document)
+    assert document.metadata == {'source': '7.py', 'chunk_id': 7, 'start_line': 1, 'end_line': 1}
@@ -0,0 +1,195 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for the content-addressed embedding cache."""
+
+import os
+import pytest
+import threading
+from awslabs.git_repo_research_mcp_server.embedding_cache import (
+    DATA_FILE,
+    INDEX_FILE,
+    RECORD_HEADER,
+    CachedEmbeddings,
+    EmbeddingCache,
+    get_cache_key,
+)
+from awslabs.git_repo_research_mcp_server.indexer import IndexConfig, RepositoryIndexer
+from unittest.mock import MagicMock, patch
+
+
+def embed(texts):
+    """Embed texts into vectors derived from their length."""
+    return [[float(len(text)), 0.5, -1.0] for text in texts]
+
+
+@pytest.fixture
+def embeddings():
+    """Create an embedding model recording the embedded texts."""
+    model = MagicMock()
+    model.embed_documents.side_effect = embed
+    return model
+
+
+def test_cached_embeddings_only_embed_missing_texts(tmp_path, embeddings):
+    """Test that texts already embedded are served from the cache."""
+    cached = CachedEmbeddings(embeddings, EmbeddingCache(str(tmp_path), 1024**2), 'model')
+
+    assert cached.embed_documents(['a', 'bb', 'a']) == embed(['a', 'bb', 'a'])
+    assert cached.embed_documents(['bb', 'ccc']) == embed(['bb', 'ccc'])
+
+    assert [call.args[0] for call in embeddings.embed_documents.call_args_list] == [
+        ['a', 'bb'],
+        ['ccc'],
+    ]
+    assert cached.counters() == (1, 4)
+    assert cached.cache.stats()['hit_rate'] == pytest.approx(1 / 5)
+
+
+def test_cache_keys_depend_on_the_model():
+    """Test that the same text embedded by two models has two cache entries."""
+    assert get_cache_key('text', 'model-a') != get_cache_key('text', 'model-b')
+
+
+def test_cache_persists_across_instances(tmp_path):
+    """Test that cached vectors are found again after reopening the cache."""
+    cache = EmbeddingCache(str(tmp_path), 1024**2)
+    cache.put_many({get_cache_key('text', 'model'): [0.25, 0.5]})
+    cache.close()
+
+    reopened = EmbeddingCache(str(tmp_path), 1024**2)
+
+    assert reopened.get_many([get_cache_key('text', 'model')]) == [[0.25, 0.5]]
+
+
+def test_cache_rebuilds_a_missing_index(tmp_path):
+    """Test that the index is rebuilt from the data file, dropping torn records."""
+    cache = EmbeddingCache(str(tmp_path), 1024**2)
+    cache.put_many({get_cache_key('a', 'model'): [1.0], get_cache_key('b', 'model'): [2.0]})
+    cache.close()
+    os.remove(tmp_path / INDEX_FILE)
+    with open(tmp_path / DATA_FILE, 'ab') as f:
+        f.write(RECORD_HEADER.pack(get_cache_key('c', 'model'), 3))
+
+    reopened = EmbeddingCache(str(tmp_path), 1024**2)
+
+    assert len(reopened) == 2
+    assert reopened.get_many([get_cache_key('b', 'model')]) == [[2.0]]
+    assert reopened.size_bytes == 2 * (RECORD_HEADER.size + 4)
+
+
+def test_cache_ignores_index_records_beyond_the_data(tmp_path):
+    """Test that index records of vectors that never reached the data file are ignored."""
+    cache = EmbeddingCache(str(tmp_path), 1024**2)
+    cache.put_many({get_cache_key('a', 'model'): [1.0], get_cache_key('b', 'model'): [2.0]})
+    cache.close()
+    with open(tmp_path / DATA_FILE, 'r+b') as f:
+        f.truncate(RECORD_HEADER.size + 4 + 1)
+
+    reopened = EmbeddingCache(str(tmp_path), 1024**2)
+
+    assert reopened.get_many([get_cache_key('a', 'model'), get_cache_key('b', 'model')]) == [
+        [1.0],
+        None,
+    ]
+
+
+def test_cache_evicts_least_recently_used_vectors(tmp_path):
+    """Test that the cache stays under its maximum size by dropping old vectors."""
+    record_size = RECORD_HEADER.size + 4 * 4
+    cache = EmbeddingCache(str(tmp_path), 4 * record_size)
+    keys = [get_cache_key(str(i), 'model') for i in range(5)]
+    cache.put_many({key: [float(i)] * 4 for i, key in enumerate(keys[:4])})
+    cache.get_many([keys[0]])
+
+    cache.put_many({keys[4]: [4.0] * 4})
+
+    assert cache.size_bytes <= 4 * record_size
+    assert cache.get_many(keys) == [[0.0] * 4, None, None, [3.0] * 4, [4.0] * 4]
+    cache.close()
+    assert len(EmbeddingCache(str(tmp_path), 4 * record_size)) == 3
+
+
+def test_cache_instances_share_their_files(tmp_path):
+    """Test that two instances on the same directory, like two processes, see each other."""
+    first = EmbeddingCache(str(tmp_path), 1024**2)
+    second = EmbeddingCache(str(tmp_path), 1024**2)
+    keys = [get_cache_key(str(i), 'model') for i in range(3)]
+
+    first.put_many({keys[0]: [0.0]})
+    second.put_many({keys[1]: [1.0, 1.0]})
+    first.put_many({keys[2]: [2.0]})
+
+    assert first.get_many(keys) == [[0.0], [1.0, 1.0], [2.0]]
+    assert second.get_many(keys) == [[0.0], [1.0, 1.0], [2.0]]
+    first.close()
+    second.close()
+    assert EmbeddingCache(str(tmp_path), 1024**2).get_many(keys) == [[0.0], [1.0, 1.0], [2.0]]
+
+
+def test_cache_instances_follow_a_compaction(tmp_path):
+    """Test that an instance keeps working after another one rewrote the files."""
+    record_size = RECORD_HEADER.size + 4 * 4
+    first = EmbeddingCache(str(tmp_path), 100 * record_size)
+    second = EmbeddingCache(str(tmp_path), 4 * record_size)
+    keys = [get_cache_key(str(i), 'model') for i in range(6)]
+    first.put_many({key: [float(i)] * 4 for i, key in enumerate(keys[:4])})
+
+    second.put_many({keys[4]: [4.0] * 4})
+    first.put_many({keys[5]: [5.0] * 4})
+
+    assert first.get_many(keys) == [None, None, [2.0] * 4, [3.0] * 4, [4.0] * 4, [5.0] * 4]
+    assert second.get_many(keys) == first.get_many(keys)
+    first.close()
+    second.close()
+    assert len(EmbeddingCache(str(tmp_path), 100 * record_size)) == 4
+
+
+def test_cache_instances_append_concurrently(tmp_path):
+    """Test that the records appended concurrently by two instances are all kept."""
+    caches = [EmbeddingCache(str(tmp_path), 1024**2) for _ in range(2)]
+
+    def append(cache, name):
+        for i in range(50):
+            cache.put_many({get_cache_key(f'{name}{i}', 'model'): [float(i)] * (i % 7 + 1)})
+
+    threads = [
+        threading.Thread(target=append, args=(cache, name))
+        for cache, name in zip(caches, ('a', 'b'))
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    for cache in caches:
+        cache.close()
+
+    reopened = EmbeddingCache(str(tmp_path), 1024**2)
+    keys = [get_cache_key(f'{name}{i}', 'model') for name in 'ab' for i in range(50)]
+    assert reopened.get_many(keys) == [[float(i)] * (i % 7 + 1) for _ in 'ab' for i in range(50)]
+
+
+def test_indexer_shares_the_cache_across_repositories(tmp_path, embeddings):
+    """Test that indexers of the same index directory share one cache."""
+    with patch(
+        'awslabs.git_repo_research_mcp_server.indexer.get_embedding_model',
+        return_value=embeddings,
+    ):
+        config = IndexConfig(embedding_model='test-model', index_dir=str(tmp_path))
+        first = RepositoryIndexer(config).embedding_generator
+        second = RepositoryIndexer(config).embedding_generator
+
+    assert isinstance(first, CachedEmbeddings)
+    assert isinstance(second, CachedEmbeddings)
+    assert first.cache is second.cache
+    assert first.cache.cache_dir == str(tmp_path / '.embedding_cache')
@@ -0,0 +1,295 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for the concurrent embedding executor, against a local stub of Bedrock."""
+
+import json
+import pytest
+import random
+import threading
+import time
+from awslabs.git_repo_research_mcp_server.embedding_executor import (
+    AdaptiveConcurrencyLimiter,
+    ConcurrentEmbeddings,
+    is_throttling_error,
+    is_transient_error,
+)
+from awslabs.git_repo_research_mcp_server.embeddings import create_bedrock_embeddings
+from botocore.exceptions import ClientError, EndpointConnectionError, ReadTimeoutError
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from langchain_core.embeddings.embeddings import Embeddings
+from loguru import logger
+from typing import cast
+
+
+def throttling_error():
+    """Create the error raised by boto3 for a throttled request."""
+    return ClientError(
+        {'Error': {'Code': 'ThrottlingException', 'Message': 'Too many requests'}},
+        'InvokeModel',
+    )
+
+
+class StubEmbeddings(Embeddings):
+    """Embedding model with a fixed latency, throttling requests beyond its capacity."""
+
+    def __init__(self, latency=0.01, capacity=None):
+        """Initialize the stub with its latency and maximum number of concurrent requests."""
+        self.latency = latency
+        self.capacity = capacity
+        self.in_flight = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def embed_documents(self, texts):
+        """Embed texts into vectors derived from their content."""
+        with self.lock:
+            if self.capacity is not None and self.in_flight >= self.capacity:
+                raise throttling_error()
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        try:
+            time.sleep(self.latency * random.uniform(0.5, 1.5))
+            return [[float(text), 1.0] for text in texts]
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+    def embed_query(self, text):
+        """Embed a query."""
+        return self.embed_documents([text])[0]
+
+
+def test_limiter_increases_additively():
+    """Test that successful requests raise the limit by about one per window."""
+    limiter = AdaptiveConcurrencyLimiter(initial=4, minimum=1, maximum=6)
+
+    for _ in range(4):
+        limiter.release(limiter.acquire())
+
+    assert 4.9 < limiter.limit < 5
+    for _ in range(20):
+        limiter.release(limiter.acquire())
+    assert limiter.limit == 6
+
+
+def test_limiter_decreases_once_per_burst():
+    """Test that requests throttled together only halve the limit once."""
+    limiter = AdaptiveConcurrencyLimiter(initial=8, minimum=1, maximum=8)
+    epochs = [limiter.acquire() for _ in range(8)]
+
+    for epoch in epochs:
+        limiter.release(epoch, throttled=True)
+
+    assert limiter.limit == 4
+    limiter.release(limiter.acquire(), throttled=True)
+    assert limiter.limit == 2
+
+
+def test_limiter_blocks_beyond_the_limit():
+    """Test that a request waits for one in flight to complete once the limit is reached."""
+    limiter = AdaptiveConcurrencyLimiter(initial=1, minimum=1, maximum=1)
+    epoch = limiter.acquire()
+    acquired = threading.Event()
+    thread = threading.Thread(target=lambda: (limiter.acquire(), acquired.set()))
+    thread.start()
+
+    assert not acquired.wait(0.05)
+    limiter.release(epoch)
+    assert acquired.wait(1)
+    thread.join()
+
+
+def test_is_throttling_error():
+    """Test that only throttling errors of Bedrock are retried."""
+    assert is_throttling_error(throttling_error())
+    assert not is_throttling_error(
+        ClientError({'Error': {'Code': 'ValidationException'}}, 'InvokeModel')
+    )
+    assert not is_throttling_error(ValueError('broken'))
+
+
+def test_embeddings_are_returned_in_order():
+    """Test that requests completing in any order are reassembled in the order of the texts."""
+    executor = ConcurrentEmbeddings(StubEmbeddings(), texts_per_request=3, max_concurrency=8)
+    texts = [str(i) for i in range(50)]
+
+    vectors = executor.embed_documents(texts)
+
+    assert vectors == [[float(i), 1.0] for i in range(50)]
+    assert executor.stats()['requests'] == 17
+    assert executor.embed_query('7') == [7.0, 1.0]
+
+
+def test_throttled_requests_are_retried():
+    """Test that throttling lowers the concurrency and throttled requests are retried."""
+    model = StubEmbeddings(capacity=3)
+    executor = ConcurrentEmbeddings(
+        model,
+        initial_concurrency=16,
+        max_concurrency=16,
+        backoff_seconds=0.001,
+        max_backoff_seconds=0.01,
+    )
+
+    vectors = executor.embed_documents([str(i) for i in range(100)])
+
+    assert vectors == [[float(i), 1.0] for i in range(100)]
+    assert executor.stats()['throttled'] > 0
+    assert executor.limiter.limit < 16
+
+
+def test_transient_errors_are_retried_without_changing_the_limit():
+    """Test that server and connection faults are retried, leaving the concurrency alone."""
+    model = StubEmbeddings()
+    errors = [
+        ClientError({'Error': {'Code': 'ModelNotReadyException'}}, 'InvokeModel'),
+        ClientError(
+            {'Error': {'Code': 'Unknown'}, 'ResponseMetadata': {'HTTPStatusCode': 503}},
+            'InvokeModel',
+        ),
+        EndpointConnectionError(endpoint_url='https://bedrock-runtime'),
+        ReadTimeoutError(endpoint_url='https://bedrock-runtime'),
+    ]
+    embed_documents = model.embed_documents
+
+    def fail_then_embed(texts):
+        if errors:
+            raise errors.pop(0)
+        return embed_documents(texts)
+
+    model.embed_documents = fail_then_embed
+    executor = ConcurrentEmbeddings(model, initial_concurrency=4, backoff_seconds=0.001)
+
+    assert executor.embed_documents(['7']) == [[7.0, 1.0]]
+    assert executor.stats() == {'requests': 5, 'throttled': 0, 'concurrency_limit': 4}
+    assert is_transient_error(throttling_error()) is False
+
+
+def test_invalid_requests_are_not_retried():
+    """Test that requests rejected as invalid are raised without a retry."""
+    model = StubEmbeddings()
+    calls = []
+
+    def embed_documents(texts):
+        calls.append(texts)
+        raise ClientError({'Error': {'Code': 'ValidationException'}}, 'InvokeModel')
+
+    model.embed_documents = embed_documents
+    executor = ConcurrentEmbeddings(model)
+
+    with pytest.raises(ClientError):
+        executor.embed_documents(['a'])
+    assert calls == [['a']]
+
+
+def test_throttled_requests_give_up_after_the_maximum_attempts():
+    """Test that a request throttled on every attempt raises the throttling error."""
+    model = StubEmbeddings(capacity=0)
+    executor = ConcurrentEmbeddings(model, max_attempts=3, backoff_seconds=0.001)
+
+    with pytest.raises(ClientError):
+        executor.embed_documents(['a'])
+    assert executor.stats() == {'requests': 3, 'throttled': 3, 'concurrency_limit': 1}
+
+
+class StubBedrockServer(ThreadingHTTPServer):
+    """Stub Bedrock runtime endpoint with a fixed latency and capacity."""
+
+    daemon_threads = True
+
+    def __init__(self, latency, capacity):
+        """Listen on a free local port."""
+        super().__init__(('127.0.0.1', 0), StubBedrockHandler)
+        self.latency = latency
+        self.capacity = capacity
+        self.in_flight = 0
+        self.lock = threading.Lock()
+
+
+class StubBedrockHandler(BaseHTTPRequestHandler):
+    """Handler of InvokeModel requests of a stub Bedrock runtime endpoint."""
+
+    def do_POST(self):
+        """Embed the input text, or reject the request beyond the capacity of the server."""
+        server = cast(StubBedrockServer, self.server)
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        with server.lock:
+            throttled = server.in_flight >= server.capacity
+            if not throttled:
+                server.in_flight += 1
+        if throttled:
+            self.respond(
+                429, {'message': 'Too many requests'}, {'x-amzn-ErrorType': 'ThrottlingException'}
+            )
+            return
+        try:
+            time.sleep(server.latency)
+            self.respond(200, {'embedding': [float(len(body['inputText'])), 1.0]})
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+    def respond(self, status, payload, headers=None):
+        """Send a JSON response."""
+        content = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(content)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):
+        """Silence the request log."""
+
+
+@pytest.fixture
+def stub_bedrock(monkeypatch):
+    """Serve a stub Bedrock runtime endpoint with 20 ms of latency and a capacity of 8."""
+    server = StubBedrockServer(latency=0.02, capacity=8)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setenv(
+        'AWS_ENDPOINT_URL_BEDROCK_RUNTIME', f'http://127.0.0.1:{server.server_address[1]}'
+    )
+    monkeypatch.setenv('AWS_ACCESS_KEY_ID', 'test')
+    monkeypatch.setenv('AWS_SECRET_ACCESS_KEY', 'test')
+    monkeypatch.delenv('AWS_PROFILE', raising=False)
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_bedrock_embeddings_against_a_stub_endpoint(stub_bedrock):
+    """Benchmark concurrent embedding against sequential embedding through a stub endpoint."""
+    embeddings = create_bedrock_embeddings('amazon.titan-embed-text-v2:0', 'us-east-1')
+    assert isinstance(embeddings, ConcurrentEmbeddings)
+    embeddings.backoff_seconds = 0.01
+    texts = ['x' * (i + 1) for i in range(160)]
+
+    start = time.perf_counter()
+    sequential = embeddings.embeddings.embed_documents(texts[:40])
+    sequential_rate = 40 / (time.perf_counter() - start)
+    start = time.perf_counter()
+    concurrent = embeddings.embed_documents(texts)
+    concurrent_rate = len(texts) / (time.perf_counter() - start)
+    logger.info(
+        f'Sequential: {sequential_rate:.0f} texts/s, concurrent: {concurrent_rate:.0f} texts/s, '
+        f'{embeddings.stats()}'
+    )
+
+    assert sequential == [[float(i + 1), 1.0] for i in range(40)]
+    assert concurrent == [[float(i + 1), 1.0] for i in range(160)]
+    assert concurrent_rate > 2 * sequential_rate
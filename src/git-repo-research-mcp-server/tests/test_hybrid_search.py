@@ -0,0 +1,337 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for the hybrid lexical and vector search."""
+
+import asyncio
+import json
+import os
+import pytest
+from awslabs.git_repo_research_mcp_server.index_cache import index_cache
+from awslabs.git_repo_research_mcp_server.indexer import (
+    DocumentBatcher,
+    IndexBuilder,
+    get_chunk_map,
+    iterate_in_thread,
+    load_chunk_map_without_pickle,
+    save_chunk_map_without_pickle,
+)
+from awslabs.git_repo_research_mcp_server.lexical_index import (
+    LEXICAL_INDEX_FILE,
+    LexicalIndex,
+    tokenize,
+)
+from awslabs.git_repo_research_mcp_server.repository import (
+    Chunk,
+    chunk_text_with_lines,
+    get_chunk_spans,
+    iter_file_chunks,
+)
+from awslabs.git_repo_research_mcp_server.search import (
+    HybridIndex,
+    RepositorySearcher,
+    is_identifier_query,
+    reciprocal_rank_fusion,
+)
+from langchain_core.documents import Document
+from unittest.mock import MagicMock, patch
+
+
+@pytest.fixture(autouse=True)
+def clear_index_cache():
+    """Start every test with an empty process-level index cache."""
+    index_cache.clear()
+    yield
+    index_cache.clear()
+
+
+def test_tokenize_splits_identifiers_into_words():
+    """Test that identifiers are indexed whole and by word."""
+    assert tokenize('getUserName(user_id, HTTPServer2)') == [
+        'getusername',
+        'get',
+        'user',
+        'name',
+        'user_id',
+        'user',
+        'id',
+        'httpserver2',
+        'http',
+        'server',
+        '2',
+    ]
+    assert tokenize('x' * 65) == []
+
+
+def test_lexical_index_ranks_by_bm25():
+    """Test that rarer terms and shorter chunks rank higher."""
+    index = LexicalIndex.build(
+        [
+            (0, 'the parser reads the config'),
+            (1, 'the config loader'),
+            (2, 'the parser ' + 'and more words ' * 20),
+            (3, 'unrelated'),
+        ]
+    )
+
+    assert [chunk_id for chunk_id, _ in index.search('parser config', 10)] == [0, 1, 2]
+    assert [chunk_id for chunk_id, _ in index.search('parser config', 1)] == [0]
+    assert index.search('missing', 10) == []
+    assert index.has_term('Loader')
+    assert not index.has_term('load')
+
+
+def test_lexical_index_save_and_load(tmp_path):
+    """Test that a saved index is loaded with the same rankings, without pickle."""
+    index = LexicalIndex.build([(5, 'alpha beta'), (7, 'beta gamma'), (9, '')])
+    index.save(str(tmp_path))
+
+    loaded = LexicalIndex.load(str(tmp_path))
+
+    assert loaded is not None
+    assert len(loaded) == 3
+    assert loaded.search('beta gamma', 10) == index.search('beta gamma', 10)
+    assert not os.path.exists(tmp_path / f'{LEXICAL_INDEX_FILE}.tmp')
+    assert LexicalIndex.load(str(tmp_path / 'missing')) is None
+
+
+def test_chunk_text_with_lines():
+    """Test that chunks record the first and last line of their text."""
+    text = ''.join(f'line {i}\n' for i in range(1, 21))
+
+    chunks = chunk_text_with_lines(text, 30, 10)
+
+    assert chunks == [
+        Chunk(text[start:end], text.count('\n', 0, start) + 1, text.count('\n', 0, end - 1) + 1)
+        for start, end in get_chunk_spans(text, 30, 10)
+    ]
+    assert chunks[0].start_line == 1
+    assert chunks[-1].end_line == 20
+
+
+def test_identical_chunks_keep_their_own_files():
+    """Test that a chunk found in two files is mapped to both, with its lines in each."""
+    batcher = DocumentBatcher(
+        iter(
+            [
+                ('a.py', [Chunk('same', 1, 2)]),
+                ('b.py', [Chunk('other', 1, 1), Chunk('same', 4, 5)]),
+            ]
+        ),
+        10,
+    )
+    list(batcher)
+
+    assert batcher.chunk_locations == [('a.py', 1, 2), ('b.py', 1, 1), ('b.py', 4, 5)]
+
+
+def test_chunk_map_round_trip(tmp_path):
+    """Test that chunk maps keep a location per chunk and read the earlier format."""
+    chunk_map = {
+        'chunks': ['same', 'same'],
+        'chunk_locations': [('a.py', 1, 2), ('b.py', 4, 5)],
+    }
+    save_chunk_map_without_pickle(chunk_map, str(tmp_path))
+
+    assert load_chunk_map_without_pickle(str(tmp_path)) == chunk_map
+
+    with open(tmp_path / 'chunk_map.json', 'w') as f:
+        json.dump({'chunks': ['x', 'y'], 'chunk_to_file': {'0': 'a.py'}}, f)
+    assert load_chunk_map_without_pickle(str(tmp_path)) == {
+        'chunks': ['x', 'y'],
+        'chunk_locations': [('a.py', 0, 0), ('unknown', 0, 0)],
+    }
+
+
+def test_reciprocal_rank_fusion():
+    """Test that chunks ranked by both rankings come first, normalized to 1."""
+    fused = reciprocal_rank_fusion([[1, 2, 3], [3, 1], []], k=60)
+
+    assert [chunk_id for chunk_id, _ in fused] == [1, 3, 2]
+    assert fused[0][1] == pytest.approx((1 / 61 + 1 / 62) / (2 / 61))
+    assert reciprocal_rank_fusion([[4]], k=60) == [(4, 1.0)]
+
+
+@pytest.mark.parametrize(
+    'query,expected',
+    [
+        ('get_user', True),
+        ('getUser', True),
+        ('_private', True),
+        ('v2', True),
+        ('user', False),
+        ('HTTP', False),
+        ('get user', False),
+    ],
+)
+def test_is_identifier_query(query, expected):
+    """Test that only single identifiers that are not plain words are identifier queries."""
+    assert is_identifier_query(query) is expected
+
+
+def embed(text):
+    """Embed a text by the presence of a few words."""
+    return [1.0 if word in text.lower() else 0.0 for word in ('token', 'cache', 'retry')] + [0.1]
+
+
+@pytest.fixture
+def embedding_generator():
+    """Create an embedding generator embedding texts by the words they contain."""
+    generator = MagicMock()
+    generator.embed_documents.side_effect = lambda texts: [embed(text) for text in texts]
+    generator.embed_query.side_effect = embed
+    return generator
+
+
+@pytest.fixture
+def index_path(tmp_path, embedding_generator):
+    """Index a repository of five files, two of them with the same content."""
+    repo = tmp_path / 'repo'
+    repo.mkdir()
+    (repo / 'auth.py').write_text(
+        'import os\n\n\ndef refresh_token(session):\n    """Refresh the token."""\n'
+        '    return session.renew()\n'
+    )
+    (repo / 'store.py').write_text(
+        'class LruCache:\n    """Cache of values."""\n\n    def get(self, key):\n'
+        '        return self.values[key]\n'
+    )
+    (repo / 'net.py').write_text('def send(request):\n    """Retry a request."""\n')
+    (repo / 'util.py').write_text('\ndef shared_helper():\n    return None\n')
+    (repo / 'vendored.py').write_text('\ndef shared_helper():\n    return None\n')
+    paths = [
+        str(repo / name) for name in ('auth.py', 'store.py', 'net.py', 'util.py', 'vendored.py')
+    ]
+    batcher = DocumentBatcher(iter_file_chunks(str(repo), paths, 120, 0, workers=1), 4)
+    vector_store = asyncio.run(
+        IndexBuilder().create_vector_store_from_batches(
+            iterate_in_thread(iter(batcher), 2), embedding_generator
+        )
+    )
+    assert vector_store is not None
+    path = str(tmp_path / 'index')
+    IndexBuilder().save_index(vector_store, path)
+    return path
+
+
+@pytest.fixture
+def searcher(tmp_path, embedding_generator):
+    """Create a searcher embedding queries with the test embedding generator."""
+    with (
+        patch(
+            'awslabs.git_repo_research_mcp_server.search.get_embedding_model',
+            return_value=embedding_generator,
+        ),
+        patch(
+            'awslabs.git_repo_research_mcp_server.indexer.get_embedding_model',
+            return_value=embedding_generator,
+        ),
+    ):
+        return RepositorySearcher(embedding_model='test-model', index_dir=str(tmp_path))
+
+
+@pytest.mark.asyncio
+async def test_hybrid_search_returns_line_ranges(index_path, searcher, embedding_generator):
+    """Test that results of a saved index have their file and lines, fused from both rankings."""
+    assert os.path.exists(os.path.join(index_path, LEXICAL_INDEX_FILE))
+
+    response = searcher.search(index_path, 'refresh the session token', limit=3)
+
+    first = response.results[0]
+    assert first.file_path == 'auth.py'
+    assert first.line_numbers == [1, 6]
+    assert first.metadata is not None
+    assert first.metadata['vector_rank'] == '1'
+    assert first.metadata['lexical_rank'] == '1'
+    assert first.score == 1.0
+    assert embedding_generator.embed_query.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_identical_chunks_are_searched_in_each_file(index_path, searcher):
+    """Test that a chunk found in two files is returned for both files."""
+    response = searcher.search(index_path, 'shared helper', limit=2)
+
+    assert [(result.file_path, result.line_numbers) for result in response.results] == [
+        ('util.py', [1, 3]),
+        ('vendored.py', [1, 3]),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_identifier_queries_skip_the_vector_search(
+    index_path, searcher, embedding_generator
+):
+    """Test that an identifier found in the lexical index does not embed the query."""
+    response = searcher.search(index_path, 'refresh_token', limit=1)
+
+    assert [result.file_path for result in response.results] == ['auth.py']
+    assert response.results[0].metadata == {'chunk_id': '0', 'lexical_rank': '1'}
+    assert embedding_generator.embed_query.call_count == 0
+
+    searcher.search(index_path, 'missing_identifier', limit=1)
+    assert embedding_generator.embed_query.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_indices_without_a_lexical_index_are_searched(index_path, searcher):
+    """Test that indices saved before lexical indexing get a lexical index on load."""
+    os.remove(os.path.join(index_path, LEXICAL_INDEX_FILE))
+
+    response = searcher.search(index_path, 'LruCache', limit=1)
+
+    assert [result.file_path for result in response.results] == ['store.py']
+
+
+@pytest.mark.asyncio
+async def test_threshold_filters_fused_scores(index_path, searcher):
+    """Test that results below the threshold are dropped."""
+    response = searcher.search(index_path, 'refresh the session token', limit=10, threshold=0.99)
+
+    assert [result.file_path for result in response.results] == ['auth.py']
+
+
+def test_vector_hits_missing_from_the_documents_leave_them_unchanged():
+    """Test that vector hits outside the chunk documents are returned without being cached."""
+    documents = {0: Document(page_content='refresh the token', metadata={'source': 'auth.py'})}
+    vector_store = MagicMock()
+    vector_store.similarity_search_with_score.return_value = [
+        (
+            Document(page_content='retry a request', metadata={'chunk_id': 1, 'source': 'net.py'}),
+            0.5,
+        )
+    ]
+    hybrid_index = HybridIndex(
+        vector_store, LexicalIndex.build([(0, 'refresh the token')]), documents
+    )
+
+    results = RepositorySearcher.__new__(RepositorySearcher)._hybrid_search(
+        hybrid_index, 'retry the token', limit=2, threshold=0.0
+    )
+
+    assert sorted(result.file_path for result in results) == ['auth.py', 'net.py']
+    assert list(hybrid_index.documents) == [0]
+
+
+def test_get_chunk_map_keeps_lines(tmp_path):
+    """Test that the chunk map of a vector store has the lines of each chunk."""
+    vector_store = MagicMock()
+    batcher = DocumentBatcher(iter([('a.py', [Chunk('one', 1, 3), Chunk('two', 3, 5)])]), 10)
+    documents = [doc for batch in batcher for doc in batch]
+    vector_store.index_to_docstore_id = {1: 'b', 0: 'a'}
+    vector_store.docstore._dict = {'a': documents[0], 'b': documents[1]}
+
+    assert get_chunk_map(vector_store) == {
+        'chunks': ['one', 'two'],
+        'chunk_locations': [('a.py', 1, 3), ('a.py', 3, 5)],
+    }
@@ -0,0 +1,280 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for incremental re-indexing of repositories."""
+
+import faiss
+import hashlib
+import numpy as np
+import os
+import pytest
+import subprocess
+import threading
+from awslabs.git_repo_research_mcp_server.indexer import (
+    FileManager,
+    IndexBuilder,
+    IndexConfig,
+    RepositoryConfig,
+    RepositoryIndexer,
+    ensure_id_mapped,
+    get_chunk_ids_by_file,
+)
+from awslabs.git_repo_research_mcp_server.utils import load_metadata
+from langchain_community.docstore.in_memory import InMemoryDocstore
+from langchain_community.vectorstores import FAISS
+from langchain_core.documents import Document
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+
+def fake_embedding(text):
+    """Embed a text into a deterministic vector."""
+    digest = hashlib.sha256(text.encode('utf-8')).digest()
+    return [byte / 255 for byte in digest[:8]]
+
+
+@pytest.fixture
+def embedding_generator():
+    """Create an embedding generator recording the embedded texts."""
+    generator = MagicMock()
+    generator.embed_documents.side_effect = lambda texts: [fake_embedding(t) for t in texts]
+    generator.embed_query.side_effect = fake_embedding
+    return generator
+
+
+@pytest.fixture
+def indexer(tmp_path, embedding_generator):
+    """Create a repository indexer storing its indices in a temporary directory."""
+    with patch(
+        'awslabs.git_repo_research_mcp_server.indexer.get_embedding_model',
+        return_value=embedding_generator,
+    ):
+        yield RepositoryIndexer(
+            IndexConfig(
+                embedding_model='test-model',
+                index_dir=str(tmp_path / 'indices'),
+                embedding_cache_max_bytes=0,
+            )
+        )
+
+
+def git(repo_dir, *args):
+    """Run a git command in the repository."""
+    subprocess.run(['git', *args], cwd=repo_dir, check=True, capture_output=True)
+
+
+@pytest.fixture
+def repo_dir(tmp_path):
+    """Create a Git repository with a few committed files."""
+    repo_dir = tmp_path / 'repo'
+    repo_dir.mkdir()
+    git(repo_dir, 'init')
+    git(repo_dir, 'config', 'user.name', 'Test User')
+    git(repo_dir, 'config', 'user.email', 'test@example.com')
+    (repo_dir / 'keep.py').write_text('def keep():\n    return 1\n')
+    (repo_dir / 'change.py').write_text('def change():\n    return 2\n')
+    (repo_dir / 'remove.py').write_text('def remove():\n    return 3\n')
+    git(repo_dir, 'add', '.')
+    git(repo_dir, 'commit', '-m', 'Initial commit')
+    return repo_dir
+
+
+def indexed_files(indexer, index_path):
+    """Get the chunk IDs of each file of an index."""
+    return get_chunk_ids_by_file(ensure_id_mapped(indexer.load_index_without_pickle(index_path)))
+
+
+@pytest.mark.asyncio
+async def test_reindexing_only_embeds_changed_files(indexer, embedding_generator, repo_dir):
+    """Test that re-indexing embeds the chunks of changed files only."""
+    config = RepositoryConfig(repository_path=str(repo_dir), include_patterns=['*.py'])
+    first = await indexer.index_repository(config)
+    assert first.status == 'success'
+    assert first.chunk_count == 3
+    kept_chunk_ids = indexed_files(indexer, first.index_path)['keep.py']
+
+    (repo_dir / 'change.py').write_text('def change():\n    return 20\n')
+    (repo_dir / 'remove.py').unlink()
+    (repo_dir / 'added.py').write_text('def added():\n    return 4\n')
+    git(repo_dir, 'add', '-A')
+    git(repo_dir, 'commit', '-m', 'Change files')
+    (repo_dir / 'untracked.py').write_text('def untracked():\n    return 5\n')
+    embedding_generator.embed_documents.reset_mock()
+
+    second = await indexer.index_repository(config)
+
+    assert second.status == 'success'
+    assert 'updated index with 4 changed files' in (second.message or '')
+    embedded = [
+        text
+        for call in embedding_generator.embed_documents.call_args_list
+        for text in call.args[0]
+    ]
+    assert sorted(embedded) == sorted(
+        [
+            'def added():\n    return 4\n',
+            'def change():\n    return 20\n',
+            'def untracked():\n    return 5\n',
+        ]
+    )
+
+    chunk_ids_by_file = indexed_files(indexer, first.index_path)
+    assert sorted(chunk_ids_by_file) == ['added.py', 'change.py', 'keep.py', 'untracked.py']
+    assert chunk_ids_by_file['keep.py'] == kept_chunk_ids
+    assert not os.path.exists(os.path.join(first.index_path, 'repository', 'remove.py'))
+    assert (
+        open(os.path.join(first.index_path, 'repository', 'change.py')).read()
+        == 'def change():\n    return 20\n'
+    )
+
+    metadata = load_metadata(os.path.join(first.index_path, 'metadata.json'))
+    assert metadata is not None
+    assert metadata.chunk_count == 4
+    assert metadata.file_count == 4
+
+
+@pytest.mark.asyncio
+async def test_reindexing_drops_dirty_files_deleted_or_reverted_since(
+    indexer, embedding_generator, repo_dir
+):
+    """Test that untracked and uncommitted content indexed earlier does not stay in the index."""
+    config = RepositoryConfig(repository_path=str(repo_dir), include_patterns=['*.py'])
+    (repo_dir / 'scratch.py').write_text('def scratch():\n    return 6\n')
+    (repo_dir / 'change.py').write_text('def change():\n    return 22\n')
+    first = await indexer.index_repository(config)
+    assert sorted(indexed_files(indexer, first.index_path)) == [
+        'change.py',
+        'keep.py',
+        'remove.py',
+        'scratch.py',
+    ]
+
+    (repo_dir / 'scratch.py').unlink()
+    git(repo_dir, 'checkout', '--', 'change.py')
+    embedding_generator.embed_documents.reset_mock()
+    main_thread = threading.current_thread()
+    embedding_threads = []
+    embedding_generator.embed_documents.side_effect = lambda texts: (
+        embedding_threads.append(threading.current_thread()) or [fake_embedding(t) for t in texts]
+    )
+
+    second = await indexer.index_repository(config)
+
+    assert 'updated index with 2 changed files' in (second.message or '')
+    assert sorted(indexed_files(indexer, first.index_path)) == [
+        'change.py',
+        'keep.py',
+        'remove.py',
+    ]
+    assert embedding_generator.embed_documents.call_args.args[0] == [
+        'def change():\n    return 2\n'
+    ]
+    assert embedding_threads and main_thread not in embedding_threads
+
+    # The working tree is clean now, so nothing is re-indexed
+    third = await indexer.index_repository(config)
+    assert 'updated index with 0 changed files' in (third.message or '')
+
+
+@pytest.mark.asyncio
+async def test_reindexing_loads_and_saves_the_index_off_the_event_loop(indexer, repo_dir):
+    """Test that loading, saving and copying the files of an updated index run in threads."""
+    config = RepositoryConfig(repository_path=str(repo_dir), include_patterns=['*.py'])
+    await indexer.index_repository(config)
+    (repo_dir / 'change.py').write_text('def change():\n    return 20\n')
+    threads = {}
+
+    def record(name, function):
+        def wrapper(*args, **kwargs):
+            threads.setdefault(name, set()).add(threading.current_thread())
+            return function(*args, **kwargs)
+
+        return wrapper
+
+    with (
+        patch.object(
+            indexer, 'load_index_without_pickle', record('load', indexer.load_index_without_pickle)
+        ),
+        patch.object(IndexBuilder, 'save_index', record('save', IndexBuilder.save_index)),
+        patch.object(FileManager, 'save_chunk_map', record('map', FileManager.save_chunk_map)),
+        patch.object(FileManager, '_sync_files', record('copy', FileManager._sync_files)),
+    ):
+        second = await indexer.index_repository(config)
+
+    assert 'updated index with 1 changed files' in (second.message or '')
+    assert sorted(threads) == ['copy', 'load', 'map', 'save']
+    assert all(threading.current_thread() not in used for used in threads.values())
+
+
+@pytest.mark.asyncio
+async def test_reindexing_with_new_settings_rebuilds_the_index(
+    indexer, embedding_generator, repo_dir
+):
+    """Test that changing the chunking settings re-embeds every file."""
+    await indexer.index_repository(
+        RepositoryConfig(repository_path=str(repo_dir), include_patterns=['*.py'])
+    )
+    embedding_generator.embed_documents.reset_mock()
+
+    response = await indexer.index_repository(
+        RepositoryConfig(repository_path=str(repo_dir), include_patterns=['*.py'], chunk_size=500)
+    )
+
+    assert response.status == 'success'
+    assert 'Successfully indexed repository' in (response.message or '')
+    embedded = [
+        text
+        for call in embedding_generator.embed_documents.call_args_list
+        for text in call.args[0]
+    ]
+    assert len(set(embedded)) == 3
+
+
+@pytest.mark.asyncio
+async def test_reindexing_without_incremental_rebuilds_the_index(
+    indexer, embedding_generator, repo_dir
+):
+    """Test that incremental indexing can be disabled."""
+    config = RepositoryConfig(repository_path=str(repo_dir), include_patterns=['*.py'])
+    await indexer.index_repository(config)
+
+    response = await indexer.index_repository(config.model_copy(update={'incremental': False}))
+
+    assert 'Successfully indexed repository' in (response.message or '')
+
+
+def test_ensure_id_mapped_converts_positional_indexes():
+    """Test that indexes of earlier versions keep their chunk IDs once converted."""
+    # The SWIG signatures of add and search differ from the numpy wrappers faiss installs
+    index: Any = faiss.IndexFlatL2(2)
+    index.add(np.array([[1.0, 0.0], [0.0, 1.0]], dtype=np.float32))
+    docstore = InMemoryDocstore(
+        {
+            'a': Document(page_content='a', metadata={'source': 'a.py', 'chunk_id': 0}),
+            'b': Document(page_content='b', metadata={'source': 'b.py', 'chunk_id': 1}),
+        }
+    )
+    vector_store = FAISS(
+        embedding_function=MagicMock(),
+        index=index,
+        docstore=docstore,
+        index_to_docstore_id={0: 'a', 1: 'b'},
+    )
+
+    vector_store = ensure_id_mapped(vector_store)
+
+    assert isinstance(vector_store.index, faiss.IndexIDMap)
+    id_mapped_index: Any = vector_store.index
+    _, ids = id_mapped_index.search(np.array([[0.0, 1.0]], dtype=np.float32), 1)
+    assert ids.tolist() == [[1]]
+    assert get_chunk_ids_by_file(vector_store) == {'a.py': [0], 'b.py': [1]}
@@ -0,0 +1,235 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for the resident index cache."""
+
+import os
+import pytest
+import threading
+from awslabs.git_repo_research_mcp_server.index_cache import INDEX_FILES, IndexCache, index_cache
+from awslabs.git_repo_research_mcp_server.indexer import IndexBuilder, RepositoryIndexer
+from awslabs.git_repo_research_mcp_server.models import IndexMetadata
+from awslabs.git_repo_research_mcp_server.search import RepositorySearcher
+from awslabs.git_repo_research_mcp_server.utils import delete_indexed_repository
+from concurrent.futures import ThreadPoolExecutor
+from langchain_core.documents import Document
+from unittest.mock import MagicMock, patch
+
+
+def write_index_files(index_path, size=10):
+    """Write index files of the given size."""
+    os.makedirs(index_path, exist_ok=True)
+    for name in INDEX_FILES:
+        with open(os.path.join(index_path, name), 'wb') as f:
+            f.write(b'x' * size)
+
+
+@pytest.fixture(autouse=True)
+def clear_index_cache():
+    """Start every test with an empty process-level index cache."""
+    index_cache.clear()
+    yield
+    index_cache.clear()
+
+
+def test_cache_loads_an_index_once(tmp_path):
+    """Test that an unchanged index is only loaded by the first lookup."""
+    cache = IndexCache(1024)
+    write_index_files(tmp_path)
+    loader = MagicMock(side_effect=lambda: object())
+
+    first = cache.get(str(tmp_path), loader)
+    second = cache.get(str(tmp_path), loader)
+
+    assert first is second
+    assert loader.call_count == 1
+    assert cache.stats()['hit_rate'] == 0.5
+
+
+def test_cache_reloads_a_rewritten_index(tmp_path):
+    """Test that an index rewritten by another process is loaded again."""
+    cache = IndexCache(1024)
+    write_index_files(tmp_path)
+    loader = MagicMock(side_effect=lambda: object())
+    cache.get(str(tmp_path), loader)
+
+    write_index_files(tmp_path, size=20)
+    cache.get(str(tmp_path), loader)
+
+    assert loader.call_count == 2
+    assert cache.size_bytes == 3 * 20
+
+
+def test_cache_invalidation(tmp_path):
+    """Test that invalidating an index drops every variant of it."""
+    cache = IndexCache(1024)
+    write_index_files(tmp_path)
+    cache.get(str(tmp_path), object, variant='model-a')
+    cache.get(str(tmp_path), object, variant='model-b')
+
+    cache.invalidate(str(tmp_path))
+
+    assert len(cache) == 0
+    assert cache.size_bytes == 0
+
+
+def test_cache_evicts_least_recently_used_indexes(tmp_path):
+    """Test that the cache stays within its budget by dropping the oldest lookups."""
+    cache = IndexCache(2 * 3 * 10)
+    for name in ('a', 'b', 'c'):
+        write_index_files(tmp_path / name)
+    cache.get(str(tmp_path / 'a'), object)
+    cache.get(str(tmp_path / 'b'), object)
+    cache.get(str(tmp_path / 'a'), object)
+
+    cache.get(str(tmp_path / 'c'), object)
+
+    loader = MagicMock()
+    cache.get(str(tmp_path / 'a'), loader)
+    cache.get(str(tmp_path / 'c'), loader)
+    assert loader.call_count == 0
+    cache.get(str(tmp_path / 'b'), loader)
+    assert loader.call_count == 1
+
+
+def test_cache_loads_outside_of_the_lock(tmp_path):
+    """Test that a slow load holds up neither other indexes nor lookups of the same index."""
+    cache = IndexCache(1024)
+    for name in ('slow', 'fast'):
+        write_index_files(tmp_path / name)
+    fast = cache.get(str(tmp_path / 'fast'), object)
+    started, release = threading.Event(), threading.Event()
+
+    def load_slowly():
+        started.set()
+        assert release.wait(timeout=5)
+        return object()
+
+    loader = MagicMock(side_effect=load_slowly)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        lookups = [executor.submit(cache.get, str(tmp_path / 'slow'), loader) for _ in range(2)]
+        assert started.wait(timeout=5)
+        # Cache hits on other indexes are served while the slow index loads
+        assert cache.get(str(tmp_path / 'fast'), MagicMock()) is fast
+        release.set()
+        first, second = [lookup.result(timeout=5) for lookup in lookups]
+
+    assert first is second
+    assert loader.call_count == 1
+    assert cache.get(str(tmp_path / 'slow'), MagicMock()) is first
+
+
+def test_cache_does_not_keep_failed_loads(tmp_path):
+    """Test that a failed load is reported and tried again by the next lookup."""
+    cache = IndexCache(1024)
+    write_index_files(tmp_path)
+
+    with pytest.raises(ValueError):
+        cache.get(str(tmp_path), MagicMock(side_effect=ValueError('corrupt index')))
+
+    assert len(cache) == 0
+    index = cache.get(str(tmp_path), object)
+    assert cache.get(str(tmp_path), MagicMock()) is index
+
+
+def test_cache_does_not_keep_missing_indexes(tmp_path):
+    """Test that indexes without files are loaded without being cached."""
+    cache = IndexCache(1024)
+    loader = MagicMock(side_effect=FileNotFoundError)
+
+    with pytest.raises(FileNotFoundError):
+        cache.get(str(tmp_path), loader)
+
+    assert len(cache) == 0
+
+
+def embed(text):
+    """Embed a text by its first letter."""
+    return [1.0 if text.startswith(letter) else 0.0 for letter in 'abg']
+
+
+@pytest.fixture
+def embedding_generator():
+    """Create an embedding generator embedding texts by their first letter."""
+    generator = MagicMock()
+    generator.embed_documents.side_effect = lambda texts: [embed(text) for text in texts]
+    generator.embed_query.side_effect = embed
+    return generator
+
+
+async def create_index(index_path, embedding_generator):
+    """Create an index of three chunks with its metadata."""
+    documents = [
+        Document(page_content=text, metadata={'source': f'{text}.py', 'chunk_id': i})
+        for i, text in enumerate(['alpha', 'beta', 'gamma'])
+    ]
+    vector_store = await IndexBuilder().create_vector_store(documents, embedding_generator)
+    IndexBuilder().save_index(vector_store, index_path)
+    metadata = IndexMetadata(
+        repository_name='repo',
+        repository_path='/tmp/repo',
+        index_path=index_path,
+        last_accessed=None,
+        file_count=3,
+        chunk_count=3,
+        embedding_model='test-model',
+        total_tokens=None,
+        index_size_bytes=None,
+        last_commit_id=None,
+        repository_directory=None,
+    )
+    with open(os.path.join(index_path, 'metadata.json'), 'w') as f:
+        f.write(metadata.model_dump_json())
+
+
+@pytest.mark.asyncio
+async def test_search_uses_the_index_cache(tmp_path, embedding_generator):
+    """Test that searches share a memory-mapped index until it is saved again or deleted."""
+    index_dir = str(tmp_path / 'indices')
+    index_path = os.path.join(index_dir, 'repo')
+    await create_index(index_path, embedding_generator)
+    with (
+        patch(
+            'awslabs.git_repo_research_mcp_server.search.get_embedding_model',
+            return_value=embedding_generator,
+        ),
+        patch(
+            'awslabs.git_repo_research_mcp_server.indexer.get_embedding_model',
+            return_value=embedding_generator,
+        ),
+    ):
+        searcher = RepositorySearcher(embedding_model='test-model', index_dir=index_dir)
+        other_searcher = RepositorySearcher(embedding_model='test-model', index_dir=index_dir)
+
+    with patch.object(
+        RepositoryIndexer,
+        'load_index_without_pickle',
+        autospec=True,
+        side_effect=RepositoryIndexer.load_index_without_pickle,
+    ) as load:
+        first = searcher.search(index_path, 'beta', limit=1)
+        second = other_searcher.search(index_path, 'gamma', limit=1)
+
+        assert [result.file_path for result in first.results] == ['beta.py']
+        assert [result.file_path for result in second.results] == ['gamma.py']
+        assert load.call_count == 1
+        assert load.call_args.kwargs == {'mmap': True}
+
+        await create_index(index_path, embedding_generator)
+        assert len(index_cache) == 0
+        searcher.search(index_path, 'alpha', limit=1)
+        assert load.call_count == 2
+
+    result = await delete_indexed_repository(index_path, index_dir=index_dir)
+    assert result['status'] == 'success'
+    assert len(index_cache) == 0
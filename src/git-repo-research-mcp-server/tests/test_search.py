@@ -14,6 +14,7 @@
 """Tests for the search functionality in Git Repository Research MCP Server."""
 
 import pytest
+from awslabs.git_repo_research_mcp_server.defaults import Constants
 from awslabs.git_repo_research_mcp_server.models import (
     SearchResponse,
 )
@@ -21,6 +22,7 @@ from awslabs.git_repo_research_mcp_server.search import (
     RepositorySearcher,
     get_repository_searcher,
 )
+from langchain_core.documents import Document
 from unittest.mock import MagicMock, patch
 
 
@@ -280,13 +282,21 @@ def test_search_with_repository_name():
         # Configure the mock vector store to return search results
         mock_doc1 = MagicMock()
         mock_doc1.page_content = 'Test content 1'
-        mock_doc1.metadata = {'source': '/path/to/file1.txt', 'chunk_id': '1'}
+        mock_doc1.metadata = {
+            'source': '/path/to/file1.txt',
+            'chunk_id': '1',
+            'start_line': 3,
+            'end_line': 7,
+        }
 
         mock_doc2 = MagicMock()
         mock_doc2.page_content = 'Test content 2'
         mock_doc2.metadata = {'source': '/path/to/file2.txt', 'chunk_id': '2'}
 
-        mock_vector_store.similarity_search.return_value = [mock_doc1, mock_doc2]
+        mock_vector_store.similarity_search_with_score.return_value = [
+            (mock_doc1, 0.2),
+            (mock_doc2, 0.4),
+        ]
         mock_vector_store.docstore._dict = {1: mock_doc1, 2: mock_doc2}
 
         mock_indexer.load_index_without_pickle.return_value = mock_vector_store
@@ -298,8 +308,6 @@ def test_search_with_repository_name():
         # Call the method
         result = searcher.search('test_repo', 'test query', limit=10, threshold=0.0)
 
-        print(result)
-
         # Verify the result
         assert isinstance(result, SearchResponse)
         assert result.query == 'test query'
@@ -309,32 +317,31 @@ def test_search_with_repository_name():
         assert result.total_results == 2
         assert result.execution_time_ms == 1000
 
-        assert result is not None
-        assert result.results is not None
-        assert len(result.results) > 0
-
-        # Verify first result
+        # Verify first result, ranked first by the only ranking with candidates
         first_result = result.results[0]
-        assert first_result is not None
         assert first_result.file_path == '/path/to/file1.txt'
         assert first_result.content == 'Test content 1'
         assert first_result.score == 1.0
-        assert first_result.metadata is not None
-        assert first_result.metadata['chunk_id'] == '1'
+        assert first_result.line_numbers == [3, 7]
+        assert first_result.metadata == {'chunk_id': '1', 'vector_rank': '1', 'distance': '0.2'}
 
         # Verify second result
         second_result = result.results[1]
-        assert second_result is not None
         assert second_result.file_path == '/path/to/file2.txt'
         assert second_result.content == 'Test content 2'
-        assert second_result.score == 1.0
+        assert second_result.score == pytest.approx(61 / 62)
+        assert second_result.line_numbers is None
         assert second_result.metadata is not None
         assert second_result.metadata['chunk_id'] == '2'
 
         # Verify the mock calls
         mock_indexer._get_index_path.assert_called_once_with('test_repo')
-        mock_indexer.load_index_without_pickle.assert_called_once_with('/tmp/index/test_repo')
-        mock_vector_store.similarity_search.assert_called_once_with('test query', k=10)
+        mock_indexer.load_index_without_pickle.assert_called_once_with(
+            '/tmp/index/test_repo', mmap=True
+        )
+        mock_vector_store.similarity_search_with_score.assert_called_once_with(
+            'test query', k=Constants.SEARCH_CANDIDATES
+        )
 
 
 def test_search_with_directory_path():
@@ -363,7 +370,7 @@ def test_search_with_directory_path():
         mock_doc1.page_content = 'Test content 1'
         mock_doc1.metadata = {'source': '/path/to/file1.txt', 'chunk_id': '1'}
 
-        mock_vector_store.similarity_search.return_value = [mock_doc1]
+        mock_vector_store.similarity_search_with_score.return_value = [(mock_doc1, 0.5)]
         mock_vector_store.docstore._dict = {1: mock_doc1}
 
         mock_indexer.load_index_without_pickle.return_value = mock_vector_store
@@ -390,11 +397,21 @@ def test_search_with_directory_path():
         assert result.results[0].score == 1.0
 
         # Verify the mock calls
-        mock_indexer.load_index_without_pickle.assert_called_once_with('/tmp/index/test_repo')
+        mock_indexer.load_index_without_pickle.assert_called_once_with(
+            '/tmp/index/test_repo', mmap=True
+        )
+
+
+def create_mock_vector_store(documents):
+    """Create a mock vector store holding documents, indexed by their position."""
+    mock_vector_store = MagicMock()
+    mock_vector_store.index_to_docstore_id = {i: f'doc-{i}' for i in range(len(documents))}
+    mock_vector_store.docstore._dict = {f'doc-{i}': doc for i, doc in enumerate(documents)}
+    return mock_vector_store
 
 
-def test_search_with_similarity_search_with_score_fallback():
-    """Test the search method with similarity_search_with_score fallback."""
+def test_search_falls_back_to_lexical_search():
+    """Test the search method when the vector search fails."""
     with (
         patch('awslabs.git_repo_research_mcp_server.search.get_embedding_model'),
         patch('awslabs.git_repo_research_mcp_server.search.get_repository_indexer'),
@@ -411,18 +428,17 @@ def test_search_with_similarity_search_with_score_fallback():
         mock_indexer = MagicMock()
         mock_indexer._get_index_path.return_value = '/tmp/index/test_repo'
 
-        # Create mock vector store
-        mock_vector_store = MagicMock()
-
-        # Configure the mock vector store to fail with similarity_search but succeed with similarity_search_with_score
-        mock_vector_store.similarity_search.side_effect = Exception('Test exception')
-
-        mock_doc1 = MagicMock()
-        mock_doc1.page_content = 'Test content 1'
-        mock_doc1.metadata = {'source': '/path/to/file1.txt', 'chunk_id': '1'}
-
-        mock_vector_store.similarity_search_with_score.return_value = [(mock_doc1, 0.5)]
-        mock_vector_store.docstore._dict = {1: mock_doc1}
+        # Create a mock vector store whose vector search fails
+        mock_vector_store = create_mock_vector_store(
+            [
+                Document(page_content='unrelated text', metadata={'source': 'a.txt'}),
+                Document(
+                    page_content='the test query is here',
+                    metadata={'source': 'b.txt', 'start_line': 1, 'end_line': 2},
+                ),
+            ]
+        )
+        mock_vector_store.similarity_search_with_score.side_effect = Exception('Test exception')
 
         mock_indexer.load_index_without_pickle.return_value = mock_vector_store
 
@@ -435,28 +451,21 @@ def test_search_with_similarity_search_with_score_fallback():
 
         # Verify the result
         assert isinstance(result, SearchResponse)
-        assert result.query == 'test query'
-        assert result.index_path == '/tmp/index/test_repo'
-        assert result.repository_name == 'test_repo'
-        assert result.repository_directory == '/tmp/index/test_repo/repository'
         assert result.total_results == 1
         assert result.execution_time_ms == 1000
-
-        assert len(result.results) == 1
-        assert result.results[0].file_path == '/path/to/file1.txt'
-        assert result.results[0].content == 'Test content 1'
-        assert result.results[0].score == 0.75  # 1.0 - min(1.0, 0.5/2.0)
+        assert result.results[0].file_path == 'b.txt'
+        assert result.results[0].content == 'the test query is here'
+        assert result.results[0].score == 1.0
+        assert result.results[0].line_numbers == [1, 2]
+        assert result.results[0].metadata == {'chunk_id': '1', 'lexical_rank': '1'}
 
         # Verify the mock calls
-        mock_indexer._get_index_path.assert_called_once_with('test_repo')
-        mock_indexer.load_index_without_pickle.assert_called_once_with('/tmp/index/test_repo')
-        mock_vector_store.similarity_search.assert_called_once_with('test query', k=10)
-        mock_vector_store.similarity_search_with_score.assert_called_once_with('test query', k=10)
+        mock_vector_store.similarity_search_with_score.assert_called_once()
         mock_logger_error.assert_called_once()
 
 
 def test_search_with_both_search_methods_failing():
-    """Test the search method when both similarity search methods fail."""
+    """Test the search method when neither the vector nor the lexical search finds a chunk."""
     with (
         patch('awslabs.git_repo_research_mcp_server.search.get_embedding_model'),
         patch('awslabs.git_repo_research_mcp_server.search.get_repository_indexer'),
@@ -472,13 +481,11 @@ def test_search_with_both_search_methods_failing():
         mock_indexer = MagicMock()
         mock_indexer._get_index_path.return_value = '/tmp/index/test_repo'
 
-        # Create mock vector store
-        mock_vector_store = MagicMock()
-
-        # Configure the mock vector store to fail with both search methods
-        mock_vector_store.similarity_search.side_effect = Exception('Test exception 1')
-        mock_vector_store.similarity_search_with_score.side_effect = Exception('Test exception 2')
-        mock_vector_store.docstore._dict = {1: MagicMock()}
+        # Create a mock vector store whose vector search fails and whose chunks do not match
+        mock_vector_store = create_mock_vector_store(
+            [Document(page_content='unrelated text', metadata={'source': 'a.txt'})]
+        )
+        mock_vector_store.similarity_search_with_score.side_effect = Exception('Test exception')
 
         mock_indexer.load_index_without_pickle.return_value = mock_vector_store
 
@@ -12,6 +12,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
+import contextvars
 import functools
 import inspect
 import json
@@ -31,11 +33,13 @@ from awslabs.mcp_lambda_handler.types import (
     StaticResource,
     TextContent,
 )
+from concurrent.futures import ThreadPoolExecutor
 from contextvars import ContextVar
 from enum import Enum
 from typing import (
     Any,
     Callable,
+    Coroutine,
     Dict,
     Generic,
     List,
@@ -100,7 +104,11 @@ class MCPLambdaHandler:
         self.version = version
         self.tools: Dict[str, Dict] = {}
         self.tool_implementations: Dict[str, Callable] = {}
+        # Converters of the arguments of each tool, such as enum values to enum members
+        self.tool_argument_converters: Dict[str, Dict[str, Callable[[Any], Any]]] = {}
         self.resources: Dict[str, Resource] = {}
+        # Event loop of the tool calls, reused by the invocations of a warm container
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
 
         # Configure session storage
         if session_store is None:
@@ -264,6 +272,12 @@ class MCPLambdaHandler:
             # Register the tool
             self.tools[tool_name] = tool_schema
             self.tool_implementations[tool_name] = func
+            # Convert enum string values to enum objects
+            self.tool_argument_converters[tool_name] = {
+                param_name: param_type
+                for param_name, param_type in hints.items()
+                if isinstance(param_type, type) and issubclass(param_type, Enum)
+            }
 
             @functools.wraps(func)
             def wrapper(*args, **kwargs):
@@ -390,8 +404,11 @@ class MCPLambdaHandler:
         return {'statusCode': 200, 'body': response.model_dump_json(), 'headers': headers}
 
     def handle_request(self, event: Dict, context: Any) -> Dict:
-        """Handle an incoming Lambda request."""
-        request_id = None
+        """Handle an incoming Lambda request.
+
+        The body is a JSON-RPC message or a batch of messages. The messages of a batch
+        are handled concurrently, so that calls of ``async def`` tools overlap.
+        """
         session_id = None
 
         try:
@@ -424,34 +441,134 @@ class MCPLambdaHandler:
             try:
                 body = json.loads(event['body'])
                 logger.debug(f'Parsed request body: {body}')
-                request_id = body.get('id') if isinstance(body, dict) else None
-
-                # Check if this is a notification (no id field)
-                if isinstance(body, dict) and 'id' not in body:
-                    logger.debug('Request is a notification')
-                    return {
-                        'statusCode': 202,
-                        'body': '',
-                        'headers': {'Content-Type': 'application/json', 'MCP-Version': '0.6'},
-                    }
-
-                # Validate basic JSON-RPC structure
-                if (
-                    not isinstance(body, dict)
-                    or body.get('jsonrpc') != '2.0'
-                    or 'method' not in body
-                ):
-                    return self._create_error_response(-32700, 'Parse error', request_id)
-
             except json.JSONDecodeError:
                 return self._create_error_response(-32700, 'Parse error')
 
+            if isinstance(body, list):
+                return self._handle_batch(body, session_id)
+            return self._run(self._handle_message(body, session_id))
+
+        except Exception as e:
+            logger.error(f'Error processing request: {str(e)}', exc_info=True)
+            return self._create_error_response(-32000, str(e), session_id=session_id)
+        finally:
+            # Clear session context
+            current_session_id.set(None)
+
+    def _run(self, coroutine: Coroutine[Any, Any, T]) -> T:
+        """Run a coroutine to completion on the event loop of the handler."""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            if self._loop is None or self._loop.is_closed():
+                self._loop = asyncio.new_event_loop()
+            return self._loop.run_until_complete(coroutine)
+        # Called from a coroutine, whose running loop cannot run another coroutine to completion
+        context = contextvars.copy_context()
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(context.run, asyncio.run, coroutine).result()
+
+    def _handle_batch(self, messages: List[Any], session_id: Optional[str]) -> Dict:
+        """Handle a JSON-RPC batch, answering its requests in a single array.
+
+        The session is validated once for the whole batch, and notifications are not
+        answered.
+        """
+        if not messages:
+            return self._create_error_response(-32600, 'Invalid Request', session_id=session_id)
+
+        requests = [
+            message
+            for message in messages
+            if not (isinstance(message, dict) and 'id' not in message)
+        ]
+        if not requests:
+            logger.debug('Batch only has notifications')
+            return {
+                'statusCode': 202,
+                'body': '',
+                'headers': {'Content-Type': 'application/json', 'MCP-Version': '0.6'},
+            }
+
+        session_error = self._validate_session(session_id, None)
+        if session_error is not None:
+            return session_error
+
+        responses = self._run(self._handle_messages(requests, session_id))
+
+        headers = {'Content-Type': 'application/json', 'MCP-Version': '0.6'}
+        if session_id:
+            headers['MCP-Session-Id'] = session_id
+        # Every response body is a JSON-RPC response, joined without parsing them again
+        body = '[' + ','.join(response['body'] for response in responses) + ']'
+        return {'statusCode': 200, 'body': body, 'headers': headers}
+
+    async def _handle_messages(self, messages: List[Any], session_id: Optional[str]) -> List[Dict]:
+        """Handle the messages of a batch concurrently, returning their responses in order."""
+        return await asyncio.gather(
+            *(self._handle_message(message, session_id, batched=True) for message in messages)
+        )
+
+    def _validate_session(self, session_id: Optional[str], request_id: Any) -> Optional[Dict]:
+        """Check that a request has a valid session if the session store needs one.
+
+        Returns:
+            The error response if the session is missing or invalid, None otherwise
+        """
+        if session_id:
+            session_data = self.session_store.get_session(session_id)
+            if session_data is None:
+                return self._create_error_response(
+                    -32000, 'Invalid or expired session', request_id, status_code=404
+                )
+        elif not isinstance(self.session_store, NoOpSessionStore):
+            return self._create_error_response(
+                -32000, 'Session required', request_id, status_code=400
+            )
+        return None
+
+    async def _handle_message(
+        self, body: Any, session_id: Optional[str], batched: bool = False
+    ) -> Dict:
+        """Handle a single JSON-RPC message.
+
+        Args:
+            body: Parsed JSON-RPC message
+            session_id: Session ID of the request, if any
+            batched: Whether the message is part of a batch, whose session is already validated
+
+        Returns:
+            The response to the message
+        """
+        request_id = body.get('id') if isinstance(body, dict) else None
+
+        try:
+            # Check if this is a notification (no id field)
+            if isinstance(body, dict) and 'id' not in body:
+                logger.debug('Request is a notification')
+                return {
+                    'statusCode': 202,
+                    'body': '',
+                    'headers': {'Content-Type': 'application/json', 'MCP-Version': '0.6'},
+                }
+
+            # Validate basic JSON-RPC structure
+            if not isinstance(body, dict) or body.get('jsonrpc') != '2.0' or 'method' not in body:
+                return self._create_error_response(-32700, 'Parse error', request_id)
+
             # Parse and validate the request
             request = JSONRPCRequest.model_validate(body)
             logger.debug(f'Validated request: {request}')
 
             # Handle initialization request
             if request.method == 'initialize':
+                if batched:
+                    return self._create_error_response(
+                        -32600,
+                        'Invalid Request: initialize cannot be part of a batch',
+                        request.id,
+                        session_id=session_id,
+                    )
                 logger.info('Handling initialize request')
                 # Create new session
                 session_id = self.session_store.create_session()
@@ -466,18 +583,10 @@ class MCPLambdaHandler:
                 return self._create_success_response(result.model_dump(), request.id, session_id)
 
             # For all other requests, validate session if provided
-            if session_id:
-                session_data = self.session_store.get_session(session_id)
-                if session_data is None:
-                    return self._create_error_response(
-                        -32000, 'Invalid or expired session', request.id, status_code=404
-                    )
-            elif request.method != 'initialize' and not isinstance(
-                self.session_store, NoOpSessionStore
-            ):
-                return self._create_error_response(
-                    -32000, 'Session required', request.id, status_code=400
-                )
+            if not batched:
+                session_error = self._validate_session(session_id, request.id)
+                if session_error is not None:
+                    return session_error
 
             # Handle tools/list request
             if request.method == 'tools/list':
@@ -488,42 +597,8 @@ class MCPLambdaHandler:
 
             # Handle tool calls
             if request.method == 'tools/call' and request.params:
-                tool_name = request.params.get('name')
-                tool_args = request.params.get('arguments', {})
+                return await self._call_tool(request, session_id)
 
-                if tool_name not in self.tools:
-                    return self._create_error_response(
-                        -32601, f"Tool '{tool_name}' not found", request.id, session_id=session_id
-                    )
-
-                try:
-                    # Convert enum string values to enum objects
-                    converted_args = {}
-                    tool_func = self.tool_implementations[tool_name]
-                    hints = get_type_hints(tool_func)
-
-                    for arg_name, arg_value in tool_args.items():
-                        arg_type = hints.get(arg_name)
-                        if isinstance(arg_type, type) and issubclass(arg_type, Enum):
-                            converted_args[arg_name] = arg_type(arg_value)
-                        else:
-                            converted_args[arg_name] = arg_value
-
-                    result = tool_func(**converted_args)
-                    content = self._convert_result_to_content(result)
-                    return self._create_success_response(
-                        {'content': content}, request.id, session_id
-                    )
-                except Exception as e:
-                    logger.error(f'Error executing tool {tool_name}: {e}')
-                    error_content = [ErrorContent(text=str(e)).model_dump()]
-                    return self._create_error_response(
-                        -32603,
-                        f'Error executing tool: {str(e)}',
-                        request.id,
-                        error_content,
-                        session_id,
-                    )
             # Handle resources/list request
             if request.method == 'resources/list':
                 logger.info('Handling resources/list request')
@@ -597,6 +672,42 @@ class MCPLambdaHandler:
         except Exception as e:
             logger.error(f'Error processing request: {str(e)}', exc_info=True)
             return self._create_error_response(-32000, str(e), request_id, session_id=session_id)
-        finally:
-            # Clear session context
-            current_session_id.set(None)
+
+    async def _call_tool(self, request: JSONRPCRequest, session_id: Optional[str]) -> Dict:
+        """Call a tool, awaiting it if it is an ``async def`` function, in a thread otherwise."""
+        params = request.params or {}
+        tool_name = params.get('name')
+        tool_args = params.get('arguments', {})
+
+        if tool_name not in self.tools:
+            return self._create_error_response(
+                -32601, f"Tool '{tool_name}' not found", request.id, session_id=session_id
+            )
+
+        try:
+            converters = self.tool_argument_converters.get(tool_name, {})
+            converted_args = {
+                arg_name: converters[arg_name](arg_value) if arg_name in converters else arg_value
+                for arg_name, arg_value in tool_args.items()
+            }
+
+            func = self.tool_implementations[tool_name]
+            if inspect.iscoroutinefunction(func):
+                result = await func(**converted_args)
+            else:
+                # Sync tools run off the loop, so that they can run event loops of their own
+                result = await asyncio.to_thread(func, **converted_args)
+            if inspect.isawaitable(result):
+                result = await result
+            content = self._convert_result_to_content(result)
+            return self._create_success_response({'content': content}, request.id, session_id)
+        except Exception as e:
+            logger.error(f'Error executing tool {tool_name}: {e}')
+            error_content = [ErrorContent(text=str(e)).model_dump()]
+            return self._create_error_response(
+                -32603,
+                f'Error executing tool: {str(e)}',
+                request.id,
+                error_content,
+                session_id,
+            )
@@ -15,15 +15,29 @@
 """Session management for MCP server with pluggable storage."""
 
 import boto3
+import copy
 import logging
+import threading
 import time
 import uuid
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional
+from botocore.exceptions import ClientError
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
 
 
 logger = logging.getLogger(__name__)
 
+# Seconds a cached session is served before being read again from DynamoDB
+SESSION_CACHE_TTL_SECONDS = 30.0
+
+# Maximum number of sessions cached by a DynamoDB session store
+SESSION_CACHE_MAX_SESSIONS = 1024
+
+# Attempts of a session update conflicting with updates from other containers
+SESSION_UPDATE_MAX_ATTEMPTS = 3
+
 
 class SessionStore(ABC):
     """Abstract base class for session storage implementations."""
@@ -102,19 +116,72 @@ class NoOpSessionStore(SessionStore):
         return True
 
 
-class DynamoDBSessionStore(SessionStore):
-    """Manages MCP sessions using DynamoDB."""
+@dataclass
+class CachedSession:
+    """Session data as last read from or written to the table."""
 
-    def __init__(self, table_name: str = 'mcp_sessions'):
+    data: Dict[str, Any]
+    version: int
+    expires_at: int
+    cached_at: float
+
+
+class DynamoDBSessionStore(SessionStore):
+    """Manages MCP sessions using DynamoDB.
+
+    Sessions are kept in a write-through in-memory cache owned by the store. A Lambda
+    container keeps the store between warm invocations, so most requests read their
+    session without calling DynamoDB. A cached session is read again from the table
+    once it is older than ``cache_ttl`` seconds, bounding how stale a session updated
+    by another container can be.
+
+    Every item has a ``version`` attribute. Updates only write the keys of the session
+    data that changed, on condition that the item still has the version they were
+    computed from. When another container updated the session first, the changes are
+    applied again on top of its version.
+    """
+
+    def __init__(
+        self,
+        table_name: str = 'mcp_sessions',
+        cache_ttl: float = SESSION_CACHE_TTL_SECONDS,
+        cache_max_sessions: int = SESSION_CACHE_MAX_SESSIONS,
+        endpoint_url: Optional[str] = None,
+        dax_endpoint: Optional[str] = None,
+    ):
         """Initialize the session store.
 
         Args:
             table_name: Name of DynamoDB table to use for sessions
+            cache_ttl: Seconds a cached session is served without reading the table
+            cache_max_sessions: Maximum number of sessions kept in the cache
+            endpoint_url: Endpoint of DynamoDB, such as DynamoDB Local, instead of the
+                endpoint of the region
+            dax_endpoint: Endpoint of a DAX cluster in front of the table, which needs
+                the amazon-dax-client package
 
         """
         self.table_name = table_name
-        self.dynamodb = boto3.resource('dynamodb')
+        self.cache_ttl = cache_ttl
+        self.cache_max_sessions = cache_max_sessions
+        if dax_endpoint:
+            try:
+                from amazondax import (  # pyright: ignore [reportMissingImports]
+                    AmazonDaxClient,
+                )
+            except ImportError as e:
+                raise ImportError(
+                    'amazon-dax-client is required to use a DAX endpoint. '
+                    'Install it with: pip install amazon-dax-client'
+                ) from e
+            self.dynamodb = AmazonDaxClient.resource(endpoint_url=dax_endpoint)
+        elif endpoint_url:
+            self.dynamodb = boto3.resource('dynamodb', endpoint_url=endpoint_url)
+        else:
+            self.dynamodb = boto3.resource('dynamodb')
         self.table = self.dynamodb.Table(table_name)  # pyright: ignore [reportAttributeAccessIssue]
+        self._cache: 'OrderedDict[str, CachedSession]' = OrderedDict()
+        self._lock = threading.Lock()
 
     def create_session(self, session_data: Optional[Dict[str, Any]] = None) -> str:
         """Create a new session.
@@ -137,10 +204,12 @@ class DynamoDBSessionStore(SessionStore):
             'session_id': session_id,
             'expires_at': expires_at,
             'created_at': int(time.time()),
+            'version': 0,
             'data': session_data or {},
         }
 
         self.table.put_item(Item=item)
+        self._cache_session(session_id, item['data'], 0, expires_at)
         logger.info(f'Created session {session_id}')
 
         return session_id
@@ -155,27 +224,34 @@ class DynamoDBSessionStore(SessionStore):
             Session data or None if not found
 
         """
-        try:
-            response = self.table.get_item(Key={'session_id': session_id})
-            item = response.get('Item')
-
-            if not item:
-                return None
-
-            # Check if session has expired
-            if item.get('expires_at', 0) < time.time():
+        cached = self._get_cached_session(session_id)
+        if cached is not None and time.time() - cached.cached_at < self.cache_ttl:
+            if cached.expires_at < time.time():
                 self.delete_session(session_id)
                 return None
+            return copy.deepcopy(cached.data)
 
-            return item.get('data', {})
-
+        try:
+            cached = self._load_session(session_id)
         except Exception as e:
             logger.error(f'Error getting session {session_id}: {e}')
             return None
+        if cached is None:
+            return None
+
+        # Check if session has expired
+        if cached.expires_at < time.time():
+            self.delete_session(session_id)
+            return None
+
+        return copy.deepcopy(cached.data)
 
     def update_session(self, session_id: str, session_data: Dict[str, Any]) -> bool:
         """Update session data.
 
+        Only the keys that differ from the cached session are written. Without a cached
+        session, the whole session data is written.
+
         Args:
             session_id: The session ID to update
             session_data: New session data
@@ -184,15 +260,33 @@ class DynamoDBSessionStore(SessionStore):
             True if successful, False otherwise
 
         """
+        cached = self._get_cached_session(session_id)
         try:
-            self.table.update_item(
-                Key={'session_id': session_id},
-                UpdateExpression='SET #data = :data',
-                ExpressionAttributeNames={'#data': 'data'},
-                ExpressionAttributeValues={':data': session_data},
-            )
-            return True
+            if cached is None:
+                self._write_session(session_id, session_data)
+                return True
+
+            changed = {
+                key: value
+                for key, value in session_data.items()
+                if key not in cached.data or cached.data[key] != value
+            }
+            removed = [key for key in cached.data if key not in session_data]
+            if not changed and not removed:
+                return True
+
+            for _ in range(SESSION_UPDATE_MAX_ATTEMPTS):
+                if self._write_changes(session_id, cached, changed, removed):
+                    return True
+                # Another container updated the session, apply the changes to its version
+                cached = self._load_session(session_id)
+                if cached is None:
+                    logger.error(f'Error updating session {session_id}: session not found')
+                    return False
+            logger.error(f'Error updating session {session_id}: too many concurrent updates')
+            return False
         except Exception as e:
+            self._forget_session(session_id)
             logger.error(f'Error updating session {session_id}: {e}')
             return False
 
@@ -206,6 +300,7 @@ class DynamoDBSessionStore(SessionStore):
             True if successful, False otherwise
 
         """
+        self._forget_session(session_id)
         try:
             self.table.delete_item(Key={'session_id': session_id})
             logger.info(f'Deleted session {session_id}')
@@ -213,3 +308,101 @@ class DynamoDBSessionStore(SessionStore):
         except Exception as e:
             logger.error(f'Error deleting session {session_id}: {e}')
             return False
+
+    def _load_session(self, session_id: str) -> Optional[CachedSession]:
+        response = self.table.get_item(Key={'session_id': session_id})
+        item = response.get('Item')
+        if not item:
+            self._forget_session(session_id)
+            return None
+        return self._cache_session(
+            session_id,
+            item.get('data', {}),
+            int(item.get('version', 0)),
+            int(item.get('expires_at', 0)),
+        )
+
+    def _write_session(self, session_id: str, session_data: Dict[str, Any]):
+        self.table.update_item(
+            Key={'session_id': session_id},
+            UpdateExpression='SET #data = :data ADD #version :one',
+            ExpressionAttributeNames={'#data': 'data', '#version': 'version'},
+            ExpressionAttributeValues={':data': session_data, ':one': 1},
+        )
+        # The version written is unknown, so the next read loads the session again
+        self._forget_session(session_id)
+
+    def _write_changes(
+        self,
+        session_id: str,
+        cached: CachedSession,
+        changed: Dict[str, Any],
+        removed: List[str],
+    ) -> bool:
+        names = {'#data': 'data', '#version': 'version'}
+        values: Dict[str, Any] = {':one': 1, ':expected': cached.version}
+        assignments = []
+        for i, (key, value) in enumerate(changed.items()):
+            names[f'#k{i}'] = key
+            values[f':v{i}'] = value
+            assignments.append(f'#data.#k{i} = :v{i}')
+        removals = []
+        for i, key in enumerate(removed):
+            names[f'#r{i}'] = key
+            removals.append(f'#data.#r{i}')
+
+        expression = ''
+        if assignments:
+            expression += f'SET {", ".join(assignments)} '
+        if removals:
+            expression += f'REMOVE {", ".join(removals)} '
+        expression += 'ADD #version :one'
+        # Items created before versioning have no version attribute
+        condition = '#version = :expected'
+        if cached.version == 0:
+            condition = f'attribute_not_exists(#version) OR {condition}'
+
+        try:
+            self.table.update_item(
+                Key={'session_id': session_id},
+                UpdateExpression=expression,
+                ConditionExpression=condition,
+                ExpressionAttributeNames=names,
+                ExpressionAttributeValues=values,
+            )
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') == 'ConditionalCheckFailedException':
+                return False
+            raise
+
+        data = {key: value for key, value in cached.data.items() if key not in removed}
+        data.update(changed)
+        self._cache_session(session_id, data, cached.version + 1, cached.expires_at)
+        return True
+
+    def _get_cached_session(self, session_id: str) -> Optional[CachedSession]:
+        with self._lock:
+            cached = self._cache.get(session_id)
+            if cached is not None:
+                self._cache.move_to_end(session_id)
+            return cached
+
+    def _cache_session(
+        self, session_id: str, data: Dict[str, Any], version: int, expires_at: int
+    ) -> CachedSession:
+        cached = CachedSession(
+            data=copy.deepcopy(data),
+            version=version,
+            expires_at=expires_at,
+            cached_at=time.time(),
+        )
+        with self._lock:
+            self._cache[session_id] = cached
+            self._cache.move_to_end(session_id)
+            while len(self._cache) > self.cache_max_sessions:
+                self._cache.popitem(last=False)
+        return cached
+
+    def _forget_session(self, session_id: str):
+        with self._lock:
+            self._cache.pop(session_id, None)
@@ -1,3 +1,4 @@
+import asyncio
 import json
 import os
 import pytest
@@ -215,7 +216,8 @@ def test_dynamodb_session_store_methods():
     with patch('boto3.resource') as mock_resource:
         mock_table = MagicMock()
         mock_resource.return_value.Table.return_value = mock_table
-        store = DynamoDBSessionStore('test-table')
+        # Without caching, every read goes to the table
+        store = DynamoDBSessionStore('test-table', cache_ttl=0)
         # create_session
         sid = store.create_session({'foo': 'bar'})
         assert isinstance(sid, str)
@@ -1425,3 +1427,198 @@ def test_multiple_resources_same_handler():
             assert 'Content' in content['text']
     finally:
         os.unlink(temp_path)
+
+
+# --- Batch and async tool tests ---
+def make_batch_event(messages, session_id=None):
+    """Create a Lambda event with a JSON-RPC batch body."""
+    event = make_lambda_event(json.dumps(messages))
+    if session_id:
+        event['headers']['mcp-session-id'] = session_id
+    return event
+
+
+def tool_call(request_id, name, arguments=None):
+    """Create a tools/call JSON-RPC request."""
+    return {
+        'jsonrpc': '2.0',
+        'id': request_id,
+        'method': 'tools/call',
+        'params': {'name': name, 'arguments': arguments or {}},
+    }
+
+
+def test_handle_request_batch():
+    """Test that a batch is answered with an array of responses, skipping notifications."""
+    handler = MCPLambdaHandler('test-server')
+
+    @handler.tool()
+    def add(a: int, b: int) -> int:
+        """Add two numbers."""
+        return a + b
+
+    resp = handler.handle_request(
+        make_batch_event(
+            [
+                {'jsonrpc': '2.0', 'id': 1, 'method': 'tools/list'},
+                {'jsonrpc': '2.0', 'method': 'notifications/initialized'},
+                tool_call(2, 'add', {'a': 1, 'b': 2}),
+                tool_call(3, 'missing'),
+                {'jsonrpc': '1.0', 'id': 4, 'method': 'ping'},
+            ]
+        ),
+        None,
+    )
+
+    assert resp['statusCode'] == 200
+    body = json.loads(resp['body'])
+    assert [response['id'] for response in body] == [1, 2, 3, 4]
+    assert body[0]['result']['tools'][0]['name'] == 'add'
+    assert body[1]['result']['content'][0]['text'] == '3'
+    assert body[2]['error']['code'] == -32601
+    assert body[3]['error']['code'] == -32700
+
+
+def test_handle_request_batch_edge_cases():
+    """Test empty batches, batches of notifications, and initialize in a batch."""
+    handler = MCPLambdaHandler('test-server')
+
+    resp = handler.handle_request(make_batch_event([]), None)
+    assert json.loads(resp['body'])['error']['code'] == -32600
+
+    resp = handler.handle_request(
+        make_batch_event([{'jsonrpc': '2.0', 'method': 'notifications/initialized'}]), None
+    )
+    assert resp['statusCode'] == 202
+
+    resp = handler.handle_request(
+        make_batch_event([{'jsonrpc': '2.0', 'id': 1, 'method': 'initialize'}]), None
+    )
+    assert json.loads(resp['body'])[0]['error']['code'] == -32600
+
+
+def test_handle_request_batch_validates_the_session_once():
+    """Test that the session of a batch is read once, and that invalid sessions are rejected."""
+    store = MagicMock()
+    store.get_session.return_value = {}
+    handler = MCPLambdaHandler('test-server', session_store=store)
+    ping = {'jsonrpc': '2.0', 'method': 'ping'}
+
+    resp = handler.handle_request(
+        make_batch_event([{**ping, 'id': i} for i in range(3)], session_id='sid'), None
+    )
+    assert resp['statusCode'] == 200
+    assert resp['headers']['MCP-Session-Id'] == 'sid'
+    assert len(json.loads(resp['body'])) == 3
+    assert store.get_session.call_count == 1
+
+    store.get_session.return_value = None
+    resp = handler.handle_request(make_batch_event([{**ping, 'id': 1}], session_id='sid'), None)
+    assert resp['statusCode'] == 404
+
+    resp = handler.handle_request(make_batch_event([{**ping, 'id': 1}]), None)
+    assert resp['statusCode'] == 400
+
+
+def test_async_tools_run_concurrently():
+    """Test that the async tools of a batch overlap, on a loop reused by later invocations."""
+    handler = MCPLambdaHandler('test-server')
+    ready = {}
+    loops = []
+
+    @handler.tool()
+    async def wait_for_signal() -> str:
+        """Wait until the signal tool runs."""
+        loops.append(asyncio.get_running_loop())
+        ready['event'] = ready.get('event') or asyncio.Event()
+        await asyncio.wait_for(ready['event'].wait(), timeout=5)
+        return 'signaled'
+
+    @handler.tool()
+    async def send_signal() -> str:
+        """Signal the waiting tool."""
+        await asyncio.sleep(0)
+        ready['event'] = ready.get('event') or asyncio.Event()
+        ready['event'].set()
+        return 'sent'
+
+    resp = handler.handle_request(
+        make_batch_event([tool_call(1, 'waitForSignal'), tool_call(2, 'sendSignal')]), None
+    )
+    body = json.loads(resp['body'])
+    assert [response['result']['content'][0]['text'] for response in body] == ['signaled', 'sent']
+
+    ready.clear()
+    resp = handler.handle_request(make_lambda_event(tool_call(3, 'sendSignal')), None)
+    assert json.loads(resp['body'])['result']['content'][0]['text'] == 'sent'
+    resp = handler.handle_request(make_lambda_event(tool_call(4, 'waitForSignal')), None)
+    assert json.loads(resp['body'])['result']['content'][0]['text'] == 'signaled'
+    assert loops[0] is loops[1]
+
+
+@pytest.mark.asyncio
+async def test_async_tools_called_from_a_running_loop():
+    """Test that the handler can be called from a coroutine."""
+    handler = MCPLambdaHandler('test-server')
+
+    @handler.tool()
+    async def echo(text: str) -> str:
+        """Echo a text."""
+        await asyncio.sleep(0)
+        return text
+
+    resp = handler.handle_request(make_lambda_event(tool_call(1, 'echo', {'text': 'hi'})), None)
+
+    assert json.loads(resp['body'])['result']['content'][0]['text'] == 'hi'
+
+
+def test_sync_tools_run_off_the_event_loop():
+    """Test that sync tools can run their own event loop, alone and within a batch."""
+    handler = MCPLambdaHandler('test-server')
+
+    async def fetch(text: str) -> str:
+        await asyncio.sleep(0)
+        return text
+
+    @handler.tool()
+    def fetch_sync(text: str) -> str:
+        """Fetch a text with an event loop of the tool."""
+        return asyncio.run(fetch(text))
+
+    resp = handler.handle_request(
+        make_lambda_event(tool_call(1, 'fetchSync', {'text': 'hi'})), None
+    )
+    assert json.loads(resp['body'])['result']['content'][0]['text'] == 'hi'
+
+    resp = handler.handle_request(
+        make_batch_event(
+            [tool_call(2, 'fetchSync', {'text': 'a'}), tool_call(3, 'fetchSync', {'text': 'b'})]
+        ),
+        None,
+    )
+    body = json.loads(resp['body'])
+    assert [response['result']['content'][0]['text'] for response in body] == ['a', 'b']
+
+
+def test_tool_argument_converters_are_built_at_registration():
+    """Test that tool calls convert enum arguments without inspecting the tool again."""
+    from enum import Enum
+
+    class Color(Enum):
+        RED = 'red'
+
+    handler = MCPLambdaHandler('test-server')
+
+    @handler.tool()
+    def paint(color: Color, times: int) -> str:
+        """Paint."""
+        return f'{color.name} x{times}'
+
+    assert handler.tool_argument_converters['paint'] == {'color': Color}
+    with patch('awslabs.mcp_lambda_handler.mcp_lambda_handler.get_type_hints') as hints:
+        resp = handler.handle_request(
+            make_lambda_event(tool_call(1, 'paint', {'color': 'red', 'times': 2})), None
+        )
+
+    assert json.loads(resp['body'])['result']['content'][0]['text'] == 'RED x2'
+    assert hints.call_count == 0
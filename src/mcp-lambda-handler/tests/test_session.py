@@ -0,0 +1,197 @@
+"""Tests for the session cache and versioned writes of DynamoDBSessionStore."""
+
+import boto3
+import builtins
+import pytest
+import time
+from awslabs.mcp_lambda_handler.session import DynamoDBSessionStore
+from moto import mock_aws
+from unittest.mock import patch
+
+
+TABLE_NAME = 'mcp_sessions'
+
+
+@pytest.fixture
+def table(monkeypatch):
+    """Create the session table in a mocked DynamoDB."""
+    monkeypatch.setenv('AWS_DEFAULT_REGION', 'us-east-1')
+    monkeypatch.setenv('AWS_ACCESS_KEY_ID', 'testing')
+    monkeypatch.setenv('AWS_SECRET_ACCESS_KEY', 'testing')
+    with mock_aws():
+        table = boto3.resource('dynamodb').create_table(  # pyright: ignore [reportAttributeAccessIssue]
+            TableName=TABLE_NAME,
+            KeySchema=[{'AttributeName': 'session_id', 'KeyType': 'HASH'}],
+            AttributeDefinitions=[{'AttributeName': 'session_id', 'AttributeType': 'S'}],
+            BillingMode='PAY_PER_REQUEST',
+        )
+        yield table
+
+
+def spy(store, method):
+    """Count the calls of a table method of a store, still calling DynamoDB."""
+    return patch.object(store.table, method, wraps=getattr(store.table, method))
+
+
+def test_sessions_are_read_from_the_cache(table):
+    """Test that a warm store reads sessions without calling DynamoDB."""
+    store = DynamoDBSessionStore(TABLE_NAME)
+    session_id = store.create_session({'user': 'alice'})
+
+    with spy(store, 'get_item') as get_item:
+        assert store.get_session(session_id) == {'user': 'alice'}
+        assert store.update_session(session_id, {'user': 'bob'}) is True
+        assert store.get_session(session_id) == {'user': 'bob'}
+
+    assert get_item.call_count == 0
+    assert table.get_item(Key={'session_id': session_id})['Item']['data'] == {'user': 'bob'}
+
+
+def test_cached_sessions_are_read_again_after_the_ttl(table):
+    """Test that a session cached longer than the TTL is read again from the table."""
+    store = DynamoDBSessionStore(TABLE_NAME, cache_ttl=60)
+    session_id = store.create_session({'count': 1})
+    table.update_item(
+        Key={'session_id': session_id},
+        UpdateExpression='SET #data.#count = :count',
+        ExpressionAttributeNames={'#data': 'data', '#count': 'count'},
+        ExpressionAttributeValues={':count': 2},
+    )
+
+    assert store.get_session(session_id) == {'count': 1}
+    with patch('awslabs.mcp_lambda_handler.session.time.time', return_value=time.time() + 61):
+        assert store.get_session(session_id) == {'count': 2}
+
+
+def test_returned_sessions_do_not_change_the_cache(table):
+    """Test that changing returned session data in place does not change the cache."""
+    store = DynamoDBSessionStore(TABLE_NAME)
+    session_id = store.create_session({'items': [1]})
+
+    data = store.get_session(session_id)
+    assert data is not None
+    data['items'].append(2)
+
+    assert store.get_session(session_id) == {'items': [1]}
+
+
+def test_updates_only_write_changed_keys(table):
+    """Test that updates set changed keys, remove deleted ones, and skip unchanged data."""
+    store = DynamoDBSessionStore(TABLE_NAME)
+    session_id = store.create_session({'keep': 'x' * 1000, 'change': 1, 'drop': True})
+
+    with spy(store, 'update_item') as update_item:
+        assert store.update_session(session_id, {'keep': 'x' * 1000, 'change': 2}) is True
+        kwargs = update_item.call_args.kwargs
+        assert (
+            kwargs['UpdateExpression'] == 'SET #data.#k0 = :v0 REMOVE #data.#r0 ADD #version :one'
+        )
+        assert kwargs['ExpressionAttributeNames']['#k0'] == 'change'
+        assert kwargs['ExpressionAttributeNames']['#r0'] == 'drop'
+        assert 'x' * 1000 not in kwargs['ExpressionAttributeValues'].values()
+
+        assert store.update_session(session_id, {'keep': 'x' * 1000, 'change': 2}) is True
+        assert update_item.call_count == 1
+
+    item = table.get_item(Key={'session_id': session_id})['Item']
+    assert item['data'] == {'keep': 'x' * 1000, 'change': 2}
+    assert item['version'] == 1
+
+
+def test_concurrent_updates_are_merged(table):
+    """Test that an update conflicting with another container is applied on its version."""
+    container_a = DynamoDBSessionStore(TABLE_NAME)
+    container_b = DynamoDBSessionStore(TABLE_NAME)
+    session_id = container_a.create_session({'a': 0, 'b': 0})
+    assert container_b.get_session(session_id) == {'a': 0, 'b': 0}
+
+    assert container_a.update_session(session_id, {'a': 1, 'b': 0}) is True
+    with spy(container_b, 'update_item') as update_item:
+        assert container_b.update_session(session_id, {'a': 0, 'b': 1}) is True
+        assert update_item.call_count == 2
+
+    item = table.get_item(Key={'session_id': session_id})['Item']
+    assert item['data'] == {'a': 1, 'b': 1}
+    assert item['version'] == 2
+    assert container_b.get_session(session_id) == {'a': 1, 'b': 1}
+
+
+def test_sessions_created_before_versioning_are_updated(table):
+    """Test that items without a version attribute are updated conditionally."""
+    table.put_item(
+        Item={
+            'session_id': 'legacy',
+            'expires_at': int(time.time()) + 3600,
+            'created_at': int(time.time()),
+            'data': {'a': 1},
+        }
+    )
+    store = DynamoDBSessionStore(TABLE_NAME)
+
+    assert store.get_session('legacy') == {'a': 1}
+    assert store.update_session('legacy', {'a': 2}) is True
+
+    item = table.get_item(Key={'session_id': 'legacy'})['Item']
+    assert item['data'] == {'a': 2}
+    assert item['version'] == 1
+
+
+def test_uncached_sessions_are_written_whole(table):
+    """Test that a session missing from the cache is written whole and read again."""
+    writer = DynamoDBSessionStore(TABLE_NAME)
+    session_id = writer.create_session({'a': 1})
+    store = DynamoDBSessionStore(TABLE_NAME)
+
+    assert store.update_session(session_id, {'b': 2}) is True
+
+    with spy(store, 'get_item') as get_item:
+        assert store.get_session(session_id) == {'b': 2}
+        assert get_item.call_count == 1
+
+
+def test_expired_and_deleted_sessions(table):
+    """Test that expired sessions are deleted and deleted sessions leave the cache."""
+    store = DynamoDBSessionStore(TABLE_NAME)
+    session_id = store.create_session()
+    assert store.delete_session(session_id) is True
+    assert store.get_session(session_id) is None
+
+    session_id = store.create_session()
+    with patch(
+        'awslabs.mcp_lambda_handler.session.time.time', return_value=time.time() + 25 * 3600
+    ):
+        assert store.get_session(session_id) is None
+    assert 'Item' not in table.get_item(Key={'session_id': session_id})
+
+
+def test_cache_is_bounded(table):
+    """Test that the least recently used sessions leave the cache."""
+    store = DynamoDBSessionStore(TABLE_NAME, cache_max_sessions=2)
+    first = store.create_session({'n': 1})
+    second = store.create_session({'n': 2})
+    store.get_session(first)
+    store.create_session({'n': 3})
+
+    with spy(store, 'get_item') as get_item:
+        assert store.get_session(first) == {'n': 1}
+        assert get_item.call_count == 0
+        assert store.get_session(second) == {'n': 2}
+        assert get_item.call_count == 1
+
+
+def test_endpoints():
+    """Test that the store can use another DynamoDB endpoint, and needs the DAX client for DAX."""
+    with patch('boto3.resource') as mock_resource:
+        DynamoDBSessionStore(TABLE_NAME, endpoint_url='http://localhost:8000')
+        mock_resource.assert_called_once_with('dynamodb', endpoint_url='http://localhost:8000')
+
+    real_import = builtins.__import__
+
+    def import_without_dax(name, *args, **kwargs):
+        if name == 'amazondax':
+            raise ImportError(name)
+        return real_import(name, *args, **kwargs)
+
+    with patch('builtins.__import__', side_effect=import_without_dax):
+        with pytest.raises(ImportError, match='amazon-dax-client'):
+            DynamoDBSessionStore(TABLE_NAME, dax_endpoint='daxs://cluster.dax.amazonaws.com')